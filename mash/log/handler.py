@@ -17,66 +17,23 @@
 #
 
 import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
 
 from amqpstorm import Connection
 
-from logging.handlers import SocketHandler
-
-
-class RabbitMQHandler(SocketHandler):
-    """
-    Log handler for sending messages to RabbitMQ.
-    """
-    def __init__(
-        self, host='localhost', port=5672, exchange='logger',
-        username='guest', password='guest',
-        routing_key='mash.logger'
-    ):
-        """
-        Initialize the handler instance.
-        """
-        super(RabbitMQHandler, self).__init__(host, port)
-
-        self.username = username
-        self.password = password
-        self.exchange = exchange
-        self.routing_key = routing_key
-
-    def makeSocket(self):
-        """
-        Create a new instance of RabbitMQ socket connection.
-        """
-        return RabbitMQSocket(
-            self.host,
-            self.port,
-            self.username,
-            self.password,
-            self.exchange,
-            self.routing_key
-        )
-
-    def makePickle(self, record):
-        """
-        Format the log message to a json string.
-        """
-        rabbit_attrs = ['msg', 'job_id']
-
-        data = {}
-        record.msg = self.format(record)
-
-        for attr in rabbit_attrs:
-            if hasattr(record, attr):
-                data[attr] = getattr(record, attr)
-
-        return json.dumps(data, sort_keys=True)
-
 
 class RabbitMQSocket(object):
     """
     RabbitMQ socket class.
 
     Maintains a connection for logging and publishing
-    logs to exchange.
+    logs to exchange. The channel is in transaction mode so a
+    batch of records is confirmed by the broker with one commit.
     """
     def __init__(
         self, host, port, username, password, exchange, routing_key
@@ -127,18 +84,320 @@ class RabbitMQSocket(object):
 
         if not self.channel or self.channel.is_closed:
             self.channel = self.connection.channel()
+            self.channel.tx.select()
 
-    def sendall(self, msg):
+    def publish(self, messages):
         """
-        Override socket sendall method to publish message to exchange.
+        Publish the messages to the exchange in one transaction.
+
+        The messages are sent without waiting for the broker and the
+        commit returns once the broker has accepted all of them.
         """
         self.open()
-        self.channel.basic.publish(
-            body=msg,
-            routing_key=self.routing_key,
-            exchange=self.exchange,
-            properties={
-                'content_type': 'application/json',
-                'delivery_mode': 2
-            }
-        )
+
+        for msg in messages:
+            self.channel.basic.publish(
+                body=msg,
+                routing_key=self.routing_key,
+                exchange=self.exchange,
+                properties={
+                    'content_type': 'application/json',
+                    'delivery_mode': 2
+                }
+            )
+
+        self.channel.tx.commit()
+
+
+class AsyncRabbitMQHandler(logging.Handler):
+    """
+    Non-blocking log handler for sending messages to RabbitMQ.
+
+    Records are formatted in the logging thread and handed to a
+    bounded queue. A background thread publishes them in batches on
+    its own connection, so a slow broker does not stall the threads
+    that log.
+
+    If the queue is full records are dropped, or with the spill
+    policy appended to spill_file and published once the queue
+    drains.
+    """
+    def __init__(
+        self, host='localhost', port=5672, exchange='logger',
+        username='guest', password='guest',
+        routing_key='mash.logger', max_queue_size=10000,
+        batch_size=100, flush_interval=0.5, retry_interval=5,
+        report_interval=60, overflow_policy='drop', spill_file=None
+    ):
+        """
+        Initialize the handler instance.
+        """
+        super(AsyncRabbitMQHandler, self).__init__()
+
+        if overflow_policy not in ('drop', 'spill'):
+            raise ValueError(
+                'Invalid overflow policy: {0}'.format(overflow_policy)
+            )
+
+        if overflow_policy == 'spill' and not spill_file:
+            raise ValueError('A spill file is required to spill records.')
+
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.exchange = exchange
+        self.routing_key = routing_key
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+        self.report_interval = report_interval
+        self.overflow_policy = overflow_policy
+        self.spill_file = spill_file
+
+        self.sock = None
+        self.records = None
+        self.stats = {
+            'queued': 0,
+            'published': 0,
+            'dropped': 0,
+            'spilled': 0,
+            'publish_errors': 0,
+            'last_latency': 0.0,
+            'max_latency': 0.0
+        }
+
+        self._pid = None
+        self._thread = None
+        self._stopped = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._reported_drops = 0
+
+    def _ensure_publisher(self):
+        """
+        Start the publisher thread in this process.
+
+        A forked child does not inherit the parent's thread so a new
+        queue and publisher are created.
+        """
+        if self._pid == os.getpid():
+            return
+
+        with self._stats_lock:
+            if self._pid == os.getpid():
+                return
+
+            self.records = queue.Queue(maxsize=self.max_queue_size)
+            self.sock = None
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._publish_records,
+                name='rabbitmq-log-publisher',
+                daemon=True
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _increment(self, name, count=1):
+        with self._stats_lock:
+            self.stats[name] += count
+
+    def get_stats(self):
+        """
+        Return a copy of the handler counters.
+
+        Latencies are the time in seconds between a record being
+        emitted and published.
+        """
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def format_record(self, record):
+        """
+        Format the log message to a json string.
+
+        The unformatted message, level, logger name and creation time
+        are included for the structured job log store.
+        """
+        rabbit_attrs = [
+            'msg', 'job_id', 'message', 'levelname', 'name', 'created'
+        ]
+
+        data = {}
+        record.msg = self.format(record)
+
+        for attr in rabbit_attrs:
+            if hasattr(record, attr):
+                data[attr] = getattr(record, attr)
+
+        return json.dumps(data, sort_keys=True)
+
+    def emit(self, record):
+        """
+        Queue the formatted record without blocking.
+        """
+        try:
+            self._ensure_publisher()
+            body = self.format_record(record)
+        except Exception:
+            self.handleError(record)
+            return
+
+        try:
+            self.records.put_nowait((time.monotonic(), body))
+        except queue.Full:
+            self._handle_overflow(body)
+        else:
+            self._increment('queued')
+
+    def _handle_overflow(self, body):
+        if self.overflow_policy == 'spill':
+            try:
+                with self._spill_lock:
+                    with open(self.spill_file, 'a') as spill:
+                        spill.write(body + '\n')
+            except Exception:
+                self._increment('dropped')
+            else:
+                self._increment('spilled')
+        else:
+            self._increment('dropped')
+
+    def _get_batch(self):
+        """
+        Wait for a record and return it with any others queued.
+        """
+        try:
+            batch = [self.records.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.records.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _get_spilled_batch(self):
+        """
+        Return spilled records once the queue has drained.
+        """
+        if self.overflow_policy != 'spill' or not self.records.empty():
+            return []
+
+        replay_file = self.spill_file + '.replay'
+
+        with self._spill_lock:
+            if not os.path.exists(self.spill_file):
+                return []
+
+            os.replace(self.spill_file, replay_file)
+
+        now = time.monotonic()
+
+        with open(replay_file) as replay:
+            batch = [
+                (now, line.strip()) for line in replay if line.strip()
+            ]
+
+        os.remove(replay_file)
+        return batch
+
+    def _publish_batch(self, batch):
+        """
+        Publish the batch in one transaction.
+
+        The batch is emptied once it is committed, a batch that fails
+        is published again as a whole.
+        """
+        if not self.sock:
+            self.sock = RabbitMQSocket(
+                self.host,
+                self.port,
+                self.username,
+                self.password,
+                self.exchange,
+                self.routing_key
+            )
+
+        self.sock.publish([body for _, body in batch])
+        now = time.monotonic()
+        latency = now - batch[-1][0]
+
+        with self._stats_lock:
+            self.stats['published'] += len(batch)
+            self.stats['last_latency'] = latency
+            self.stats['max_latency'] = max(
+                now - batch[0][0], self.stats['max_latency']
+            )
+
+        del batch[:]
+
+    def _report_drops(self):
+        """
+        Report records dropped since the last report to stderr.
+        """
+        dropped = self.get_stats()['dropped']
+
+        if dropped > self._reported_drops:
+            sys.stderr.write(
+                'RabbitMQ log handler dropped {0} records.\n'.format(
+                    dropped - self._reported_drops
+                )
+            )
+            self._reported_drops = dropped
+
+    def _publish_records(self):
+        """
+        Publish queued records until the handler is closed.
+
+        A batch that fails to publish is retried on a new connection.
+        """
+        batch = []
+        last_report = time.monotonic()
+
+        while batch or not self.records.empty() or \
+                not self._stopped.is_set():
+            if not batch:
+                batch = self._get_batch() or self._get_spilled_batch()
+
+            if batch:
+                try:
+                    self._publish_batch(batch)
+                except Exception:
+                    self._increment('publish_errors')
+                    self._close_socket()
+
+                    if self._stopped.wait(self.retry_interval):
+                        break
+
+            if time.monotonic() - last_report >= self.report_interval:
+                self._report_drops()
+                last_report = time.monotonic()
+
+        self._close_socket()
+
+    def _close_socket(self):
+        try:
+            if self.sock:
+                self.sock.close()
+        except Exception:
+            pass
+
+        self.sock = None
+
+    def close(self):
+        """
+        Publish the queued records and stop the publisher thread.
+        """
+        self._stopped.set()
+
+        if self._thread and self._pid == os.getpid():
+            self._thread.join(timeout=self.flush_interval + 5)
+
+        self._report_drops()
+        super(AsyncRabbitMQHandler, self).close()
@@ -25,6 +25,7 @@ from mash.services.api.extensions import api, jwt
 
 from mash.log.filter import BaseServiceFilter
 from mash.utils.mash_utils import setup_logfile, setup_rabbitmq_log_handler
+from mash.utils.metrics import register_flask_metrics
 from mash.utils.email_notification import EmailNotification
 
 from mash.services.api.v1.utils.tokens import is_token_revoked
@@ -47,6 +48,7 @@ from mash.services.api.v1.routes.jobs.gce import api as v1_gce_jobs_api
 from mash.services.api.v1.routes.jobs.azure import api as v1_azure_jobs_api
 from mash.services.api.v1.routes.jobs.oci import api as v1_oci_jobs_api
 from mash.services.api.v1.routes.jobs.aliyun import api as v1_aliyun_jobs_api
+from mash.services.api.v1.routes.jobs.bulk import api as v1_bulk_jobs_api
 
 
 @jwt.token_in_blocklist_loader
@@ -63,6 +65,7 @@ def create_app(config_object):
     register_extensions(app)
     register_namespaces()
     configure_logger(app)
+    register_flask_metrics(app, 'api')
     configure_mailer(app)
     return app
 
@@ -123,6 +126,7 @@ def register_namespaces():
     api.add_namespace(v1_azure_jobs_api, path='/v1/jobs/azure')
     api.add_namespace(v1_oci_jobs_api, path='/v1/jobs/oci')
     api.add_namespace(v1_aliyun_jobs_api, path='/v1/jobs/aliyun')
+    api.add_namespace(v1_bulk_jobs_api, path='/v1/jobs/bulk')
 
 
 def register_extensions(app):
@@ -44,6 +44,14 @@ class Config(object):
     def LOG_FILE(self):
         return self.config.get_log_file('api')
 
+    @property
+    def JOB_LOG_DIRECTORY(self):
+        return self.config.get_job_log_directory()
+
+    @property
+    def JOB_LOG_ARCHIVE_DIRECTORY(self):
+        return self.config.get_job_log_archive_directory()
+
     @property
     def CLOUD_DATA(self):
         return self.config.get_cloud_data()
@@ -18,20 +18,48 @@
 
 import json
 
-from flask import request, jsonify, make_response, current_app
+from flask import (
+    Response,
+    current_app,
+    jsonify,
+    make_response,
+    request,
+    stream_with_context
+)
 from flask_restx import Namespace, Resource
 from flask_jwt_extended import (
     jwt_required,
     get_jwt_identity
 )
 
+from mash.mash_exceptions import MashJobException
 from mash.services.api.v1.schema import (
     default_response,
     validation_error,
-    job_list
+    job_list,
+    job_log,
+    job_stages
+)
+from mash.services.api.v1.utils.jobs import (
+    delete_job,
+    get_job,
+    get_jobs,
+    get_job_timeline,
+    get_stage_statistics
+)
+from mash.services.api.v1.utils.jobs.logs import gzip_response, read_job_log
+from mash.services.api.v1.utils.job_status import (
+    get_subscriber,
+    stream_job_status
+)
+from mash.services.database.routes.jobs import (
+    job_response,
+    job_data,
+    job_stage_response,
+    job_timeline_response,
+    stage_percentiles,
+    stage_statistics_response
 )
-from mash.services.api.v1.utils.jobs import delete_job, get_job, get_jobs
-from mash.services.database.routes.jobs import job_response, job_data
 
 
 api = Namespace(
@@ -41,11 +69,23 @@ api = Namespace(
 
 api.models['job_data'] = job_data
 api.models['job_response'] = job_response
+api.models['job_stage_response'] = job_stage_response
+api.models['job_timeline_response'] = job_timeline_response
+api.models['stage_percentiles'] = stage_percentiles
+api.models['stage_statistics_response'] = stage_statistics_response
 
 job_list_request = api.schema_model(
     'job_list_request', job_list
 )
 
+job_log_request = api.schema_model(
+    'job_log_request', job_log
+)
+
+job_stages_request = api.schema_model(
+    'job_stages_request', job_stages
+)
+
 validation_error_response = api.schema_model(
     'validation_error', validation_error
 )
@@ -87,6 +127,37 @@ class JobList(Resource):
         return make_response(jsonify(jobs), 200)
 
 
+@api.route('/stages')
+@api.doc(security='apiKey')
+@api.response(400, 'Validation error', validation_error_response)
+@api.response(401, 'Unauthorized', default_response)
+@api.response(422, 'Not processable', default_response)
+class JobStages(Resource):
+    @api.doc('get_job_stages')
+    @jwt_required()
+    @api.expect(job_stages_request)
+    @api.response(200, 'Success', [stage_statistics_response])
+    def get(self):
+        """
+        Get p50 and p95 stage duration, queue wait and throughput.
+
+        The percentiles are aggregated per cloud and service over the
+        jobs of the user.
+        """
+        try:
+            data = json.loads(request.data.decode())
+        except json.decoder.JSONDecodeError:  # pragma: no cover
+            data = {}  # pragma: no cover
+
+        try:
+            statistics = get_stage_statistics(get_jwt_identity(), **data)
+        except Exception as error:
+            current_app.logger.warning(error)
+            return make_response(jsonify({'msg': str(error)}), 400)
+
+        return make_response(jsonify(statistics), 200)
+
+
 @api.route('/<string:job_id>')
 @api.doc(security='apiKey')
 @api.response(400, 'Validation error', validation_error_response)
@@ -134,3 +205,101 @@ class Job(Resource):
             return make_response(jsonify(job), 200)
         else:
             return make_response(jsonify({'msg': 'Job not found'}), 404)
+
+
+@api.route('/<string:job_id>/events')
+@api.doc(security='apiKey')
+@api.response(401, 'Unauthorized', default_response)
+@api.response(422, 'Not processable', default_response)
+class JobEvents(Resource):
+    @api.doc('get_job_events')
+    @jwt_required()
+    @api.response(200, 'Server-Sent Events stream of job status')
+    @api.response(404, 'Not found', default_response)
+    def get(self, job_id):
+        """
+        Stream job status changes as Server-Sent Events.
+
+        The current state is sent first and the stream ends when the
+        job is finished or failed.
+        """
+        job_subscriber = get_subscriber()
+
+        # Subscribe before reading the job so no transition is missed.
+        watcher = job_subscriber.subscribe(job_id)
+
+        try:
+            job = get_job(job_id, get_jwt_identity())
+        except Exception:
+            job_subscriber.unsubscribe(job_id, watcher)
+            raise
+
+        if not job:
+            job_subscriber.unsubscribe(job_id, watcher)
+            return make_response(jsonify({'msg': 'Job not found'}), 404)
+
+        return Response(
+            stream_with_context(
+                stream_job_status(job, job_subscriber, watcher)
+            ),
+            mimetype='text/event-stream',
+            headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no'
+            }
+        )
+
+
+@api.route('/<string:job_id>/timeline')
+@api.doc(security='apiKey')
+@api.response(401, 'Unauthorized', default_response)
+@api.response(422, 'Not processable', default_response)
+class JobTimeline(Resource):
+    @api.doc('get_job_timeline')
+    @jwt_required()
+    @api.response(200, 'Success', job_timeline_response)
+    @api.response(404, 'Not found', default_response)
+    def get(self, job_id):
+        """
+        Get the queue wait, start and finish time of each job stage.
+        """
+        timeline = get_job_timeline(job_id, get_jwt_identity())
+
+        if timeline:
+            return make_response(jsonify(timeline), 200)
+        else:
+            return make_response(jsonify({'msg': 'Job not found'}), 404)
+
+
+@api.route('/<string:job_id>/logs')
+@api.doc(security='apiKey')
+@api.response(400, 'Validation error', validation_error_response)
+@api.response(401, 'Unauthorized', default_response)
+@api.response(422, 'Not processable', default_response)
+class JobLogs(Resource):
+    @api.doc('get_job_logs')
+    @jwt_required()
+    @api.expect(job_log_request)
+    @api.response(200, 'Success')
+    @api.response(404, 'Not found', default_response)
+    def get(self, job_id):
+        """
+        Get a line or byte range of the job log.
+
+        By default the last 100 lines are returned. The next offset in
+        the response can be used to follow the log.
+        """
+        try:
+            data = json.loads(request.data.decode())
+        except json.decoder.JSONDecodeError:  # pragma: no cover
+            data = {}  # pragma: no cover
+
+        if not get_job(job_id, get_jwt_identity()):
+            return make_response(jsonify({'msg': 'Job not found'}), 404)
+
+        try:
+            log = read_job_log(job_id, data)
+        except MashJobException as error:
+            return make_response(jsonify({'msg': str(error)}), 404)
+
+        return gzip_response(make_response(jsonify(log), 200))
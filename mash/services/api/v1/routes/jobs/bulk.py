@@ -0,0 +1,89 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import json
+
+from flask import jsonify, request, make_response
+from flask_restx import Namespace, Resource, fields
+from flask_jwt_extended import (
+    jwt_required,
+    get_jwt_identity
+)
+
+from mash.services.api.v1.schema import (
+    default_response,
+    validation_error
+)
+from mash.services.api.v1.routes.jobs import job_response
+from mash.services.api.v1.schema.jobs.bulk import bulk_job_message
+from mash.services.api.v1.utils.jobs.bulk import submit_bulk_jobs
+
+api = Namespace(
+    'Bulk Jobs',
+    description='Bulk Job operations'
+)
+api.models['job_response'] = job_response
+
+bulk_job = api.schema_model('bulk_job', bulk_job_message)
+validation_error_response = api.schema_model(
+    'validation_error', validation_error
+)
+bulk_job_result = api.model(
+    'bulk_job_result', {
+        'index': fields.Integer(example=0),
+        'status': fields.String(example='created'),
+        'msg': fields.String(example='Job doc is valid!'),
+        'job': fields.Nested(job_response, skip_none=True)
+    }
+)
+bulk_job_response = api.model(
+    'bulk_job_response', {
+        'jobs': fields.List(fields.Nested(bulk_job_result, skip_none=True))
+    }
+)
+
+
+@api.route('/')
+class BulkJobCreate(Resource):
+    @api.doc('add_bulk_jobs', security='apiKey')
+    @jwt_required()
+    @api.expect(bulk_job)
+    @api.response(200, 'Job docs are valid', bulk_job_response)
+    @api.response(201, 'Jobs added', bulk_job_response)
+    @api.response(400, 'Validation error', validation_error_response)
+    @api.response(401, 'Unauthorized', default_response)
+    @api.response(422, 'Not processable', default_response)
+    def post(self):
+        """
+        Add a list or matrix of jobs.
+
+        A result is returned for each job doc. Invalid job docs do
+        not prevent the valid job docs from being created.
+        """
+        data = json.loads(request.data.decode())
+        results = submit_bulk_jobs(data, get_jwt_identity())
+        status = [result['status'] for result in results]
+
+        if 'created' in status:
+            status_code = 201
+        elif 'valid' in status:
+            status_code = 200
+        else:
+            status_code = 400
+
+        return make_response(jsonify({'jobs': results}), status_code)
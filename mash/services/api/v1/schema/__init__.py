@@ -148,3 +148,73 @@ job_list = {
     },
     'additionalProperties': False
 }
+
+job_log = {
+    'type': 'object',
+    'properties': {
+        'line_offset': integer_with_example(
+            -100,
+            description='The first line to return. A negative offset '
+                        'counts back from the end of the log. Defaults to '
+                        'the last 100 lines.'
+        ),
+        'line_limit': {
+            'type': 'integer',
+            'minimum': 1,
+            'maximum': 10000,
+            'example': 100,
+            'description': 'The maximum number of lines to return.'
+        },
+        'byte_offset': {
+            'type': 'integer',
+            'minimum': 0,
+            'example': 0,
+            'description': 'Return a byte range starting at this offset '
+                           'instead of a line range. Line options are '
+                           'ignored when a byte offset is provided.'
+        },
+        'byte_limit': {
+            'type': 'integer',
+            'minimum': 1,
+            'maximum': 1048576,
+            'example': 65536,
+            'description': 'The maximum number of bytes to return.'
+        },
+        'follow': {
+            'type': 'boolean',
+            'example': True,
+            'description': 'If no log data is available at the offset wait '
+                           'for the log to grow before returning.'
+        },
+        'wait': {
+            'type': 'integer',
+            'minimum': 1,
+            'maximum': 60,
+            'example': 30,
+            'description': 'The maximum time in seconds to wait for new '
+                           'log data in follow mode.'
+        }
+    },
+    'additionalProperties': False
+}
+
+job_stages = {
+    'type': 'object',
+    'properties': {
+        'cloud': string_with_example(
+            'ec2',
+            description='Only include stages of jobs in this cloud.'
+        ),
+        'start': string_with_example(
+            '2026-10-01T00:00:00Z',
+            description='Only include stages finished after this '
+                        'date-time. Defaults to the last 30 days.'
+        ),
+        'end': string_with_example(
+            '2026-10-31T00:00:00Z',
+            description='Only include stages finished before this '
+                        'date-time.'
+        )
+    },
+    'additionalProperties': False
+}
@@ -18,7 +18,10 @@
 
 import copy
 
-from mash.services.api.v1.schema import string_with_example
+from mash.services.api.v1.schema import (
+    integer_with_example,
+    string_with_example
+)
 from mash.services.api.v1.schema.jobs import base_job_message
 
 azure_job_message = copy.deepcopy(base_job_message)
@@ -91,6 +94,34 @@ azure_job_message['properties']['gallery_resource_group'] = string_with_example(
                 'gallery is found. By default the source_resource_group '
                 'is used.'
 )
+azure_job_message['properties']['gallery_target_regions'] = {
+    'type': 'array',
+    'items': {
+        'type': 'object',
+        'properties': {
+            'name': string_with_example(
+                'eastus',
+                description='The region to replicate the image to.'
+            ),
+            'replica_count': dict(
+                integer_with_example(
+                    2,
+                    description='The number of replicas of the image '
+                                'version in the region.'
+                ),
+                minimum=1
+            )
+        },
+        'additionalProperties': False,
+        'required': ['name']
+    },
+    'minItems': 1,
+    'example': [{'name': 'eastus', 'replica_count': 2}],
+    'description': 'The regions the shared image gallery version is '
+                   'replicated to while it is created. The image '
+                   'region is always included with one replica unless '
+                   'it is listed with a replica count.'
+}
 
 azure_job_message['required'].append('cloud_account')
 azure_job_message['properties']['image']['example'] = \
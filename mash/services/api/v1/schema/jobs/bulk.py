@@ -0,0 +1,77 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+bulk_job_message = {
+    'type': 'object',
+    'properties': {
+        'jobs': {
+            'type': 'array',
+            'items': {'type': 'object'},
+            'minItems': 1,
+            'example': [
+                {
+                    'cloud': 'ec2',
+                    'cloud_account': 'account1',
+                    'cloud_architecture': 'x86_64'
+                }
+            ],
+            'description': 'A list of job docs. Each job doc requires a '
+                           'cloud key with one of the following values: '
+                           'aliyun, azure, ec2, gce or oci. The remaining '
+                           'keys follow the job doc schema of the given '
+                           'cloud.'
+        },
+        'job': {
+            'type': 'object',
+            'example': {
+                'image': 'openSUSE-Leap-15.0-EC2-HVM',
+                'last_service': 'publish'
+            },
+            'description': 'The base job doc used to expand the matrix. '
+                           'Every combination of matrix values is applied '
+                           'on top of a copy of this job doc.'
+        },
+        'matrix': {
+            'type': 'object',
+            'additionalProperties': {
+                'type': 'array',
+                'minItems': 1
+            },
+            'minProperties': 1,
+            'example': {
+                'cloud': ['ec2'],
+                'cloud_account': ['account1', 'account2'],
+                'cloud_architecture': ['x86_64', 'aarch64']
+            },
+            'description': 'A dictionary of job doc keys and a list of '
+                           'values for each key. One job is submitted for '
+                           'each combination of values.'
+        },
+        'dry_run': {
+            'type': 'boolean',
+            'example': True,
+            'description': 'Only validate the job documents and return. '
+                           'Do not create the jobs.'
+        }
+    },
+    'additionalProperties': False,
+    'anyOf': [
+        {'required': ['jobs']},
+        {'required': ['matrix']}
+    ]
+}
@@ -21,6 +21,17 @@ import copy
 from mash.services.api.v1.schema import string_with_example, non_empty_string
 from mash.services.api.v1.schema.jobs import base_job_message
 
+create_method = {
+    'type': 'string',
+    'enum': ['helper_instance', 'ebs_direct'],
+    'example': 'ebs_direct',
+    'description': 'The method used to create the image. With '
+                   '"helper_instance" the image is written to a volume '
+                   'attached to a helper instance. With "ebs_direct" the '
+                   'image is written straight into a snapshot using the '
+                   'EBS direct APIs. Defaults to "helper_instance".'
+}
+
 ec2_job_account = {
     'type': 'object',
     'properties': {
@@ -43,14 +54,16 @@ ec2_job_account = {
             'subnet-12345678',
             description='The subnet to use for image test and image '
                         'creation.'
-        )
+        ),
+        'create_method': create_method
     },
     'additionalProperties': False,
     'required': ['name'],
     'description': 'EC2 account credentials to use for the job. '
                    'Name is required and the other properties are '
-                   'optional. If supplied region, root_swap_ami and '
-                   'subnet will override the account default values.'
+                   'optional. If supplied region, root_swap_ami, '
+                   'subnet and create_method will override the account '
+                   'default values.'
 }
 
 ec2_job_message = copy.deepcopy(base_job_message)
@@ -89,6 +102,15 @@ ec2_job_message['properties']['use_root_swap'] = {
     'description': 'Whether to use root swap technique during image '
                    'creation in ec2imgutils package.'
 }
+ec2_job_message['properties']['create_method'] = create_method
+ec2_job_message['properties']['create_once'] = {
+    'type': 'boolean',
+    'description': 'Whether to create the image only once per partition. '
+                   'The image is created in the first account of each '
+                   'partition and the other accounts copy it. This avoids '
+                   'uploading the image to every account. Not supported '
+                   'with billing_codes.'
+}
 ec2_job_message['properties']['cloud_accounts'] = {
     'type': 'array',
     'items': ec2_job_account,
@@ -19,6 +19,7 @@
 from flask import current_app
 
 from mash.utils.mash_utils import handle_request
+from mash.services.api.v1.utils.lookups import cached_lookup
 from mash.mash_exceptions import MashException
 
 
@@ -54,6 +55,7 @@ def get_aliyun_accounts(user_id):
     return response.json()
 
 
+@cached_lookup
 def get_aliyun_account(name, user_id):
     """
     Get Aliyun account for given user.
@@ -19,9 +19,11 @@
 from flask import current_app
 
 from mash.utils.mash_utils import handle_request
+from mash.services.api.v1.utils.lookups import cached_lookup
 from mash.mash_exceptions import MashException
 
 
+@cached_lookup
 def get_accounts_in_ec2_group(group_name, user_id):
     """
     Get an EC2 group for user.
@@ -65,6 +67,7 @@ def get_ec2_accounts(user_id):
     return response.json()
 
 
+@cached_lookup
 def get_ec2_account(name, user_id):
     """
     Get EC2 account for given user.
@@ -0,0 +1,250 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+
+from amqpstorm import Connection
+from flask import current_app
+
+from mash.services.status_levels import EXCEPTION, FAILED, FINISHED
+
+module = sys.modules[__name__]
+
+subscriber = None
+
+final_states = (FINISHED, FAILED, EXCEPTION)
+
+
+class JobStatusSubscriber(object):
+    """
+    Fan out job status events to API watchers.
+
+    A single AMQP subscription is shared by all watchers in the API
+    worker. Each watcher gets a bounded queue of events for one job,
+    a slow watcher drops events instead of blocking the consumer.
+    """
+
+    def __init__(
+        self,
+        host,
+        user,
+        password,
+        exchange='jobcreator',
+        routing_key='job_status',
+        retry_interval=5,
+        max_queued_events=100
+    ):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.exchange = exchange
+        self.routing_key = routing_key
+        self.retry_interval = retry_interval
+        self.max_queued_events = max_queued_events
+
+        self.watchers = {}
+        self.log = logging.getLogger('APIService')
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Start the consumer thread if it is not already running.
+        """
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._consume,
+                name='job-status-subscriber',
+                daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """
+        Signal the consumer thread to exit after the current connection.
+        """
+        self._stopped.set()
+
+    def subscribe(self, job_id):
+        """
+        Register a watcher for the job and return its event queue.
+        """
+        self.start()
+        watcher = queue.Queue(maxsize=self.max_queued_events)
+
+        with self._lock:
+            self.watchers.setdefault(job_id, []).append(watcher)
+
+        return watcher
+
+    def unsubscribe(self, job_id, watcher):
+        """
+        Remove the watcher for the job.
+        """
+        with self._lock:
+            watchers = self.watchers.get(job_id, [])
+
+            if watcher in watchers:
+                watchers.remove(watcher)
+
+            if not watchers:
+                self.watchers.pop(job_id, None)
+
+    def _consume(self):
+        """
+        Consume status events, reconnecting until stopped.
+
+        The queue is exclusive to this worker and removed by the
+        broker when the connection closes.
+        """
+        while not self._stopped.is_set():
+            connection = None
+
+            try:
+                connection = Connection(
+                    self.host,
+                    self.user,
+                    self.password,
+                    kwargs={'heartbeat': 600}
+                )
+                channel = connection.channel()
+                channel.exchange.declare(
+                    exchange=self.exchange,
+                    exchange_type='direct',
+                    durable=True
+                )
+                result = channel.queue.declare(exclusive=True)
+                channel.queue.bind(
+                    exchange=self.exchange,
+                    queue=result['queue'],
+                    routing_key=self.routing_key
+                )
+                channel.basic.consume(
+                    callback=self._dispatch,
+                    queue=result['queue'],
+                    no_ack=True
+                )
+                channel.start_consuming()
+            except Exception as error:
+                self.log.warning(
+                    'Job status subscription failed: {0}'.format(error)
+                )
+                self._stopped.wait(self.retry_interval)
+            finally:
+                if connection and connection.is_open:
+                    connection.close()
+
+    def _dispatch(self, message):
+        """
+        Deliver the status event to all watchers of the job.
+        """
+        try:
+            event = json.loads(message.body)
+        except Exception as error:
+            self.log.warning(
+                'Invalid job status event received: {0}'.format(error)
+            )
+            return
+
+        with self._lock:
+            watchers = list(self.watchers.get(event.get('job_id'), []))
+
+        for watcher in watchers:
+            try:
+                watcher.put_nowait(event)
+            except queue.Full:
+                pass
+
+
+def get_subscriber():
+    """
+    Return the job status subscriber for this API worker.
+    """
+    if not subscriber:
+        module.subscriber = JobStatusSubscriber(
+            current_app.config['AMQP_HOST'],
+            current_app.config['AMQP_USER'],
+            current_app.config['AMQP_PASS']
+        )
+
+    return subscriber
+
+
+def format_event(event, event_type='status'):
+    """
+    Return the event as a Server-Sent Events message.
+    """
+    return 'event: {0}\ndata: {1}\n\n'.format(
+        event_type,
+        json.dumps(event, sort_keys=True)
+    )
+
+
+def stream_job_status(
+    job,
+    job_subscriber,
+    watcher,
+    keepalive_interval=15,
+    timeout=3600
+):
+    """
+    Generate Server-Sent Events for the job until it reaches a final state.
+
+    The current job state is sent first, then each transition as it is
+    received. A comment line is sent when idle to keep proxies from
+    closing the connection. The stream ends after timeout seconds and
+    the client is expected to reconnect.
+    """
+    event = {
+        'job_id': job['job_id'],
+        'state': job.get('state'),
+        'current_service': job.get('current_service'),
+        'errors': job.get('errors', [])
+    }
+    deadline = time.monotonic() + timeout
+
+    try:
+        yield format_event(event)
+
+        while event.get('state') not in final_states:
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0:
+                break
+
+            try:
+                event = watcher.get(
+                    timeout=min(keepalive_interval, remaining)
+                )
+            except queue.Empty:
+                yield ': keepalive\n\n'
+                continue
+
+            yield format_event(event)
+    finally:
+        job_subscriber.unsubscribe(job['job_id'], watcher)
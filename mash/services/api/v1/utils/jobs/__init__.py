@@ -22,7 +22,6 @@ import uuid
 from dateutil import parser
 from flask import current_app
 
-from mash.services.api.v1.utils.amqp import publish
 from mash.mash_exceptions import MashJobException
 from mash.utils.mash_utils import normalize_dictionary
 from mash.services.status_levels import RUNNING
@@ -34,25 +33,17 @@ def get_new_job_id():
     return str(uuid.uuid4())
 
 
-def create_job(data):
+def get_job_db_args(data):
     """
-    Create a new job for user.
+    Return the job attributes stored in the database for a job doc.
     """
-    if data.get('dry_run'):
-        return None
-
-    job_id = get_new_job_id()
-    data['job_id'] = job_id
-
-    user_id = data['requesting_user']
-
     kwargs = {
-        'job_id': job_id,
+        'job_id': data['job_id'],
         'last_service': data['last_service'],
         'utctime': data['utctime'],
         'image': data['image'],
         'download_url': data['download_url'],
-        'user_id': user_id,
+        'user_id': data['requesting_user'],
         'state': RUNNING,
         'current_service': current_app.config['SERVICE_NAMES'][0]
     }
@@ -66,6 +57,24 @@ def create_job(data):
     if data.get('profile'):
         kwargs['profile'] = data['profile']
 
+    return kwargs
+
+
+def create_job(data):
+    """
+    Create a new job for user.
+
+    The job doc is stored in the job outbox with the job in one
+    transaction. The outbox relay publishes it to the job creator.
+    """
+    if data.get('dry_run'):
+        return None
+
+    data['job_id'] = get_new_job_id()
+
+    kwargs = get_job_db_args(data)
+    kwargs['job_document'] = json.dumps(data, sort_keys=True)
+
     response = handle_request(
         current_app.config['DATABASE_API_URL'],
         'jobs/',
@@ -73,24 +82,30 @@ def create_job(data):
         job_data=kwargs
     )
 
-    try:
-        publish(
-            'jobcreator',
-            'job_document',
-            json.dumps(data, sort_keys=True)
-        )
-    except Exception:
-        try:
-            handle_request(
-                current_app.config['DATABASE_API_URL'],
-                'jobs/',
-                'delete',
-                job_data={'job_id': job_id, 'user_id': user_id}
-            )
-        except Exception:
-            pass  # Attempt to cleanup job in database
+    return response.json()
+
+
+def create_jobs(jobs):
+    """
+    Create a set of new jobs for user.
+
+    All jobs and their job docs are inserted in the database in
+    one transaction.
+    """
+    kwargs = []
+    for data in jobs:
+        data['job_id'] = get_new_job_id()
 
-        raise MashJobException('Failed to initialize job.')
+        job_args = get_job_db_args(data)
+        job_args['job_document'] = json.dumps(data, sort_keys=True)
+        kwargs.append(job_args)
+
+    response = handle_request(
+        current_app.config['DATABASE_API_URL'],
+        'jobs/bulk',
+        'post',
+        job_data={'jobs': kwargs}
+    )
 
     return response.json()
 
@@ -188,6 +203,40 @@ def get_job(job_id, user_id):
     return response.json()
 
 
+def get_job_timeline(job_id, user_id):
+    """
+    Get the stage timeline of the job for given user.
+    """
+    response = handle_request(
+        current_app.config['DATABASE_API_URL'],
+        'jobs/timeline',
+        'get',
+        job_data={'job_id': job_id, 'user_id': user_id}
+    )
+
+    return response.json()
+
+
+def get_stage_statistics(user_id, cloud=None, start=None, end=None):
+    """
+    Get the stage percentiles per cloud and service for user.
+    """
+    job_data = {'user_id': user_id}
+
+    for key, value in (('cloud', cloud), ('start', start), ('end', end)):
+        if value:
+            job_data[key] = value
+
+    response = handle_request(
+        current_app.config['DATABASE_API_URL'],
+        'jobs/stages',
+        'get',
+        job_data=job_data
+    )
+
+    return response.json()
+
+
 def get_jobs(user_id, page=None, per_page=None):
     """
     Retrieve all jobs for user.
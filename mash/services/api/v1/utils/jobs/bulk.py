@@ -0,0 +1,173 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import copy
+import itertools
+
+from flask import current_app
+from flask_restx import SchemaModel
+from werkzeug.exceptions import BadRequest
+
+from mash.mash_exceptions import MashException, MashJobException
+from mash.services.api.v1.schema.jobs.aliyun import aliyun_job_message
+from mash.services.api.v1.schema.jobs.azure import azure_job_message
+from mash.services.api.v1.schema.jobs.ec2 import ec2_job_message
+from mash.services.api.v1.schema.jobs.gce import gce_job_message
+from mash.services.api.v1.schema.jobs.oci import oci_job_message
+from mash.services.api.v1.utils.jobs import create_jobs
+from mash.services.api.v1.utils.jobs.aliyun import validate_aliyun_job
+from mash.services.api.v1.utils.jobs.azure import validate_azure_job
+from mash.services.api.v1.utils.jobs.ec2 import validate_ec2_job
+from mash.services.api.v1.utils.jobs.gce import validate_gce_job
+from mash.services.api.v1.utils.jobs.oci import validate_oci_job
+from mash.services.api.v1.utils.lookups import shared_lookups
+
+job_types = {
+    'aliyun': (
+        SchemaModel('aliyun_job', aliyun_job_message),
+        validate_aliyun_job
+    ),
+    'azure': (
+        SchemaModel('azure_job', azure_job_message),
+        validate_azure_job
+    ),
+    'ec2': (
+        SchemaModel('ec2_job', ec2_job_message),
+        validate_ec2_job
+    ),
+    'gce': (
+        SchemaModel('gce_job', gce_job_message),
+        validate_gce_job
+    ),
+    'oci': (
+        SchemaModel('oci_job', oci_job_message),
+        validate_oci_job
+    )
+}
+
+
+def expand_job_matrix(data):
+    """
+    Return the list of job docs for a bulk job request.
+
+    The explicit list of jobs is followed by one job for each
+    combination of values in the matrix.
+    """
+    jobs = copy.deepcopy(data.get('jobs', []))
+    matrix = data.get('matrix')
+
+    if matrix:
+        keys = sorted(matrix)
+
+        for values in itertools.product(*[matrix[key] for key in keys]):
+            job_doc = copy.deepcopy(data.get('job', {}))
+            job_doc.update(zip(keys, copy.deepcopy(values)))
+            jobs.append(job_doc)
+
+    return jobs
+
+
+def validate_bulk_job(job_doc, user_id):
+    """
+    Validate a single job doc from a bulk job request.
+
+    The doc is validated against the schema of the cloud framework
+    then by the cloud specific validation function.
+    """
+    cloud = job_doc.pop('cloud', None)
+
+    if cloud not in job_types:
+        raise MashJobException(
+            'A cloud is required for each job. '
+            'Valid clouds are: {clouds}.'.format(
+                clouds=', '.join(sorted(job_types))
+            )
+        )
+
+    schema, validate = job_types[cloud]
+
+    try:
+        schema.validate(job_doc)
+    except BadRequest as error:
+        errors = getattr(error, 'data', {}).get('errors', {})
+        raise MashJobException(
+            'Invalid {cloud} job doc: {errors}'.format(
+                cloud=cloud,
+                errors='; '.join(
+                    '{0}: {1}'.format(key, value)
+                    for key, value in sorted(errors.items())
+                )
+            )
+        )
+
+    job_doc['cloud'] = cloud
+    job_doc['requesting_user'] = user_id
+
+    return validate(job_doc)
+
+
+def submit_bulk_jobs(data, user_id):
+    """
+    Validate and create all jobs in a bulk job request.
+
+    Validation shares account and user lookups across all job docs.
+    The valid jobs are created together and a result is returned for
+    each job doc in the order they were expanded.
+    """
+    job_docs = expand_job_matrix(data)
+    results = []
+    valid_jobs = []
+
+    with shared_lookups():
+        for index, job_doc in enumerate(job_docs):
+            result = {'index': index}
+            results.append(result)
+
+            try:
+                job_doc = validate_bulk_job(job_doc, user_id)
+            except MashException as error:
+                result['status'] = 'invalid'
+                result['msg'] = 'Job failed: {0}'.format(error)
+                continue
+            except Exception as error:
+                current_app.logger.warning(error)
+                result['status'] = 'invalid'
+                result['msg'] = 'Failed to validate job'
+                continue
+
+            if data.get('dry_run') or job_doc.get('dry_run'):
+                result['status'] = 'valid'
+                result['msg'] = 'Job doc is valid!'
+            else:
+                valid_jobs.append((result, job_doc))
+
+    if valid_jobs:
+        try:
+            jobs = create_jobs([job_doc for result, job_doc in valid_jobs])
+        except Exception as error:
+            current_app.logger.warning(error)
+
+            for result, job_doc in valid_jobs:
+                result['status'] = 'failed'
+                result['msg'] = 'Failed to start job'
+        else:
+            for (result, job_doc), job in zip(valid_jobs, jobs):
+                result['status'] = 'created'
+                result['job'] = job
+
+    return results
@@ -94,7 +94,8 @@ def add_target_ec2_account(
         'partition': account['partition'],
         'target_regions': list(set(regions)),  # Remove any duplicates
         'helper_image': helper_image,
-        'subnet': subnet
+        'subnet': subnet,
+        'create_method': job_doc_data.get('create_method')
     }
 
 
@@ -157,6 +158,13 @@ def validate_ec2_job(job_doc):
             'Ensure "uefi" is included in "boot_firmware" list.'
         )
 
+    if job_doc.get('create_once') and job_doc.get('billing_codes'):
+        # EC2 does not copy shared images with billing product codes
+        raise MashJobException(
+            'Images with billing codes cannot be copied between accounts. '
+            'Remove "create_once" to create the image in every account.'
+        )
+
     job_doc = validate_job(job_doc)
 
     user_id = job_doc['requesting_user']
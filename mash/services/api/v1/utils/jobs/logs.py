@@ -0,0 +1,156 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import gzip
+import os
+
+from flask import current_app, request
+
+from mash.mash_exceptions import MashJobException
+from mash.utils.job_log import (
+    JobLogReader,
+    get_job_log_path,
+    get_job_log_reader,
+    wait_for_log_growth
+)
+from mash.utils.job_log_archive import JobLogArchive
+
+default_line_limit = 100
+default_byte_limit = 65536
+default_wait = 30
+
+
+def get_job_log_file(job_id):
+    """
+    Return the path of the job log file written by the logger service.
+
+    Logs written before the job log directory was sharded are found
+    in the top level directory.
+    """
+    job_log_dir = current_app.config['JOB_LOG_DIRECTORY']
+    log_file = get_job_log_path(job_log_dir, job_id)
+    legacy_file = os.path.join(job_log_dir, ''.join([job_id, '.log']))
+
+    if not os.path.exists(log_file) and os.path.exists(legacy_file):
+        return legacy_file
+
+    return log_file
+
+
+def get_archived_job_log_reader(job_id, log_file):
+    """
+    Return a reader for the archived log of the job or None.
+
+    Log records the logger wrote after the log was archived are
+    appended to the archived data.
+    """
+    archive = JobLogArchive(current_app.config['JOB_LOG_ARCHIVE_DIRECTORY'])
+    data = archive.read(job_id)
+
+    if data is None:
+        return None
+
+    if os.path.isfile(log_file):
+        with open(log_file, 'rb') as log:
+            data += log.read()
+
+    return JobLogReader(log_file, data=data)
+
+
+def read_job_log(job_id, options):
+    """
+    Return a byte or line range of the job log.
+
+    Archived logs are read transparently. In follow mode, if nothing is
+    available at the requested offset, wait for the logger to append
+    to the file before reading.
+    """
+    log_file = get_job_log_file(job_id)
+    reader = get_archived_job_log_reader(job_id, log_file)
+
+    if reader:
+        # Archived jobs are finished, there is nothing to follow.
+        options = dict(options, follow=False)
+    elif os.path.isfile(log_file):
+        reader = get_job_log_reader(log_file)
+    else:
+        raise MashJobException(
+            'No log found for job {0}.'.format(job_id)
+        )
+
+    result = _read_job_log(reader, options)
+
+    if options.get('follow') and result['available'] == 0:
+        if wait_for_log_growth(
+            log_file,
+            result['size'],
+            options.get('wait', default_wait)
+        ):
+            result = _read_job_log(reader, options)
+
+    del result['available']
+    result['job_id'] = job_id
+    return result
+
+
+def _read_job_log(reader, options):
+    size = reader.get_size()
+
+    if 'byte_offset' in options:
+        offset = options['byte_offset']
+        data, next_offset = reader.read_bytes(
+            offset,
+            options.get('byte_limit', default_byte_limit)
+        )
+
+        return {
+            'data': data.decode('utf-8', errors='replace'),
+            'byte_offset': offset,
+            'next_byte_offset': next_offset,
+            'size': size,
+            'available': len(data)
+        }
+
+    lines, offset, next_offset = reader.read_lines(
+        options.get('line_offset', -default_line_limit),
+        options.get('line_limit', default_line_limit)
+    )
+
+    return {
+        'lines': lines,
+        'line_offset': offset,
+        'next_line_offset': next_offset,
+        'size': size,
+        'available': len(lines)
+    }
+
+
+def gzip_response(response, min_size=1024):
+    """
+    Compress the response body if the client accepts gzip encoding.
+    """
+    accept_encoding = request.headers.get('Accept-Encoding', '')
+
+    if 'gzip' not in accept_encoding.lower() or \
+            response.content_length < min_size:
+        return response
+
+    response.set_data(gzip.compress(response.get_data(), compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
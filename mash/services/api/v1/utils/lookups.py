@@ -0,0 +1,66 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import copy
+
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import g, has_app_context
+
+
+@contextmanager
+def shared_lookups():
+    """
+    Share database lookups for the duration of the context.
+
+    Lookup functions decorated with cached_lookup only hit the
+    database service once per unique set of arguments while the
+    context is active. Used when validating many job docs at once.
+    """
+    g.lookup_cache = {}
+
+    try:
+        yield
+    finally:
+        g.pop('lookup_cache', None)
+
+
+def cached_lookup(func):
+    """
+    Cache the result of the lookup while in a shared_lookups context.
+
+    Outside of the context the lookup is always sent to the database
+    service. A copy of the cached value is returned so callers can
+    safely modify the result.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        cache = g.get('lookup_cache') if has_app_context() else None
+
+        if cache is None:
+            return func(*args, **kwargs)
+
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+
+        if key not in cache:
+            cache[key] = func(*args, **kwargs)
+
+        return copy.deepcopy(cache[key])
+
+    return wrapper
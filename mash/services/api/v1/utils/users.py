@@ -24,6 +24,7 @@ from mash.services.api.variables import (
 )
 from mash.mash_exceptions import MashException
 from mash.utils.mash_utils import handle_request
+from mash.services.api.v1.utils.lookups import cached_lookup
 
 
 def add_user(email, password=None):
@@ -109,6 +110,7 @@ def get_user_by_email(email, create=False):
     return response.json()
 
 
+@cached_lookup
 def get_user_by_id(user_id):
     """
     Retrieve user from database if a match exists.
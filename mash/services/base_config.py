@@ -21,6 +21,7 @@ import yaml
 
 from mash.mash_exceptions import MashConfigException
 from mash.services.base_defaults import Defaults
+from mash.utils.job_log import get_job_log_path
 
 
 class BaseConfig(object):
@@ -114,16 +115,40 @@ class BaseConfig(object):
             dir=log_dir, service=service
         )
 
+    def get_job_log_directory(self):
+        """
+        Return the directory containing the per job log files.
+
+        :rtype: string
+        """
+        log_dir = os.path.join(self.get_log_directory(), 'jobs')
+        return os.path.expanduser(os.path.normpath(log_dir))
+
+    def get_job_log_archive_directory(self):
+        """
+        Return the directory of the compressed job log archives.
+
+        :rtype: string
+        """
+        archive_dir = os.path.join(self.get_log_directory(), 'archive')
+        return os.path.expanduser(os.path.normpath(archive_dir))
+
+    def get_log_store_directory(self):
+        """
+        Return the directory of the structured job log store.
+
+        :rtype: string
+        """
+        store_dir = os.path.join(self.get_log_directory(), 'store')
+        return os.path.expanduser(os.path.normpath(store_dir))
+
     def get_job_log_file(self, job_id):
         """
         Return log file given the job_id.
 
         :rtype: string
         """
-        log_file = os.path.join(
-            self.get_log_directory(), 'jobs', ''.join([job_id, '.log'])
-        )
-        return os.path.expanduser(os.path.normpath(log_file))
+        return get_job_log_path(self.get_job_log_directory(), job_id)
 
     def get_cloud_data(self):
         """
@@ -391,6 +416,18 @@ class BaseConfig(object):
         )
         return oci_upload_process_count or Defaults.get_oci_upload_process_count()
 
+    def get_aliyun_upload_process_count(self):
+        """
+        Return the process count for Aliyun parallel image uploads.
+
+        :return: int
+        """
+        aliyun_upload_process_count = self._get_attribute(
+            attribute='aliyun_upload_process_count'
+        )
+        return aliyun_upload_process_count or \
+            Defaults.get_aliyun_upload_process_count()
+
     def get_base_thread_pool_count(self):
         """
         Return the thread pool count for listener services background scheduler.
@@ -413,6 +450,29 @@ class BaseConfig(object):
         )
         return publish_thread_pool_count or Defaults.get_publish_thread_pool_count()
 
+    def get_job_thread_pool_count(self):
+        """
+        Return the thread pool count for the parallel tasks of a job.
+
+        :return: int
+        """
+        job_thread_pool_count = self._get_attribute(
+            attribute='job_thread_pool_count'
+        )
+        return job_thread_pool_count or Defaults.get_job_thread_pool_count()
+
+    def get_account_thread_pool_count(self):
+        """
+        Return the number of parallel tasks of a job per cloud account.
+
+        :return: int
+        """
+        account_thread_pool_count = self._get_attribute(
+            attribute='account_thread_pool_count'
+        )
+        return account_thread_pool_count or \
+            Defaults.get_account_thread_pool_count()
+
     def get_auth_methods(self):
         """
         Return the list of allowed authentication methods.
@@ -507,3 +567,179 @@ class BaseConfig(object):
             database_api_url += '/'
 
         return database_api_url or Defaults.get_database_api_url()
+
+    def get_metrics_host(self):
+        """
+        Return the host address the metrics endpoints listen on.
+
+        metrics:
+          host: 0.0.0.0
+
+        if no configuration exists the metrics host from
+        the Defaults class is returned.
+
+        :rtype: string
+        """
+        metrics_host = self._get_attribute(
+            attribute='host',
+            element='metrics'
+        )
+
+        return metrics_host or Defaults.get_metrics_host()
+
+    def get_metrics_port(self, service):
+        """
+        Return the port of the metrics endpoint for service.
+
+        metrics:
+          ports:
+            obs: 9610
+
+        Configured ports override the ports from the Defaults
+        class. A port of 0 disables the endpoint of the service.
+
+        :rtype: int
+        """
+        ports = Defaults.get_metrics_ports()
+        ports.update(
+            self._get_attribute(attribute='ports', element='metrics') or {}
+        )
+
+        return ports.get(service) or None
+
+    def get_tracing_enabled(self):
+        """
+        Return True if the services export trace spans.
+
+        tracing:
+          enabled: true
+
+        :rtype: bool
+        """
+        enabled = self._get_attribute(attribute='enabled', element='tracing')
+
+        if enabled is None:
+            return Defaults.get_tracing_enabled()
+
+        return enabled
+
+    def get_trace_directory(self):
+        """
+        Return the directory the trace span files are written to.
+
+        tracing:
+          directory: /var/log/mash/traces/
+
+        if no configuration exists the traces directory is
+        in the log directory.
+
+        :rtype: string
+        """
+        trace_dir = self._get_attribute(
+            attribute='directory',
+            element='tracing'
+        )
+        trace_dir = trace_dir or os.path.join(
+            self.get_log_directory(), 'traces'
+        )
+        return os.path.expanduser(os.path.normpath(trace_dir))
+
+    def get_cloud_api_rate_limits(self):
+        """
+        Return the API calls per second allowed for each cloud account.
+
+        cloud_api:
+          rate_limits:
+            ec2: 20
+
+        Configured limits override the limits from the Defaults class.
+        A warning is logged when a job approaches the limit.
+
+        :rtype: dict
+        """
+        rate_limits = Defaults.get_cloud_api_rate_limits()
+        rate_limits.update(
+            self._get_attribute(
+                attribute='rate_limits',
+                element='cloud_api'
+            ) or {}
+        )
+
+        return rate_limits
+
+    def get_ec2_helper_pool(self):
+        """
+        Return the settings of the EC2 helper instance pool.
+
+        ec2_helper_pool:
+          size: 1
+          max_instances: 10
+          idle_timeout: 900
+
+        Size is the number of idle instances kept per account, region
+        and helper image, the pool is disabled with a size of 0.
+        Settings that are not configured are taken from the Defaults
+        class.
+
+        :rtype: dict
+        """
+        settings = Defaults.get_ec2_helper_pool()
+        settings.update(
+            self._get_attribute(attribute='ec2_helper_pool') or {}
+        )
+        return settings
+
+    def get_bandwidth_scheduler(self):
+        """
+        Return the settings of the host-wide bandwidth scheduler.
+
+        bandwidth_scheduler:
+          state_dir: /var/lib/mash/bandwidth/
+          limits:
+            total: 125000000
+            upload: 100000000
+          weights:
+            upload: 1
+            download: 2
+
+        Limits are in bytes per second for the upload and download
+        direction and for both directions in total, transfers are
+        not limited if no limit is configured. The total limit is
+        split between the active directions by their weights.
+        Services with the same state_dir share the limits. Settings
+        that are not configured are taken from the Defaults class.
+
+        :rtype: dict
+        """
+        settings = Defaults.get_bandwidth_scheduler()
+        settings.update(
+            self._get_attribute(attribute='bandwidth_scheduler') or {}
+        )
+        return settings
+
+    def get_cloud_api_rate_limiter_rates(self):
+        """
+        Return the shared rate limiter rates of each cloud API family.
+
+        cloud_api:
+          rate_limiter:
+            ec2:
+              read: 20
+              write: 5
+
+        Rates are API calls per second for an account and region,
+        configured families override the families from the Defaults
+        class. A family with a rate of 0 is not limited.
+
+        :rtype: dict
+        """
+        rates = Defaults.get_cloud_api_rate_limiter_rates()
+        configured_rates = self._get_attribute(
+            attribute='rate_limiter',
+            element='cloud_api'
+        ) or {}
+
+        for cloud, families in configured_rates.items():
+            rates.setdefault(cloud, {}).update(families)
+
+        return rates
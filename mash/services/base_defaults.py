@@ -76,6 +76,10 @@ class Defaults(object):
     def get_azure_max_workers():
         return 5
 
+    @staticmethod
+    def get_azure_blob_copy():
+        return False
+
     @staticmethod
     def get_smtp_host():
         return 'localhost'
@@ -116,6 +120,10 @@ class Defaults(object):
     def get_oci_upload_process_count():
         return 3
 
+    @staticmethod
+    def get_aliyun_upload_process_count():
+        return 3
+
     @staticmethod
     def get_base_thread_pool_count():
         return 10
@@ -124,6 +132,14 @@ class Defaults(object):
     def get_publish_thread_pool_count():
         return 50
 
+    @staticmethod
+    def get_job_thread_pool_count():
+        return 10
+
+    @staticmethod
+    def get_account_thread_pool_count():
+        return 5
+
     @staticmethod
     def get_auth_methods():
         return ['password']
@@ -135,3 +151,63 @@ class Defaults(object):
     @staticmethod
     def get_database_api_url():
         return 'http://localhost:5007/'
+
+    @staticmethod
+    def get_metrics_host():
+        return 'localhost'
+
+    @staticmethod
+    def get_metrics_ports():
+        return {
+            'obs': 9610,
+            'upload': 9611,
+            'create': 9612,
+            'test': 9613,
+            'raw_image_upload': 9614,
+            'replicate': 9615,
+            'publish': 9616,
+            'deprecate': 9617,
+            'jobcreator': 9620,
+            'logger': 9621,
+            'cleanup': 9622,
+            'outbox': 9623
+        }
+
+    @staticmethod
+    def get_tracing_enabled():
+        return False
+
+    @staticmethod
+    def get_cloud_api_rate_limits():
+        # Sustained API calls per second per account and region
+        return {
+            'azure': 3,
+            'ec2': 20,
+            'gce': 20
+        }
+
+    @staticmethod
+    def get_bandwidth_scheduler():
+        # Downloads feed the pipeline and get twice the share of uploads
+        return {
+            'state_dir': None,
+            'limits': {},
+            'weights': {'upload': 1, 'download': 2}
+        }
+
+    @staticmethod
+    def get_ec2_helper_pool():
+        # The pool of warm EC2 helper instances is disabled by default
+        return {
+            'size': 0,
+            'max_instances': 10,
+            'idle_timeout': 900
+        }
+
+    @staticmethod
+    def get_cloud_api_rate_limiter_rates():
+        # Maximum calls per second per account, region and API family
+        return {
+            'ec2': {'read': 20, 'write': 5},
+            'gce': {'read': 20, 'write': 10}
+        }
@@ -49,3 +49,22 @@ class CleanupConfig(BaseConfig):
         )
         return max_image_age if max_image_age else \
             CleanupDefaults.get_max_image_age()
+
+    def get_log_archive_age(self):
+        """
+        Return the time (in days) since a job log was last written
+        before it is moved to the job log archive:
+
+        cleanup:
+          log_archive_age: 7
+
+        if no configuration exists the log archive age from
+        the Defaults class is returned
+
+        :rtype: int
+        """
+        log_archive_age = self._get_attribute(
+            attribute='log_archive_age', element='cleanup'
+        )
+        return log_archive_age if log_archive_age else \
+            CleanupDefaults.get_log_archive_age()
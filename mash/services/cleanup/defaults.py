@@ -24,3 +24,7 @@ class Defaults(object):
     @classmethod
     def get_max_image_age(self):
         return 90
+
+    @classmethod
+    def get_log_archive_age(self):
+        return 7
@@ -24,6 +24,7 @@ from apscheduler.schedulers.background import BlockingScheduler
 from pytz import utc
 
 from mash.services.mash_service import MashService
+from mash.utils.job_log_archive import JobLogArchive
 from mash.utils.mash_utils import setup_logfile
 
 
@@ -52,6 +53,12 @@ class CleanupService(MashService):
             hour='5',
             minute='0'
         )
+        self.scheduler.add_job(
+            self._archive_job_logs,
+            'cron',
+            hour='5',
+            minute='30'
+        )
         self.scheduler.start()
 
     def _purge_images(self):
@@ -71,3 +78,65 @@ class CleanupService(MashService):
                     if entry.stat().st_mtime < cutoff:
                         self.log.info('Purging {}'.format(entry.name))
                         shutil.rmtree(entry.path)
+
+    @staticmethod
+    def _get_job_log_entries(job_log_dir):
+        """
+        Yield the files in the job log shard directories.
+
+        Files in the top level directory were written before the job
+        logs were sharded.
+        """
+        with os.scandir(job_log_dir) as scanner:
+            for entry in scanner:
+                if entry.is_file(follow_symlinks=False):
+                    yield entry
+                elif entry.is_dir(follow_symlinks=False):
+                    with os.scandir(entry.path) as shard_scanner:
+                        for shard_entry in shard_scanner:
+                            if shard_entry.is_file(follow_symlinks=False):
+                                yield shard_entry
+
+    def _archive_job_logs(self):
+        """
+        Move job logs that are no longer written to the log archive.
+
+        A job log that has not been written for log_archive_age days
+        belongs to a finished job.
+        """
+        job_log_dir = self.config.get_job_log_directory()
+        log_archive_age = self.config.get_log_archive_age()
+        archive = JobLogArchive(self.config.get_job_log_archive_directory())
+
+        if not os.path.isdir(job_log_dir):
+            self.log.error('Error: no such directory {}'.format(job_log_dir))
+            return
+
+        cutoff = time.time() - log_archive_age * 86400
+        archived = 0
+
+        for entry in self._get_job_log_entries(job_log_dir):
+            if entry.name.endswith('.log.archiving'):
+                # Interrupted archive run, the log is no longer written
+                log_file = entry.path[:-len('.archiving')]
+            elif entry.name.endswith('.log'):
+                if entry.stat().st_mtime >= cutoff:
+                    continue
+
+                log_file = entry.path
+            else:
+                continue
+
+            job_id = os.path.basename(log_file)[:-len('.log')]
+
+            try:
+                if archive.archive(job_id, log_file):
+                    archived += 1
+            except Exception as error:
+                self.log.error(
+                    'Unable to archive log for job {0}: {1}'.format(
+                        job_id, error
+                    )
+                )
+
+        self.log.info('Archived {0} job logs.'.format(archived))
@@ -16,12 +16,11 @@
 # along with mash.  If not, see <http://www.gnu.org/licenses/>
 #
 
-from azure_img_utils.azure_image import AzureImage
-
 # project
 from mash.services.mash_job import MashJob
 from mash.mash_exceptions import MashCreateException
 from mash.services.status_levels import SUCCESS
+from mash.utils.azure import AzureImage
 
 
 class AzureCreateJob(MashJob):
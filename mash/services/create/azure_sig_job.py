@@ -20,12 +20,11 @@ import re
 
 from datetime import datetime
 
-from azure_img_utils.azure_image import AzureImage
-
 # project
 from mash.services.mash_job import MashJob
 from mash.mash_exceptions import MashCreateException
 from mash.services.status_levels import SUCCESS
+from mash.utils.azure import AzureImage
 
 
 class AzureSIGCreateJob(MashJob):
@@ -56,6 +55,7 @@ class AzureSIGCreateJob(MashJob):
             )
 
         self.generation_id = self.job_config.get('generation_id')
+        self.target_regions = self.job_config.get('target_regions')
         self.gallery_resource_group = self.job_config.get(
             'gallery_resource_group'
         ) or self.resource_group
@@ -83,46 +83,79 @@ class AzureSIGCreateJob(MashJob):
             log_callback=self.log_callback
         )
 
-        image_name = self._create_image(
-            azure_image,
-            plan_id=self.sku
-        )
-        self.status_msg['images'] = [image_name]
-
+        plan_ids = [self.sku]
         if self.generation_id:
-            image_name = self._create_image(
+            plan_ids.append(self.generation_id)
+
+        # The versions of all plans are created from the same blob
+        # at the same time.
+        executor = self.get_task_executor()
+        for plan_id in plan_ids:
+            executor.submit(
+                plan_id,
+                self._start_image_creation,
                 azure_image,
-                plan_id=self.generation_id
+                plan_id
+            )
+
+        errors = []
+        self.status_msg['images'] = []
+
+        # Pollers poll in their own threads, waiting on each in turn
+        # waits for all operations running together.
+        for task in self.run_tasks(executor):
+            if task.error:
+                errors.append(str(task.error))
+                continue
+
+            image_name, poller = task.result
+
+            try:
+                poller.result()
+            except Exception as error:
+                errors.append(str(error))
+                continue
+
+            self.log_callback.info(
+                'Created image with version: {0} '
+                'in the image defintion: {1} of the gallery: {2} '
+                'found in resource group: {3}'.format(
+                    self.image_version,
+                    image_name,
+                    self.gallery_name,
+                    self.resource_group
+                )
             )
             self.status_msg['images'].append(image_name)
 
+        if errors:
+            raise MashCreateException(
+                'Failed to create gallery image versions: {0}'.format(
+                    '; '.join(errors)
+                )
+            )
+
         self.status_msg['image_version'] = self.image_version
 
-    def _create_image(self, azure_image, plan_id):
+    def _start_image_creation(self, azure_image, plan_id):
         """
-        Create gallery image version from existing page blob.
+        Start gallery image version creation from existing page blob.
+
+        The version is replicated to the target regions while it
+        is created. Return the image name and the poller of the
+        creation.
         """
         image_name = '_'.join([self.offer_id.replace('-', '_'), plan_id])
 
-        azure_image.create_gallery_image_version(
+        poller = azure_image.begin_create_gallery_image_version(
             blob_name=self.blob_name,
             gallery_name=self.gallery_name,
             gallery_image_name=image_name,
             image_version=self.image_version,
             region=self.region,
             force_replace_image=True,
-            gallery_resource_group=self.gallery_resource_group
-        )
-
-        self.log_callback.info(
-            'Created image with version: {0} '
-            'in the image defintion: {1} of the gallery: {2} '
-            'found in resource group: {3}'.format(
-                self.image_version,
-                image_name,
-                self.gallery_name,
-                self.resource_group
-            )
+            gallery_resource_group=self.gallery_resource_group,
+            target_regions=self.target_regions
         )
 
-        return image_name
+        return image_name, poller
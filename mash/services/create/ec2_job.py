@@ -23,9 +23,18 @@ from ec2imgutils.ec2setup import EC2Setup
 
 # project
 from mash.services.mash_job import MashJob
+from mash.services.create.helper_pool import helper_pool
 from mash.mash_exceptions import MashUploadException
+from mash.utils.ebs import (
+    create_snapshot_from_image,
+    delete_snapshot,
+    get_volume_size,
+    register_image_from_snapshot
+)
 from mash.utils.ec2 import (
+    get_account_id,
     get_client,
+    modify_image_sharing,
     get_vpc_id_from_subnet,
     cleanup_ec2_image,
     image_exists,
@@ -37,6 +46,7 @@ from mash.utils.mash_utils import (
     timestamp_from_epoch
 )
 from mash.services.status_levels import SUCCESS, FAILED
+from mash.utils.cloud_api import api_account
 
 
 class EC2CreateJob(MashJob):
@@ -48,6 +58,15 @@ class EC2CreateJob(MashJob):
     For upload to Amazon the ec2uploadimg python interface
     is used. The custom parameters are passed in one by one
     to this application.
+
+    With the ebs_direct create method of a target region the image
+    is written to a snapshot with the EBS direct APIs instead and
+    no helper instance is launched.
+
+    With create_once the image is only created in one account per
+    partition, the other accounts copy it with copy_image. Images
+    with billing codes cannot be copied, the API rejects create_once
+    together with billing_codes.
     """
 
     def post_init(self):
@@ -69,6 +88,7 @@ class EC2CreateJob(MashJob):
         self.force_replace_image = self.job_config.get('force_replace_image')
         self.tpm_support = self.job_config.get('tpm_support')
         self.boot_firmware = self.job_config.get('boot_firmware', ['bios'])
+        self.create_once = self.job_config.get('create_once', False)
 
         # EC2 images only support one firmware
         self.boot_firmware = self.boot_firmware[0]
@@ -83,6 +103,7 @@ class EC2CreateJob(MashJob):
     def run_job(self):
         self.status = SUCCESS
         self.status_msg['source_regions'] = {}
+        self.status_msg['image_provenance'] = {}
         self.log_callback.info('Creating image.')
 
         timestamp = None
@@ -140,106 +161,46 @@ class EC2CreateJob(MashJob):
 
         self.request_credentials(accounts)
 
-        for region, info in self.target_regions.items():
+        create_regions = self.target_regions
+        copy_regions = {}
+        if self.create_once:
+            create_regions, copy_regions = self._get_copy_regions()
+
+        for region, info in create_regions.items():
             self.status_msg['source_regions'][region] = None
-            ssh_key_pair = None
             account = info['account']
             credentials = self.credentials[account]
 
-            use_root_swap = info['use_root_swap']
-            self.ec2_upload_parameters['launch_ami'] = info['helper_image']
-            self.ec2_upload_parameters['billing_codes'] = \
-                info['billing_codes']
-
-            self.ec2_upload_parameters['access_key'] = \
-                credentials['access_key_id']
-            self.ec2_upload_parameters['secret_key'] = \
-                credentials['secret_access_key']
-
             try:
-                ec2_client = get_client(
-                    'ec2', credentials['access_key_id'],
-                    credentials['secret_access_key'], region
-                )
-
-                exists = image_exists(ec2_client, self.cloud_image_name)
-                if exists and not self.force_replace_image:
-                    raise MashUploadException(
-                        '{image_name} already exists. '
-                        'Use force_replace_image to '
-                        'replace the existing image.'.format(
-                            image_name=self.cloud_image_name
-                        )
-                    )
-                elif exists and self.force_replace_image:
-                    cleanup_all_ec2_images(
-                        credentials['access_key_id'],
-                        credentials['secret_access_key'],
-                        self.log_callback,
-                        info['regions'],
-                        self.cloud_image_name
+                # API calls are rate limited per account
+                with api_account(account):
+                    ec2_client = get_client(
+                        'ec2', credentials['access_key_id'],
+                        credentials['secret_access_key'], region
                     )
 
-                # NOTE: Temporary ssh keys:
-                # The temporary creation and registration of a ssh key pair
-                # is considered a workaround implementation which should be better
-                # covered by the EC2ImageUploader code. Due to a lack of
-                # development resources in the ec2utils.ec2uploadimg project and
-                # other peoples concerns for just using a generic mash ssh key
-                # for the upload, the private _create_key_pair and _delete_key_pair
-                # methods exists and could be hopefully replaced by a better
-                # concept in the near future.
-                ssh_key_pair = self._create_key_pair(ec2_client)
-
-                self.ec2_upload_parameters['ssh_key_pair_name'] = \
-                    ssh_key_pair.name
-                self.ec2_upload_parameters['ssh_key_private_key_file'] = \
-                    ssh_key_pair.private_key_file.name
-
-                # Create a temporary vpc, subnet and security group for the
-                # helper image, unless a subnet was specified.
-                # This provides a security group with an open ssh port.
-                ec2_setup = EC2Setup(
-                    credentials['access_key_id'],
-                    region,
-                    credentials['secret_access_key'],
-                    None,
-                    log_callback=self.log_callback
-                )
+                    self._check_image_name(ec2_client, info, credentials)
 
-                subnet_id = info.get('subnet')
-                if subnet_id:
-                    vpc_id = get_vpc_id_from_subnet(ec2_client, subnet_id)
-                    security_group_id = ec2_setup.create_security_group(vpc_id=vpc_id)
-                else:
-                    subnet_id = ec2_setup.create_vpc_subnet()
-                    security_group_id = ec2_setup.create_security_group()
-
-                self.ec2_upload_parameters['vpc_subnet_id'] = subnet_id
-                self.ec2_upload_parameters['security_group_ids'] = \
-                    security_group_id
-
-                ec2_upload = EC2ImageUploader(
-                    **self.ec2_upload_parameters
-                )
-
-                ec2_upload.set_region(region)
-
-                if use_root_swap:
-                    ami_id = ec2_upload.create_image_use_root_swap(
-                        self.status_msg['image_file']
-                    )
-                else:
-                    ami_id = ec2_upload.create_image(
-                        self.status_msg['image_file']
-                    )
+                    create_method = info.get('create_method') or 'helper_instance'
+                    if create_method == 'ebs_direct':
+                        ami_id = self._create_image_ebs_direct(
+                            ec2_client, region, info, credentials
+                        )
+                    else:
+                        ami_id = self._create_image_helper_instance(
+                            ec2_client, region, info, credentials
+                        )
 
-                self.status_msg['source_regions'][region] = ami_id
-                self.log_callback.info(
-                    'Created image has ID: {0} in region {1}'.format(
-                        ami_id, region
+                    self.status_msg['source_regions'][region] = ami_id
+                    self.status_msg['image_provenance'][region] = {
+                        'account': account,
+                        'method': create_method
+                    }
+                    self.log_callback.info(
+                        'Created image has ID: {0} in region {1}'.format(
+                            ami_id, region
+                        )
                     )
-                )
             except Exception as error:
                 self.status = FAILED
                 msg = 'Image creation in account {0} failed with: {1}'.format(
@@ -249,12 +210,9 @@ class EC2CreateJob(MashJob):
                 self.add_error_msg(msg)
                 self.log_callback.error(msg)
                 break  # No need to continue if one account fails
-            finally:
-                if ssh_key_pair:
-                    self._delete_key_pair(
-                        ec2_client, ssh_key_pair
-                    )
-                    ec2_setup.clean_up()
+
+        if self.status == SUCCESS and copy_regions:
+            self._copy_images(copy_regions)
 
         if self.status != SUCCESS:
             for region, info in self.target_regions.items():
@@ -264,13 +222,14 @@ class EC2CreateJob(MashJob):
                     # Only cleanup regions that passed
 
                     try:
-                        cleanup_ec2_image(
-                            credentials['access_key_id'],
-                            credentials['secret_access_key'],
-                            self.log_callback,
-                            region,
-                            image_id=self.status_msg['source_regions'][region]
-                        )
+                        with api_account(info['account']):
+                            cleanup_ec2_image(
+                                credentials['access_key_id'],
+                                credentials['secret_access_key'],
+                                self.log_callback,
+                                region,
+                                image_id=self.status_msg['source_regions'][region]
+                            )
                     except Exception as error:
                         self.log_callback.warning(
                             'Failed to cleanup image: {0} in region {1}.'
@@ -281,6 +240,343 @@ class EC2CreateJob(MashJob):
                             )
                         )
 
+    def _create_image_helper_instance(
+        self, ec2_client, region, info, credentials
+    ):
+        """
+        Create the image by writing it to a volume of a helper instance.
+
+        A warm instance from the helper pool is used when the pool
+        is enabled and has capacity.
+        """
+        ssh_key_pair = None
+        use_root_swap = info['use_root_swap']
+        self.ec2_upload_parameters['launch_ami'] = info['helper_image']
+        self.ec2_upload_parameters['billing_codes'] = \
+            info['billing_codes']
+
+        self.ec2_upload_parameters['access_key'] = \
+            credentials['access_key_id']
+        self.ec2_upload_parameters['secret_key'] = \
+            credentials['secret_access_key']
+
+        helper = helper_pool.lease(
+            self.requesting_user,
+            info['account'],
+            region,
+            self.arch,
+            info['helper_image'],
+            credentials,
+            subnet=info.get('subnet'),
+            instance_type=self.ec2_upload_parameters['launch_inst_type']
+        )
+        if helper:
+            return self._create_image_pooled_helper(
+                helper, region, use_root_swap
+            )
+
+        try:
+            # NOTE: Temporary ssh keys:
+            # The temporary creation and registration of a ssh key pair
+            # is considered a workaround implementation which should be better
+            # covered by the EC2ImageUploader code. Due to a lack of
+            # development resources in the ec2utils.ec2uploadimg project and
+            # other peoples concerns for just using a generic mash ssh key
+            # for the upload, the private _create_key_pair and _delete_key_pair
+            # methods exists and could be hopefully replaced by a better
+            # concept in the near future.
+            ssh_key_pair = self._create_key_pair(ec2_client)
+
+            self.ec2_upload_parameters['ssh_key_pair_name'] = \
+                ssh_key_pair.name
+            self.ec2_upload_parameters['ssh_key_private_key_file'] = \
+                ssh_key_pair.private_key_file.name
+
+            # Create a temporary vpc, subnet and security group for the
+            # helper image, unless a subnet was specified.
+            # This provides a security group with an open ssh port.
+            ec2_setup = EC2Setup(
+                credentials['access_key_id'],
+                region,
+                credentials['secret_access_key'],
+                None,
+                log_callback=self.log_callback
+            )
+
+            subnet_id = info.get('subnet')
+            if subnet_id:
+                vpc_id = get_vpc_id_from_subnet(ec2_client, subnet_id)
+                security_group_id = ec2_setup.create_security_group(vpc_id=vpc_id)
+            else:
+                subnet_id = ec2_setup.create_vpc_subnet()
+                security_group_id = ec2_setup.create_security_group()
+
+            self.ec2_upload_parameters['vpc_subnet_id'] = subnet_id
+            self.ec2_upload_parameters['security_group_ids'] = \
+                security_group_id
+
+            ec2_upload = EC2ImageUploader(
+                **self.ec2_upload_parameters
+            )
+
+            ec2_upload.set_region(region)
+
+            if use_root_swap:
+                return ec2_upload.create_image_use_root_swap(
+                    self.status_msg['image_file']
+                )
+            else:
+                return ec2_upload.create_image(
+                    self.status_msg['image_file']
+                )
+        finally:
+            if ssh_key_pair:
+                self._delete_key_pair(
+                    ec2_client, ssh_key_pair
+                )
+                ec2_setup.clean_up()
+
+    def _create_image_pooled_helper(self, helper, region, use_root_swap):
+        """
+        Create the image with a helper instance leased from the pool.
+
+        The instance is returned to the pool unless it is consumed by
+        the root swap method or the image creation failed.
+        """
+        self.log_callback.info(
+            'Leased helper instance {0} in {1} after {2:.1f} seconds.'.format(
+                helper.instance_id, region, helper.lease_wait
+            )
+        )
+        self.ec2_upload_parameters['running_id'] = helper.instance_id
+        self.ec2_upload_parameters['ssh_key_pair_name'] = \
+            helper.key_pair_name
+        self.ec2_upload_parameters['ssh_key_private_key_file'] = \
+            helper.private_key_file
+        self.ec2_upload_parameters['vpc_subnet_id'] = helper.subnet_id
+        self.ec2_upload_parameters['security_group_ids'] = \
+            helper.security_group_id
+
+        reusable = False
+        try:
+            ec2_upload = EC2ImageUploader(
+                **self.ec2_upload_parameters
+            )
+            ec2_upload.set_region(region)
+
+            if use_root_swap:
+                return ec2_upload.create_image_use_root_swap(
+                    self.status_msg['image_file']
+                )
+
+            # The pool terminates or keeps the running instance
+            ec2_upload.instance_ids = []
+            ami_id = ec2_upload.create_image(self.status_msg['image_file'])
+            reusable = True
+            return ami_id
+        finally:
+            self.ec2_upload_parameters['running_id'] = None
+            helper_pool.release(helper, reusable=reusable)
+
+    def _create_image_ebs_direct(self, ec2_client, region, info, credentials):
+        """
+        Create the image from a snapshot written with the EBS direct APIs.
+
+        No helper instance is launched, the raw image is written
+        straight into a new snapshot which is registered as the AMI.
+        The snapshot is deleted if the image is not registered.
+        """
+        ebs_client = get_client(
+            'ebs', credentials['access_key_id'],
+            credentials['secret_access_key'], region
+        )
+
+        snapshot_id = create_snapshot_from_image(
+            ebs_client,
+            self.status_msg['image_file'],
+            self.cloud_image_description,
+            volume_size=get_volume_size(
+                self.status_msg['image_file'],
+                self.ec2_upload_parameters['root_volume_size']
+            ),
+            log_callback=self.log_callback,
+            job_id=self.id,
+            ec2_client=ec2_client
+        )
+
+        try:
+            return register_image_from_snapshot(
+                ec2_client,
+                snapshot_id,
+                self.cloud_image_name,
+                self.cloud_image_description,
+                arch=self.arch,
+                boot_mode=self.boot_firmware,
+                tpm_support=self.tpm_support,
+                billing_codes=info['billing_codes'],
+                volume_type=self.ec2_upload_parameters['backing_store']
+            )
+        except Exception:
+            delete_snapshot(ec2_client, snapshot_id, self.log_callback)
+            raise
+
+    def _check_image_name(self, ec2_client, info, credentials):
+        """
+        Fail if the image name is in use unless it should be replaced.
+        """
+        exists = image_exists(ec2_client, self.cloud_image_name)
+        if exists and not self.force_replace_image:
+            raise MashUploadException(
+                '{image_name} already exists. '
+                'Use force_replace_image to '
+                'replace the existing image.'.format(
+                    image_name=self.cloud_image_name
+                )
+            )
+        elif exists and self.force_replace_image:
+            cleanup_all_ec2_images(
+                credentials['access_key_id'],
+                credentials['secret_access_key'],
+                self.log_callback,
+                info['regions'],
+                self.cloud_image_name
+            )
+
+    def _get_copy_regions(self):
+        """
+        Split the target regions by partition.
+
+        The image is created in the first target region of each
+        partition, the other target regions copy it from there.
+        Return the create regions and a dictionary of copy regions
+        to their source region.
+        """
+        create_regions = {}
+        copy_regions = {}
+        partitions = {}
+
+        for region, info in self.target_regions.items():
+            source_region = partitions.setdefault(
+                info.get('partition'),
+                region
+            )
+
+            if source_region == region:
+                create_regions[region] = info
+            else:
+                copy_regions[region] = source_region
+
+        return create_regions, copy_regions
+
+    def _copy_images(self, copy_regions):
+        """
+        Copy the created images to the accounts of the copy regions.
+
+        The copies run in parallel and only the image metadata is sent,
+        the image data is copied by EC2 between the accounts.
+        """
+        executor = self.get_task_executor()
+
+        for region, source_region in copy_regions.items():
+            self.status_msg['source_regions'][region] = None
+            executor.submit(
+                region,
+                self._copy_image,
+                region,
+                source_region,
+                account=self.target_regions[region]['account']
+            )
+
+        for result in self.run_tasks(executor):
+            if result.error:
+                self.status = FAILED
+                msg = 'Image copy in account {0} failed with: {1}'.format(
+                    result.account,
+                    result.error
+                )
+                self.add_error_msg(msg)
+                self.log_callback.error(msg)
+                continue
+
+            source_region = copy_regions[result.name]
+            source_info = self.target_regions[source_region]
+            self.status_msg['source_regions'][result.name] = result.result
+            self.status_msg['image_provenance'][result.name] = {
+                'account': result.account,
+                'method': 'copy',
+                'source_account': source_info['account'],
+                'source_region': source_region,
+                'source_image': self.status_msg['source_regions'][source_region]
+            }
+            self.log_callback.info(
+                'Copied image has ID: {0} in region {1}'.format(
+                    result.result, result.name
+                )
+            )
+
+    def _copy_image(self, region, source_region):
+        """
+        Share the source image with the account and copy it.
+
+        The image is shared until the copy is available.
+        """
+        info = self.target_regions[region]
+        credentials = self.credentials[info['account']]
+        source_account = self.target_regions[source_region]['account']
+        source_credentials = self.credentials[source_account]
+        source_image = self.status_msg['source_regions'][source_region]
+
+        ec2_client = get_client(
+            'ec2', credentials['access_key_id'],
+            credentials['secret_access_key'], region
+        )
+        self._check_image_name(ec2_client, info, credentials)
+
+        source_client = get_client(
+            'ec2', source_credentials['access_key_id'],
+            source_credentials['secret_access_key'], source_region
+        )
+        account_id = get_account_id(
+            credentials['access_key_id'],
+            credentials['secret_access_key'],
+            region
+        )
+
+        # The task runs as the copy account, the source image
+        # calls are rate limited for the source account.
+        with api_account(source_account):
+            shared = account_id != get_account_id(
+                source_credentials['access_key_id'],
+                source_credentials['secret_access_key'],
+                source_region
+            )
+
+            if shared:
+                modify_image_sharing(source_client, source_image, [account_id])
+
+        try:
+            image_id = ec2_client.copy_image(
+                Name=self.cloud_image_name,
+                Description=self.cloud_image_description,
+                SourceImageId=source_image,
+                SourceRegion=source_region
+            )['ImageId']
+            ec2_client.get_waiter('image_available').wait(
+                ImageIds=[image_id],
+                WaiterConfig={'Delay': 15, 'MaxAttempts': 240}
+            )
+        finally:
+            if shared:
+                with api_account(source_account):
+                    modify_image_sharing(
+                        source_client,
+                        source_image,
+                        [account_id],
+                        operation='remove'
+                    )
+
+        return image_id
+
     def _create_key_pair(self, ec2_client):
         ssh_key_pair_type = namedtuple(
             'ssh_key_pair_type', ['name', 'private_key_file']
@@ -0,0 +1,534 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import logging
+import threading
+import time
+
+from collections import namedtuple
+from tempfile import NamedTemporaryFile
+
+from ec2imgutils.ec2setup import EC2Setup
+
+from mash.utils.cloud_api import api_account
+from mash.utils.ec2 import get_client, get_vpc_id_from_subnet
+from mash.utils.mash_utils import generate_name
+from mash.utils.metrics import registry
+
+lease_wait = registry.histogram(
+    'mash_ec2_helper_pool_lease_wait_seconds',
+    'Time jobs waited for a helper instance from the pool.',
+    ('result',),
+    buckets=(0, 1, 10, 30, 60, 120, 300)
+)
+pool_instances = registry.gauge(
+    'mash_ec2_helper_pool_instances',
+    'Helper instances in the pool by state.',
+    ('state',)
+)
+
+HelperInstance = namedtuple(
+    'HelperInstance',
+    [
+        'key',
+        'instance_id',
+        'key_pair_name',
+        'private_key_file',
+        'subnet_id',
+        'security_group_id',
+        'lease_wait'
+    ]
+)
+
+
+class HelperSlot(object):
+    """
+    Helper instances of one account, region, architecture and helper image.
+
+    The instances of a slot share a temporary ssh key pair and
+    security group which are removed with the last instance.
+    """
+    def __init__(self, key, credentials, instance_type):
+        self.key = key
+        self.credentials = credentials
+        self.instance_type = instance_type
+        self.idle = []
+        self.leased = set()
+        self.launching = 0
+        self.key_pair_name = None
+        self.private_key_file = None
+        self.ec2_setup = None
+        self.subnet_id = key[5]
+        self.security_group_id = None
+        self.lock = threading.Lock()
+
+    @property
+    def user(self):
+        return self.key[0]
+
+    @property
+    def account(self):
+        return self.key[1]
+
+    @property
+    def region(self):
+        return self.key[2]
+
+    @property
+    def helper_image(self):
+        return self.key[4]
+
+    def count(self):
+        return len(self.idle) + len(self.leased) + self.launching
+
+    def get_client(self):
+        return get_client(
+            'ec2',
+            self.credentials['access_key_id'],
+            self.credentials['secret_access_key'],
+            self.region
+        )
+
+
+class EC2HelperPool(object):
+    """
+    Pool of booted EC2 helper instances shared by the create jobs.
+
+    Up to size idle instances are kept for each user, account,
+    region, architecture, helper image and subnet. Account names
+    are only unique per user, instances are never shared between
+    users. A job leases an instance
+    instead of launching one and releases it when the image is
+    written. Instances which still have volumes attached or that
+    were consumed by the root swap method are terminated, the others
+    return to the pool. Idle instances are terminated after
+    idle_timeout seconds and the pool never runs more than
+    max_instances instances which caps its cost. When the pool is
+    at capacity jobs launch their own helper instance.
+
+    The pool only holds the credentials of an account while it has
+    instances of the account.
+    """
+    def __init__(self):
+        self.size = 0
+        self.max_instances = 0
+        self.idle_timeout = 900
+        self.log = logging.getLogger('MashService')
+        self._slots = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._reaper = None
+
+    def configure(
+        self, size=0, max_instances=10, idle_timeout=900,
+        reap_interval=60, log=None
+    ):
+        """
+        Set the pool limits and start terminating idle instances.
+
+        A size of 0 disables the pool.
+        """
+        self.size = size
+        self.max_instances = max_instances
+        self.idle_timeout = idle_timeout
+        self.log = log or self.log
+
+        if self.enabled and not self._reaper:
+            self._stopped.clear()
+            self._reaper = threading.Thread(
+                target=self._reap_loop,
+                args=(reap_interval,),
+                name='helper-pool-reaper',
+                daemon=True
+            )
+            self._reaper.start()
+
+    @property
+    def enabled(self):
+        return self.size > 0
+
+    def _get_instance_counts(self):
+        counts = {('idle',): 0, ('leased',): 0, ('launching',): 0}
+
+        with self._lock:
+            for slot in self._slots.values():
+                counts[('idle',)] += len(slot.idle)
+                counts[('leased',)] += len(slot.leased)
+                counts[('launching',)] += slot.launching
+
+        return counts
+
+    def _count(self):
+        return sum(slot.count() for slot in self._slots.values())
+
+    def lease(
+        self, user, account, region, arch, helper_image, credentials,
+        subnet=None, instance_type='t2.micro'
+    ):
+        """
+        Return a running helper instance or None.
+
+        None is returned when the pool is disabled or at capacity.
+        An idle instance is returned immediately, otherwise a new
+        instance is launched. Idle instances that are no longer
+        running, for example terminated outside the pool, are
+        dropped. Leased instances must be released.
+        """
+        if not self.enabled:
+            return None
+
+        start = time.monotonic()
+        key = (user, account, region, arch, helper_image, subnet)
+
+        with self._lock:
+            slot = self._slots.get(key)
+
+            if not slot:
+                slot = HelperSlot(key, credentials, instance_type)
+                self._slots[key] = slot
+
+            slot.credentials = credentials
+
+        instance_id = stale_id = None
+
+        while not instance_id:
+            with self._lock:
+                # The slot is not empty until the next instance is taken
+                slot.leased.discard(stale_id)
+
+                if slot.idle:
+                    instance_id, _ = slot.idle.pop()
+                    slot.leased.add(instance_id)
+                    result = 'idle'
+                elif self._count() >= self.max_instances:
+                    result = 'capacity'
+                else:
+                    slot.launching += 1
+                    result = 'launched'
+
+            if result == 'capacity':
+                lease_wait.observe(0, result=result)
+                self._remove_if_empty(slot)
+                return None
+
+            if instance_id:
+                if not self._is_available(slot, instance_id):
+                    stale_id, instance_id = instance_id, None
+
+                continue
+
+            try:
+                with api_account(slot.account, slot.user):
+                    instance_id = self._launch(slot)
+            except Exception:
+                with self._lock:
+                    slot.launching -= 1
+
+                self._remove_if_empty(slot)
+                raise
+
+            with self._lock:
+                slot.launching -= 1
+                slot.leased.add(instance_id)
+
+        wait_time = time.monotonic() - start
+        lease_wait.observe(wait_time, result=result)
+        self._start_refill(slot)
+
+        return HelperInstance(
+            key,
+            instance_id,
+            slot.key_pair_name,
+            slot.private_key_file.name,
+            slot.subnet_id,
+            slot.security_group_id,
+            wait_time
+        )
+
+    def release(self, helper, reusable=True):
+        """
+        Return the leased helper instance to the pool.
+
+        The instance is scrubbed of attached volumes first, instances
+        which are not reusable are terminated.
+        """
+        slot = self._slots[helper.key]
+
+        if reusable:
+            try:
+                reusable = self._is_clean(slot, helper.instance_id)
+            except Exception as error:
+                self.log.warning(
+                    'Unable to inspect helper instance {0}: {1}'.format(
+                        helper.instance_id, error
+                    )
+                )
+                reusable = False
+
+        with self._lock:
+            slot.leased.discard(helper.instance_id)
+
+            if reusable and len(slot.idle) < self.size:
+                slot.idle.append((helper.instance_id, time.monotonic()))
+                return
+
+        self._terminate(slot, [helper.instance_id])
+
+    def _is_available(self, slot, instance_id):
+        """
+        Check the idle instance can be leased.
+
+        Instances that are gone or not clean are terminated.
+        """
+        try:
+            with api_account(slot.account, slot.user):
+                if self._is_clean(slot, instance_id):
+                    return True
+
+                slot.get_client().terminate_instances(
+                    InstanceIds=[instance_id]
+                )
+        except Exception as error:
+            self.log.warning(
+                'Idle helper instance {0} is not available: {1}'.format(
+                    instance_id, error
+                )
+            )
+
+        return False
+
+    def _is_clean(self, slot, instance_id):
+        """
+        Check the instance is running with only its root volume attached.
+        """
+        instance = slot.get_client().describe_instances(
+            InstanceIds=[instance_id]
+        )['Reservations'][0]['Instances'][0]
+
+        if instance['State']['Name'] != 'running':
+            return False
+
+        return all(
+            mapping['DeviceName'] == instance['RootDeviceName']
+            for mapping in instance.get('BlockDeviceMappings', [])
+        )
+
+    def _prepare_slot(self, slot, client):
+        """
+        Create the ssh key pair and security group of the slot.
+        """
+        with slot.lock:
+            if slot.key_pair_name:
+                return
+
+            ec2_setup = EC2Setup(
+                slot.credentials['access_key_id'],
+                slot.region,
+                slot.credentials['secret_access_key'],
+                None,
+                log_callback=self.log
+            )
+            slot.ec2_setup = ec2_setup
+
+            if slot.subnet_id:
+                vpc_id = get_vpc_id_from_subnet(client, slot.subnet_id)
+                security_group_id = ec2_setup.create_security_group(
+                    vpc_id=vpc_id
+                )
+            else:
+                slot.subnet_id = ec2_setup.create_vpc_subnet()
+                security_group_id = ec2_setup.create_security_group()
+
+            slot.security_group_id = security_group_id
+
+            key_pair_name = 'mash-pool-{0}'.format(generate_name())
+            ssh_key = client.create_key_pair(KeyName=key_pair_name)
+            private_key_file = NamedTemporaryFile()
+
+            with open(private_key_file.name, 'w') as private_key:
+                private_key.write(ssh_key['KeyMaterial'])
+
+            slot.private_key_file = private_key_file
+            slot.key_pair_name = key_pair_name
+
+    def _launch(self, slot):
+        """
+        Launch a helper instance and wait until it passed status checks.
+        """
+        client = slot.get_client()
+        self._prepare_slot(slot, client)
+
+        instance = client.run_instances(
+            ImageId=slot.helper_image,
+            MinCount=1,
+            MaxCount=1,
+            KeyName=slot.key_pair_name,
+            InstanceType=slot.instance_type,
+            NetworkInterfaces=[{
+                'DeviceIndex': 0,
+                'AssociatePublicIpAddress': True,
+                'SubnetId': slot.subnet_id,
+                'Groups': [slot.security_group_id]
+            }],
+            TagSpecifications=[{
+                'ResourceType': 'instance',
+                'Tags': [{'Key': 'Name', 'Value': 'mash-helper-pool'}]
+            }]
+        )['Instances'][0]
+        instance_id = instance['InstanceId']
+
+        try:
+            client.get_waiter('instance_status_ok').wait(
+                InstanceIds=[instance_id]
+            )
+        except Exception:
+            client.terminate_instances(InstanceIds=[instance_id])
+            raise
+
+        return instance_id
+
+    def _start_refill(self, slot):
+        thread = threading.Thread(
+            target=self._refill,
+            args=(slot,),
+            name='helper-pool-refill',
+            daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _refill(self, slot):
+        """
+        Launch instances until the slot has size idle instances.
+        """
+        while not self._stopped.is_set():
+            with self._lock:
+                if len(slot.idle) + slot.launching >= self.size or \
+                        self._count() >= self.max_instances:
+                    return
+
+                slot.launching += 1
+
+            try:
+                instance_id = self._launch(slot)
+            except Exception as error:
+                self.log.warning(
+                    'Unable to launch helper instance in {0}: {1}'.format(
+                        slot.region, error
+                    )
+                )
+
+                with self._lock:
+                    slot.launching -= 1
+
+                self._remove_if_empty(slot)
+                return
+
+            with self._lock:
+                slot.launching -= 1
+                slot.idle.append((instance_id, time.monotonic()))
+
+    def _terminate(self, slot, instance_ids):
+        """
+        Terminate the instances and remove the slot once it is empty.
+        """
+        try:
+            with api_account(slot.account, slot.user):
+                client = slot.get_client()
+                client.terminate_instances(InstanceIds=instance_ids)
+                client.get_waiter('instance_terminated').wait(
+                    InstanceIds=instance_ids
+                )
+        except Exception as error:
+            self.log.warning(
+                'Unable to terminate helper instances {0}: {1}'.format(
+                    ', '.join(instance_ids), error
+                )
+            )
+
+        self._remove_if_empty(slot)
+
+    def _remove_if_empty(self, slot):
+        """
+        Remove the slot and its resources once it has no instances.
+        """
+        with self._lock:
+            if slot.count() or self._slots.get(slot.key) is not slot:
+                return
+
+            del self._slots[slot.key]
+
+        try:
+            with api_account(slot.account, slot.user):
+                if slot.key_pair_name:
+                    slot.get_client().delete_key_pair(
+                        KeyName=slot.key_pair_name
+                    )
+                    slot.private_key_file.close()
+
+                if slot.ec2_setup:
+                    slot.ec2_setup.clean_up()
+        except Exception as error:
+            self.log.warning(
+                'Unable to clean up helper pool resources in {0}: {1}'.format(
+                    slot.region, error
+                )
+            )
+
+        slot.credentials = None
+
+    def reap(self, now=None):
+        """
+        Terminate the instances idle for longer than idle_timeout.
+        """
+        now = now or time.monotonic()
+        expired = []
+
+        with self._lock:
+            for slot in list(self._slots.values()):
+                instance_ids = [
+                    instance_id for instance_id, idle_since in slot.idle
+                    if now - idle_since >= self.idle_timeout
+                ]
+
+                if instance_ids:
+                    slot.idle = [
+                        item for item in slot.idle
+                        if item[0] not in instance_ids
+                    ]
+                    expired.append((slot, instance_ids))
+
+        for slot, instance_ids in expired:
+            self._terminate(slot, instance_ids)
+
+    def _reap_loop(self, interval):
+        while not self._stopped.wait(interval):
+            self.reap()
+
+    def close(self):
+        """
+        Terminate all idle instances and stop the pool.
+        """
+        self._stopped.set()
+        self._reaper = None
+        self.size = 0
+        self.reap(now=float('inf'))
+
+
+helper_pool = EC2HelperPool()
+pool_instances.set_function(helper_pool._get_instance_counts)
@@ -31,6 +31,7 @@ from mash.services.create.ec2_job import EC2CreateJob
 from mash.services.create.gce_job import GCECreateJob
 from mash.services.create.oci_job import OCICreateJob
 from mash.services.create.aliyun_job import AliyunCreateJob
+from mash.services.create.helper_pool import helper_pool
 
 
 def main():
@@ -57,10 +58,15 @@ def main():
             }
         )
 
+        config = BaseConfig()
+
+        # Warm EC2 helper instances shared by the jobs of the service
+        helper_pool.configure(log=log, **config.get_ec2_helper_pool())
+
         # run service, enter main loop
         ListenerService(
             service_exchange=service_name,
-            config=BaseConfig(),
+            config=config,
             custom_args={
                 'job_factory': job_factory
             }
@@ -80,3 +86,5 @@ def main():
         log.error('Unexpected error: {0}'.format(e))
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        helper_pool.close()
@@ -23,6 +23,7 @@ from flask import Flask
 from flask.logging import default_handler
 
 from mash.utils.mash_utils import setup_logfile, setup_rabbitmq_log_handler
+from mash.utils.metrics import register_flask_metrics
 from mash.log.filter import BaseServiceFilter
 from mash.services.credentials.datastore import CredentialsDatastore
 from mash.services.credentials.routes import credentials
@@ -46,6 +47,7 @@ def create_app(config_object):
     app.config.from_object(config_object)
     register_blueprints(app)
     configure_logger(app)
+    register_flask_metrics(app, 'credentials')
     setup_app(app)
     return app
 
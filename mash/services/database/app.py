@@ -22,8 +22,9 @@ from flask import Flask
 from flask.logging import default_handler
 
 from mash.utils.mash_utils import setup_logfile, setup_rabbitmq_log_handler
+from mash.utils.metrics import register_flask_metrics
 from mash.log.filter import BaseServiceFilter
-from mash.services.database.routes import jobs, tokens, users
+from mash.services.database.routes import jobs, logs, tokens, users
 from mash.services.database.routes.accounts import aliyun, azure, ec2, gce, oci
 from mash.services.database.extensions import db, migrate
 from mash.services.database.commands import tokens_cli
@@ -44,6 +45,7 @@ def create_app(config_object):
     register_blueprints(app)
     register_commands(app)
     configure_logger(app)
+    register_flask_metrics(app, 'database')
     register_extensions(app)
     return app
 
@@ -71,6 +73,7 @@ def configure_logger(app):
 def register_blueprints(app):
     """Register Flask blueprints."""
     app.register_blueprint(jobs.blueprint)
+    app.register_blueprint(logs.blueprint)
     app.register_blueprint(tokens.blueprint)
     app.register_blueprint(users.blueprint)
     app.register_blueprint(azure.blueprint)
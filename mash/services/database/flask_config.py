@@ -52,3 +52,7 @@ class Config(object):
     @property
     def CREDENTIALS_URL(self):
         return self.config.get_credentials_url()
+
+    @property
+    def LOG_STORE_DIRECTORY(self):
+        return self.config.get_log_store_directory()
@@ -255,6 +255,12 @@ class Job(db.Model):
     _data = db.Column('data', db.Text)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     user = db.relationship('User', back_populates='jobs')
+    stages = db.relationship(
+        'JobStage',
+        back_populates='job',
+        lazy='select',
+        cascade='all, delete, delete-orphan'
+    )
 
     @property
     def data(self):
@@ -274,3 +280,55 @@ class Job(db.Model):
 
     def __repr__(self):
         return '<Job {}>'.format(self.job_id)
+
+
+class JobOutbox(db.Model):
+    __tablename__ = 'job_outbox'
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(40), nullable=False)
+    message = db.Column(db.Text, nullable=False)
+    created = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return '<Job Outbox {}>'.format(self.job_id)
+
+
+class JobStage(db.Model):
+    __tablename__ = 'job_stage'
+    id = db.Column(db.Integer, primary_key=True)
+    service = db.Column(db.String(16), nullable=False)
+    cloud = db.Column(db.String(16))
+    status = db.Column(db.String(12))
+    queued_time = db.Column(db.DateTime)
+    start_time = db.Column(db.DateTime)
+    finish_time = db.Column(db.DateTime, index=True, nullable=False)
+    bytes_transferred = db.Column(db.BigInteger, default=0)
+    _api_calls = db.Column('api_calls', db.Text)
+    job_id = db.Column(
+        db.Integer,
+        db.ForeignKey('job.id'),
+        index=True,
+        nullable=False
+    )
+    job = db.relationship('Job', back_populates='stages')
+
+    @property
+    def api_calls(self):
+        return json.loads(self._api_calls) if self._api_calls else None
+
+    @api_calls.setter
+    def api_calls(self, value):
+        self._api_calls = json.dumps(value) if value else None
+
+    @property
+    def queue_wait(self):
+        if self.queued_time and self.start_time:
+            return (self.start_time - self.queued_time).total_seconds()
+
+    @property
+    def duration(self):
+        if self.start_time:
+            return (self.finish_time - self.start_time).total_seconds()
+
+    def __repr__(self):
+        return '<Job Stage {}>'.format(self.service)
@@ -26,7 +26,12 @@ from mash.services.database.utils.jobs import (
     get_job_by_user,
     get_jobs,
     delete_job_for_user,
-    create_new_job
+    create_new_job,
+    create_new_jobs,
+    get_outbox_messages,
+    delete_outbox_messages,
+    get_job_timeline,
+    get_stage_statistics
 )
 
 blueprint = Blueprint('jobs', __name__, url_prefix='/jobs')
@@ -61,19 +66,70 @@ job_response = Model(
     }
 )
 
+job_stage_response = Model(
+    'job_stage_response', {
+        'service': fields.String(example='upload'),
+        'cloud': fields.String(example='ec2'),
+        'status': fields.String(example='success'),
+        'queued_time': fields.DateTime(),
+        'start_time': fields.DateTime(),
+        'finish_time': fields.DateTime(),
+        'queue_wait': fields.Float(example=1.5),
+        'duration': fields.Float(example=120.25),
+        'bytes_transferred': fields.Integer(example=1073741824),
+        'api_calls': fields.Raw(
+            example={'calls': 120, 'retries': 2, 'throttled': 1}
+        )
+    }
+)
+
+job_timeline_response = Model(
+    'job_timeline_response', {
+        'job_id': fields.String(
+            example='12345678-1234-1234-1234-123456789012'
+        ),
+        'stages': fields.List(fields.Nested(job_stage_response))
+    }
+)
+
+stage_percentiles = Model(
+    'stage_percentiles', {
+        'p50': fields.Float(example=60.5),
+        'p95': fields.Float(example=300.0)
+    }
+)
+
+stage_statistics_response = Model(
+    'stage_statistics_response', {
+        'cloud': fields.String(example='ec2'),
+        'service': fields.String(example='upload'),
+        'count': fields.Integer(example=10),
+        'duration': fields.Nested(stage_percentiles),
+        'queue_wait': fields.Nested(stage_percentiles),
+        'bytes_per_second': fields.Nested(stage_percentiles)
+    }
+)
+
 
 @blueprint.route('/', methods=['PUT'])
 def update_job_status():
     data = json.loads(request.data.decode())
 
     try:
-        save_job_status(data)
+        job = save_job_status(data)
     except Exception as error:
         msg = 'Unable to update job status: {0}'.format(error)
         current_app.logger.warning(msg)
         return make_response(jsonify({'msg': msg}), 400)
 
-    return make_response(jsonify({'msg': 'Job status updated'}), 200)
+    return make_response(
+        jsonify({
+            'msg': 'Job status updated',
+            'state': job.state,
+            'current_service': job.current_service
+        }),
+        200
+    )
 
 
 @blueprint.route('/', methods=['POST'])
@@ -93,6 +149,59 @@ def create_job():
     )
 
 
+@blueprint.route('/bulk', methods=['POST'])
+def create_jobs():
+    data = json.loads(request.data.decode())
+
+    try:
+        jobs = create_new_jobs(data['jobs'])
+    except Exception as error:
+        msg = 'Unable to create jobs: {0}'.format(error)
+        current_app.logger.warning(msg)
+        return make_response(jsonify({'msg': msg}), 400)
+
+    jobs = [marshal(job, job_response, skip_none=True) for job in jobs]
+    return make_response(jsonify(jobs), 200)
+
+
+@blueprint.route('/outbox', methods=['GET'])
+def get_outbox():
+    data = json.loads(request.data.decode())
+
+    kwargs = {}
+    if data.get('limit'):
+        kwargs['limit'] = data['limit']
+
+    messages = get_outbox_messages(**kwargs)
+    messages = [
+        {
+            'id': message.id,
+            'job_id': message.job_id,
+            'message': message.message
+        } for message in messages
+    ]
+    return make_response(jsonify(messages), 200)
+
+
+@blueprint.route('/outbox', methods=['DELETE'])
+def delete_outbox():
+    data = json.loads(request.data.decode())
+
+    try:
+        rows_deleted = delete_outbox_messages(data['ids'])
+    except Exception as error:
+        current_app.logger.warning(error)
+        return make_response(
+            jsonify({'msg': 'Delete outbox messages failed'}),
+            400
+        )
+
+    return make_response(
+        jsonify({'rows_deleted': rows_deleted}),
+        200
+    )
+
+
 @blueprint.route('/', methods=['GET'])
 def get_job():
     data = json.loads(request.data.decode())
@@ -116,6 +225,54 @@ def get_job():
     )
 
 
+@blueprint.route('/timeline', methods=['GET'])
+def get_timeline():
+    data = json.loads(request.data.decode())
+    job_id = data['job_id']
+    user_id = data['user_id']
+
+    try:
+        stages = get_job_timeline(job_id, user_id)
+    except Exception as error:
+        msg = 'Unable to get timeline for job {0}: {1}'.format(
+            job_id,
+            error
+        )
+        current_app.logger.warning(msg)
+        return make_response(jsonify({'msg': msg}), 400)
+
+    if stages is None:
+        return make_response(jsonify({}), 200)
+
+    timeline = {'job_id': job_id, 'stages': stages}
+    return make_response(
+        jsonify(marshal(timeline, job_timeline_response)),
+        200
+    )
+
+
+@blueprint.route('/stages', methods=['GET'])
+def get_stages():
+    data = json.loads(request.data.decode() or '{}')
+    kwargs = {
+        key: data[key] for key in (
+            'user_id', 'cloud', 'start', 'end'
+        ) if key in data
+    }
+
+    try:
+        statistics = get_stage_statistics(**kwargs)
+    except Exception as error:
+        msg = 'Unable to get stage statistics: {0}'.format(error)
+        current_app.logger.warning(msg)
+        return make_response(jsonify({'msg': msg}), 400)
+
+    return make_response(
+        jsonify(marshal(statistics, stage_statistics_response)),
+        200
+    )
+
+
 @blueprint.route('/list/<string:user>', methods=['GET'])
 def get_job_list(user):
     data = json.loads(request.data.decode())
@@ -0,0 +1,44 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import json
+
+from flask import Blueprint, current_app, jsonify, request, make_response
+
+from mash.services.database.utils.logs import query_job_logs
+
+blueprint = Blueprint('logs', __name__, url_prefix='/logs')
+
+
+@blueprint.route('/', methods=['GET'])
+def get_logs():
+    data = json.loads(request.data.decode() or '{}')
+    kwargs = {
+        key: data[key] for key in (
+            'job_id', 'service', 'level', 'text', 'start', 'end', 'limit'
+        ) if key in data
+    }
+
+    try:
+        records = query_job_logs(**kwargs)
+    except Exception as error:
+        msg = 'Unable to query job logs: {0}'.format(error)
+        current_app.logger.warning(msg)
+        return make_response(jsonify({'msg': msg}), 400)
+
+    return make_response(jsonify(records), 200)
@@ -16,21 +16,44 @@
 # along with mash.  If not, see <http://www.gnu.org/licenses/>
 #
 
-from datetime import datetime
+import math
+
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from dateutil import parser
 
 from mash.services.database.extensions import db
-from mash.services.database.models import Job
+from mash.services.database.models import Job, JobOutbox, JobStage
 from mash.services.status_levels import FAILED, EXCEPTION, RUNNING, FINISHED
 
 
-def create_new_job(data):
+def add_job_to_session(data):
     """
-    Create a new job for user.
+    Add a new job to the database session.
+
+    If the data contains a job document it is added to the job
+    outbox in the same session. The outbox relay publishes the
+    document once the transaction is committed.
     """
+    job_document = data.pop('job_document', None)
     job = Job(**data)
+    db.session.add(job)
+
+    if job_document:
+        db.session.add(
+            JobOutbox(job_id=job.job_id, message=job_document)
+        )
 
+    return job
+
+
+def create_new_job(data):
+    """
+    Create a new job for user.
+    """
     try:
-        db.session.add(job)
+        job = add_job_to_session(data)
         db.session.commit()
     except Exception:
         db.session.rollback()
@@ -39,6 +62,45 @@ def create_new_job(data):
     return job
 
 
+def create_new_jobs(jobs_data):
+    """
+    Create a set of new jobs in a single transaction.
+
+    Either all jobs are created or none.
+    """
+    try:
+        jobs = [add_job_to_session(data) for data in jobs_data]
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return jobs
+
+
+def get_outbox_messages(limit=100):
+    """
+    Return the oldest job outbox messages pending publication.
+    """
+    return JobOutbox.query.order_by(JobOutbox.id).limit(limit).all()
+
+
+def delete_outbox_messages(message_ids):
+    """
+    Delete the job outbox messages once they have been published.
+    """
+    try:
+        rows_deleted = JobOutbox.query.filter(
+            JobOutbox.id.in_(message_ids)
+        ).delete(synchronize_session=False)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return rows_deleted
+
+
 def get_job(job_id):
     """
     Get job.
@@ -99,6 +161,10 @@ def save_job_status(job_doc):
 
     status = job_doc.pop('status')
     current_service = job_doc.pop('current_service')
+    stage_metrics = job_doc.pop('stage_metrics', None)
+
+    if stage_metrics:
+        job.stages.append(get_job_stage(status, stage_metrics))
 
     failed_states = (FAILED, EXCEPTION)
     if status in failed_states and job.state != status:
@@ -123,3 +189,134 @@ def save_job_status(job_doc):
     except Exception:
         db.session.rollback()
         raise
+
+    return job
+
+
+def get_job_stage(status, metrics):
+    """
+    Return a job stage from the metrics in a service status message.
+    """
+    return JobStage(
+        service=metrics['service'],
+        cloud=metrics.get('cloud'),
+        status=status,
+        queued_time=parse_time(metrics.get('queued_time')),
+        start_time=parse_time(metrics.get('start_time')),
+        finish_time=parse_time(metrics['finish_time']),
+        bytes_transferred=metrics.get('bytes_transferred') or 0,
+        api_calls=metrics.get('api_calls')
+    )
+
+
+def get_job_timeline(job_id, user_id):
+    """
+    Get the stages of the job for given user ordered by finish time.
+
+    Returns None if the job does not exist.
+    """
+    job = get_job_by_user(job_id, user_id)
+
+    if not job:
+        return None
+
+    return sorted(job.stages, key=lambda stage: stage.finish_time)
+
+
+def get_stage_statistics(
+    user_id=None,
+    cloud=None,
+    start=None,
+    end=None,
+    percentiles=(50, 95)
+):
+    """
+    Get the stage duration, queue wait and throughput percentiles.
+
+    The statistics are aggregated per cloud and service for stages
+    that finished between start and end. The default range is the
+    last 30 days. The OBS download is not cloud specific and is
+    counted for the cloud of the job.
+    """
+    start = parse_time(start) or datetime.utcnow() - timedelta(days=30)
+    conditions = [JobStage.finish_time >= start]
+
+    if end:
+        conditions.append(JobStage.finish_time <= parse_time(end))
+
+    if user_id:
+        conditions.append(Job.user_id == user_id)
+
+    stages = JobStage.query.join(JobStage.job).filter(*conditions).all()
+    job_clouds = {
+        stage.job_id: stage.cloud for stage in stages if stage.cloud
+    }
+
+    groups = defaultdict(list)
+    for stage in stages:
+        stage_cloud = stage.cloud or job_clouds.get(stage.job_id)
+
+        if not cloud or stage_cloud == cloud:
+            groups[(stage_cloud, stage.service)].append(stage)
+
+    statistics = []
+    for (stage_cloud, service), group in sorted(
+        groups.items(),
+        key=lambda item: (item[0][0] or '', item[0][1])
+    ):
+        durations = [
+            stage.duration for stage in group if stage.duration is not None
+        ]
+        queue_waits = [
+            stage.queue_wait for stage in group
+            if stage.queue_wait is not None
+        ]
+        throughputs = [
+            stage.bytes_transferred / stage.duration for stage in group
+            if stage.bytes_transferred and stage.duration
+        ]
+
+        statistics.append({
+            'cloud': stage_cloud,
+            'service': service,
+            'count': len(group),
+            'duration': get_percentiles(durations, percentiles),
+            'queue_wait': get_percentiles(queue_waits, percentiles),
+            'bytes_per_second': get_percentiles(throughputs, percentiles)
+        })
+
+    return statistics
+
+
+def get_percentiles(values, percentiles):
+    """
+    Return the nearest-rank percentiles of values keyed by p<percentile>.
+    """
+    values = sorted(values)
+    result = {}
+
+    for percentile in percentiles:
+        key = 'p{0}'.format(percentile)
+
+        if values:
+            index = math.ceil(percentile / 100 * len(values)) - 1
+            result[key] = values[max(index, 0)]
+        else:
+            result[key] = None
+
+    return result
+
+
+def parse_time(value):
+    """
+    Parse the date-time string to a naive UTC datetime.
+    """
+    if not value:
+        return None
+
+    date = parser.isoparse(value)
+
+    if date.tzinfo:
+        date = date.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return date
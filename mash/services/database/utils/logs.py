@@ -0,0 +1,66 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+from datetime import timezone
+
+from dateutil import parser
+from flask import current_app
+
+from mash.utils.job_log_store import JobLogStore
+
+max_query_limit = 1000
+
+
+def query_job_logs(
+    job_id=None,
+    service=None,
+    level=None,
+    text=None,
+    start=None,
+    end=None,
+    limit=100
+):
+    """
+    Query the structured job log store.
+
+    Start and end are date-time strings, without a time zone UTC is
+    assumed. At most max_query_limit records are returned.
+    """
+    store = JobLogStore(current_app.config['LOG_STORE_DIRECTORY'])
+
+    return store.query(
+        job_id=job_id,
+        service=service,
+        level=level,
+        text=text,
+        start=parse_date(start),
+        end=parse_date(end),
+        limit=min(limit, max_query_limit)
+    )
+
+
+def parse_date(value):
+    if not value:
+        return None
+
+    date = parser.isoparse(value)
+
+    if not date.tzinfo:
+        date = date.replace(tzinfo=timezone.utc)
+
+    return date
@@ -49,6 +49,8 @@ class EC2DeprecateJob(MashJob):
     def run_job(self):
         """
         Deprecate image in all target regions in each source region.
+
+        Regions are deprecated in parallel.
         """
         self.status = SUCCESS
 
@@ -64,29 +66,50 @@ class EC2DeprecateJob(MashJob):
         self.request_credentials(accounts)
         self.cloud_image_name = self.status_msg['cloud_image_name']
 
+        executor = self.get_task_executor()
         for region_info in self.deprecate_regions:
-            credential = self.credentials[region_info['account']]
-
-            deprecator = EC2DeprecateImg(
-                access_key=credential['access_key_id'],
-                secret_key=credential['secret_access_key'],
-                deprecation_image_name=self.old_cloud_image_name,
-                replacement_image_name=self.cloud_image_name,
-                log_callback=self.log_callback
-            )
-
             for region in region_info['target_regions']:
-                deprecator.set_region(region)
-                try:
-                    result = deprecator.deprecate_images()
-                    if result is False:
-                        self.log_callback.warning(
-                            'Unable to deprecate image in {region}, '
-                            'no image found.'.format(region=region)
-                        )
-                except Exception as error:
-                    raise MashDeprecateException(
-                        'Error deprecating image {0} in {1}. {2}'.format(
-                            self.old_cloud_image_name, region, error
-                        )
-                    )
+                executor.submit(
+                    region,
+                    self._deprecate_image,
+                    region,
+                    self.credentials[region_info['account']],
+                    account=region_info['account']
+                )
+
+        errors = [
+            str(result.error) for result in self.run_tasks(executor)
+            if result.error
+        ]
+
+        if errors:
+            raise MashDeprecateException(' '.join(errors))
+
+    def _deprecate_image(self, region, credential):
+        """
+        Deprecate image in the region.
+
+        Each region uses its own client as regions run in parallel.
+        """
+        deprecator = EC2DeprecateImg(
+            access_key=credential['access_key_id'],
+            secret_key=credential['secret_access_key'],
+            deprecation_image_name=self.old_cloud_image_name,
+            replacement_image_name=self.cloud_image_name,
+            log_callback=self.log_callback
+        )
+        deprecator.set_region(region)
+
+        try:
+            result = deprecator.deprecate_images()
+            if result is False:
+                self.log_callback.warning(
+                    'Unable to deprecate image in {region}, '
+                    'no image found.'.format(region=region)
+                )
+        except Exception as error:
+            raise MashDeprecateException(
+                'Error deprecating image {0} in {1}. {2}'.format(
+                    self.old_cloud_image_name, region, error
+                )
+            )
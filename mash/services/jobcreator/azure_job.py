@@ -54,6 +54,7 @@ class AzureJob(BaseJob):
         )
         self.gallery_name = self.kwargs.get('gallery_name')
         self.gallery_resource_group = self.kwargs.get('gallery_resource_group')
+        self.gallery_target_regions = self.kwargs.get('gallery_target_regions')
 
     def get_deprecate_message(self):
         """
@@ -216,6 +217,10 @@ class AzureJob(BaseJob):
             create_message['create_job']['gallery_name'] = self.gallery_name
             create_message['create_job']['gallery_resource_group'] = self.gallery_resource_group
 
+            if self.gallery_target_regions:
+                create_message['create_job']['target_regions'] = \
+                    self.gallery_target_regions
+
         create_message['create_job'].update(self.base_message)
 
         return JsonFormat.json_message(create_message)
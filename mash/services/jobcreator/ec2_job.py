@@ -35,6 +35,11 @@ class EC2Job(BaseJob):
         self.allow_copy = self.kwargs.get('allow_copy', 'none')
         self.billing_codes = self.kwargs.get('billing_codes')
         self.use_root_swap = self.kwargs.get('use_root_swap', False)
+        self.create_method = self.kwargs.get(
+            'create_method',
+            'helper_instance'
+        )
+        self.create_once = self.kwargs.get('create_once', False)
         self.tpm_support = self.kwargs.get('tpm_support')
         self.entity_id = self.kwargs.get('entity_id')
         self.version_title = self.kwargs.get('version_title')
@@ -245,6 +250,9 @@ class EC2Job(BaseJob):
         }
         create_message['create_job'].update(self.base_message)
 
+        if self.create_once:
+            create_message['create_job']['create_once'] = True
+
         if self.cloud_architecture:
             create_message['create_job']['cloud_architecture'] = \
                 self.cloud_architecture
@@ -264,7 +272,10 @@ class EC2Job(BaseJob):
                 'billing_codes': self.billing_codes,
                 'use_root_swap': self.use_root_swap,
                 'subnet': value['subnet'],
-                'regions': value['target_regions']
+                'partition': value['partition'],
+                'regions': value['target_regions'],
+                'create_method':
+                    value.get('create_method') or self.create_method
             }
 
         return target_regions
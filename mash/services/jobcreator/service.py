@@ -25,6 +25,7 @@ from mash.utils.json_format import JsonFormat
 from mash.utils.mash_utils import setup_logfile
 from mash.utils.mash_utils import handle_request
 from mash.utils.email_notification import EmailNotification
+from mash.utils.tracing import get_job_trace_id, tracer
 
 
 class JobCreatorService(MashService):
@@ -40,6 +41,7 @@ class JobCreatorService(MashService):
         """
         self.service_queue = 'service'
         self.job_document_key = 'job_document'
+        self.job_status_key = 'job_status'
 
         logfile_handler = setup_logfile(
             self.config.get_log_file(self.service_exchange)
@@ -101,6 +103,8 @@ class JobCreatorService(MashService):
             )
 
         if job_doc:
+            context = tracer.extract(message.properties.get('headers'))
+
             for key, value in job_doc.items():
                 service = key.rsplit('_', maxsplit=1)[0]
 
@@ -111,7 +115,8 @@ class JobCreatorService(MashService):
                         )
                     )
                 else:
-                    self._process_job_status(service, value)
+                    with tracer.activate(context):
+                        self._process_job_status(service, value)
 
         message.ack()
 
@@ -139,7 +144,7 @@ class JobCreatorService(MashService):
         notification_email = job_doc.pop('notification_email')
 
         try:
-            handle_request(
+            response = handle_request(
                 self.database_api_url,
                 'jobs/',
                 'put',
@@ -147,6 +152,8 @@ class JobCreatorService(MashService):
             )
         except Exception as error:
             self.log.error('Job status update failed: {}'.format(error))
+        else:
+            self.publish_job_status(job_doc, response.json())
 
         if notification_email and (last_service == service):
             self.send_notification(
@@ -158,6 +165,37 @@ class JobCreatorService(MashService):
                 job_doc['errors']
             )
 
+    def publish_job_status(self, job_doc, job_state):
+        """
+        Publish the job state transition for API status watchers.
+
+        Status events are transient, they are not persisted and the
+        broker drops them if no API worker is subscribed.
+        """
+        event = {
+            'job_id': job_doc['id'],
+            'state': job_state.get('state'),
+            'current_service': job_state.get('current_service'),
+            'prev_service': job_doc['prev_service'],
+            'status': job_doc['status'],
+            'errors': job_doc.get('errors', [])
+        }
+
+        try:
+            self.channel.basic.publish(
+                body=JsonFormat.json_message(event),
+                routing_key=self.job_status_key,
+                exchange=self.service_exchange,
+                properties={
+                    'content_type': 'application/json',
+                    'delivery_mode': 1
+                }
+            )
+        except Exception as error:
+            self.log.warning(
+                'Job status event publish failed: {}'.format(error)
+            )
+
     def publish_job_doc(self, service, job_doc):
         """
         Publish the job_doc message to the given service exchange.
@@ -175,6 +213,18 @@ class JobCreatorService(MashService):
             extra={'job_id': job.id}
         )
 
+        # The job documents start the trace of the job
+        with tracer.span(
+            'send_job',
+            trace_id=get_job_trace_id(job.id),
+            attributes={'mash.job_id': job.id, 'mash.cloud': job.cloud}
+        ):
+            self._publish_job_docs(job)
+
+    def _publish_job_docs(self, job):
+        """
+        Publish the service specific job document to each service.
+        """
         for service in self.services:
             if service == 'deprecate':
                 self.publish_job_doc(
@@ -20,6 +20,8 @@ import json
 import os
 import signal
 
+from datetime import datetime
+
 from amqpstorm import AMQPError
 
 from apscheduler import events
@@ -30,9 +32,13 @@ from apscheduler.executors.pool import ThreadPoolExecutor
 from pytz import utc
 
 from mash.mash_exceptions import MashListenerServiceException
-from mash.services.mash_service import MashService
+from mash.services.mash_service import MashService, service_jobs
 from mash.services.status_levels import EXCEPTION, SUCCESS
+from mash.utils.cloud_api import register_boto_handlers
 from mash.utils.json_format import JsonFormat
+from mash.utils.metrics import registry
+from mash.utils.rate_limiter import rate_limiter
+from mash.utils.tracing import tracer
 from mash.utils.mash_utils import (
     remove_file,
     persist_json,
@@ -40,6 +46,27 @@ from mash.utils.mash_utils import (
     setup_logfile
 )
 
+thread_pool_workers = registry.gauge(
+    'mash_thread_pool_workers',
+    'Worker threads in the service job thread pool.',
+    ('service',)
+)
+thread_pool_busy = registry.gauge(
+    'mash_thread_pool_busy',
+    'Worker threads in the service job thread pool running a job.',
+    ('service',)
+)
+job_stage_duration = registry.histogram(
+    'mash_job_stage_duration_seconds',
+    'Time to run a job in the service.',
+    ('service', 'cloud', 'status')
+)
+job_queue_wait = registry.histogram(
+    'mash_job_queue_wait_seconds',
+    'Time between a job being ready and starting in the service.',
+    ('service', 'cloud')
+)
+
 
 class ListenerService(MashService):
     """
@@ -53,6 +80,8 @@ class ListenerService(MashService):
         self.listener_msg_key = 'listener_msg'
 
         self.jobs = {}
+        self.scheduled_jobs = set()
+        self.running_jobs = set()
 
         # setup service job directory
         self.job_directory = self.config.get_job_directory(
@@ -90,6 +119,12 @@ class ListenerService(MashService):
             'thread_pool_count',
             self.config.get_base_thread_pool_count()
         )
+        self._register_metrics(thread_pool_count)
+        register_boto_handlers()
+        rate_limiter.configure(
+            self.config.get_cloud_api_rate_limiter_rates()
+        )
+
         executors = {
             'default': ThreadPoolExecutor(thread_pool_count)
         }
@@ -147,6 +182,48 @@ class ListenerService(MashService):
                 extra={'job_id': job_id}
             )
 
+    def _register_metrics(self, thread_pool_count):
+        """
+        Report job counts and thread pool usage when metrics are scraped.
+        """
+        service = self.service_exchange
+
+        def get_job_counts():
+            running = len(self.running_jobs)
+            scheduled = len(self.scheduled_jobs)
+            return {
+                (service, 'waiting'): max(len(self.jobs) - scheduled, 0),
+                (service, 'pending'): max(scheduled - running, 0),
+                (service, 'running'): running
+            }
+
+        service_jobs.set_function(get_job_counts)
+        thread_pool_workers.set(thread_pool_count, service=service)
+        thread_pool_busy.set_function(
+            lambda: {(service,): len(self.running_jobs)}
+        )
+
+    def _observe_job_metrics(self, job):
+        """
+        Record the run time and queue wait of the finished job.
+        """
+        if not job.start_time:
+            return
+
+        job_stage_duration.observe(
+            (datetime.utcnow() - job.start_time).total_seconds(),
+            service=self.service_exchange,
+            cloud=job.cloud,
+            status=job.status
+        )
+
+        if job.queued_time:
+            job_queue_wait.observe(
+                (job.start_time - job.queued_time).total_seconds(),
+                service=self.service_exchange,
+                cloud=job.cloud
+            )
+
     def _cleanup_job(self, job_id):
         """
         Job failed upstream.
@@ -159,7 +236,9 @@ class ListenerService(MashService):
         self._delete_job(job.id)
 
         message = self._get_status_message(job)
-        self._publish_message(message, job.id)
+
+        with tracer.activate(job.trace_context):
+            self._publish_message(message, job.id)
 
     def _delete_job(self, job_id):
         """
@@ -202,12 +281,17 @@ class ListenerService(MashService):
         """
         Build and return json message.
 
-        Message contains completion status to post to next service exchange.
+        Message contains completion status to post to next service exchange
+        and the timing and transfer metrics of the job in this service.
         """
         key = '{0}_result'.format(self.service_exchange)
+        status_msg = dict(job.get_status_message())
+        status_msg['stage_metrics'] = job.get_stage_metrics(
+            self.service_exchange
+        )
         return JsonFormat.json_message(
             {
-                key: job.get_status_message()
+                key: status_msg
             }
         )
 
@@ -229,6 +313,10 @@ class ListenerService(MashService):
             job = self.jobs[listener_msg['id']]
             job.listener_msg = message
             job.set_status_message(listener_msg)
+            job.queued_time = datetime.utcnow()
+            job.trace_context = tracer.extract(
+                message.properties.get('headers')
+            )
 
             if status == SUCCESS:
                 self._schedule_job(job.id)
@@ -262,6 +350,8 @@ class ListenerService(MashService):
         metadata = job.get_job_id()
 
         self._delete_job(job_id)
+        self.scheduled_jobs.discard(job_id)
+        self.running_jobs.discard(job_id)
 
         if event.exception:
             job.status = EXCEPTION
@@ -289,8 +379,13 @@ class ListenerService(MashService):
                 extra=metadata
             )
 
+        self._observe_job_metrics(job)
         message = self._get_status_message(job)
-        self._publish_message(message, job.id)
+
+        # Continue the trace of the job in the next service
+        with tracer.activate(job.trace_context):
+            self._publish_message(message, job.id)
+
         job.listener_msg.ack()
 
     def _process_job_missed(self, event):
@@ -335,6 +430,7 @@ class ListenerService(MashService):
                 misfire_grace_time=None,
                 coalesce=True
             )
+            self.scheduled_jobs.add(job_id)
         except ConflictingIdError:
             self.log.warning(
                 'Job already running. Received multiple '
@@ -346,6 +442,7 @@ class ListenerService(MashService):
         """
         Process job based on job id.
         """
+        self.running_jobs.add(job_id)
         job = self.jobs[job_id]
         job.process_job()
 
@@ -0,0 +1,89 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+from mash.services.base_config import BaseConfig
+from mash.services.logger.defaults import Defaults as LoggerDefaults
+
+
+class LoggerConfig(BaseConfig):
+    """
+    Implements reading of logger configuration from mash configuration file:
+
+    * /etc/mash/mash_config.yaml
+
+    The mash configuration file is a yaml formatted file containing
+    information to control the behavior of the mash services.
+    """
+    def __init__(self, config_file=None):
+        super(LoggerConfig, self).__init__(config_file)
+
+    def get_flush_interval(self):
+        """
+        Return the max time (in seconds) log records are buffered
+        before they are written to the job log files:
+
+        logger:
+          flush_interval: 1
+
+        if no configuration exists the flush interval from
+        the Defaults class is returned
+
+        :rtype: int
+        """
+        flush_interval = self._get_attribute(
+            attribute='flush_interval', element='logger'
+        )
+        return flush_interval if flush_interval else \
+            LoggerDefaults.get_flush_interval()
+
+    def get_batch_size(self):
+        """
+        Return the max number of log messages consumed before the
+        job log files are flushed and the messages acknowledged:
+
+        logger:
+          batch_size: 500
+
+        if no configuration exists the batch size from
+        the Defaults class is returned
+
+        :rtype: int
+        """
+        batch_size = self._get_attribute(
+            attribute='batch_size', element='logger'
+        )
+        return batch_size if batch_size else \
+            LoggerDefaults.get_batch_size()
+
+    def get_max_open_files(self):
+        """
+        Return the max number of job log files kept open:
+
+        logger:
+          max_open_files: 64
+
+        if no configuration exists the max open files from
+        the Defaults class is returned
+
+        :rtype: int
+        """
+        max_open_files = self._get_attribute(
+            attribute='max_open_files', element='logger'
+        )
+        return max_open_files if max_open_files else \
+            LoggerDefaults.get_max_open_files()
@@ -16,11 +16,30 @@
 # along with mash.  If not, see <http://www.gnu.org/licenses/>
 #
 
+import fcntl
 import json
+import os
+import time
+
+from collections import OrderedDict
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from pytz import utc
 
 from mash.mash_exceptions import MashLoggerException
 from mash.services.mash_service import MashService
+from mash.utils.job_log_store import JobLogStore
 from mash.utils.mash_utils import setup_logfile
+from mash.utils.metrics import registry
+
+records_written = registry.counter(
+    'mash_log_records_written_total',
+    'Log messages written and acknowledged by the logger.'
+)
+flush_duration = registry.histogram(
+    'mash_log_flush_duration_seconds',
+    'Time to write, sync and acknowledge a batch of log messages.'
+)
 
 
 class LoggerService(MashService):
@@ -28,6 +47,13 @@ class LoggerService(MashService):
     Implementation of logger service. Consumes logs from all
     services and persists to files based on job id.
 
+    Log records are buffered per job and written in batches. The
+    messages of a batch are acknowledged together once the job log
+    files are flushed to disk, so records are not lost if the service
+    stops before a write. Each job record is also added to the
+    structured job log store, the partitions of previous days are
+    compressed by a background job.
+
     * :attr:`custom_args`
     """
     def post_init(self, custom_args=None):
@@ -42,6 +68,18 @@ class LoggerService(MashService):
         )
         self.log.addHandler(logfile_handler)
 
+        self.flush_interval = self.config.get_flush_interval()
+        self.batch_size = self.config.get_batch_size()
+        self.max_open_files = self.config.get_max_open_files()
+
+        self.log_files = OrderedDict()
+        self.pending_records = {}
+        self.pending_store_records = []
+        self.log_store = JobLogStore(self.config.get_log_store_directory())
+        self.unacked_count = 0
+        self.last_delivery_tag = None
+        self.last_flush = time.monotonic()
+
         self.bind_queue(self.service_exchange, 'mash.logger', 'logging')
         self.start()
 
@@ -50,38 +88,192 @@ class LoggerService(MashService):
         Callback for logger queue.
 
         1. Attempt to de-serialize the log message.
-        2. Determine log file name based on job_id.
-        3. Write or append to log file.
+        2. Buffer the log record based on job_id.
+        3. Flush the buffered records once the batch is full.
         """
-        message.ack()
+        self.last_delivery_tag = message.delivery_tag
+        self.unacked_count += 1
 
         try:
             data = json.loads(message.body)
         except Exception:
+            self._flush()
             raise MashLoggerException(
                 'Could not de-serialize log message.'
             )
 
         if 'job_id' in data:
-            file_name = data.get('job_id')
-            log_file = self.config.get_job_log_file(file_name)
+            self.pending_records.setdefault(data['job_id'], []).append(
+                data['msg'].replace('Job[{0}]: '.format(data['job_id']), '')
+            )
+            self.pending_store_records.append({
+                'job_id': data['job_id'],
+                'service': self._get_service_name(data.get('name')),
+                'level': data.get('levelname'),
+                'timestamp': data.get('created') or time.time(),
+                'message': data.get('message', data['msg'])
+            })
+
+        if self.unacked_count >= self.batch_size:
+            self._flush()
+
+    @staticmethod
+    def _get_service_name(logger_name):
+        """
+        Return the service name from the logger name.
+
+        Example: Raw_Image_UploadService -> raw_image_upload
+        """
+        if not logger_name:
+            return None
+
+        if logger_name.endswith('Service'):
+            logger_name = logger_name[:-len('Service')]
+
+        return logger_name.lower()
+
+    def _get_log_file(self, job_id):
+        """
+        Return an open append handle for the job log file.
+
+        The handle is returned with a shared lock which has to be
+        released once the records are written. The cleanup service
+        renames a log file while holding an exclusive lock to archive
+        it, a handle that no longer refers to the log file is reopened
+        so late records start a new log file.
+
+        Handles are cached and the least recently used handle is
+        closed when more than max_open_files are open.
+        """
+        path = self.config.get_job_log_file(job_id)
+        log_file = self.log_files.pop(job_id, None)
+
+        while True:
+            if not log_file:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                log_file = open(path, 'a')
+
+            fcntl.flock(log_file, fcntl.LOCK_SH)
+
+            if self._is_log_file(log_file, path):
+                break
+
+            log_file.close()
+            log_file = None
 
+        self.log_files[job_id] = log_file
+
+        while len(self.log_files) > self.max_open_files:
+            _, expired_file = self.log_files.popitem(last=False)
+            expired_file.close()
+
+        return log_file
+
+    @staticmethod
+    def _is_log_file(log_file, path):
+        """
+        Check the handle still refers to the file at path.
+        """
+        try:
+            return os.path.samestat(
+                os.fstat(log_file.fileno()), os.stat(path)
+            )
+        except FileNotFoundError:
+            return False
+
+    def _close_log_file(self, job_id):
+        log_file = self.log_files.pop(job_id, None)
+
+        if log_file:
+            log_file.close()
+
+    def _close_log_files(self):
+        for job_id in list(self.log_files):
+            self._close_log_file(job_id)
+
+    def _flush(self):
+        """
+        Write the buffered records and acknowledge the batch.
+
+        The messages are only acknowledged after the job log files
+        are synced to disk.
+        """
+        start = time.monotonic()
+
+        for job_id, records in self.pending_records.items():
             try:
-                with open(log_file, 'a') as job_log:
-                    job_log.write(
-                        data['msg'].replace(
-                            'Job[{0}]: '.format(data['job_id']), ''
-                        )
-                    )
+                log_file = self._get_log_file(job_id)
+                log_file.write(''.join(records))
+                log_file.flush()
+                os.fsync(log_file.fileno())
+                fcntl.flock(log_file, fcntl.LOCK_UN)
             except Exception as e:
+                self._close_log_file(job_id)
                 raise MashLoggerException(
                     'Could not write to log file: {0}'.format(e)
                 )
 
+        self.pending_records = {}
+
+        try:
+            self.log_store.add_records(self.pending_store_records)
+        except Exception as e:
+            raise MashLoggerException(
+                'Could not write to log store: {0}'.format(e)
+            )
+
+        self.pending_store_records = []
+
+        if self.last_delivery_tag is not None:
+            self.channel.basic.ack(
+                delivery_tag=self.last_delivery_tag,
+                multiple=True
+            )
+
+        records_written.inc(self.unacked_count)
+        self.last_delivery_tag = None
+        self.unacked_count = 0
+        self.last_flush = time.monotonic()
+        flush_duration.observe(self.last_flush - start)
+
+    def _seal_log_store(self):
+        """
+        Compress the log store partitions of previous days.
+
+        This runs every hour outside of the flush path, partitions
+        that failed to compress are retried on the next run.
+        """
+        try:
+            self.log_store.seal_partitions()
+        except Exception as e:
+            self.log.warning(
+                'Could not compress log store partitions: {0}'.format(e)
+            )
+
+    def _consume(self):
+        """
+        Consume log messages and flush at least every flush_interval.
+        """
+        while not self.channel.is_closed and self.channel.consumer_tags:
+            self.channel.process_data_events()
+
+            flush_due = time.monotonic() - self.last_flush \
+                >= self.flush_interval
+
+            if self.unacked_count and flush_due:
+                self._flush()
+
     def start(self):
         """
         Start logger service.
+
+        The prefetch count limits unacknowledged messages to a
+        single batch.
         """
+        self.channel.basic.qos(prefetch_count=self.batch_size)
+        self.scheduler = BackgroundScheduler(timezone=utc)
+        self.scheduler.add_job(self._seal_log_store, 'cron', minute='5')
+        self.scheduler.start()
         self.consume_queue(
             self._process_log,
             'logging',
@@ -89,10 +281,13 @@ class LoggerService(MashService):
         )
 
         try:
-            self.channel.start_consuming()
+            self._consume()
         except KeyboardInterrupt:
             pass
         except Exception:
             raise
         finally:
+            self.scheduler.shutdown()
+            self._close_log_files()
+            self.log_store.close()
             self.close_connection()
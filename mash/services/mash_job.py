@@ -17,10 +17,23 @@
 #
 
 import logging
+import os
+
+from datetime import datetime
 
 from mash.mash_exceptions import MashJobException
 from mash.services.status_levels import UNKOWN
+from mash.utils.cloud_api import CloudApiProfiler, profile_api_calls
+from mash.utils.concurrency import TaskExecutor
 from mash.utils.mash_utils import handle_request
+from mash.utils.metrics import registry
+from mash.utils.tracing import get_job_trace_id, tracer
+
+transfer_bytes = registry.counter(
+    'mash_transfer_bytes_total',
+    'Image bytes downloaded or uploaded.',
+    ('direction', 'cloud')
+)
 
 
 class MashJob(object):
@@ -39,6 +52,17 @@ class MashJob(object):
         self.config = config
         self.status_msg = {'status': UNKOWN, 'errors': []}
 
+        # Stage metrics
+        self.queued_time = None
+        self.start_time = None
+        self.bytes_transferred = 0
+        self.task_metrics = []
+
+        # Span context of the previous stage, replaced by the
+        # context of this stage once the job is processed.
+        self.trace_context = None
+        self.api_profiler = None
+
         try:
             self.id = job_config['id']
             self.last_service = job_config['last_service']
@@ -108,7 +132,95 @@ class MashJob(object):
         self.log_callback.extra = {
             'job_id': self.id
         }
-        self.run_job()
+        self.start_time = datetime.utcnow()
+        self.api_profiler = CloudApiProfiler(
+            log_callback=self.log_callback,
+            rate_limits=self.config.get_cloud_api_rate_limits()
+        )
+
+        with tracer.span(
+            'process_job',
+            parent=self.trace_context,
+            trace_id=get_job_trace_id(self.id),
+            attributes={
+                'mash.job_id': self.id,
+                'mash.cloud': self.cloud,
+                'mash.job_class': type(self).__name__
+            }
+        ) as span:
+            self.trace_context = span.context
+
+            # Single account jobs attribute all API calls to the account
+            with profile_api_calls(
+                self.api_profiler,
+                getattr(self, 'account', None),
+                self.requesting_user
+            ):
+                self.run_job()
+
+            span.set_attribute('mash.status', self.status)
+
+    def get_task_executor(self):
+        """
+        Return an executor for tasks of the job that run in parallel.
+        """
+        return TaskExecutor(
+            max_workers=self.config.get_job_thread_pool_count(),
+            max_account_workers=self.config.get_account_thread_pool_count()
+        )
+
+    def run_tasks(self, executor):
+        """
+        Run the tasks of the executor and add their timing to the metrics.
+
+        Return the results of the tasks in the order submitted.
+        """
+        results = executor.run()
+        self.task_metrics.extend(result.to_dict() for result in results)
+        return results
+
+    def add_bytes_transferred(self, file_name):
+        """
+        Add the size of the transferred file to the stage metrics.
+
+        The metrics are informational and a file that cannot be
+        found does not fail the job.
+        """
+        try:
+            size = os.path.getsize(file_name)
+        except OSError:
+            return
+
+        self.bytes_transferred += size
+        transfer_bytes.inc(size, direction='upload', cloud=self.cloud)
+
+    def get_stage_metrics(self, service):
+        """
+        Return the timing, transfer and API call metrics of the job.
+
+        Jobs that run tasks in parallel add the timing of each task.
+
+        The job is finished in the service when the metrics are
+        requested. If the job was never run in the service the
+        start time is None.
+        """
+        metrics = {
+            'service': service,
+            'cloud': self.cloud,
+            'finish_time': datetime.utcnow().isoformat(),
+            'bytes_transferred': self.bytes_transferred,
+            'api_calls': None,
+            'tasks': self.task_metrics
+        }
+
+        if self.api_profiler:
+            metrics['api_calls'] = self.api_profiler.get_summary()
+
+        for key in ('queued_time', 'start_time'):
+            value = getattr(self, key)
+            metrics[key] = value.isoformat() if value else None
+
+        return metrics
 
     @property
     def cloud_image_name(self):
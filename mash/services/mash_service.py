@@ -23,7 +23,31 @@ from amqpstorm import Connection
 # project
 from mash.log.filter import BaseServiceFilter
 from mash.mash_exceptions import MashRabbitConnectionException
+from mash.utils.bandwidth import bandwidth_scheduler
 from mash.utils.mash_utils import setup_rabbitmq_log_handler
+from mash.utils.metrics import registry, start_metrics_server
+from mash.utils.tracing import FileSpanExporter, tracer
+
+messages_consumed = registry.counter(
+    'mash_messages_consumed_total',
+    'Messages delivered to the service from a queue.',
+    ('service', 'queue')
+)
+service_jobs = registry.gauge(
+    'mash_jobs',
+    'Jobs in the service by state.',
+    ('service', 'state')
+)
+log_handler_records = registry.gauge(
+    'mash_log_handler_records',
+    'Records handled by the log handler by state since start.',
+    ('state',)
+)
+log_handler_latency = registry.gauge(
+    'mash_log_handler_latency_seconds',
+    'Time between a log record being emitted and published.',
+    ('stat',)
+)
 
 
 class MashService(object):
@@ -68,8 +92,67 @@ class MashService(object):
         self.log.addHandler(rabbit_handler)
         self.log.addFilter(BaseServiceFilter())
 
+        self.metrics_server = None
+        self._start_metrics_server(rabbit_handler)
+
+        self._configure_tracing()
+        bandwidth_scheduler.configure(
+            **self.config.get_bandwidth_scheduler()
+        )
+
         self.post_init()
 
+    def _configure_tracing(self):
+        """
+        Export the trace spans of the process if tracing is enabled.
+        """
+        if not self.config.get_tracing_enabled():
+            return
+
+        tracer.configure(
+            FileSpanExporter(
+                self.config.get_trace_directory(),
+                self.service_exchange
+            )
+        )
+
+    def _start_metrics_server(self, rabbit_handler):
+        """
+        Serve the process metrics if a port is configured for the service.
+
+        Metrics are not required to run the service, if the port
+        is in use a warning is logged and the service continues.
+        """
+        log_handler_records.set_function(
+            lambda: {
+                (state,): value
+                for state, value in rabbit_handler.get_stats().items()
+                if not state.endswith('latency')
+            }
+        )
+        log_handler_latency.set_function(
+            lambda: {
+                (stat.split('_')[0],): value
+                for stat, value in rabbit_handler.get_stats().items()
+                if stat.endswith('latency')
+            }
+        )
+
+        port = self.config.get_metrics_port(self.service_exchange)
+
+        if not port:
+            return
+
+        try:
+            self.metrics_server = start_metrics_server(
+                port,
+                host=self.config.get_metrics_host()
+            )
+        except OSError as error:
+            self.log.warning(
+                'Metrics server failed to start: {0}'.format(error)
+            )
+
     def post_init(self):
         """
         Post initialization method
@@ -126,6 +209,23 @@ class MashService(object):
             self.channel = self.connection.channel()
             self.channel.confirm_deliveries()
 
+    def _get_message_properties(self):
+        """
+        Return the properties of a persistent json message.
+
+        The active trace context is propagated in the message headers.
+        """
+        properties = {
+            'content_type': 'application/json',
+            'delivery_mode': 2
+        }
+
+        headers = tracer.inject()
+        if headers:
+            properties['headers'] = headers
+
+        return properties
+
     def _publish(self, exchange, routing_key, message):
         """
         Publish message to the provided exchange with the routing key.
@@ -134,13 +234,38 @@ class MashService(object):
             body=message,
             routing_key=routing_key,
             exchange=exchange,
-            properties={
-                'content_type': 'application/json',
-                'delivery_mode': 2
-            },
+            properties=self._get_message_properties(),
             mandatory=True
         )
 
+    def _publish_batch(self, exchange, routing_key, messages):
+        """
+        Publish a batch of messages with a single broker confirmation.
+
+        The service channel confirms every message individually. The
+        batch is instead published on a transactional channel and
+        committed once, either all messages are accepted or none are.
+        """
+        self._open_connection()
+        batch_channel = self.connection.channel()
+        properties = self._get_message_properties()
+
+        try:
+            batch_channel.tx.select()
+
+            for message in messages:
+                batch_channel.basic.publish(
+                    body=message,
+                    routing_key=routing_key,
+                    exchange=exchange,
+                    properties=properties,
+                    mandatory=True
+                )
+
+            batch_channel.tx.commit()
+        finally:
+            batch_channel.close()
+
     def bind_queue(self, exchange, routing_key, name):
         """
         Bind queue on exchange to the provided routing key.
@@ -172,8 +297,13 @@ class MashService(object):
         """
         queue = self._get_queue_name(exchange, queue_name)
         self._declare_queue(queue)
+
+        def count_message(message):
+            messages_consumed.inc(service=self.service_exchange, queue=queue)
+            return callback(message)
+
         self.channel.basic.consume(
-            callback=callback, queue=queue
+            callback=count_message, queue=queue
         )
 
     def unbind_queue(self, queue, exchange, routing_key):
@@ -28,6 +28,10 @@ from obs_img_utils.api import OBSImageUtil
 
 # project
 from mash.services.base_defaults import Defaults
+from mash.services.mash_job import transfer_bytes
+from mash.utils.bandwidth import DOWNLOAD, bandwidth_scheduler
+from mash.utils.mash_utils import get_image_digest
+from mash.utils.tracing import get_job_trace_id, tracer
 
 
 class OBSImageBuildResult(object):
@@ -123,6 +127,17 @@ class OBSImageBuildResult(object):
         )
         self.errors = []
 
+        # Stage metrics
+        self.queued_time = None
+        self.start_time = None
+        self.bytes_transferred = 0
+
+        # Content digest of the downloaded image
+        self.image_digest = None
+
+        # Span context of the job document message
+        self.trace_context = None
+
         # How often to update log callback with download progress.
         # 25 updates every 25%. I.e. 25, 50, 75, 100.
         self.download_progress_percent = 25
@@ -167,6 +182,9 @@ class OBSImageBuildResult(object):
         if isotime:
             job_time = datetime.strptime(isotime[:19], '%Y-%m-%dT%H:%M:%S')
 
+        # The job waits in the queue from the requested start time
+        self.queued_time = max(filter(None, [job_time, datetime.utcnow()]))
+
         self.scheduler = BackgroundScheduler(timezone=utc)
 
         self.job = self.scheduler.add_job(
@@ -210,10 +228,30 @@ class OBSImageBuildResult(object):
                         'last_service': self.last_service,
                         'build_time':
                             self.downloader.build_time,
+                        'image_digest': self.image_digest,
+                        'download_url': self.download_url,
+                        'stage_metrics': self._get_stage_metrics()
                     }
                 }
             )
 
+    def _get_stage_metrics(self):
+        """
+        Return the timing and transfer metrics of the image download.
+        """
+        metrics = {
+            'service': 'obs',
+            'cloud': None,
+            'finish_time': datetime.utcnow().isoformat(),
+            'bytes_transferred': self.bytes_transferred
+        }
+
+        for key in ('queued_time', 'start_time'):
+            value = getattr(self, key)
+            metrics[key] = value.isoformat() if value else None
+
+        return metrics
+
     def _job_submit_event(self, event):
         self.log_callback.info('Oneshot Job submitted')
 
@@ -224,15 +262,52 @@ class OBSImageBuildResult(object):
         pass
 
     def _update_image_status(self):
+        with tracer.span(
+            'process_job',
+            parent=self.trace_context,
+            trace_id=get_job_trace_id(self.job_id),
+            attributes={'mash.job_id': self.job_id}
+        ) as span:
+            self._run_image_update()
+            span.set_attribute('mash.status', self.job_status)
+
+    def _run_image_update(self):
         self.log_callback.extra = {
             'job_id': self.job_id
         }
         self.log_callback.info('Job running')
+        self.start_time = datetime.utcnow()
 
         try:
             # Force parse of metadata file to get build time
             self.downloader.packages
-            image_source = self.downloader.get_image()
+
+            with tracer.span(
+                'download',
+                attributes={'mash.download_url': self.download_url}
+            ) as span:
+                image_source = self.downloader.get_image()
+
+                try:
+                    self.bytes_transferred = os.path.getsize(image_source)
+                except OSError:
+                    # Metrics are informational, do not fail the job
+                    pass
+                else:
+                    transfer_bytes.inc(
+                        self.bytes_transferred,
+                        direction='download',
+                        cloud=''
+                    )
+
+                span.set_attribute('mash.bytes', self.bytes_transferred)
+
+                # The checksum validated by the download is the sha256
+                # digest of the image, it is only computed here if the
+                # validation was skipped.
+                self.image_digest = self.downloader.image_checksum or \
+                    get_image_digest(image_source)
+
             self.log_callback.info(
                 'Downloaded: {0}'.format(image_source)
             )
@@ -264,10 +339,18 @@ class OBSImageBuildResult(object):
     def progress_callback(self, block_num, read_size, total_size, done=False):
         """
         Update progress in log callback
+
+        Downloaded blocks are drawn from the bandwidth scheduler,
+        the download pauses while the scheduler holds the callback.
         """
         if done:
             self.log_callback.info('Image download finished.')
         else:
+            if block_num:
+                bandwidth_scheduler.request(
+                    read_size, self.job_id, DOWNLOAD
+                )
+
             percent = int(((block_num * read_size) / total_size) * 100)
 
             if percent % self.download_progress_percent == 0 \
@@ -20,10 +20,11 @@ import os
 import dateutil.parser
 
 # project
-from mash.services.mash_service import MashService
+from mash.services.mash_service import MashService, service_jobs
 from mash.services.obs.build_result import OBSImageBuildResult
 from mash.utils.json_format import JsonFormat
 from mash.utils.mash_utils import persist_json, restart_jobs, setup_logfile
+from mash.utils.tracing import tracer
 
 
 class OBSImageBuildResultService(MashService):
@@ -46,6 +47,9 @@ class OBSImageBuildResultService(MashService):
         self.download_directory = self.config.get_download_directory()
 
         self.jobs = {}
+        service_jobs.set_function(
+            lambda: {(self.service_exchange, 'running'): len(self.jobs)}
+        )
 
         # setup service job directory
         self.job_directory = self.config.get_job_directory(
@@ -112,7 +116,10 @@ class OBSImageBuildResultService(MashService):
                 }
             )
         if message.method['routing_key'] == 'job_document':
-            self._handle_jobs(job_data)
+            with tracer.activate(
+                tracer.extract(message.properties.get('headers'))
+            ):
+                self._handle_jobs(job_data)
 
         message.ack()
 
@@ -247,6 +254,7 @@ class OBSImageBuildResultService(MashService):
 
         job_worker = OBSImageBuildResult(**kwargs)
         job_worker.set_result_handler(self._send_job_result_for_upload)
+        job_worker.trace_context = tracer.get_current_context()
         job_worker.start_watchdog(isotime=time)
         self.jobs[job_id] = job_worker
         return {
@@ -0,0 +1,69 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+from mash.services.base_config import BaseConfig
+from mash.services.outbox.defaults import Defaults as OutboxDefaults
+
+
+class OutboxConfig(BaseConfig):
+    """
+    Implements reading of outbox configuration from mash configuration file:
+
+    * /etc/mash/mash_config.yaml
+
+    The mash configuration file is a yaml formatted file containing
+    information to control the behavior of the mash services.
+    """
+    def __init__(self, config_file=None):
+        super(OutboxConfig, self).__init__(config_file)
+
+    def get_relay_interval(self):
+        """
+        Return the interval (in seconds) between outbox relay runs:
+
+        outbox:
+          relay_interval: 2
+
+        if no configuration exists the relay interval from
+        the Defaults class is returned
+
+        :rtype: int
+        """
+        relay_interval = self._get_attribute(
+            attribute='relay_interval', element='outbox'
+        )
+        return relay_interval if relay_interval else \
+            OutboxDefaults.get_relay_interval()
+
+    def get_relay_batch_size(self):
+        """
+        Return the max number of messages published in one batch:
+
+        outbox:
+          relay_batch_size: 100
+
+        if no configuration exists the relay batch size from
+        the Defaults class is returned
+
+        :rtype: int
+        """
+        relay_batch_size = self._get_attribute(
+            attribute='relay_batch_size', element='outbox'
+        )
+        return relay_batch_size if relay_batch_size else \
+            OutboxDefaults.get_relay_batch_size()
@@ -0,0 +1,126 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+from apscheduler.schedulers.background import BlockingScheduler
+from pytz import utc
+
+from mash.services.mash_service import MashService
+from mash.utils.mash_utils import handle_request, setup_logfile
+
+
+class OutboxService(MashService):
+    """
+    Implementation of outbox service.
+
+    Relays job documents stored in the database job outbox to the
+    job creator. Jobs and their documents are committed together
+    by the database service so no job is created without a document
+    being published.
+    """
+    def post_init(self):
+        """
+        Initialize outbox class.
+        """
+        logfile_handler = setup_logfile(
+            self.config.get_log_file(self.service_exchange)
+        )
+        self.log.addHandler(logfile_handler)
+
+        self.job_creator_exchange = 'jobcreator'
+        self.job_document_key = 'job_document'
+        self.database_api_url = self.config.get_database_api_url()
+        self.relay_interval = self.config.get_relay_interval()
+        self.relay_batch_size = self.config.get_relay_batch_size()
+
+        self._declare_direct_exchange(self.job_creator_exchange)
+        self.start()
+
+    def start(self):
+        self.scheduler = BlockingScheduler(timezone=utc)
+
+        self.scheduler.add_job(
+            self._relay_messages,
+            'interval',
+            seconds=self.relay_interval,
+            max_instances=1,
+            coalesce=True
+        )
+        self.scheduler.start()
+
+    def _relay_messages(self):
+        """
+        Publish pending outbox messages to the job creator.
+
+        Messages are published in batches until the outbox is empty.
+        A batch is only removed from the outbox after the broker
+        confirms it. If the removal fails the batch is published
+        again on the next run.
+        """
+        while True:
+            try:
+                response = handle_request(
+                    self.database_api_url,
+                    'jobs/outbox',
+                    'get',
+                    job_data={'limit': self.relay_batch_size}
+                )
+                messages = response.json()
+            except Exception as error:
+                self.log.error(
+                    'Unable to retrieve outbox messages: {0}'.format(error)
+                )
+                return
+
+            if not messages:
+                return
+
+            try:
+                self._publish_batch(
+                    self.job_creator_exchange,
+                    self.job_document_key,
+                    [message['message'] for message in messages]
+                )
+            except Exception as error:
+                self.log.error(
+                    'Unable to publish outbox messages: {0}'.format(error)
+                )
+                return
+
+            try:
+                handle_request(
+                    self.database_api_url,
+                    'jobs/outbox',
+                    'delete',
+                    job_data={
+                        'ids': [message['id'] for message in messages]
+                    }
+                )
+            except Exception as error:
+                self.log.error(
+                    'Unable to delete outbox messages: {0}'.format(error)
+                )
+                return
+
+            for message in messages:
+                self.log.info(
+                    'Job document sent to job creator.',
+                    extra={'job_id': message['job_id']}
+                )
+
+            if len(messages) < self.relay_batch_size:
+                return
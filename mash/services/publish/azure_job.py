@@ -16,11 +16,10 @@
 # along with mash.  If not, see <http://www.gnu.org/licenses/>
 #
 
-from azure_img_utils.azure_image import AzureImage
-
 from mash.mash_exceptions import MashPublishException
 from mash.services.mash_job import MashJob
 from mash.services.status_levels import FAILED, SUCCESS
+from mash.utils.azure import AzureImage
 
 
 class AzurePublishJob(MashJob):
@@ -47,7 +47,7 @@ class EC2PublishJob(MashJob):
 
     def run_job(self):
         """
-        Publish image and update status.
+        Publish image in all target regions in parallel and update status.
         """
         self.status = SUCCESS
 
@@ -59,25 +59,46 @@ class EC2PublishJob(MashJob):
         self.request_credentials(accounts)
         self.cloud_image_name = self.status_msg['cloud_image_name']
 
+        executor = self.get_task_executor()
         for region_info in self.publish_regions:
-            creds = self.credentials[region_info['account']]
+            for region in region_info['target_regions']:
+                executor.submit(
+                    region,
+                    self._publish_image,
+                    region,
+                    self.credentials[region_info['account']],
+                    account=region_info['account']
+                )
 
-            publish = EC2PublishImage(
-                access_key=creds['access_key_id'],
-                allow_copy=self.allow_copy,
-                image_name=self.cloud_image_name,
-                secret_key=creds['secret_access_key'],
-                visibility=self.share_with,
-                log_callback=self.log_callback
-            )
+        errors = [
+            str(result.error) for result in self.run_tasks(executor)
+            if result.error
+        ]
 
-            for region in region_info['target_regions']:
-                publish.set_region(region)
-                try:
-                    publish.publish_images()
-                except Exception as error:
-                    raise MashPublishException(
-                        'An error publishing image {0} in {1}. {2}'.format(
-                            self.cloud_image_name, region, error
-                        )
-                    )
+        if errors:
+            raise MashPublishException(' '.join(errors))
+
+    def _publish_image(self, region, creds):
+        """
+        Publish image in the region.
+
+        Each region uses its own client as regions run in parallel.
+        """
+        publish = EC2PublishImage(
+            access_key=creds['access_key_id'],
+            allow_copy=self.allow_copy,
+            image_name=self.cloud_image_name,
+            secret_key=creds['secret_access_key'],
+            visibility=self.share_with,
+            log_callback=self.log_callback
+        )
+        publish.set_region(region)
+
+        try:
+            publish.publish_images()
+        except Exception as error:
+            raise MashPublishException(
+                'An error publishing image {0} in {1}. {2}'.format(
+                    self.cloud_image_name, region, error
+                )
+            )
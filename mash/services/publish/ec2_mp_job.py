@@ -23,6 +23,7 @@ from ec2imgutils.ec2publishimg import EC2PublishImage
 from mash.mash_exceptions import MashPublishException
 from mash.services.mash_job import MashJob
 from mash.services.status_levels import SUCCESS
+from mash.utils.cloud_api import api_account
 from mash.utils.ec2 import get_client, start_mp_change_set
 from mash.utils.mash_utils import format_string_with_date
 
@@ -79,39 +80,41 @@ class EC2MPPublishJob(MashJob):
             creds = self.credentials[account]
             ami_id = self.status_msg['source_regions'][region]
 
-            self.share_image(
-                region,
-                creds['access_key_id'],
-                creds['secret_access_key']
-            )
+            # API calls are rate limited per account
+            with api_account(account):
+                self.share_image(
+                    region,
+                    creds['access_key_id'],
+                    creds['secret_access_key']
+                )
 
-            client = get_client(
-                'marketplace-catalog',
-                creds['access_key_id'],
-                creds['secret_access_key'],
-                region
-            )
+                client = get_client(
+                    'marketplace-catalog',
+                    creds['access_key_id'],
+                    creds['secret_access_key'],
+                    region
+                )
 
-            response = start_mp_change_set(
-                client,
-                self.entity_id,
-                self.version_title,
-                ami_id,
-                self.access_role_arn,
-                self.release_notes,
-                self.os_name,
-                self.os_version,
-                self.usage_instructions,
-                self.recommended_instance_type,
-                self.ssh_user
-            )
-            self.status_msg['change_set_id'] = response.get('ChangeSetId')
-            self.log_callback.info(
-                'Marketplace change set submitted. Change set id: '
-                '{change_set}'.format(
-                    change_set=self.status_msg['change_set_id']
+                response = start_mp_change_set(
+                    client,
+                    self.entity_id,
+                    self.version_title,
+                    ami_id,
+                    self.access_role_arn,
+                    self.release_notes,
+                    self.os_name,
+                    self.os_version,
+                    self.usage_instructions,
+                    self.recommended_instance_type,
+                    self.ssh_user
+                )
+                self.status_msg['change_set_id'] = response.get('ChangeSetId')
+                self.log_callback.info(
+                    'Marketplace change set submitted. Change set id: '
+                    '{change_set}'.format(
+                        change_set=self.status_msg['change_set_id']
+                    )
                 )
-            )
 
     def share_image(self, region, access_key_id, secret_access_key):
         publish = EC2PublishImage(
@@ -16,13 +16,12 @@
 # along with mash.  If not, see <http://www.gnu.org/licenses/>
 #
 
-import time
-
 from aliyun_img_utils.aliyun_image import AliyunImage
 
 from mash.mash_exceptions import MashReplicateException
 from mash.services.mash_job import MashJob
 from mash.services.status_levels import FAILED, SUCCESS
+from mash.utils.aliyun import ImageReplicationTracker
 
 
 class AliyunReplicateJob(MashJob):
@@ -69,26 +68,40 @@ class AliyunReplicateJob(MashJob):
         )
 
         images = aliyun_image.replicate_image(self.cloud_image_name)
-
-        # Replication can take time so give it 5 minutes before checking
-        time.sleep(300)
+        copies = {}
 
         for region, image_id in images.items():
             if image_id:
-                aliyun_image.region = region
-                try:
-                    aliyun_image.wait_on_compute_image(image_id)
-                except Exception as error:
-                    self.log_failure(region, str(error))
+                copies[region] = image_id
             else:
                 self.log_failure(region, 'Image ID is None')
 
+        # Wait for the copies in all regions at once, regions
+        # are reported as soon as their image is ready.
+        tracker = ImageReplicationTracker(
+            credentials['access_key'],
+            credentials['access_secret'],
+            copies
+        )
+        tracker.track(self._replication_finished)
+
         # Merge region to image id hash
         self.status_msg['source_regions'] = {
             **self.status_msg['source_regions'],
             **images
         }
 
+    def _replication_finished(self, region, image_id, error):
+        """
+        Report a region as soon as the replicated image is ready.
+        """
+        if error:
+            self.log_failure(region, error)
+        else:
+            self.log_callback.info(
+                'Image {0} available in {1}.'.format(image_id, region)
+            )
+
     def log_failure(self, region, message):
         """
         Convenience method to log failure and mark status FAILED
@@ -24,6 +24,7 @@ from collections import defaultdict
 from mash.mash_exceptions import MashReplicateException
 from mash.services.mash_job import MashJob
 from mash.services.status_levels import FAILED, SUCCESS
+from mash.utils.cloud_api import api_account
 from mash.utils.ec2 import get_client, describe_images
 
 
@@ -75,26 +76,31 @@ class EC2ReplicateJob(MashJob):
                 )
             )
 
-            for target_region in reg_info['target_regions']:
-                if source_region != target_region:
-                    # Replicate image to all target regions
-                    # for each source region
-                    image_id = self._replicate_to_region(
-                        credential,
-                        self.status_msg['source_regions'][source_region],
-                        source_region,
-                        target_region
-                    )
-
-                    self.status_msg['source_regions'][target_region] = \
-                        image_id
-                    self.source_region_results[target_region]['image_id'] = \
-                        image_id
-
-                    # Save account along with results to prevent searching dict
-                    # twice to find associated credentials on each waiter.
-                    self.source_region_results[target_region]['account'] = \
-                        credential
+            # API calls are rate limited per account
+            with api_account(reg_info['account']):
+                for target_region in reg_info['target_regions']:
+                    if source_region != target_region:
+                        # Replicate image to all target regions
+                        # for each source region
+                        image_id = self._replicate_to_region(
+                            credential,
+                            self.status_msg['source_regions'][source_region],
+                            source_region,
+                            target_region
+                        )
+
+                        self.status_msg['source_regions'][target_region] = \
+                            image_id
+                        self.source_region_results[target_region]['image_id'] = \
+                            image_id
+
+                        # Save account along with results to prevent searching dict
+                        # twice to find associated credentials on each waiter.
+                        self.source_region_results[target_region]['account'] = \
+                            credential
+                        self.source_region_results[target_region][
+                            'account_name'
+                        ] = reg_info['account']
 
         if self.source_region_results:
             # Wait for images to replicate, this will take time.
@@ -106,12 +112,13 @@ class EC2ReplicateJob(MashJob):
 
             if reg_info['image_id']:
                 try:
-                    self._wait_on_image(
-                        credential['access_key_id'],
-                        credential['secret_access_key'],
-                        reg_info['image_id'],
-                        target_region
-                    )
+                    with api_account(reg_info['account_name']):
+                        self._wait_on_image(
+                            credential['access_key_id'],
+                            credential['secret_access_key'],
+                            reg_info['image_id'],
+                            target_region
+                        )
                 except Exception as error:
                     self.status = FAILED
                     msg = 'Replicate to {0} region failed: {1}'.format(
@@ -21,13 +21,12 @@ import os
 import random
 import traceback
 
-from azure_img_utils.azure_image import AzureImage
-
 from mash.mash_exceptions import MashTestException
 from mash.services.mash_job import MashJob
 from mash.services.status_levels import EXCEPTION, SUCCESS
 from mash.services.test.utils import process_test_result
 from mash.utils.mash_utils import create_ssh_key_pair, create_json_file
+from mash.utils.azure import AzureImage
 from img_proof.ipa_controller import test_image
 
 instance_types = {
@@ -108,47 +107,49 @@ class AzureSIGTestJob(MashJob):
         credentials = self.credentials[self.account]
         self.image_version = self.status_msg['image_version']
 
+        images = self.status_msg['images']
+        self.status_msg.pop('test_results', None)
+
+        # Gallery images are tested at the same time, the number of
+        # test instances is limited per subscription.
         with create_json_file(credentials) as auth_file:
-            for image_definition in self.status_msg['images']:
-                try:
-                    exit_status, result = test_image(
-                        'azure',
-                        cleanup=True,
-                        description=self.description,
-                        distro=self.distro,
-                        image_id=image_definition,
-                        instance_type=self.instance_type,
-                        img_proof_timeout=self.img_proof_timeout,
-                        log_level=logging.DEBUG,
-                        region=self.region,
-                        service_account_file=auth_file,
-                        ssh_private_key_file=self.ssh_private_key_file,
-                        ssh_user=self.ssh_user,
-                        tests=self.tests,
-                        log_callback=self.log_callback,
-                        prefix_name='mash',
-                        gallery_name=self.gallery_name,
-                        gallery_resource_group=self.gallery_resource_group,
-                        image_version=self.image_version
-                    )
-                except Exception as error:
-                    self.add_error_msg(str(error))
-                    exit_status = 1
-                    result = {
-                        'status': EXCEPTION,
-                        'msg': str(traceback.format_exc())
-                    }
-
-                self.status = process_test_result(
-                    exit_status,
-                    result,
-                    self.log_callback,
-                    self.region,
-                    self.status_msg
+            executor = self.get_task_executor()
+            for image_definition in images:
+                executor.submit(
+                    image_definition,
+                    self._test_image,
+                    image_definition,
+                    auth_file,
+                    executor,
+                    account=credentials.get('subscriptionId', self.account)
                 )
 
-                if self.status != SUCCESS:
-                    break
+            results = self.run_tasks(executor)
+
+        for image_definition, task in zip(images, results):
+            if task.cancelled:
+                self.log_callback.info(
+                    'Skipped testing image {0}, another image '
+                    'failed.'.format(image_definition)
+                )
+                continue
+
+            exit_status, result, error = task.result
+
+            if error:
+                self.add_error_msg(error)
+
+            status = process_test_result(
+                exit_status,
+                result,
+                self.log_callback,
+                self.region,
+                self.status_msg,
+                variant=image_definition
+            )
+
+            if status != SUCCESS:
+                self.status = status
 
         if self.status != SUCCESS:
             self.add_error_msg(
@@ -161,6 +162,50 @@ class AzureSIGTestJob(MashJob):
                 (self.status != SUCCESS and self.cleanup_images is not False):
             self.cleanup_all_images()
 
+    def _test_image(self, image_definition, auth_file, executor):
+        """
+        Test the gallery image version with img-proof.
+
+        A failed test cancels the tests of images that have not
+        started. Return the exit status and result of the test and
+        an error message if the test raised an exception.
+        """
+        error_msg = None
+
+        try:
+            exit_status, result = test_image(
+                'azure',
+                cleanup=True,
+                description=self.description,
+                distro=self.distro,
+                image_id=image_definition,
+                instance_type=self.instance_type,
+                img_proof_timeout=self.img_proof_timeout,
+                log_level=logging.DEBUG,
+                region=self.region,
+                service_account_file=auth_file,
+                ssh_private_key_file=self.ssh_private_key_file,
+                ssh_user=self.ssh_user,
+                tests=self.tests,
+                log_callback=self.log_callback,
+                prefix_name='mash',
+                gallery_name=self.gallery_name,
+                gallery_resource_group=self.gallery_resource_group,
+                image_version=self.image_version
+            )
+        except Exception as error:
+            error_msg = str(error)
+            exit_status = 1
+            result = {
+                'status': EXCEPTION,
+                'msg': str(traceback.format_exc())
+            }
+
+        if exit_status != 0:
+            executor.cancel()
+
+        return exit_status, result, error_msg
+
     def cleanup_all_images(self):
         credentials = self.credentials[self.account]
         blob_name = self.status_msg['blob_name']
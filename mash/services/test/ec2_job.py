@@ -28,6 +28,7 @@ from mash.services.test.utils import (
     get_testing_account,
     process_test_result
 )
+from mash.utils.cloud_api import api_account
 from mash.utils.mash_utils import create_ssh_key_pair
 from mash.utils.ec2 import (
     setup_ec2_networking,
@@ -120,7 +121,8 @@ class EC2TestJob(MashJob):
                 # There are no aarch64 based instance types available.
                 continue
 
-            with setup_ec2_networking(
+            # API calls are rate limited per account
+            with api_account(account), setup_ec2_networking(
                 credentials['access_key_id'],
                 region,
                 credentials['secret_access_key'],
@@ -189,10 +191,11 @@ class EC2TestJob(MashJob):
             for region, info in self.test_regions.items():
                 credentials = self.credentials[info['account']]
 
-                cleanup_ec2_image(
-                    credentials['access_key_id'],
-                    credentials['secret_access_key'],
-                    self.log_callback,
-                    region,
-                    image_id=self.status_msg['source_regions'][region]
-                )
+                with api_account(info['account']):
+                    cleanup_ec2_image(
+                        credentials['access_key_id'],
+                        credentials['secret_access_key'],
+                        self.log_callback,
+                        region,
+                        image_id=self.status_msg['source_regions'][region]
+                    )
@@ -23,7 +23,7 @@ import traceback
 
 from mash.mash_exceptions import MashTestException
 from mash.services.mash_job import MashJob
-from mash.services.status_levels import EXCEPTION, SUCCESS
+from mash.services.status_levels import EXCEPTION, FAILED, SUCCESS
 from mash.services.test.utils import process_test_result
 from mash.utils.mash_utils import create_ssh_key_pair, create_json_file
 from mash.utils.gce import (
@@ -133,90 +133,154 @@ class GCETestJob(MashJob):
         fallback_regions.add(self.region)
 
         self.cloud_image_name = self.status_msg['cloud_image_name']
+        self.status_msg.pop('test_results', None)
+        zones = self._get_variant_zones(fallback_regions)
 
+        # Each boot firmware variant runs in its own instance, the
+        # variants are tested at the same time in different zones.
         with create_json_file(credentials) as auth_file:
-            for firmware in self.boot_firmware:
-                self.log_callback.info(
-                    'Running img-proof tests against image with '
-                    'type: {inst_type}. Using boot firmware setting: '
-                    '{firmware}.'.format(
-                        inst_type=self.instance_type,
-                        firmware=firmware
-                    )
+            executor = self.get_task_executor()
+            for firmware, zone in zip(self.boot_firmware, zones):
+                executor.submit(
+                    firmware,
+                    self._test_variant,
+                    firmware,
+                    zone,
+                    set(fallback_regions),
+                    auth_file
                 )
 
-                if self.test_gvnic_with == firmware:
-                    test_gvnic = True
-                else:
-                    test_gvnic = False
-
-                enable_secure_boot = True if firmware == 'uefi' else False
-
-                retry_region = self.region
-                while fallback_regions:
-                    try:
-                        exit_status, result = test_image(
-                            self.cloud,
-                            cleanup=True,
-                            description=self.description,
-                            distro=self.distro,
-                            image_id=self.cloud_image_name,
-                            instance_type=self.instance_type,
-                            img_proof_timeout=self.img_proof_timeout,
-                            log_level=logging.DEBUG,
-                            region=retry_region,
-                            service_account_file=auth_file,
-                            ssh_private_key_file=self.ssh_private_key_file,
-                            ssh_user=self.ssh_user,
-                            tests=self.tests,
-                            enable_secure_boot=enable_secure_boot,
-                            image_project=self.image_project,
-                            log_callback=self.log_callback,
-                            prefix_name='mash',
-                            sev_capable=self.sev_capable,
-                            use_gvnic=test_gvnic
-                        )
-                    except IpaRetryableError as error:
-                        exit_status = 1
-                        result = {
-                            'status': EXCEPTION,
-                            'msg': str(error)
-                        }
-                        fallback_regions.remove(retry_region)
-
-                        if fallback_regions:
-                            retry_region = random.choice(list(fallback_regions))
-                    except Exception as error:
-                        self.add_error_msg(str(error))
-                        exit_status = 1
-                        result = {
-                            'status': EXCEPTION,
-                            'msg': str(traceback.format_exc())
-                        }
-                        break
-                    else:
-                        break
-
-                self.status = process_test_result(
-                    exit_status,
-                    result,
-                    self.log_callback,
-                    self.region,
-                    self.status_msg
+            results = self.run_tasks(executor)
+
+        for firmware, task in zip(self.boot_firmware, results):
+            if task.error:
+                msg = 'Testing {0} boot firmware variant failed: {1}'.format(
+                    firmware, task.error
                 )
+                self.add_error_msg(msg)
+                self.log_callback.error(msg)
+                self.status = FAILED
+                continue
+
+            exit_status, result, region, error = task.result
 
-                if self.status != SUCCESS:
-                    self.add_error_msg(
-                        'Image failed img-proof test suite. '
-                        'See "mash job test-results --job-id {GUID} -v" '
-                        'for details on the failing tests.'
-                    )
-                    break
+            if error:
+                self.add_error_msg(error)
+
+            status = process_test_result(
+                exit_status,
+                result,
+                self.log_callback,
+                region,
+                self.status_msg,
+                variant=firmware
+            )
+
+            if status != SUCCESS:
+                self.status = status
+
+        if self.status != SUCCESS:
+            self.add_error_msg(
+                'Image failed img-proof test suite. '
+                'See "mash job test-results --job-id {GUID} -v" '
+                'for details on the failing tests.'
+            )
 
         if self.cleanup_images or \
                 (self.status != SUCCESS and self.cleanup_images is not False):
             self.cleanup_image()
 
+    def _get_variant_zones(self, fallback_regions):
+        """
+        Return the zone to test each boot firmware variant in.
+
+        The first variant is tested in the job region and the other
+        variants in different zones from the fallback regions while
+        there are unused zones left.
+        """
+        zones = [self.region]
+        available = fallback_regions - {self.region}
+
+        for _ in self.boot_firmware[1:]:
+            if available:
+                zone = random.choice(sorted(available))
+                available.remove(zone)
+            else:
+                zone = self.region
+
+            zones.append(zone)
+
+        return zones
+
+    def _test_variant(self, firmware, region, fallback_regions, auth_file):
+        """
+        Test the boot firmware variant of the image with img-proof.
+
+        The test is retried in a fallback region when instances
+        cannot be launched in the region. Return the exit status,
+        result and final region of the test and an error message
+        if the test raised an exception.
+        """
+        self.log_callback.info(
+            'Running img-proof tests against image with '
+            'type: {inst_type}. Using boot firmware setting: '
+            '{firmware}.'.format(
+                inst_type=self.instance_type,
+                firmware=firmware
+            )
+        )
+
+        test_gvnic = self.test_gvnic_with == firmware
+        enable_secure_boot = True if firmware == 'uefi' else False
+        fallback_regions.add(region)
+        error_msg = None
+
+        while fallback_regions:
+            try:
+                exit_status, result = test_image(
+                    self.cloud,
+                    cleanup=True,
+                    description=self.description,
+                    distro=self.distro,
+                    image_id=self.cloud_image_name,
+                    instance_type=self.instance_type,
+                    img_proof_timeout=self.img_proof_timeout,
+                    log_level=logging.DEBUG,
+                    region=region,
+                    service_account_file=auth_file,
+                    ssh_private_key_file=self.ssh_private_key_file,
+                    ssh_user=self.ssh_user,
+                    tests=self.tests,
+                    enable_secure_boot=enable_secure_boot,
+                    image_project=self.image_project,
+                    log_callback=self.log_callback,
+                    prefix_name='mash',
+                    sev_capable=self.sev_capable,
+                    use_gvnic=test_gvnic
+                )
+            except IpaRetryableError as error:
+                exit_status = 1
+                result = {
+                    'status': EXCEPTION,
+                    'msg': str(error)
+                }
+                fallback_regions.remove(region)
+
+                if fallback_regions:
+                    region = random.choice(list(fallback_regions))
+            except Exception as error:
+                error_msg = str(error)
+                exit_status = 1
+                result = {
+                    'status': EXCEPTION,
+                    'msg': str(traceback.format_exc())
+                }
+                break
+            else:
+                break
+
+        return exit_status, result, region, error_msg
+
     def cleanup_image(self):
         credentials = self.credentials[self.account]
         project = credentials.get('project_id')
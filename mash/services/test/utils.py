@@ -25,8 +25,34 @@ def get_testing_account(account_info):
     return account_info.get('testing_account', account_info['account'])
 
 
-def process_test_result(status, result, log_callback, region, status_msg):
-    if 'tests' in result:
+def merge_test_results(status_msg, result, variant):
+    """
+    Add the img-proof results of a test variant to the status message.
+
+    The tests and summaries of all variants are combined, variants
+    run at the same time so the duration is the longest variant.
+    The summary of each variant is kept in variants.
+    """
+    test_results = json.loads(status_msg.get('test_results') or '{}')
+    summary = test_results.setdefault('summary', {})
+
+    for key, value in result['summary'].items():
+        if key == 'duration':
+            summary[key] = max(summary.get(key, 0), value)
+        else:
+            summary[key] = summary.get(key, 0) + value
+
+    test_results.setdefault('tests', []).extend(result['tests'])
+    test_results.setdefault('variants', {})[variant] = result['summary']
+    status_msg['test_results'] = json.dumps(test_results)
+
+
+def process_test_result(
+    status, result, log_callback, region, status_msg, variant=None
+):
+    if 'tests' in result and variant:
+        merge_test_results(status_msg, result, variant)
+    elif 'tests' in result:
         status_msg['test_results'] = json.dumps({
             'tests': result['tests'],
             'summary': result['summary']
@@ -16,13 +16,28 @@
 # along with mash.  If not, see <http://www.gnu.org/licenses/>
 #
 
+import os
+
+from oss2 import PartIterator
+from oss2.exceptions import NoSuchUpload, OssError
+from oss2.models import PartInfo
+
 # project
 from mash.services.mash_job import MashJob
 from mash.mash_exceptions import MashUploadException
 from mash.utils.mash_utils import (
     format_string_with_date,
+    persist_json,
     timestamp_from_epoch
 )
+from mash.utils.multipart import (
+    MULTIPART_UPLOAD_KEY,
+    ThroughputTuner,
+    is_resumable,
+    new_upload_state,
+    reconcile_parts,
+    upload_parts
+)
 from mash.services.status_levels import SUCCESS
 from aliyun_img_utils.aliyun_image import AliyunImage
 
@@ -30,6 +45,10 @@ from aliyun_img_utils.aliyun_image import AliyunImage
 class AliyunUploadJob(MashJob):
     """
     Implements system image upload to Aliyun
+
+    The image is uploaded to OSS in parallel parts of a multipart
+    upload. The upload id and the uploaded parts are checkpointed
+    in the job file so a restarted job only uploads missing parts.
     """
     def post_init(self):
         try:
@@ -47,6 +66,9 @@ class AliyunUploadJob(MashJob):
 
         self.use_build_time = self.job_config.get('use_build_time')
         self.force_replace_image = self.job_config.get('force_replace_image')
+        self.upload_process_count = \
+            self.config.get_aliyun_upload_process_count()
+        self._image_size = 0
 
         # How often to update log callback with upload progress.
         # 25 updates every 25%. I.e. 25, 50, 75, 100.
@@ -107,11 +129,46 @@ class AliyunUploadJob(MashJob):
             )
             aliyun_image.delete_storage_blob(object_name)
 
-        aliyun_image.upload_image_tarball(
-            self.status_msg['image_file'],
-            blob_name=object_name,
-            progress_callback=self.progress_callback
+        image_file = self.status_msg['image_file']
+        self._image_size = os.path.getsize(image_file)
+        bucket_client = aliyun_image.bucket_client
+        state = self._get_upload_state(bucket_client, object_name, image_file)
+
+        def upload_part(part_num, data):
+            return bucket_client.upload_part(
+                object_name,
+                state['upload_id'],
+                part_num,
+                data
+            ).etag
+
+        # The configured process count is the starting point,
+        # parallelism adapts to the measured throughput.
+        tuner = ThroughputTuner(
+            workers=self.upload_process_count,
+            max_workers=2 * self.upload_process_count
+        )
+        parts = upload_parts(
+            image_file,
+            state,
+            upload_part,
+            tuner=tuner,
+            persist_callback=self._persist_upload_state,
+            progress_callback=self._part_uploaded,
+            job_id=self.id
+        )
+
+        bucket_client.complete_multipart_upload(
+            object_name,
+            state['upload_id'],
+            [PartInfo(part_num, etag) for part_num, etag in parts]
         )
+        self._persist_upload_state(None)
+        self.progress_callback(0, 0, done=True)
+
+        # Blob upload takes time to finish up
+        aliyun_image.wait_on_blob(object_name)
+        self.add_bytes_transferred(self.status_msg['image_file'])
 
         self.status_msg['cloud_image_name'] = self.cloud_image_name
         self.status_msg['object_name'] = object_name
@@ -122,6 +179,79 @@ class AliyunUploadJob(MashJob):
             )
         )
 
+    def _get_upload_state(self, bucket_client, object_name, image_file):
+        """
+        Return the state of the multipart upload of the image.
+
+        A checkpointed upload of the same image is resumed, otherwise
+        a new multipart upload is initiated.
+        """
+        state = self.job_config.get(MULTIPART_UPLOAD_KEY)
+
+        if is_resumable(state, object_name, image_file):
+            try:
+                uploaded_parts = {
+                    part.part_number: (part.etag, part.size)
+                    for part in PartIterator(
+                        bucket_client, object_name, state['upload_id']
+                    )
+                }
+            except NoSuchUpload:
+                self.log_callback.warning(
+                    'Multipart upload {0} no longer exists, '
+                    'starting a new upload.'.format(state['upload_id'])
+                )
+            else:
+                uploaded = reconcile_parts(state, uploaded_parts)
+                self.log_callback.info(
+                    'Resuming upload of {0}: {1} bytes already uploaded.'.format(
+                        object_name, uploaded
+                    )
+                )
+
+                if uploaded:
+                    self._part_uploaded(uploaded)
+
+                return state
+        elif state:
+            self._abort_upload(bucket_client, state)
+
+        upload_id = bucket_client.init_multipart_upload(object_name).upload_id
+        state = new_upload_state(upload_id, object_name, image_file)
+        self._persist_upload_state(state)
+        return state
+
+    def _abort_upload(self, bucket_client, state):
+        """
+        Abort a checkpointed multipart upload of a different image.
+        """
+        try:
+            bucket_client.abort_multipart_upload(
+                state['object_name'],
+                state['upload_id']
+            )
+        except OssError as error:
+            self.log_callback.warning(
+                'Unable to abort multipart upload {0}: {1}'.format(
+                    state['upload_id'], error.message
+                )
+            )
+
+    def _persist_upload_state(self, state):
+        """
+        Checkpoint the multipart upload state in the job file.
+        """
+        if state:
+            self.job_config[MULTIPART_UPLOAD_KEY] = state
+        else:
+            self.job_config.pop(MULTIPART_UPLOAD_KEY, None)
+
+        if self.job_file:
+            persist_json(self.job_file, self.job_config)
+
+    def _part_uploaded(self, size):
+        self.progress_callback(size, self._image_size)
+
     def progress_callback(self, read_size, total_size, done=False):
         """
         Update progress in log callback
@@ -16,16 +16,25 @@
 # along with mash.  If not, see <http://www.gnu.org/licenses/>
 #
 
-from azure_img_utils.azure_image import AzureImage
-
 # project
 from mash.services.mash_job import MashJob
 from mash.mash_exceptions import MashUploadException
 from mash.utils.mash_utils import (
+    IMAGE_DIGEST_KEY,
     format_string_with_date,
     timestamp_from_epoch
 )
 from mash.services.status_levels import SUCCESS
+from mash.services.upload.blob_sources import (
+    BlobSource,
+    blob_sources,
+    get_image_key
+)
+from mash.utils.azure import AzureImage
+
+# Source blobs are shared for less time than their SAS URL is valid
+SOURCE_URL_EXPIRE_HOURS = 6
+SOURCE_TTL = 5 * 60 * 60
 
 
 class AzureUploadJob(MashJob):
@@ -82,13 +91,12 @@ class AzureUploadJob(MashJob):
             log_callback=self.log_callback
         )
 
-        azure_image.upload_image_blob(
-            self.status_msg['image_file'],
-            max_workers=self.config.get_azure_max_workers(),
-            max_retry_attempts=self.config.get_azure_max_retry_attempts(),
-            blob_name=blob_name,
-            force_replace_image=self.force_replace_image
-        )
+        if self._reuse_image_blob(azure_image, blob_name):
+            pass
+        elif self.config.get_azure_blob_copy():
+            self._copy_or_upload_image_blob(azure_image, blob_name)
+        else:
+            self._upload_image_blob(azure_image, blob_name)
 
         self.status_msg['cloud_image_name'] = self.cloud_image_name
         self.status_msg['blob_name'] = blob_name
@@ -98,3 +106,147 @@ class AzureUploadJob(MashJob):
                 self.container
             )
         )
+
+    def _reuse_image_blob(self, azure_image, blob_name):
+        """
+        Reuse a blob of the image in the container if it exists.
+
+        Blobs are found by the image digest in their metadata. A blob
+        with a different name is copied server side. Returns False if
+        the image has to be transferred.
+        """
+        digest = self.status_msg.get('image_digest')
+
+        if not digest:
+            return False
+
+        source_name = azure_image.find_blob_by_digest(
+            digest,
+            blob_name=blob_name
+        )
+
+        if not source_name:
+            return False
+        elif source_name == blob_name:
+            self.log_callback.info(
+                'Image blob {0} with the same digest already exists, '
+                'skipping upload.'.format(blob_name)
+            )
+            return True
+
+        try:
+            azure_image.copy_image_blob(
+                azure_image.get_blob_sas_url(source_name),
+                blob_name,
+                force_replace_image=self.force_replace_image
+            )
+        except Exception as error:
+            self.log_callback.warning(
+                'Copy of image blob {0} failed, uploading the image '
+                'instead: {1}'.format(source_name, error)
+            )
+            return False
+
+        self.log_callback.info(
+            'Copied image blob {0} with the same digest.'.format(source_name)
+        )
+        return True
+
+    def _upload_image_blob(self, azure_image, blob_name):
+        digest = self.status_msg.get('image_digest')
+        azure_image.upload_image_blob(
+            self.status_msg['image_file'],
+            max_workers=self.config.get_azure_max_workers(),
+            max_retry_attempts=self.config.get_azure_max_retry_attempts(),
+            blob_name=blob_name,
+            force_replace_image=self.force_replace_image,
+            job_id=self.id,
+            metadata={IMAGE_DIGEST_KEY: digest} if digest else None
+        )
+        self.add_bytes_transferred(self.status_msg['image_file'])
+
+    def _copy_or_upload_image_blob(self, azure_image, blob_name):
+        """
+        Copy the image blob uploaded by an earlier job or upload it.
+
+        The blob is copied server side from the source storage account
+        with a read only SAS URL of the source blob. If the copy fails
+        the image is uploaded directly. The first job uploading an
+        image becomes the source for the jobs after it.
+
+        Only images with a content digest are shared, without it a
+        different image could be copied into the storage account.
+        """
+        digest = self.status_msg.get('image_digest')
+
+        if not digest:
+            self._upload_image_blob(azure_image, blob_name)
+            return
+
+        key = get_image_key(
+            self.requesting_user,
+            digest,
+            self.status_msg.get('download_url')
+        )
+        source, owner = blob_sources.get_source(key)
+
+        if source and (source.storage_account, source.container) != (
+            self.storage_account, self.container
+        ):
+            try:
+                azure_image.copy_image_blob(
+                    source.url,
+                    blob_name,
+                    force_replace_image=self.force_replace_image
+                )
+            except Exception as error:
+                self.log_callback.warning(
+                    'Server side copy of the image blob failed, uploading '
+                    'the image instead: {0}'.format(error)
+                )
+            else:
+                self.status_msg['blob_source'] = '{0}/{1}/{2}'.format(
+                    source.storage_account,
+                    source.container,
+                    source.blob_name
+                )
+                self.log_callback.info(
+                    'Copied image blob from storage account {0}.'.format(
+                        source.storage_account
+                    )
+                )
+                return
+
+        try:
+            self._upload_image_blob(azure_image, blob_name)
+        except Exception:
+            if owner:
+                blob_sources.discard(key)
+            raise
+
+        if not owner:
+            return
+
+        try:
+            source_url = azure_image.get_blob_sas_url(
+                blob_name,
+                expire_hours=SOURCE_URL_EXPIRE_HOURS
+            )
+        except Exception as error:
+            self.log_callback.warning(
+                'Unable to share the image blob for copies: {0}'.format(
+                    error
+                )
+            )
+            blob_sources.discard(key)
+        else:
+            blob_sources.publish(
+                key,
+                BlobSource(
+                    self.storage_account,
+                    self.container,
+                    blob_name,
+                    source_url
+                ),
+                SOURCE_TTL
+            )
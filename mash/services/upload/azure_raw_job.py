@@ -18,12 +18,10 @@
 
 import os
 
-from azure_img_utils.azure_image import AzureImage
-from azure_img_utils.storage import upload_azure_file
-
 from mash.services.mash_job import MashJob
 from mash.mash_exceptions import MashUploadException
 from mash.services.status_levels import SUCCESS
+from mash.utils.azure import AzureImage, upload_azure_file
 
 
 class AzureRawUploadJob(MashJob):
@@ -85,8 +83,10 @@ class AzureRawUploadJob(MashJob):
                 azure_image.blob_service_client,
                 max_retry_attempts=self.config.get_azure_max_retry_attempts(),
                 max_workers=self.config.get_azure_max_workers(),
-                expand_image=False
+                expand_image=False,
+                job_id=self.id
             )
+            self.add_bytes_transferred(file_path)
 
         self.status_msg['blob_name'] = file_name
         self.log_callback.info(
@@ -18,14 +18,12 @@
 
 import re
 
-from azure_img_utils.azure_image import AzureImage
-from azure_img_utils.storage import upload_azure_file
-
 # project
 from mash.services.mash_job import MashJob
 from mash.mash_exceptions import MashUploadException
 from mash.utils.mash_utils import format_string_with_date
 from mash.services.status_levels import SUCCESS
+from mash.utils.azure import AzureImage, upload_azure_file
 
 
 # https://[storage-account].[maangement-url]/[container]?[SAS token]
@@ -77,8 +75,10 @@ class AzureSASUploadJob(MashJob):
             blob_service_client=azure_image.blob_service_client,
             max_retry_attempts=self.config.get_azure_max_retry_attempts(),
             max_workers=self.config.get_azure_max_workers(),
-            is_page_blob=True
+            is_page_blob=True,
+            job_id=self.id
         )
+        self.add_bytes_transferred(self.status_msg['image_file'])
         self.log_callback.info(
             'Uploaded blob: {blob} using sas token.'.format(
                 blob=self.blob_name
@@ -0,0 +1,114 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import threading
+import time
+
+from collections import namedtuple
+
+BlobSource = namedtuple(
+    'BlobSource',
+    ['storage_account', 'container', 'blob_name', 'url']
+)
+
+
+def get_image_key(requesting_user, digest, download_url=None):
+    """
+    Return the key identifying the image across jobs.
+
+    Each job downloads its own copy of the image, the content digest
+    identifies it. Blobs are only shared between the jobs of the
+    same user downloading the image from the same URL.
+    """
+    return requesting_user, download_url, digest
+
+
+class BlobSourceEntry(object):
+    def __init__(self):
+        self.source = None
+        self.expires = None
+        self.ready = threading.Event()
+
+
+class BlobSourceRegistry(object):
+    """
+    Blobs uploaded by the jobs of the upload service by image.
+
+    The first job uploading an image becomes the source of the
+    image, jobs uploading the same image later copy the source blob.
+    Jobs that start while the source is being uploaded wait for it.
+    """
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_source(self, key, timeout=3600):
+        """
+        Return the source blob of the image and if the caller owns it.
+
+        When no source exists the caller becomes the owner and has to
+        publish the uploaded blob or discard the entry. Otherwise the
+        source is returned once uploaded, None is returned if the
+        upload failed or did not finish within timeout seconds.
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            for expired_key, entry in list(self._entries.items()):
+                if entry.expires and entry.expires <= now:
+                    del self._entries[expired_key]
+
+            entry = self._entries.get(key)
+
+            if not entry:
+                self._entries[key] = BlobSourceEntry()
+                return None, True
+
+        entry.ready.wait(timeout)
+        return entry.source, False
+
+    def publish(self, key, source, ttl):
+        """
+        Make the uploaded blob the source of the image for ttl seconds.
+        """
+        with self._lock:
+            entry = self._entries.setdefault(key, BlobSourceEntry())
+            entry.source = source
+            entry.expires = time.monotonic() + ttl
+
+        entry.ready.set()
+
+    def discard(self, key):
+        """
+        Remove the source of the image, waiting jobs upload the image.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+
+        if entry:
+            entry.ready.set()
+
+    def clear(self):
+        with self._lock:
+            entries, self._entries = self._entries, {}
+
+        for entry in entries.values():
+            entry.ready.set()
+
+
+blob_sources = BlobSourceRegistry()
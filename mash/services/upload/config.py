@@ -34,6 +34,8 @@ class UploadConfig(BaseConfig):
         max_chunk_retry_attempts: 5
         # max number of worker threads for upload
         max_workers: 16
+        # copy images uploaded by an earlier job server side
+        blob_copy: true
     """
     def __init__(self, config_file=None):
         super(UploadConfig, self).__init__(config_file)
@@ -46,3 +48,7 @@ class UploadConfig(BaseConfig):
     def get_azure_max_workers(self):
         return self.azure_upload.get('max_workers') or \
             Defaults.get_azure_max_workers()
+
+    def get_azure_blob_copy(self):
+        return self.azure_upload.get('blob_copy') or \
+            Defaults.get_azure_blob_copy()
@@ -28,7 +28,9 @@ from mash.utils.gce import (
     get_gce_storage_driver,
     upload_image_tarball,
     delete_image_tarball,
-    blob_exists
+    blob_exists,
+    copy_blob,
+    find_blob_by_digest
 )
 
 
@@ -85,7 +87,42 @@ class GCEUploadJob(MashJob):
         storage_driver = get_gce_storage_driver(credentials)
 
         object_name = ''.join([self.cloud_image_name, '.tar.gz'])
+        digest = self.status_msg.get('image_digest')
+        source_name = None
 
+        if digest:
+            source_name = find_blob_by_digest(
+                storage_driver,
+                digest,
+                self.bucket,
+                object_name=object_name
+            )
+
+        if source_name == object_name:
+            self.log_callback.info(
+                'Image tarball: {0} with the same digest already exists '
+                'in the bucket named: {1}, skipping upload.'.format(
+                    object_name,
+                    self.bucket
+                )
+            )
+        else:
+            self._upload_tarball(
+                storage_driver, object_name, digest, source_name
+            )
+
+        self.status_msg['cloud_image_name'] = self.cloud_image_name
+        self.status_msg['object_name'] = object_name
+
+    def _upload_tarball(
+        self, storage_driver, object_name, digest, source_name=None
+    ):
+        """
+        Upload the image tarball or copy the tarball source_name.
+
+        The tarball source_name in the bucket has the same digest
+        and is copied without transferring the image.
+        """
         exists = blob_exists(storage_driver, object_name, self.bucket)
         if exists and not self.force_replace_image:
             raise MashUploadException(
@@ -109,15 +146,25 @@ class GCEUploadJob(MashJob):
                 self.bucket
             )
 
+        if source_name:
+            copy_blob(storage_driver, source_name, object_name, self.bucket)
+            self.log_callback.info(
+                'Copied image tarball: {0}, with the same digest.'.format(
+                    source_name
+                )
+            )
+            return
+
         upload_image_tarball(
             storage_driver,
             object_name,
             self.status_msg['image_file'],
-            self.bucket
+            self.bucket,
+            job_id=self.id,
+            digest=digest
         )
+        self.add_bytes_transferred(self.status_msg['image_file'])
 
-        self.status_msg['cloud_image_name'] = self.cloud_image_name
-        self.status_msg['object_name'] = object_name
         self.log_callback.info(
             'Uploaded image: {0}, to the bucket named: {1}'.format(
                 object_name,
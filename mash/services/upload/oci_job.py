@@ -16,23 +16,54 @@
 # along with mash.  If not, see <http://www.gnu.org/licenses/>
 #
 
+import base64
+import hashlib
+
 from os import stat
 
-from oci.object_storage import ObjectStorageClient, UploadManager
+from oci.exceptions import ServiceError
+from oci.object_storage import (
+    ObjectStorageClient,
+    ObjectStorageClientCompositeOperations
+)
+from oci.object_storage.models import (
+    CommitMultipartUploadDetails,
+    CommitMultipartUploadPartDetails,
+    CopyObjectDetails,
+    CreateMultipartUploadDetails,
+    WorkRequest
+)
+from oci.pagination import list_call_get_all_results
 
 # project
 from mash.services.mash_job import MashJob
 from mash.mash_exceptions import MashUploadException
 from mash.utils.mash_utils import (
+    IMAGE_DIGEST_KEY,
     format_string_with_date,
+    persist_json,
     timestamp_from_epoch
 )
+from mash.utils.multipart import (
+    MULTIPART_UPLOAD_KEY,
+    ThroughputTuner,
+    is_resumable,
+    new_upload_state,
+    reconcile_parts,
+    upload_parts
+)
 from mash.services.status_levels import SUCCESS
 
 
 class OCIUploadJob(MashJob):
     """
     Implements VM image upload to OCI
+
+    The image is uploaded in parallel parts of a multipart upload.
+    The upload id and the uploaded parts are persisted in the job
+    file, a job that is restarted resumes the upload and only
+    uploads the missing parts. An object of the image in the bucket
+    is found by the image digest in its metadata and reused.
     """
     def post_init(self):
         self._image_size = 0
@@ -89,28 +120,98 @@ class OCIUploadJob(MashJob):
         }
         object_storage = ObjectStorageClient(config)
         namespace = object_storage.get_namespace().data
-        upload_manager = UploadManager(
-            object_storage,
-            allow_parallel_uploads=True,
-            parallel_process_count=self.upload_process_count
-        )
 
         object_name = ''.join([self.cloud_image_name, '.qcow2'])
-        self._image_size = stat(self.status_msg['image_file']).st_size
+        image_file = self.status_msg['image_file']
+        self._image_size = stat(image_file).st_size
+        digest = self.status_msg.get('image_digest')
+        source_name = None
 
-        with open(self.status_msg['image_file'], 'rb') as image_stream:
-            upload_manager.upload_stream(
-                namespace,
-                self.bucket,
-                object_name,
-                image_stream,
-                progress_callback=self._progress_callback
+        if digest:
+            source_name = self._find_object_by_digest(
+                object_storage, namespace, object_name, digest
+            )
+
+        if source_name == object_name:
+            self.log_callback.info(
+                'Image: {0} with the same digest already exists in the '
+                'bucket named: {1}, skipping upload.'.format(
+                    object_name,
+                    self.bucket
+                )
+            )
+        elif source_name:
+            self._copy_object(
+                object_storage, namespace, source_name, object_name
+            )
+        else:
+            self._upload_object(
+                object_storage, namespace, object_name, image_file, digest
             )
 
         self.status_msg['cloud_image_name'] = self.cloud_image_name
         self.status_msg['object_name'] = object_name
         self.status_msg['namespace'] = namespace
 
+    def _upload_object(
+        self, object_storage, namespace, object_name, image_file,
+        digest=None
+    ):
+        """
+        Upload the image in a multipart upload.
+        """
+        state = self._get_upload_state(
+            object_storage, namespace, object_name, image_file,
+            digest=digest
+        )
+
+        def upload_part(part_num, data):
+            md5 = base64.b64encode(hashlib.md5(data).digest()).decode()
+            response = object_storage.upload_part(
+                namespace,
+                self.bucket,
+                object_name,
+                state['upload_id'],
+                part_num,
+                data,
+                content_md5=md5
+            )
+            return response.headers['etag']
+
+        # The configured process count is the starting point,
+        # parallelism adapts to the measured throughput.
+        tuner = ThroughputTuner(
+            workers=self.upload_process_count,
+            max_workers=2 * self.upload_process_count
+        )
+        parts = upload_parts(
+            image_file,
+            state,
+            upload_part,
+            tuner=tuner,
+            persist_callback=self._persist_upload_state,
+            progress_callback=self._progress_callback,
+            job_id=self.id
+        )
+
+        object_storage.commit_multipart_upload(
+            namespace,
+            self.bucket,
+            object_name,
+            state['upload_id'],
+            CommitMultipartUploadDetails(
+                parts_to_commit=[
+                    CommitMultipartUploadPartDetails(
+                        part_num=part_num,
+                        etag=etag
+                    ) for part_num, etag in parts
+                ]
+            )
+        )
+        self._persist_upload_state(None)
+
+        self.add_bytes_transferred(image_file)
+
         self.log_callback.info(
             'Uploaded image: {0}, to the bucket named: {1}'.format(
                 object_name,
@@ -118,6 +219,171 @@ class OCIUploadJob(MashJob):
             )
         )
 
+    def _find_object_by_digest(
+        self, object_storage, namespace, object_name, digest
+    ):
+        """
+        Return the name of an object in the bucket with the image digest.
+
+        Only the metadata of objects with the size of the image is
+        requested. The object object_name is preferred if it has the
+        digest. Returns None if no object has the digest.
+        """
+        objects = list_call_get_all_results(
+            object_storage.list_objects,
+            namespace,
+            self.bucket,
+            fields='name,size'
+        ).data.objects
+        names = [item.name for item in objects if item.size == self._image_size]
+        names.sort(key=lambda name: name != object_name)
+
+        for name in names:
+            headers = object_storage.head_object(
+                namespace,
+                self.bucket,
+                name
+            ).headers
+
+            if headers.get('opc-meta-' + IMAGE_DIGEST_KEY) == digest:
+                return name
+
+    def _copy_object(self, object_storage, namespace, source_name, object_name):
+        """
+        Copy the object source_name to object_name in the bucket.
+
+        The copy runs in a work request of the object storage which
+        is waited for, the object metadata is copied with the object.
+        """
+        composite = ObjectStorageClientCompositeOperations(object_storage)
+        response = composite.copy_object_and_wait_for_state(
+            namespace,
+            self.bucket,
+            CopyObjectDetails(
+                source_object_name=source_name,
+                destination_region=self.region,
+                destination_namespace=namespace,
+                destination_bucket=self.bucket,
+                destination_object_name=object_name
+            ),
+            wait_for_states=[
+                WorkRequest.STATUS_COMPLETED,
+                WorkRequest.STATUS_FAILED,
+                WorkRequest.STATUS_CANCELED
+            ],
+            waiter_kwargs={
+                'max_wait_seconds': self.config.get_max_oci_wait_seconds()
+            }
+        )
+
+        if response.data.status != WorkRequest.STATUS_COMPLETED:
+            raise MashUploadException(
+                'Copy of image: {0} to {1} {2}.'.format(
+                    source_name,
+                    object_name,
+                    response.data.status.lower()
+                )
+            )
+
+        self.log_callback.info(
+            'Copied image: {0} with the same digest.'.format(source_name)
+        )
+
+    def _get_upload_state(
+        self, object_storage, namespace, object_name, image_file,
+        digest=None
+    ):
+        """
+        Return the state of the multipart upload of the image.
+
+        A persisted upload of the same image is resumed, otherwise
+        a new multipart upload is created with the image digest in
+        the object metadata.
+        """
+        state = self.job_config.get(MULTIPART_UPLOAD_KEY)
+
+        if is_resumable(state, object_name, image_file):
+            try:
+                uploaded_parts = list_call_get_all_results(
+                    object_storage.list_multipart_upload_parts,
+                    namespace,
+                    self.bucket,
+                    object_name,
+                    state['upload_id']
+                ).data
+            except ServiceError as error:
+                if error.status != 404:
+                    raise
+
+                self.log_callback.warning(
+                    'Multipart upload {0} no longer exists, '
+                    'starting a new upload.'.format(state['upload_id'])
+                )
+            else:
+                uploaded = reconcile_parts(state, {
+                    part.part_number: (part.etag, part.size)
+                    for part in uploaded_parts
+                })
+                self.log_callback.info(
+                    'Resuming upload of {0}: {1} bytes already uploaded.'.format(
+                        object_name, uploaded
+                    )
+                )
+
+                if uploaded:
+                    self._progress_callback(uploaded)
+
+                return state
+        elif state:
+            self._abort_upload(object_storage, namespace, state)
+
+        metadata = None
+
+        if digest:
+            metadata = {'opc-meta-' + IMAGE_DIGEST_KEY: digest}
+
+        upload_id = object_storage.create_multipart_upload(
+            namespace,
+            self.bucket,
+            CreateMultipartUploadDetails(
+                object=object_name,
+                metadata=metadata
+            )
+        ).data.upload_id
+        state = new_upload_state(upload_id, object_name, image_file)
+        self._persist_upload_state(state)
+        return state
+
+    def _abort_upload(self, object_storage, namespace, state):
+        """
+        Abort a persisted multipart upload of a different image.
+        """
+        try:
+            object_storage.abort_multipart_upload(
+                namespace,
+                self.bucket,
+                state['object_name'],
+                state['upload_id']
+            )
+        except ServiceError as error:
+            self.log_callback.warning(
+                'Unable to abort multipart upload {0}: {1}'.format(
+                    state['upload_id'], error.message
+                )
+            )
+
+    def _persist_upload_state(self, state):
+        """
+        Persist the multipart upload state in the job file.
+        """
+        if state:
+            self.job_config[MULTIPART_UPLOAD_KEY] = state
+        else:
+            self.job_config.pop(MULTIPART_UPLOAD_KEY, None)
+
+        if self.job_file:
+            persist_json(self.job_file, self.job_config)
+
     def _progress_callback(self, bytes_uploaded):
         self._total_bytes_transferred += bytes_uploaded
         percent_transferred = (self._total_bytes_transferred * 100) / self._image_size
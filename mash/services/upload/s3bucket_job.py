@@ -21,7 +21,9 @@ from os import stat, path
 # project
 from mash.services.mash_job import MashJob
 from mash.mash_exceptions import MashUploadException
-from mash.utils.ec2 import get_client
+from mash.utils.bandwidth import open_throttled
+from mash.utils.ec2 import find_object_by_digest, get_client
+from mash.utils.mash_utils import IMAGE_DIGEST_KEY
 from mash.services.status_levels import SUCCESS
 
 
@@ -102,14 +104,65 @@ class S3BucketUploadJob(MashJob):
                 credentials['secret_access_key'], None
             )
 
-            client.upload_file(
-                self.status_msg['image_file'],
-                bucket_name,
-                key_name,
-                Callback=self._log_progress
-            )
+            digest = self.status_msg.get('image_digest')
+            source_key = None
+
+            if digest:
+                source_key = find_object_by_digest(
+                    client,
+                    bucket_name,
+                    digest,
+                    self._image_size,
+                    key_name=key_name
+                )
+
+            if source_key == key_name:
+                self.log_callback.info(
+                    'Raw image {0} with the same digest already exists, '
+                    'skipping upload.'.format(key_name)
+                )
+            elif source_key:
+                # Large objects are copied in parts which do not keep
+                # the metadata of the source object.
+                client.copy(
+                    {'Bucket': bucket_name, 'Key': source_key},
+                    bucket_name,
+                    key_name,
+                    ExtraArgs={
+                        'Metadata': {IMAGE_DIGEST_KEY: digest},
+                        'MetadataDirective': 'REPLACE'
+                    }
+                )
+                self.log_callback.info(
+                    'Copied raw image {0} with the same digest.'.format(
+                        source_key
+                    )
+                )
+            else:
+                self._upload_raw_image(client, bucket_name, key_name, digest)
 
         except Exception as e:
             raise MashUploadException(
                 'Raw upload to S3 bucket failed with: {0}'.format(e)
             )
+
+    def _upload_raw_image(self, client, bucket_name, key_name, digest=None):
+        """
+        Upload the raw image, the image digest is stored as metadata.
+        """
+        extra_args = None
+
+        if digest:
+            extra_args = {'Metadata': {IMAGE_DIGEST_KEY: digest}}
+
+        with open_throttled(
+            self.status_msg['image_file'], self.id
+        ) as image:
+            client.upload_fileobj(
+                image,
+                bucket_name,
+                key_name,
+                ExtraArgs=extra_args,
+                Callback=self._log_progress
+            )
+        self.add_bytes_transferred(self.status_msg['image_file'])
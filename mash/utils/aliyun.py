@@ -16,12 +16,17 @@
 # along with mash.  If not, see <http://www.gnu.org/licenses/>
 #
 
+import time
+
 from contextlib import contextmanager, suppress
+from aliyun_img_utils.aliyun_image import AliyunImage
+from aliyun_img_utils.aliyun_exceptions import AliyunImageException
 from aliyun_img_utils.aliyun_utils import (
     get_compute_client,
     import_key_pair,
     delete_key_pair
 )
+from mash.utils.concurrency import TaskExecutor
 from mash.utils.mash_utils import generate_name, get_key_from_file
 
 
@@ -54,3 +59,146 @@ def setup_key_pair(
     finally:
         with suppress(Exception):
             delete_key_pair(key_name, client)
+
+
+class ImageReplicationTracker(object):
+    """
+    Track compute images copied to other regions until they are ready.
+
+    The state of the images in all pending regions is polled
+    concurrently. The poll interval starts at min_interval and is
+    multiplied by backoff, up to max_interval, after every poll in
+    which no image changed its state or progress. Any change resets
+    the interval to min_interval.
+    """
+    def __init__(
+        self,
+        access_key,
+        access_secret,
+        images,
+        min_interval=30,
+        max_interval=300,
+        backoff=2,
+        timeout=3600,
+        max_workers=10
+    ):
+        self.access_key = access_key
+        self.access_secret = access_secret
+        self.pending = dict(images)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.interval = min_interval
+        self.states = {}
+        self._clients = {}
+
+    def _get_client(self, region):
+        if region not in self._clients:
+            self._clients[region] = AliyunImage(
+                self.access_key,
+                self.access_secret,
+                region
+            )
+
+        return self._clients[region]
+
+    def _get_state(self, region, image_id):
+        """
+        Return the status and progress of the image in the region.
+
+        Copies that are not visible yet are reported as unknown.
+        """
+        try:
+            image = self._get_client(region).get_compute_image(
+                image_id=image_id
+            )
+        except AliyunImageException:
+            return 'unknown', None
+
+        return image.get('Status', 'unknown'), image.get('Progress')
+
+    def poll(self):
+        """
+        Poll the state of all pending images once.
+
+        Return a list of (region, image_id, error) tuples of the
+        images that finished, error is None if the image is available.
+        """
+        executor = TaskExecutor(max_workers=self.max_workers)
+
+        for region, image_id in self.pending.items():
+            executor.submit(region, self._get_state, region, image_id)
+
+        finished = []
+        changed = False
+
+        for result in executor.run():
+            region = result.name
+            image_id = self.pending[region]
+
+            if result.error:
+                state = ('unknown', None)
+            else:
+                state = result.result
+
+            changed = changed or self.states.get(region) != state
+            self.states[region] = state
+            status = state[0]
+            error = None
+
+            if status == 'Available':
+                pass
+            elif status in AliyunImage.IMAGE_BROKEN_STATES:
+                error = 'Image in a broken state: {0}'.format(status)
+            elif status in AliyunImage.IMAGE_PROCESSING_STATES or \
+                    status == 'unknown':
+                continue
+            else:
+                error = 'Image in an unexpected state: {0}'.format(status)
+
+            del self.pending[region]
+            finished.append((region, image_id, error))
+
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(
+                self.interval * self.backoff, self.max_interval
+            )
+
+        return finished
+
+    def track(self, callback):
+        """
+        Poll until all images finished or the timeout expired.
+
+        callback(region, image_id, error) is called for every image
+        as soon as it is available or failed. Images that are still
+        pending at the timeout are reported with an error.
+        """
+        end = time.monotonic() + self.timeout
+
+        while self.pending:
+            for region, image_id, error in self.poll():
+                callback(region, image_id, error)
+
+            if not self.pending:
+                break
+
+            remaining = end - time.monotonic()
+
+            if remaining <= 0:
+                for region, image_id in list(self.pending.items()):
+                    del self.pending[region]
+                    callback(
+                        region,
+                        image_id,
+                        'Image not available within {0} seconds.'.format(
+                            self.timeout
+                        )
+                    )
+                break
+
+            time.sleep(min(self.interval, remaining))
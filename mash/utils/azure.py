@@ -0,0 +1,371 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import lzma
+import os
+import time
+
+from datetime import datetime, timedelta
+
+from azure.storage.blob import BlobSasPermissions, generate_blob_sas
+from azure_img_utils.azure_image import AzureImage as BaseAzureImage
+from azure_img_utils.exceptions import (
+    AzureImgUtilsException,
+    AzureImgUtilsStorageException
+)
+from azure_img_utils.filetype import FileType
+from azure_img_utils.storage import get_blob_client
+
+from mash.utils.bandwidth import open_throttled
+from mash.utils.cloud_api import add_azure_profiler_policy
+from mash.utils.mash_utils import IMAGE_DIGEST_KEY
+
+
+def get_gallery_target_regions(region, target_regions=None):
+    """
+    Return the publishing profile target regions of an image version.
+
+    The source region is always a target region with one replica
+    unless it is in target_regions with a replica count.
+    """
+    replica_counts = {region: 1}
+
+    for target_region in target_regions or []:
+        replica_counts[target_region['name']] = target_region.get(
+            'replica_count', 1
+        )
+
+    return [
+        {'name': name, 'regional_replica_count': replica_count}
+        for name, replica_count in replica_counts.items()
+    ]
+
+
+def upload_azure_file(
+    blob_name,
+    container,
+    file_name,
+    blob_service_client,
+    max_retry_attempts=5,
+    max_workers=5,
+    is_page_blob=False,
+    expand_image=True,
+    job_id=None,
+    metadata=None
+):
+    """
+    Upload file to Azure storage container.
+
+    Works like upload_azure_file of azure_img_utils but the file
+    is read through the bandwidth scheduler on behalf of job_id
+    and the blob is created with the metadata.
+    """
+    blob_client = get_blob_client(blob_service_client, blob_name, container)
+    blob_type = 'PageBlob' if is_page_blob else 'BlockBlob'
+    file_type = FileType(file_name)
+
+    if file_type.is_xz() and expand_image:
+        opener = lzma.LZMAFile
+    else:
+        opener = open
+
+    error = None
+
+    for _ in range(max_retry_attempts):
+        with open_throttled(file_name, job_id, opener=opener) as image_stream:
+            try:
+                blob_client.upload_blob(
+                    image_stream,
+                    blob_type=blob_type,
+                    length=file_type.get_size(),
+                    max_concurrency=max_workers,
+                    metadata=metadata
+                )
+                return
+            except Exception as upload_error:
+                error = upload_error
+
+    raise AzureImgUtilsStorageException(
+        'Unable to upload {0}: {1}'.format(file_name, error)
+    )
+
+
+class AzureImage(BaseAzureImage):
+    """
+    Azure image class with clients instrumented by the API profiler.
+    """
+    @property
+    def blob_service_client(self):
+        return add_azure_profiler_policy(
+            super(AzureImage, self).blob_service_client
+        )
+
+    @property
+    def compute_client(self):
+        return add_azure_profiler_policy(
+            super(AzureImage, self).compute_client
+        )
+
+    def upload_image_blob(
+        self,
+        image_file,
+        max_workers=None,
+        max_retry_attempts=None,
+        blob_name=None,
+        force_replace_image=False,
+        is_page_blob=True,
+        expand_image=True,
+        job_id=None,
+        metadata=None
+    ):
+        """
+        Upload image tarball to the configured container.
+
+        The image is read through the bandwidth scheduler on behalf
+        of job_id.
+        """
+        if not blob_name:
+            blob_name = image_file.rsplit(os.sep, maxsplit=1)[-1]
+
+        if self.image_blob_exists(blob_name):
+            if not force_replace_image:
+                raise AzureImgUtilsException(
+                    'Image {0} already exists. To replace an existing '
+                    'image use force_replace_image option.'.format(blob_name)
+                )
+
+            self.delete_storage_blob(blob_name)
+
+        kwargs = {
+            'is_page_blob': is_page_blob,
+            'expand_image': expand_image,
+            'job_id': job_id,
+            'metadata': metadata
+        }
+
+        if max_workers:
+            kwargs['max_workers'] = max_workers
+
+        if max_retry_attempts:
+            kwargs['max_retry_attempts'] = max_retry_attempts
+
+        try:
+            upload_azure_file(
+                blob_name,
+                self.container,
+                image_file,
+                self.blob_service_client,
+                **kwargs
+            )
+        except FileNotFoundError:
+            raise AzureImgUtilsException(
+                'Image file {0} not found. Ensure the path to '
+                'the file is correct.'.format(image_file)
+            )
+
+        return blob_name
+
+    def begin_create_gallery_image_version(
+        self,
+        blob_name,
+        gallery_name,
+        gallery_image_name,
+        image_version,
+        region,
+        force_replace_image=False,
+        gallery_resource_group=None,
+        target_regions=None
+    ):
+        """
+        Start creating a gallery image version from a storage blob.
+
+        Works like create_gallery_image_version but returns the poller
+        of the long running operation instead of waiting for it. The
+        version is replicated to the target regions while it is
+        created, target_regions is a list of dictionaries with the
+        region name and an optional replica_count.
+        """
+        if not all([self.container, self.resource_group,
+                    self.storage_account]):
+            raise AzureImgUtilsException(
+                'Container, resource group and storage account are '
+                'required to create a gallery image'
+            )
+
+        gallery_resource_group = gallery_resource_group or \
+            self.resource_group
+        exists = self.gallery_image_version_exists(
+            gallery_name,
+            gallery_image_name,
+            image_version,
+            gallery_resource_group
+        )
+
+        if exists and force_replace_image:
+            self.delete_gallery_image_version(
+                gallery_name,
+                gallery_image_name,
+                image_version,
+                gallery_resource_group
+            )
+        elif exists:
+            raise AzureImgUtilsException(
+                'Gallery image version already exists. To force deletion '
+                'and re-create the image set "force_replace_image" to True.'
+            )
+
+        source_id = '/subscriptions/{0}/resourceGroups/{1}/providers/' \
+            'Microsoft.Storage/storageAccounts/{2}'.format(
+                self.compute_client._config.subscription_id,
+                self.resource_group,
+                self.storage_account
+            )
+        source_uri = 'https://{0}.blob.core.windows.net/{1}/{2}'.format(
+            self.storage_account,
+            self.container,
+            blob_name
+        )
+        image_profile = {
+            'location': region,
+            'publishing_profile': {
+                'target_regions': get_gallery_target_regions(
+                    region,
+                    target_regions
+                )
+            },
+            'storage_profile': {
+                'os_disk_image': {
+                    'source': {
+                        'id': source_id,
+                        'uri': source_uri
+                    },
+                    'host_caching': 'ReadWrite'
+                }
+            }
+        }
+
+        return self.compute_client.gallery_image_versions.begin_create_or_update(  # noqa
+            gallery_resource_group,
+            gallery_name,
+            gallery_image_name,
+            image_version,
+            image_profile
+        )
+
+    def find_blob_by_digest(self, digest, blob_name=None):
+        """
+        Return the name of a blob in the configured container by digest.
+
+        The blob named blob_name is preferred if it has the digest.
+        Returns None if no blob has the digest in its metadata.
+        """
+        container_client = self.blob_service_client.get_container_client(
+            self.container
+        )
+        match = None
+
+        for blob in container_client.list_blobs(include=['metadata']):
+            if (blob.metadata or {}).get(IMAGE_DIGEST_KEY) != digest:
+                continue
+            elif blob.name == blob_name:
+                return blob.name
+
+            match = match or blob.name
+
+        return match
+
+    def get_blob_sas_url(self, blob_name, expire_hours=6):
+        """
+        Return a read only URL of the blob in the configured container.
+
+        The shared access signature is scoped to the blob and expires
+        after expire_hours.
+        """
+        sas_token = generate_blob_sas(
+            self.storage_account,
+            self.container,
+            blob_name,
+            account_key=self.blob_service_client.credential.account_key,
+            permission=BlobSasPermissions(read=True),
+            expiry=datetime.utcnow() + timedelta(hours=expire_hours)
+        )
+        return 'https://{0}.blob.core.windows.net/{1}/{2}?{3}'.format(
+            self.storage_account,
+            self.container,
+            blob_name,
+            sas_token
+        )
+
+    def copy_image_blob(
+        self,
+        source_url,
+        blob_name,
+        force_replace_image=False,
+        timeout=3600,
+        interval=10
+    ):
+        """
+        Copy a blob to the configured container inside Azure.
+
+        The copy runs server side from the source URL and is polled
+        until it finished. A failed copy or a copy which did not
+        finish within timeout seconds is aborted and the incomplete
+        blob is deleted.
+        """
+        exists = self.image_blob_exists(blob_name)
+
+        if exists and not force_replace_image:
+            raise AzureImgUtilsException(
+                'Image {0} already exists. To replace an existing '
+                'image use force_replace_image option.'.format(blob_name)
+            )
+        elif exists:
+            self.delete_storage_blob(blob_name)
+
+        blob_client = self.blob_service_client.get_blob_client(
+            self.container,
+            blob_name
+        )
+        copy_id = blob_client.start_copy_from_url(source_url)['copy_id']
+        deadline = time.monotonic() + timeout
+
+        try:
+            while True:
+                copy = blob_client.get_blob_properties().copy
+
+                if copy.status == 'success':
+                    return blob_name
+                elif copy.status != 'pending':
+                    raise AzureImgUtilsException(
+                        'Copy of blob {0} {1}: {2}'.format(
+                            blob_name,
+                            copy.status,
+                            copy.status_description
+                        )
+                    )
+                elif time.monotonic() >= deadline:
+                    blob_client.abort_copy(copy_id)
+                    raise AzureImgUtilsException(
+                        'Copy of blob {0} did not finish within {1} '
+                        'seconds.'.format(blob_name, timeout)
+                    )
+
+                time.sleep(interval)
+        except Exception:
+            self.delete_storage_blob(blob_name)
+            raise
@@ -0,0 +1,483 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import fcntl
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+
+from mash.utils.metrics import registry
+
+UPLOAD = 'upload'
+DOWNLOAD = 'download'
+TOTAL = 'total'
+
+bandwidth_wait = registry.histogram(
+    'mash_bandwidth_wait_seconds',
+    'Time transfers waited for the bandwidth scheduler.',
+    ('direction',),
+    buckets=(0, 0.1, 0.5, 1, 5, 30, 60)
+)
+bandwidth_bytes = registry.counter(
+    'mash_bandwidth_bytes_total',
+    'Bytes transferred through the bandwidth scheduler.',
+    ('direction',)
+)
+
+
+class BandwidthBucket(object):
+    """
+    Token bucket of bytes per second.
+
+    The bucket holds up to burst seconds of tokens. Transfers
+    may overdraw the bucket, the debt delays the next transfer
+    until it is refilled. With a state_file the tokens are kept
+    in the file and the bucket is shared by all processes on the
+    host, access is serialized with a file lock.
+    """
+    def __init__(self, rate, burst=1, state_file=None):
+        self.rate = rate
+        self.burst = burst
+        self.state_file = state_file
+        self._state = None
+
+    @property
+    def capacity(self):
+        return self.rate * self.burst
+
+    def _refill(self, state, now):
+        """
+        Return the state with the tokens refilled until now.
+
+        Without a state the bucket starts full.
+        """
+        if state is None:
+            return {'tokens': self.capacity, 'updated': now}
+
+        elapsed = max(0, now - state['updated'])
+        state['tokens'] = min(
+            self.capacity,
+            state['tokens'] + elapsed * self.rate
+        )
+        state['updated'] = now
+        return state
+
+    def _update(self, func, now):
+        """
+        Refill the tokens and apply func to the state, return its result.
+
+        func changes the state in place.
+        """
+        if not self.state_file:
+            self._state = self._refill(self._state, now)
+            return func(self._state)
+
+        with open(self.state_file, 'a+') as state_file:
+            fcntl.flock(state_file, fcntl.LOCK_EX)
+            state_file.seek(0)
+
+            try:
+                state = self._refill(json.loads(state_file.read()), now)
+            except (ValueError, KeyError, TypeError, AttributeError):
+                state = self._refill(None, now)
+
+            result = func(state)
+            state_file.seek(0)
+            state_file.truncate()
+            state_file.write(json.dumps(state))
+
+        return result
+
+    def get_wait(self, now=None, direction=None):
+        """
+        Return the seconds until the bucket is no longer in debt.
+
+        The direction is only used by weighted buckets.
+        """
+        now = time.monotonic() if now is None else now
+        return self._update(
+            lambda state: max(0, -state['tokens'] / self.rate), now
+        )
+
+    def consume(self, size, now=None, direction=None):
+        """
+        Take size tokens from the bucket.
+        """
+        def take(state):
+            state['tokens'] -= size
+
+        now = time.monotonic() if now is None else now
+        self._update(take, now)
+
+
+class WeightedBandwidthBucket(BandwidthBucket):
+    """
+    Token bucket shared by the directions in proportion to their weights.
+
+    Every direction has its own tokens and the refill is split
+    between the active directions by weight. A direction is active
+    while it is in debt or transferred within active_window seconds,
+    the share of an idle direction goes to the others. The state
+    holds the shares, with a state_file the weights apply to the
+    transfers of all processes on the host.
+    """
+    def __init__(
+        self, rate, weights=None, burst=1, state_file=None, active_window=1
+    ):
+        super(WeightedBandwidthBucket, self).__init__(
+            rate, burst=burst, state_file=state_file
+        )
+        self.weights = weights or {}
+        self.active_window = active_window
+
+    def _get_weight(self, direction):
+        return self.weights.get(direction) or 1
+
+    def _is_recent(self, state, direction, now):
+        return now - state['active'][direction] < self.active_window
+
+    def _get_shares(self, state, now):
+        """
+        Return the fraction of the rate of each active direction.
+        """
+        active = [
+            direction for direction, tokens in state['tokens'].items()
+            if tokens < 0 or self._is_recent(state, direction, now)
+        ]
+        total = sum(self._get_weight(direction) for direction in active)
+
+        return {
+            direction: self._get_weight(direction) / total
+            for direction in active
+        }
+
+    def _refill(self, state, now):
+        """
+        Return the state with the shares of the directions refilled.
+
+        Idle directions are removed, a direction starts without
+        tokens once it becomes active.
+        """
+        if state is None:
+            return {'tokens': {}, 'active': {}, 'updated': now}
+
+        elapsed = max(0, now - state['updated'])
+        shares = self._get_shares(state, now)
+
+        for direction in list(state['tokens']):
+            share = shares.get(direction)
+
+            if share is None:
+                del state['tokens'][direction]
+                del state['active'][direction]
+                continue
+
+            state['tokens'][direction] = min(
+                self.capacity * share,
+                state['tokens'][direction] + elapsed * self.rate * share
+            )
+
+        state['updated'] = now
+        return state
+
+    def _activate(self, state, direction, now):
+        state['tokens'].setdefault(direction, 0)
+        state['active'][direction] = now
+
+    def get_wait(self, now=None, direction=None):
+        """
+        Return the seconds until the direction is no longer in debt.
+        """
+        def get_wait(state):
+            self._activate(state, direction, now)
+            share = self._get_shares(state, now)[direction]
+            return max(0, -state['tokens'][direction] / (self.rate * share))
+
+        now = time.monotonic() if now is None else now
+        return self._update(get_wait, now)
+
+    def consume(self, size, now=None, direction=None):
+        """
+        Take size tokens from the share of the direction.
+        """
+        def take(state):
+            self._activate(state, direction, now)
+            state['tokens'][direction] -= size
+
+        now = time.monotonic() if now is None else now
+        self._update(take, now)
+
+
+class BandwidthScheduler(object):
+    """
+    Bandwidth scheduler shared by the transfers of all jobs.
+
+    Transfers are limited per direction (upload and download) and
+    in total with token buckets in bytes per second. Directions
+    without a limit are not scheduled. With a state_dir the buckets
+    are shared by all services on the host.
+
+    The total limit is shared by the directions in proportion to
+    their weights, the shares are kept in the state of the total
+    bucket and hold for the transfers of all services. A direction
+    without transfers leaves its share to the other one.
+
+    Transfers of a service waiting for bandwidth are served by
+    weighted fair queuing: every job and direction is a flow, a
+    transfer is tagged with the virtual time at which it would
+    finish if each flow received bandwidth in proportion to the
+    weight of its direction, and the transfer with the smallest tag
+    goes first. Jobs get equal shares and busy jobs cannot starve
+    others.
+
+    Limits and weights can be changed live by writing them to
+    limits.json in the state_dir, for example with set_limits.
+    The file is checked every check_interval seconds by every
+    service and replaces the configured limits.
+    """
+    def __init__(self):
+        self.limits = {}
+        self.weights = {}
+        self.state_dir = None
+        self.check_interval = 1
+        self._configured = ({}, {})
+        self._buckets = {}
+        self._flows = {}
+        self._queue = []
+        self._virtual_time = 0
+        self._sequence = itertools.count()
+        self._limits_mtime = None
+        self._last_check = None
+        self._cond = threading.Condition()
+
+    @property
+    def limits_file(self):
+        if not self.state_dir:
+            return None
+
+        return os.path.join(self.state_dir, 'limits.json')
+
+    def configure(
+        self, limits=None, weights=None, state_dir=None, check_interval=1
+    ):
+        """
+        Set the limits in bytes per second and the direction weights.
+        """
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+
+        with self._cond:
+            self.state_dir = state_dir
+            self.check_interval = check_interval
+            self._configured = (dict(limits or {}), dict(weights or {}))
+            self._limits_mtime = None
+            self._last_check = None
+            self._apply(*self._configured)
+
+    def _apply(self, limits, weights):
+        self.limits = {
+            name: limit for name, limit in limits.items() if limit
+        }
+        self.weights = weights
+        self._buckets = {}
+
+        for name, limit in self.limits.items():
+            state_file = None
+
+            if self.state_dir:
+                state_file = os.path.join(
+                    self.state_dir, '{0}.bucket'.format(name)
+                )
+
+            if name == TOTAL:
+                self._buckets[name] = WeightedBandwidthBucket(
+                    limit, weights=weights, state_file=state_file
+                )
+            else:
+                self._buckets[name] = BandwidthBucket(
+                    limit, state_file=state_file
+                )
+
+    def set_limits(self, limits, weights=None):
+        """
+        Change the limits of all services on the host.
+
+        Without a state_dir only this process is changed.
+        """
+        data = {'limits': limits, 'weights': weights or self.weights}
+
+        if not self.limits_file:
+            with self._cond:
+                self._apply(data['limits'], data['weights'])
+            return
+
+        temp_file = self.limits_file + '.tmp'
+
+        with open(temp_file, 'w') as limits_file:
+            json.dump(data, limits_file)
+
+        os.replace(temp_file, self.limits_file)
+
+    def _reload(self, now):
+        """
+        Apply limits changed in the limits file since the last check.
+        """
+        if not self.limits_file:
+            return
+
+        if self._last_check is not None and \
+                now - self._last_check < self.check_interval:
+            return
+
+        self._last_check = now
+
+        try:
+            mtime = os.stat(self.limits_file).st_mtime
+        except OSError:
+            mtime = None
+
+        if mtime == self._limits_mtime:
+            return
+
+        self._limits_mtime = mtime
+        limits, weights = self._configured
+
+        if mtime is not None:
+            try:
+                with open(self.limits_file) as limits_file:
+                    data = json.load(limits_file)
+                limits = data.get('limits') or {}
+                weights = data.get('weights') or weights
+            except (OSError, ValueError, AttributeError):
+                return
+
+        self._apply(limits, weights)
+
+    def _get_buckets(self, direction):
+        return [
+            self._buckets[name] for name in (direction, TOTAL)
+            if name in self._buckets
+        ]
+
+    def request(self, size, job_id=None, direction=UPLOAD):
+        """
+        Wait until size bytes can be transferred by the job.
+
+        Return the time spent waiting.
+        """
+        if size <= 0:
+            return 0
+
+        start = time.monotonic()
+
+        with self._cond:
+            self._reload(start)
+            buckets = self._get_buckets(direction)
+
+            if buckets:
+                self._schedule(size, job_id, direction, buckets)
+
+        bandwidth_bytes.inc(size, direction=direction)
+
+        if not buckets:
+            return 0
+
+        waited = time.monotonic() - start
+        bandwidth_wait.observe(waited, direction=direction)
+        return waited
+
+    def _schedule(self, size, job_id, direction, buckets):
+        flow = (job_id, direction)
+        weight = self.weights.get(direction) or 1
+        start_tag = max(self._virtual_time, self._flows.get(flow, 0))
+        finish_tag = start_tag + size / weight
+        self._flows[flow] = finish_tag
+
+        entry = (finish_tag, next(self._sequence))
+        heapq.heappush(self._queue, entry)
+        self._cond.notify_all()
+
+        try:
+            while True:
+                wait = None
+
+                if self._queue[0] == entry:
+                    now = time.monotonic()
+                    wait = max(
+                        bucket.get_wait(now, direction) for bucket in buckets
+                    )
+
+                    if not wait:
+                        for bucket in buckets:
+                            bucket.consume(size, now, direction)
+                        break
+
+                self._cond.wait(wait)
+        finally:
+            self._queue.remove(entry)
+            heapq.heapify(self._queue)
+            self._cond.notify_all()
+
+        # Flows that finished before the virtual time restart from it
+        self._virtual_time = max(self._virtual_time, start_tag)
+        self._flows = {
+            key: tag for key, tag in self._flows.items()
+            if tag > self._virtual_time
+        }
+
+
+class ThrottledReader(object):
+    """
+    File object that draws the bytes read from the bandwidth scheduler.
+
+    Other attributes are passed through to the wrapped file object.
+    """
+    def __init__(
+        self, file_obj, job_id=None, direction=UPLOAD, scheduler=None
+    ):
+        self._file = file_obj
+        self._job_id = job_id
+        self._direction = direction
+        self._scheduler = scheduler or bandwidth_scheduler
+
+    def read(self, *args):
+        data = self._file.read(*args)
+        self._scheduler.request(len(data), self._job_id, self._direction)
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._file.close()
+
+
+def open_throttled(file_name, job_id=None, direction=UPLOAD, opener=open):
+    """
+    Open the file for reading through the bandwidth scheduler.
+    """
+    return ThrottledReader(opener(file_name, 'rb'), job_id, direction)
+
+
+bandwidth_scheduler = BandwidthScheduler()
@@ -0,0 +1,633 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import json
+import threading
+import time
+
+from collections import deque
+from contextlib import contextmanager
+
+from botocore import handlers
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
+from azure.core.pipeline.policies import HTTPPolicy
+
+from mash.utils.metrics import cloud_api_duration, cloud_api_errors, registry
+from mash.utils.rate_limiter import rate_limiter
+from mash.utils.tracing import SPAN_KIND_CLIENT, tracer
+
+THROTTLING_ERRORS = {
+    'Throttling',
+    'ThrottlingException',
+    'ThrottledException',
+    'RequestLimitExceeded',
+    'RequestThrottled',
+    'RequestThrottledException',
+    'TooManyRequestsException',
+    'SlowDown',
+    'rateLimitExceeded',
+    'userRateLimitExceeded',
+    'TooManyRequests',
+    '429'
+}
+
+cloud_api_retries = registry.counter(
+    'mash_cloud_api_retries_total',
+    'Cloud provider API requests retried by the SDK.',
+    ('cloud', 'operation')
+)
+cloud_api_throttled = registry.counter(
+    'mash_cloud_api_throttled_total',
+    'Cloud provider API calls rejected by rate limiting.',
+    ('cloud', 'operation')
+)
+
+_local = threading.local()
+
+
+def is_throttling_error(error):
+    return error in THROTTLING_ERRORS
+
+
+def get_profiler():
+    """
+    Return the API call profiler active in the current thread or None.
+    """
+    return getattr(_local, 'profiler', None)
+
+
+def get_account():
+    """
+    Return the cloud account calls are attributed to in this thread.
+    """
+    return getattr(_local, 'account', None)
+
+
+def get_user():
+    """
+    Return the mash user that owns the account in this thread.
+
+    Account names are only unique per user, rate limits are kept
+    per user and account.
+    """
+    return getattr(_local, 'user', None)
+
+
+@contextmanager
+def profile_api_calls(profiler, account=None, user=None):
+    """
+    Record the cloud API calls of the thread in the profiler.
+
+    Hooks run in the thread that makes the call, threads started
+    in the with block need to activate the profiler themselves.
+    """
+    previous = get_profiler(), get_account(), get_user()
+    _local.profiler = profiler
+    _local.account = account
+    _local.user = user
+
+    try:
+        yield profiler
+    finally:
+        _local.profiler, _local.account, _local.user = previous
+
+
+@contextmanager
+def api_account(account, user=None):
+    """
+    Attribute the cloud API calls in the with block to the account.
+
+    The account belongs to the user of the thread unless a user
+    is given.
+    """
+    previous = get_account(), get_user()
+    _local.account = account
+    _local.user = user or previous[1]
+
+    try:
+        yield
+    finally:
+        _local.account, _local.user = previous
+
+
+class ApiCallStats(object):
+    """
+    Counters for a group of API calls.
+    """
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.throttled = 0
+        self.duration = 0.0
+        self.max_duration = 0.0
+
+    def add(self, duration, error=None, retries=0):
+        self.calls += 1
+        self.retries += retries
+        self.duration += duration
+        self.max_duration = max(self.max_duration, duration)
+
+        if error:
+            self.errors += 1
+
+        if is_throttling_error(error):
+            self.throttled += 1
+
+    def to_dict(self):
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'retries': self.retries,
+            'throttled': self.throttled,
+            'duration': round(self.duration, 3),
+            'max_duration': round(self.max_duration, 3)
+        }
+
+
+class CloudApiProfiler(object):
+    """
+    Per job record of cloud API calls.
+
+    Calls are grouped per operation and per account and region,
+    rate limits apply per account and region in all clouds. The
+    call rate of each account is measured over a sliding window
+    and a warning is logged when it approaches the configured
+    limit or when the cloud throttles a call. Each warning is
+    logged at most once per window for an account.
+    """
+    def __init__(
+        self, log_callback=None, rate_limits=None, window=60,
+        warning_ratio=0.8
+    ):
+        self.log_callback = log_callback
+        self.rate_limits = rate_limits or {}
+        self.window = window
+        self.warning_ratio = warning_ratio
+        self.total = ApiCallStats()
+        self.operations = {}
+        self.accounts = {}
+        self._calls = {}
+        self._max_rates = {}
+        self._warnings = {}
+        self._lock = threading.Lock()
+
+    def record_call(
+        self, cloud, operation, duration, error=None, retries=0,
+        account=None, region=None
+    ):
+        """
+        Add the API call to the profile and check the account rate.
+        """
+        account_key = (cloud, account or get_account(), region)
+        now = time.monotonic()
+
+        with self._lock:
+            self.total.add(duration, error, retries)
+
+            for stats, key in (
+                (self.operations, (cloud, operation)),
+                (self.accounts, account_key)
+            ):
+                if key not in stats:
+                    stats[key] = ApiCallStats()
+
+                stats[key].add(duration, error, retries)
+
+            rate = self._update_rate(account_key, now)
+            warnings = []
+
+            if is_throttling_error(error):
+                warnings.append(
+                    ('throttled', '{0} was throttled: {1}'.format(
+                        operation, error
+                    ))
+                )
+
+            limit = self.rate_limits.get(cloud)
+            if limit and rate >= limit * self.warning_ratio:
+                warnings.append(
+                    ('rate', 'call rate is {0:.1f}/s of a {1}/s limit'.format(
+                        rate, limit
+                    ))
+                )
+
+            warnings = [
+                message for kind, message in warnings
+                if self._should_warn(account_key, kind, now)
+            ]
+
+        for message in warnings:
+            self._warn(account_key, message)
+
+    def _update_rate(self, account_key, now):
+        calls = self._calls.setdefault(account_key, deque())
+        calls.append(now)
+
+        while calls[0] <= now - self.window:
+            calls.popleft()
+
+        rate = len(calls) / self.window
+        self._max_rates[account_key] = max(
+            self._max_rates.get(account_key, 0), rate
+        )
+        return rate
+
+    def _should_warn(self, account_key, kind, now):
+        last_warning = self._warnings.get((account_key, kind))
+
+        if last_warning is not None and now - last_warning < self.window:
+            return False
+
+        self._warnings[(account_key, kind)] = now
+        return True
+
+    def _warn(self, account_key, message):
+        if not self.log_callback:
+            return
+
+        cloud, account, region = account_key
+        self.log_callback.warning(
+            'API rate limit warning for {0} account {1}{2}: {3}.'.format(
+                cloud,
+                account or 'unknown',
+                ' in {0}'.format(region) if region else '',
+                message
+            )
+        )
+
+    def get_summary(self, max_operations=10):
+        """
+        Return a summary of the API calls for the job status message.
+
+        Operations are sorted by total time spent and limited to
+        max_operations.
+        """
+        with self._lock:
+            summary = self.total.to_dict()
+            summary['accounts'] = [
+                dict(
+                    cloud=cloud,
+                    account=account,
+                    region=region,
+                    max_rate=round(self._max_rates[(cloud, account, region)], 3),
+                    **stats.to_dict()
+                )
+                for (cloud, account, region), stats in self.accounts.items()
+            ]
+            operations = sorted(
+                self.operations.items(),
+                key=lambda item: item[1].duration,
+                reverse=True
+            )
+            summary['operations'] = [
+                dict(cloud=cloud, operation=operation, **stats.to_dict())
+                for (cloud, operation), stats in operations[:max_operations]
+            ]
+
+        return summary
+
+
+def start_api_call(cloud, operation, **attributes):
+    """
+    Return the state of an API call that has been sent.
+    """
+    return {
+        'cloud': cloud,
+        'operation': operation,
+        'region': attributes.get('region'),
+        'start_time': time.monotonic(),
+        'span': tracer.start_span(
+            '{0} {1}'.format(cloud, operation),
+            kind=SPAN_KIND_CLIENT,
+            attributes=dict(attributes, **{'rpc.method': operation})
+        )
+    }
+
+
+def finish_api_call(call, error=None, retries=0, status_code=None):
+    """
+    Record the finished API call in metrics, trace and job profile.
+    """
+    cloud = call['cloud']
+    operation = call['operation']
+    duration = time.monotonic() - call['start_time']
+    error = str(error) if error else None
+
+    cloud_api_duration.observe(duration, cloud=cloud, operation=operation)
+
+    if retries:
+        cloud_api_retries.inc(retries, cloud=cloud, operation=operation)
+
+    if error:
+        cloud_api_errors.inc(cloud=cloud, operation=operation, error=error)
+
+    if is_throttling_error(error):
+        cloud_api_throttled.inc(cloud=cloud, operation=operation)
+
+    span = call['span']
+    span.set_attribute('mash.retries', retries)
+
+    if status_code:
+        span.set_attribute('http.status_code', status_code)
+
+    if error:
+        span.set_error(error)
+
+    span.end()
+
+    profiler = get_profiler()
+    if profiler:
+        profiler.record_call(
+            cloud,
+            operation,
+            duration,
+            error=error,
+            retries=retries,
+            region=call['region']
+        )
+
+
+# botocore event handlers
+
+def boto_before_call(model, context, request_signer=None, **kwargs):
+    context['mash_api_call'] = start_api_call(
+        model.service_model.service_name,
+        model.name,
+        region=getattr(request_signer, 'region_name', None),
+        **{'rpc.service': model.service_model.service_name}
+    )
+
+
+def boto_after_call(http_response, parsed, context, **kwargs):
+    call = context.pop('mash_api_call', None)
+
+    if not call:
+        return
+
+    error = None
+    if http_response.status_code >= 400:
+        error = parsed.get('Error', {}).get('Code', 'Unknown')
+
+    finish_api_call(
+        call,
+        error=error,
+        retries=parsed.get('ResponseMetadata', {}).get('RetryAttempts', 0),
+        status_code=http_response.status_code
+    )
+
+
+def boto_after_call_error(exception, context, **kwargs):
+    call = context.pop('mash_api_call', None)
+
+    if call:
+        finish_api_call(call, error=type(exception).__name__)
+
+
+def boto_request_created(request, operation_name, **kwargs):
+    # Emitted for every attempt of an EC2 call including retries
+    call = request.context.get('mash_api_call')
+
+    if call:
+        rate_limiter.acquire(
+            call['cloud'],
+            operation_name,
+            account=get_account(),
+            region=call['region'],
+            user=get_user()
+        )
+
+
+def boto_response_received(parsed_response, context, exception=None,
+                           **kwargs):
+    call = context.get('mash_api_call')
+
+    if not call or exception is not None:
+        return
+
+    error = (parsed_response or {}).get('Error', {}).get('Code')
+    rate_limiter.record(
+        call['cloud'],
+        call['operation'],
+        throttled=is_throttling_error(error),
+        account=get_account(),
+        region=call['region'],
+        user=get_user()
+    )
+
+
+def register_boto_handlers():
+    """
+    Add the API call hooks to every botocore session created after.
+
+    Clients are created by ec2imgutils as well as mash, registering
+    the handlers as builtin handlers instruments them all. Each
+    attempt of an EC2 call goes through the shared rate limiter.
+    """
+    specs = [
+        ('before-call', boto_before_call),
+        ('after-call', boto_after_call),
+        ('after-call-error', boto_after_call_error),
+        ('request-created.ec2', boto_request_created),
+        ('response-received.ec2', boto_response_received)
+    ]
+
+    for spec in specs:
+        if spec not in handlers.BUILTIN_HANDLERS:
+            handlers.BUILTIN_HANDLERS.append(spec)
+
+
+# googleapiclient request builder
+
+class CountingHttp(object):
+    """
+    Count the HTTP requests of an API call including retries.
+
+    Each request of the call goes through the shared rate limiter.
+    """
+    def __init__(self, http, call):
+        self.http = http
+        self.call = call
+        self.requests = 0
+
+    def request(self, *args, **kwargs):
+        self.requests += 1
+        account = get_account()
+        user = get_user()
+        operation = self.call['operation']
+
+        rate_limiter.acquire('gce', operation, account=account, user=user)
+        response, content = self.http.request(*args, **kwargs)
+        rate_limiter.record(
+            'gce',
+            operation,
+            throttled=is_throttling_error(
+                get_gce_reason(response.status, content)
+            ),
+            account=account,
+            user=user
+        )
+        return response, content
+
+    def __getattr__(self, name):
+        return getattr(self.http, name)
+
+
+def get_gce_reason(status, content):
+    """
+    Return the error reason of a Google API response or None.
+    """
+    if status < 400:
+        return None
+
+    try:
+        return json.loads(content)['error']['errors'][0]['reason']
+    except Exception:
+        return str(status)
+
+
+def get_gce_error(error):
+    """
+    Return the error reason of a Google API HttpError.
+    """
+    return get_gce_reason(error.resp.status, error.content)
+
+
+class ProfiledHttpRequest(HttpRequest):
+    """
+    Google API request that records each execution.
+
+    Used as the requestBuilder of discovery clients.
+    """
+    def execute(self, http=None, num_retries=0):
+        call = start_api_call('gce', self.methodId or self.method)
+        http = CountingHttp(http or self.http, call)
+        error = None
+
+        try:
+            return super(ProfiledHttpRequest, self).execute(
+                http=http,
+                num_retries=num_retries
+            )
+        except HttpError as http_error:
+            error = get_gce_error(http_error)
+            raise
+        except Exception as exception:
+            error = type(exception).__name__
+            raise
+        finally:
+            finish_api_call(
+                call,
+                error=error,
+                retries=max(http.requests - 1, 0)
+            )
+
+
+# Azure pipeline policy
+
+def get_azure_operation(http_request):
+    """
+    Return the method and resource type of an Azure request.
+
+    ARM resource paths alternate between types and names after the
+    provider namespace, names are dropped so the operation does not
+    contain ids.
+    """
+    path = http_request.url.split('?', maxsplit=1)[0]
+    segments = [segment for segment in path.split('/') if segment]
+
+    if 'providers' in segments:
+        segments = segments[segments.index('providers') + 1:]
+        resource = '/'.join([segments[0]] + segments[1::2])
+    elif '.blob.' in path:
+        resource = 'blob'
+    else:
+        resource = segments[-1] if segments else ''
+
+    return '{0} {1}'.format(http_request.method, resource)
+
+
+class AzureApiProfilerPolicy(HTTPPolicy):
+    """
+    Record Azure API calls.
+
+    Added in front of the retry policy so each call is recorded
+    once with the number of retries it took. Calls wait for the
+    shared rate limiter before they are sent.
+    """
+    def send(self, request):
+        operation = get_azure_operation(request.http_request)
+        account = get_account()
+        user = get_user()
+
+        rate_limiter.acquire('azure', operation, account=account, user=user)
+        call = start_api_call('azure', operation)
+
+        try:
+            response = self.next.send(request)
+        except Exception as exception:
+            finish_api_call(
+                call,
+                error=type(exception).__name__,
+                retries=request.context.get('retry_count', 0)
+            )
+            raise
+
+        status_code = response.http_response.status_code
+        error = None
+
+        if status_code >= 400:
+            error = response.http_response.headers.get(
+                'x-ms-error-code'
+            ) or str(status_code)
+
+        rate_limiter.record(
+            'azure',
+            operation,
+            throttled=is_throttling_error(error) or status_code == 429,
+            account=account,
+            user=user
+        )
+        finish_api_call(
+            call,
+            error=error,
+            retries=request.context.get('retry_count', 0),
+            status_code=status_code
+        )
+        return response
+
+
+def add_azure_profiler_policy(client):
+    """
+    Add the profiler policy in front of the client pipeline.
+
+    Azure clients created by azure_img_utils do not accept custom
+    policies, the policy is linked into the pipeline of the client
+    instead.
+    """
+    pipeline = getattr(client, '_pipeline', None) or client._client._pipeline
+    policies = pipeline._impl_policies
+
+    if policies and isinstance(policies[0], AzureApiProfilerPolicy):
+        return client
+
+    policy = AzureApiProfilerPolicy()
+    policy.next = policies[0]
+    policies.insert(0, policy)
+    return client
@@ -0,0 +1,152 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import threading
+import time
+
+from collections import namedtuple
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+from mash.utils.cloud_api import (
+    get_account,
+    get_profiler,
+    get_user,
+    profile_api_calls
+)
+from mash.utils.tracing import tracer
+
+
+class TaskResult(
+    namedtuple('TaskResult', ['name', 'account', 'result', 'error', 'duration'])
+):
+    """
+    Outcome of a task run by the TaskExecutor.
+    """
+    __slots__ = ()
+
+    @property
+    def cancelled(self):
+        return isinstance(self.error, CancelledError)
+
+    def to_dict(self):
+        if self.cancelled:
+            status = 'cancelled'
+        elif self.error:
+            status = 'failed'
+        else:
+            status = 'success'
+
+        return {
+            'name': self.name,
+            'account': self.account,
+            'status': status,
+            'duration': round(self.duration, 3)
+        }
+
+
+class TaskExecutor(object):
+    """
+    Run independent tasks of a job in parallel threads.
+
+    Tasks run in the trace context and with the API call profiler
+    of the thread that created the executor, cloud API calls of a
+    task are attributed to the account of the task. At most
+    max_account_workers tasks of one account run at the same time.
+
+    A failing task does not stop the other tasks, the error is
+    returned in the result of the task. Tasks can cancel their
+    siblings with cancel, tasks that have not started are then
+    skipped with a CancelledError. Running tasks are not interrupted.
+    """
+    def __init__(self, max_workers=10, max_account_workers=None):
+        self.max_workers = max_workers
+        self.max_account_workers = max_account_workers
+        self.tasks = []
+        self._account = get_account()
+        self._profiler = get_profiler()
+        self._user = get_user()
+        self._context = tracer.get_current_context()
+        self._account_semaphores = {}
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """
+        Skip the tasks that have not started yet.
+        """
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def submit(self, name, func, *args, account=None, **kwargs):
+        """
+        Add a task to run func with the arguments.
+        """
+        self.tasks.append((name, account, func, args, kwargs))
+
+    def _run_task(self, name, account, func, args, kwargs):
+        semaphore = self._account_semaphores.get(account)
+
+        if semaphore:
+            semaphore.acquire()
+
+        start = time.monotonic()
+        result = error = None
+
+        try:
+            if self.is_cancelled():
+                raise CancelledError()
+
+            with tracer.activate(self._context), profile_api_calls(
+                self._profiler, account or self._account, self._user
+            ):
+                with tracer.span(name, attributes={'mash.task': name}):
+                    result = func(*args, **kwargs)
+        except Exception as task_error:
+            error = task_error
+        finally:
+            if semaphore:
+                semaphore.release()
+
+        return TaskResult(
+            name, account, result, error, time.monotonic() - start
+        )
+
+    def run(self):
+        """
+        Run the submitted tasks and return the results in order.
+        """
+        tasks, self.tasks = self.tasks, []
+        self._cancelled.clear()
+
+        if not tasks:
+            return []
+
+        if self.max_account_workers:
+            for _, account, _, _, _ in tasks:
+                self._account_semaphores.setdefault(
+                    account,
+                    threading.BoundedSemaphore(self.max_account_workers)
+                )
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(tasks))
+        ) as pool:
+            futures = [pool.submit(self._run_task, *task) for task in tasks]
+
+        return [future.result() for future in futures]
@@ -0,0 +1,394 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import base64
+import hashlib
+import lzma
+import math
+import os
+import struct
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from mash.mash_exceptions import MashUploadException
+from mash.utils.bandwidth import ThrottledReader
+from mash.utils.cloud_api import (
+    get_account,
+    get_profiler,
+    get_user,
+    profile_api_calls
+)
+
+GIB = 1024 ** 3
+CHECKSUM_ALGORITHM = 'SHA256'
+
+
+def open_image(image_file):
+    """
+    Open the raw image file, xz compressed images are decompressed.
+    """
+    if image_file.endswith('.xz'):
+        return lzma.open(image_file, 'rb')
+
+    return open(image_file, 'rb')
+
+
+def _read_multibyte_integer(data, pos):
+    """
+    Decode a variable length integer of the xz index at pos.
+
+    Return the value and the position after the integer.
+    """
+    value = 0
+    shift = 0
+
+    while True:
+        byte = data[pos]
+        value |= (byte & 0x7f) << shift
+        pos += 1
+
+        if not byte & 0x80:
+            return value, pos
+
+        shift += 7
+
+
+def get_xz_uncompressed_size(image_file):
+    """
+    Return the uncompressed size of the xz compressed image.
+
+    The size is the sum of the uncompressed sizes of all blocks
+    recorded in the index of each stream. The index is found with
+    the backward size of the stream footer at the end of the file,
+    the image is not decompressed.
+    """
+    size = 0
+
+    with open(image_file, 'rb') as image:
+        end = image.seek(0, os.SEEK_END)
+
+        try:
+            while end > 0:
+                image.seek(end - 4)
+
+                if image.read(4) == b'\0\0\0\0':
+                    # Stream padding
+                    end -= 4
+                    continue
+
+                image.seek(end - 12)
+                footer = image.read(12)
+
+                if footer[10:] != b'YZ':
+                    raise ValueError('no stream footer')
+
+                index_size = (struct.unpack('<I', footer[4:8])[0] + 1) * 4
+                image.seek(end - 12 - index_size)
+                index = image.read(index_size)
+
+                if index[0] != 0:
+                    raise ValueError('no stream index')
+
+                count, pos = _read_multibyte_integer(index, 1)
+                blocks_size = 0
+
+                for _ in range(count):
+                    unpadded_size, pos = _read_multibyte_integer(index, pos)
+                    block_size, pos = _read_multibyte_integer(index, pos)
+                    blocks_size += (unpadded_size + 3) // 4 * 4
+                    size += block_size
+
+                # Stream header, blocks, index and stream footer
+                end -= 12 + blocks_size + index_size + 12
+        except (IndexError, OSError, ValueError) as error:
+            raise MashUploadException(
+                'Unable to read the size of image {0}: {1}'.format(
+                    image_file, error
+                )
+            )
+
+    return size
+
+
+def get_image_size(image_file):
+    """
+    Return the size in bytes of the raw image.
+    """
+    if image_file.endswith('.xz'):
+        return get_xz_uncompressed_size(image_file)
+
+    return os.path.getsize(image_file)
+
+
+def get_volume_size(image_file, min_size=10):
+    """
+    Return the size in GiB of the volume required for the image.
+    """
+    return max(min_size, math.ceil(get_image_size(image_file) / GIB))
+
+
+def delete_snapshot(ec2_client, snapshot_id, log_callback=None):
+    """
+    Delete the snapshot of a failed image creation.
+
+    Errors are logged and not raised to not hide the original error.
+    """
+    try:
+        ec2_client.delete_snapshot(SnapshotId=snapshot_id)
+    except Exception as error:
+        if log_callback:
+            log_callback.warning(
+                'Unable to delete snapshot {0}: {1}'.format(
+                    snapshot_id, error
+                )
+            )
+
+
+def read_block(image, block_size):
+    """
+    Read one block of the image, the last block is padded with zeros.
+
+    Return None at the end of the image.
+    """
+    data = b''
+
+    while len(data) < block_size:
+        chunk = image.read(block_size - len(data))
+
+        if not chunk:
+            break
+
+        data += chunk
+
+    if not data:
+        return None
+
+    return data.ljust(block_size, b'\0')
+
+
+def is_zero_block(data):
+    return data.count(0) == len(data)
+
+
+def put_snapshot_block(ebs_client, snapshot_id, block_index, data):
+    """
+    Write one block of the snapshot and return its SHA256 digest.
+    """
+    digest = hashlib.sha256(data).digest()
+    ebs_client.put_snapshot_block(
+        SnapshotId=snapshot_id,
+        BlockIndex=block_index,
+        BlockData=data,
+        DataLength=len(data),
+        Checksum=base64.b64encode(digest).decode(),
+        ChecksumAlgorithm=CHECKSUM_ALGORITHM
+    )
+    return digest
+
+
+def write_snapshot_blocks(
+    ebs_client,
+    snapshot_id,
+    block_size,
+    image_file,
+    volume_size,
+    max_workers=16,
+    job_id=None
+):
+    """
+    Write the non zero blocks of the image to the snapshot in parallel.
+
+    At most 2 * max_workers blocks are held in memory. The image is
+    read through the bandwidth scheduler on behalf of job_id.
+
+    Return the digests of the written blocks by block index and the
+    number of blocks of the image.
+    """
+    max_blocks = volume_size * GIB // block_size
+    profiler = get_profiler()
+    account = get_account()
+    user = get_user()
+    digests = {}
+
+    def put_block(block_index, data):
+        with profile_api_calls(profiler, account, user):
+            digests[block_index] = put_snapshot_block(
+                ebs_client, snapshot_id, block_index, data
+            )
+
+    block_index = 0
+    pending = set()
+
+    with ThrottledReader(open_image(image_file), job_id) as image, \
+            ThreadPoolExecutor(max_workers=max_workers) as pool:
+        try:
+            while True:
+                data = read_block(image, block_size)
+
+                if data is None:
+                    break
+                elif block_index >= max_blocks:
+                    raise MashUploadException(
+                        'Image {0} does not fit in a volume of {1} GiB.'.format(
+                            image_file, volume_size
+                        )
+                    )
+
+                if not is_zero_block(data):
+                    pending.add(pool.submit(put_block, block_index, data))
+
+                if len(pending) >= 2 * max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        future.result()
+
+                block_index += 1
+
+            for future in pending:
+                future.result()
+        except Exception:
+            for future in pending:
+                future.cancel()
+            raise
+
+    return digests, block_index
+
+
+def create_snapshot_from_image(
+    ebs_client,
+    image_file,
+    description,
+    volume_size=None,
+    max_workers=16,
+    log_callback=None,
+    job_id=None,
+    ec2_client=None
+):
+    """
+    Write the raw image into a new snapshot with the EBS direct APIs.
+
+    Blocks that only contain zeros are skipped as unwritten blocks
+    of a snapshot read as zeros. An image larger than volume_size
+    fails before the snapshot is started. If writing the snapshot
+    fails it is deleted with ec2_client.
+
+    Return the id of the snapshot. The snapshot is in pending state
+    until EC2 finished processing the blocks.
+    """
+    volume_size = volume_size or get_volume_size(image_file)
+    image_size = get_image_size(image_file)
+
+    if image_size > volume_size * GIB:
+        raise MashUploadException(
+            'Image {0} does not fit in a volume of {1} GiB.'.format(
+                image_file, volume_size
+            )
+        )
+
+    snapshot = ebs_client.start_snapshot(
+        VolumeSize=volume_size,
+        Description=description
+    )
+    snapshot_id = snapshot['SnapshotId']
+
+    try:
+        digests, block_count = write_snapshot_blocks(
+            ebs_client,
+            snapshot_id,
+            snapshot['BlockSize'],
+            image_file,
+            volume_size,
+            max_workers=max_workers,
+            job_id=job_id
+        )
+
+        # The linear aggregate is the checksum of the block checksums
+        # in order of the block index.
+        checksum = hashlib.sha256(
+            b''.join(digests[index] for index in sorted(digests))
+        ).digest()
+        ebs_client.complete_snapshot(
+            SnapshotId=snapshot_id,
+            ChangedBlocksCount=len(digests),
+            Checksum=base64.b64encode(checksum).decode(),
+            ChecksumAlgorithm=CHECKSUM_ALGORITHM,
+            ChecksumAggregationMethod='LINEAR'
+        )
+    except Exception:
+        if ec2_client:
+            delete_snapshot(ec2_client, snapshot_id, log_callback)
+        raise
+
+    if log_callback:
+        log_callback.info(
+            'Wrote {0} of {1} blocks of image to snapshot {2}.'.format(
+                len(digests), block_count, snapshot_id
+            )
+        )
+
+    return snapshot_id
+
+
+def register_image_from_snapshot(
+    ec2_client,
+    snapshot_id,
+    image_name,
+    image_description,
+    arch='x86_64',
+    boot_mode='legacy-bios',
+    tpm_support=None,
+    billing_codes=None,
+    volume_type='gp3',
+    root_device_name='/dev/sda1'
+):
+    """
+    Wait for the snapshot to complete and register an AMI from it.
+
+    Return the id of the new AMI.
+    """
+    ec2_client.get_waiter('snapshot_completed').wait(
+        SnapshotIds=[snapshot_id]
+    )
+
+    kwargs = {
+        'Name': image_name,
+        'Description': image_description,
+        'Architecture': arch,
+        'RootDeviceName': root_device_name,
+        'BlockDeviceMappings': [{
+            'DeviceName': root_device_name,
+            'Ebs': {
+                'SnapshotId': snapshot_id,
+                'VolumeType': volume_type,
+                'DeleteOnTermination': True
+            }
+        }],
+        'VirtualizationType': 'hvm',
+        'EnaSupport': True,
+        'SriovNetSupport': 'simple',
+        'BootMode': boot_mode
+    }
+
+    if tpm_support:
+        kwargs['TpmSupport'] = tpm_support
+
+    if billing_codes:
+        kwargs['BillingProducts'] = billing_codes.split(',')
+
+    return ec2_client.register_image(**kwargs)['ImageId']
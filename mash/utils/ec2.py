@@ -21,7 +21,11 @@ import json
 import boto3
 
 from contextlib import contextmanager, suppress
-from mash.utils.mash_utils import generate_name, get_key_from_file
+from mash.utils.mash_utils import (
+    IMAGE_DIGEST_KEY,
+    generate_name,
+    get_key_from_file
+)
 from mash.mash_exceptions import MashGCEUtilsException
 
 from ec2imgutils.ec2setup import EC2Setup
@@ -214,6 +218,70 @@ def image_exists(client, cloud_image_name):
     return False
 
 
+def find_object_by_digest(client, bucket, digest, size, key_name=None):
+    """
+    Return the key of an object in the S3 bucket with the image digest.
+
+    Only the metadata of objects with the size of the image is
+    requested. The object key_name is preferred if it has the digest.
+    Returns None if no object has the digest.
+    """
+    keys = []
+    paginator = client.get_paginator('list_objects_v2')
+
+    for page in paginator.paginate(Bucket=bucket):
+        for item in page.get('Contents', []):
+            if item['Size'] == size:
+                keys.append(item['Key'])
+
+    keys.sort(key=lambda key: key != key_name)
+
+    for key in keys:
+        response = client.head_object(Bucket=bucket, Key=key)
+
+        if response['Metadata'].get(IMAGE_DIGEST_KEY) == digest:
+            return key
+
+
+def get_account_id(access_key_id, secret_access_key, region_name):
+    """
+    Return the AWS account number of the credentials.
+    """
+    client = get_client(
+        'sts',
+        access_key_id,
+        secret_access_key,
+        region_name
+    )
+    return client.get_caller_identity()['Account']
+
+
+def modify_image_sharing(client, image_id, account_ids, operation='add'):
+    """
+    Add or remove the permissions of the accounts to copy the image.
+
+    Copying an AMI requires launch permission on the image and
+    create volume permission on each of its snapshots.
+    """
+    user_ids = [{'UserId': account_id} for account_id in account_ids]
+    client.modify_image_attribute(
+        ImageId=image_id,
+        LaunchPermission={operation.capitalize(): user_ids}
+    )
+
+    for image in describe_images(client, [image_id]):
+        for mapping in image.get('BlockDeviceMappings', []):
+            snapshot_id = mapping.get('Ebs', {}).get('SnapshotId')
+
+            if snapshot_id:
+                client.modify_snapshot_attribute(
+                    SnapshotId=snapshot_id,
+                    Attribute='createVolumePermission',
+                    OperationType=operation,
+                    UserIds=list(account_ids)
+                )
+
+
 def start_mp_change_set(
     client,
     entity_id,
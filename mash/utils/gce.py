@@ -18,6 +18,7 @@
 
 import datetime
 import itertools
+import os
 import random
 import time
 
@@ -29,15 +30,29 @@ from googleapiclient import discovery
 from googleapiclient.errors import HttpError
 
 from mash.mash_exceptions import MashException
+from mash.utils.bandwidth import open_throttled
+from mash.utils.cloud_api import ProfiledHttpRequest
+from mash.utils.mash_utils import IMAGE_DIGEST_KEY
 
 
-def upload_image_tarball(storage_driver, object_name, image_file, bucket):
+def upload_image_tarball(
+    storage_driver, object_name, image_file, bucket, job_id=None,
+    digest=None
+):
     """
     Upload image tarball to blob in the provided bucket.
+
+    The tarball is read through the bandwidth scheduler. The image
+    digest is stored in the blob metadata.
     """
     bucket = storage_driver.get_bucket(bucket)
     blob = bucket.blob(object_name)
-    blob.upload_from_filename(image_file)
+
+    if digest:
+        blob.metadata = {IMAGE_DIGEST_KEY: digest}
+
+    with open_throttled(image_file, job_id) as image:
+        blob.upload_from_file(image, size=os.path.getsize(image_file))
 
 
 def blob_exists(storage_driver, object_name, bucket):
@@ -49,6 +64,36 @@ def blob_exists(storage_driver, object_name, bucket):
     return blob.exists()
 
 
+def find_blob_by_digest(storage_driver, digest, bucket, object_name=None):
+    """
+    Return the name of a blob in the provided bucket with the digest.
+
+    The blob named object_name is preferred if it has the digest.
+    Returns None if no blob has the digest in its metadata.
+    """
+    match = None
+
+    for blob in storage_driver.get_bucket(bucket).list_blobs():
+        if (blob.metadata or {}).get(IMAGE_DIGEST_KEY) != digest:
+            continue
+        elif blob.name == object_name:
+            return blob.name
+
+        match = match or blob.name
+
+    return match
+
+
+def copy_blob(storage_driver, source_name, object_name, bucket):
+    """
+    Copy the blob source_name to object_name in the provided bucket.
+
+    The blob is copied by the storage service.
+    """
+    bucket = storage_driver.get_bucket(bucket)
+    bucket.copy_blob(bucket.blob(source_name), bucket, object_name)
+
+
 def delete_image_tarball(storage_driver, object_name, bucket):
     """
     Delete image tarball based on object_name from bucket.
@@ -302,7 +347,8 @@ def get_gce_compute_driver(credentials, version='v1'):
         'compute',
         version,
         credentials=client_creds,
-        cache_discovery=False
+        cache_discovery=False,
+        requestBuilder=ProfiledHttpRequest
     )
 
 
@@ -0,0 +1,208 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import io
+import os
+import threading
+import time
+
+from collections import OrderedDict
+
+module_lock = threading.Lock()
+readers = OrderedDict()
+
+
+class JobLogReader(object):
+    """
+    Read byte and line ranges from an append-only job log file.
+
+    A sparse index stores the byte offset of every index_interval
+    line. A line range read seeks to the nearest indexed line instead
+    of scanning the file from the start, and the index is extended
+    incrementally as the logger appends to the file.
+
+    If data is provided the log is read from memory instead, this is
+    used for logs restored from the archive.
+    """
+
+    def __init__(self, log_file, index_interval=1000, data=None):
+        self.log_file = log_file
+        self.index_interval = index_interval
+        self.data = data
+        self._lock = threading.Lock()
+        self._reset_index()
+
+    def _open(self):
+        if self.data is not None:
+            return io.BytesIO(self.data)
+
+        return open(self.log_file, 'rb')
+
+    def _reset_index(self):
+        self.offsets = [0]
+        self.indexed_size = 0
+        self.line_count = 0
+
+    def get_size(self):
+        """
+        Return the current size of the log file in bytes.
+
+        :rtype: int
+        """
+        if self.data is not None:
+            return len(self.data)
+
+        return os.path.getsize(self.log_file)
+
+    def update_index(self):
+        """
+        Index any complete lines appended since the last update.
+
+        A partial last line is left for the next update. If the file
+        shrank it was replaced and the index is rebuilt.
+        """
+        with self._lock:
+            size = self.get_size()
+
+            if size < self.indexed_size:
+                self._reset_index()
+
+            if size == self.indexed_size:
+                return
+
+            position = self.indexed_size
+
+            with self._open() as log:
+                log.seek(position)
+
+                for line in log:
+                    if not line.endswith(b'\n'):
+                        break
+
+                    position += len(line)
+                    self.line_count += 1
+
+                    if self.line_count % self.index_interval == 0:
+                        self.offsets.append(position)
+
+            self.indexed_size = position
+
+    def read_bytes(self, offset, limit):
+        """
+        Return up to limit bytes starting at offset and the next offset.
+
+        :rtype: tuple
+        """
+        with self._open() as log:
+            log.seek(offset)
+            data = log.read(limit)
+
+        return data, offset + len(data)
+
+    def read_lines(self, offset, limit):
+        """
+        Return up to limit complete lines starting at line offset.
+
+        A negative offset counts back from the last line so the tail
+        of the log can be read with offset=-limit. Returns the lines,
+        the offset of the first line returned and the next line offset.
+
+        :rtype: tuple
+        """
+        self.update_index()
+
+        if offset < 0:
+            offset = max(self.line_count + offset, 0)
+
+        offset = min(offset, self.line_count)
+        checkpoint = offset // self.index_interval
+        lines = []
+
+        with self._open() as log:
+            log.seek(self.offsets[checkpoint])
+
+            for _ in range(offset - checkpoint * self.index_interval):
+                log.readline()
+
+            while len(lines) < limit:
+                line = log.readline()
+
+                if not line.endswith(b'\n'):
+                    break
+
+                lines.append(line.decode('utf-8', errors='replace'))
+
+        return lines, offset, offset + len(lines)
+
+
+def get_job_log_path(job_log_dir, job_id, shard_length=2):
+    """
+    Return the path of the log file of the job.
+
+    Job logs are sharded into directories by the job id prefix so
+    no directory grows with the number of jobs.
+
+    :rtype: string
+    """
+    return os.path.join(
+        job_log_dir, job_id[:shard_length], ''.join([job_id, '.log'])
+    )
+
+
+def get_job_log_reader(log_file, max_readers=128):
+    """
+    Return the cached reader for log_file.
+
+    The least recently used reader is evicted when more than
+    max_readers logs are open.
+
+    :rtype: JobLogReader
+    """
+    with module_lock:
+        reader = readers.pop(log_file, None) or JobLogReader(log_file)
+        readers[log_file] = reader
+
+        while len(readers) > max_readers:
+            readers.popitem(last=False)
+
+    return reader
+
+
+def wait_for_log_growth(log_file, size, timeout, poll_interval=0.25):
+    """
+    Wait until the log file is larger than size or timeout expires.
+
+    Returns True if the log grew before the timeout.
+
+    :rtype: bool
+    """
+    deadline = time.monotonic() + timeout
+
+    while True:
+        try:
+            if os.path.getsize(log_file) > size:
+                return True
+        except FileNotFoundError:
+            pass
+
+        remaining = deadline - time.monotonic()
+
+        if remaining <= 0:
+            return False
+
+        time.sleep(min(poll_interval, remaining))
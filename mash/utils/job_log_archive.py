@@ -0,0 +1,189 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import fcntl
+import gzip
+import os
+import sqlite3
+import time
+
+from contextlib import closing
+
+index_schema = (
+    'CREATE TABLE IF NOT EXISTS archive ('
+    'job_id TEXT NOT NULL, segment TEXT NOT NULL, '
+    'offset INTEGER NOT NULL, length INTEGER NOT NULL, '
+    'size INTEGER NOT NULL, archived REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS archive_job_id ON archive (job_id)'
+)
+
+
+class JobLogArchive(object):
+    """
+    Compressed segment archives of job log files.
+
+    The archive is sharded by the job id prefix. Each shard holds
+    append-only segment files and an index of the segment, offset
+    and length of every archived log part. Each archive run of a log
+    is stored as a gzip member, a log is read with one seek per
+    member and without decompressing the rest of the segment.
+
+    Layout::
+
+        archive_dir/12/index.db
+        archive_dir/12/segment-000001.gz
+    """
+
+    def __init__(
+        self,
+        archive_dir,
+        max_segment_size=268435456,
+        shard_length=2
+    ):
+        self.archive_dir = archive_dir
+        self.max_segment_size = max_segment_size
+        self.shard_length = shard_length
+
+    def get_shard_directory(self, job_id):
+        """
+        Return the shard directory for the job id.
+
+        :rtype: string
+        """
+        return os.path.join(self.archive_dir, job_id[:self.shard_length])
+
+    def _connect_index(self, shard_dir):
+        connection = sqlite3.connect(os.path.join(shard_dir, 'index.db'))
+
+        for statement in index_schema:
+            connection.execute(statement)
+
+        return connection
+
+    def _get_entries(self, job_id):
+        shard_dir = self.get_shard_directory(job_id)
+
+        if not os.path.exists(os.path.join(shard_dir, 'index.db')):
+            return []
+
+        with closing(self._connect_index(shard_dir)) as connection:
+            return connection.execute(
+                'SELECT segment, offset, length FROM archive '
+                'WHERE job_id = ? ORDER BY rowid',
+                (job_id,)
+            ).fetchall()
+
+    def _get_segment(self, shard_dir):
+        """
+        Return the segment to append to in the shard.
+
+        A new segment is started once the latest is full.
+        """
+        segments = sorted(
+            name for name in os.listdir(shard_dir)
+            if name.startswith('segment-')
+        )
+
+        if segments:
+            segment = segments[-1]
+            segment_size = os.path.getsize(os.path.join(shard_dir, segment))
+
+            if segment_size < self.max_segment_size:
+                return segment
+
+        return 'segment-{0:06d}.gz'.format(len(segments) + 1)
+
+    def read(self, job_id):
+        """
+        Return the archived log of the job or None if not archived.
+
+        :rtype: bytes
+        """
+        entries = self._get_entries(job_id)
+
+        if not entries:
+            return None
+
+        shard_dir = self.get_shard_directory(job_id)
+        data = []
+
+        for segment, offset, length in entries:
+            with open(os.path.join(shard_dir, segment), 'rb') as archive:
+                archive.seek(offset)
+                data.append(gzip.decompress(archive.read(length)))
+
+        return b''.join(data)
+
+    def archive(self, job_id, log_file):
+        """
+        Move the job log file into the archive.
+
+        The log file is renamed to a detached file while holding an
+        exclusive lock on it. The logger writes under a shared lock
+        and reopens the log file once it was renamed, so no record
+        is appended to the detached file. The detached file is
+        appended to the log data archived before as a new member and
+        removed once the member is synced to disk and indexed. A
+        detached file left by an interrupted run is archived first.
+
+        Returns True if a log file was archived.
+
+        :rtype: bool
+        """
+        detached_file = log_file + '.archiving'
+
+        if not os.path.exists(detached_file):
+            try:
+                with open(log_file, 'rb') as log:
+                    fcntl.flock(log, fcntl.LOCK_EX)
+                    os.replace(log_file, detached_file)
+            except FileNotFoundError:
+                return False
+
+        shard_dir = self.get_shard_directory(job_id)
+        os.makedirs(shard_dir, exist_ok=True)
+
+        with open(detached_file, 'rb') as log:
+            data = log.read()
+
+        member = gzip.compress(data)
+        segment = self._get_segment(shard_dir)
+
+        with open(os.path.join(shard_dir, segment), 'ab') as archive:
+            offset = archive.tell()
+            archive.write(member)
+            archive.flush()
+            os.fsync(archive.fileno())
+
+        with closing(self._connect_index(shard_dir)) as connection:
+            with connection:
+                connection.execute(
+                    'INSERT INTO archive (job_id, segment, offset, length, '
+                    'size, archived) VALUES (?, ?, ?, ?, ?, ?)',
+                    (
+                        job_id,
+                        segment,
+                        offset,
+                        len(member),
+                        len(data),
+                        time.time()
+                    )
+                )
+
+        os.remove(detached_file)
+        return True
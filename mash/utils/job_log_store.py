@@ -0,0 +1,375 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import glob
+import gzip
+import os
+import shutil
+import sqlite3
+import threading
+import time
+
+from contextlib import closing, suppress
+from datetime import datetime, timedelta, timezone
+from tempfile import mkstemp
+
+schema = (
+    'CREATE TABLE IF NOT EXISTS logs ('
+    'id INTEGER PRIMARY KEY, job_id TEXT NOT NULL, service TEXT, '
+    'level TEXT, timestamp REAL NOT NULL, message TEXT)',
+    'CREATE INDEX IF NOT EXISTS logs_job_id ON logs (job_id, timestamp)',
+    'CREATE INDEX IF NOT EXISTS logs_service ON logs (service, timestamp)',
+    'CREATE INDEX IF NOT EXISTS logs_level ON logs (level, timestamp)',
+    'CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts USING fts5('
+    'message, content=\'logs\', content_rowid=\'id\')',
+    'CREATE TRIGGER IF NOT EXISTS logs_fts_insert AFTER INSERT ON logs '
+    'BEGIN INSERT INTO logs_fts (rowid, message) '
+    'VALUES (new.id, new.message); END'
+)
+
+columns = ('job_id', 'service', 'level', 'timestamp', 'message')
+
+
+class JobLogStore(object):
+    """
+    Structured job log store partitioned by day.
+
+    Each UTC day of log records is written to a SQLite partition with
+    indexes on job id, service and level and a full text index on the
+    message. Partitions of previous days are sealed, vacuumed and gzip
+    compressed. A late record for a sealed day starts a new partition
+    for that day, a day may have several sealed partitions.
+
+    Sealed partitions are decompressed once for queries into the
+    cache directory, at most max_cached_partitions of the most
+    recently queried partitions are kept.
+
+    Layout::
+
+        store_dir/2026-10-19.db
+        store_dir/2026-10-18.1760832000000000000.db.gz
+        store_dir/cache/2026-10-18.1760832000000000000.db
+    """
+
+    def __init__(self, store_dir, max_cached_partitions=16):
+        self.store_dir = store_dir
+        self.cache_dir = os.path.join(store_dir, 'cache')
+        self.max_cached_partitions = max_cached_partitions
+        self.connections = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_day(timestamp):
+        """
+        Return the UTC day of the epoch timestamp.
+
+        :rtype: string
+        """
+        return datetime.fromtimestamp(
+            timestamp, tz=timezone.utc
+        ).strftime('%Y-%m-%d')
+
+    def _get_partition_file(self, day):
+        return os.path.join(self.store_dir, '{0}.db'.format(day))
+
+    def _get_connection(self, day):
+        """
+        Return the open connection to the active partition for the day.
+
+        Partitions are sealed by another thread, connections are
+        only used while holding the lock.
+        """
+        if day not in self.connections:
+            os.makedirs(self.store_dir, exist_ok=True)
+            connection = sqlite3.connect(
+                self._get_partition_file(day),
+                check_same_thread=False
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+
+            for statement in schema:
+                connection.execute(statement)
+
+            self.connections[day] = connection
+
+        return self.connections[day]
+
+    def add_records(self, records):
+        """
+        Insert the log records in one transaction per partition.
+
+        Each record is a dict with job_id, service, level, timestamp
+        (epoch seconds) and message.
+        """
+        partitions = {}
+
+        for record in records:
+            day = self.get_day(record['timestamp'])
+            partitions.setdefault(day, []).append(
+                tuple(record.get(column) for column in columns)
+            )
+
+        with self.lock:
+            for day, rows in partitions.items():
+                connection = self._get_connection(day)
+
+                with connection:
+                    connection.executemany(
+                        'INSERT INTO logs (job_id, service, level, '
+                        'timestamp, message) VALUES (?, ?, ?, ?, ?)',
+                        rows
+                    )
+
+    def close(self):
+        with self.lock:
+            for connection in self.connections.values():
+                connection.close()
+
+            self.connections = {}
+
+    def seal_partitions(self, today=None):
+        """
+        Compress the active partitions of days before today.
+
+        An active partition is closed and renamed to a sealed name
+        while records are not added, it is vacuumed and compressed
+        afterwards. Sealed partitions that were not compressed by
+        an interrupted run are compressed as well.
+        """
+        today = today or self.get_day(time.time())
+        pattern = os.path.join(self.store_dir, '????-??-??.db')
+
+        for partition_file in sorted(glob.glob(pattern)):
+            day = os.path.basename(partition_file)[:-len('.db')]
+
+            if day < today:
+                self._retire_partition(day, partition_file)
+
+        pattern = os.path.join(self.store_dir, '????-??-??.*.db')
+
+        for sealed_file in sorted(glob.glob(pattern)):
+            with closing(sqlite3.connect(sealed_file)) as connection:
+                connection.execute('VACUUM')
+
+            with open(sealed_file, 'rb') as source:
+                with gzip.open(sealed_file + '.gz.tmp', 'wb') as target:
+                    shutil.copyfileobj(source, target)
+
+            os.replace(sealed_file + '.gz.tmp', sealed_file + '.gz')
+            os.remove(sealed_file)
+
+    def _retire_partition(self, day, partition_file):
+        """
+        Close the active partition of the day and rename it.
+
+        The write ahead log is merged into the partition before it
+        is renamed, late records for the day start a new partition.
+        """
+        with self.lock:
+            connection = self.connections.pop(day, None)
+
+            if connection:
+                connection.close()
+
+            with closing(sqlite3.connect(partition_file)) as connection:
+                connection.execute('PRAGMA journal_mode=DELETE')
+
+            os.replace(
+                partition_file,
+                os.path.join(
+                    self.store_dir,
+                    '{0}.{1}.db'.format(day, time.time_ns())
+                )
+            )
+
+    def _get_partitions(self, start, end):
+        """
+        Return the partition files for each day from start to end.
+
+        A sealed partition is returned uncompressed while it is
+        being compressed.
+
+        :rtype: list
+        """
+        partitions = []
+        day = start.date()
+
+        while day <= end.date():
+            name = day.strftime('%Y-%m-%d')
+            sealed_files = glob.glob(
+                os.path.join(self.store_dir, '{0}.*.db'.format(name))
+            )
+            day_partitions = sealed_files + [
+                sealed_file for sealed_file in glob.glob(
+                    os.path.join(self.store_dir, '{0}.*.db.gz'.format(name))
+                ) if sealed_file[:-len('.gz')] not in sealed_files
+            ]
+            day_partitions.sort()
+
+            active_file = self._get_partition_file(name)
+            if os.path.exists(active_file):
+                day_partitions.append(active_file)
+
+            partitions.append(day_partitions)
+            day += timedelta(days=1)
+
+        return partitions
+
+    def query(
+        self,
+        job_id=None,
+        service=None,
+        level=None,
+        text=None,
+        start=None,
+        end=None,
+        limit=100
+    ):
+        """
+        Return log records matching all given filters ordered by time.
+
+        The text filter is a full text search query on the message.
+        The time range defaults to the last 7 days.
+
+        :rtype: list
+        """
+        end = end or datetime.now(tz=timezone.utc)
+        start = start or end - timedelta(days=7)
+
+        conditions = ['timestamp >= ?', 'timestamp <= ?']
+        args = [start.timestamp(), end.timestamp()]
+
+        for column, value in (
+            ('job_id', job_id),
+            ('service', service),
+            ('level', level)
+        ):
+            if value:
+                conditions.append('{0} = ?'.format(column))
+                args.append(value)
+
+        if text:
+            conditions.append(
+                'id IN (SELECT rowid FROM logs_fts WHERE logs_fts MATCH ?)'
+            )
+            args.append(text)
+
+        statement = (
+            'SELECT job_id, service, level, timestamp, message FROM logs '
+            'WHERE {0} ORDER BY timestamp LIMIT ?'
+        ).format(' AND '.join(conditions))
+
+        results = []
+
+        for day_partitions in self._get_partitions(start, end):
+            if len(results) >= limit:
+                break
+
+            day_results = []
+
+            for partition_file in day_partitions:
+                cached = partition_file.endswith('.gz')
+
+                if cached:
+                    partition_file = self._get_cached_partition(
+                        partition_file
+                    )
+
+                day_results.extend(
+                    self._query_partition(
+                        partition_file,
+                        statement,
+                        args + [limit - len(results)],
+                        immutable=cached
+                    )
+                )
+
+            day_results.sort(key=lambda record: record['timestamp'])
+            results.extend(day_results[:limit - len(results)])
+
+        return results
+
+    @staticmethod
+    def _query_partition(partition_file, statement, args, immutable=False):
+        uri = 'file:{0}?mode=ro'.format(partition_file)
+
+        if immutable:
+            # Cached partitions are not locked, they are never written
+            uri += '&immutable=1'
+
+        with closing(sqlite3.connect(uri, uri=True)) as connection:
+            rows = connection.execute(statement, args).fetchall()
+
+        return [dict(zip(columns, row)) for row in rows]
+
+    def _get_cached_partition(self, sealed_file):
+        """
+        Return the decompressed sealed partition from the cache.
+
+        Sealed partitions are never modified, a cached partition is
+        valid as long as its sealed partition exists.
+        """
+        partition_file = os.path.join(
+            self.cache_dir, os.path.basename(sealed_file)[:-len('.gz')]
+        )
+
+        try:
+            os.utime(partition_file)
+        except FileNotFoundError:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, temp_file = mkstemp(dir=self.cache_dir, suffix='.tmp')
+
+            try:
+                with gzip.open(sealed_file, 'rb') as source:
+                    with open(fd, 'wb') as target:
+                        shutil.copyfileobj(source, target)
+
+                os.replace(temp_file, partition_file)
+            except Exception:
+                os.remove(temp_file)
+                raise
+
+            self._prune_cache()
+
+        return partition_file
+
+    def _prune_cache(self):
+        """
+        Remove cached partitions of removed sealed partitions and the
+        least recently queried partitions over max_cached_partitions.
+        """
+        cached_files = []
+
+        for partition_file in glob.glob(os.path.join(self.cache_dir, '*.db')):
+            sealed_file = os.path.join(
+                self.store_dir, os.path.basename(partition_file) + '.gz'
+            )
+
+            with suppress(FileNotFoundError):
+                if os.path.exists(sealed_file):
+                    cached_files.append(
+                        (os.path.getmtime(partition_file), partition_file)
+                    )
+                else:
+                    os.remove(partition_file)
+
+        cached_files.sort(reverse=True)
+
+        for _, partition_file in cached_files[self.max_cached_partitions:]:
+            with suppress(FileNotFoundError):
+                os.remove(partition_file)
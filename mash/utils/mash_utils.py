@@ -32,9 +32,13 @@ from contextlib import contextmanager, suppress
 from string import ascii_lowercase
 from tempfile import NamedTemporaryFile
 
-from mash.log.handler import RabbitMQHandler
+from mash.log.handler import AsyncRabbitMQHandler
 from mash.mash_exceptions import MashException, MashLogSetupException
 from mash.utils.json_format import JsonFormat
+from mash.utils.tracing import SPAN_KIND_CLIENT, tracer
+
+# Object metadata key of the image digest in cloud storage
+IMAGE_DIGEST_KEY = 'mash_image_sha256'
 
 
 @contextmanager
@@ -148,6 +152,19 @@ def persist_json(file_path, data):
         json_file.write(JsonFormat.json_message(data))
 
 
+def get_image_digest(image_file, block_size=1048576):
+    """
+    Return the sha256 hex digest of the image file.
+    """
+    digest = hashlib.sha256()
+
+    with open(image_file, 'rb') as image:
+        for block in iter(lambda: image.read(block_size), b''):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
 def load_json(file_path):
     """
     Load json from file and return dictionary.
@@ -184,7 +201,16 @@ def handle_request(url, endpoint, method, job_data=None):
     data = None if not job_data else JsonFormat.json_message(job_data)
     uri = ''.join([url, endpoint])
 
-    response = request_method(uri, data=data)
+    with tracer.span(
+        '{0} {1}'.format(method.upper(), endpoint),
+        kind=SPAN_KIND_CLIENT,
+        attributes={'http.method': method.upper(), 'http.url': uri}
+    ) as span:
+        response = request_method(uri, data=data, headers=tracer.inject())
+        span.set_attribute('http.status_code', response.status_code)
+
+        if response.status_code not in (200, 201):
+            span.set_error(response.reason)
 
     if response.status_code not in (200, 201):
         try:
@@ -228,7 +254,7 @@ def get_logging_formatter():
 
 
 def setup_rabbitmq_log_handler(host, username, password):
-    rabbit_handler = RabbitMQHandler(
+    rabbit_handler = AsyncRabbitMQHandler(
         host=host,
         username=username,
         password=password,
@@ -0,0 +1,432 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import math
+import threading
+import time
+
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from flask import Response, g, request
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60,
+    120, 300, 600, 1800, 3600, 7200
+)
+
+
+def format_value(value):
+    """
+    Return the value in the text exposition format.
+    """
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+
+    if math.isnan(value):
+        return 'NaN'
+
+    if float(value).is_integer():
+        return str(int(value))
+
+    return repr(float(value))
+
+
+def format_labels(labels):
+    """
+    Return the label pairs in the text exposition format.
+    """
+    if not labels:
+        return ''
+
+    pairs = []
+    for name, value in labels:
+        value = str(value).replace('\\', r'\\').replace(
+            '"', r'\"'
+        ).replace('\n', r'\n')
+        pairs.append('{0}="{1}"'.format(name, value))
+
+    return '{{{0}}}'.format(','.join(pairs))
+
+
+class Metric(object):
+    """
+    Base class for a metric family with a fixed set of label names.
+
+    Values are kept per label value tuple. A function can be set
+    instead which is called on collection and returns either a
+    single value or a dictionary of label value tuples to values.
+    This is used for values that are cheaper to read when scraped
+    than to keep up to date, such as queue lengths.
+    """
+    metric_type = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.function = None
+        self._lock = threading.Lock()
+        self._values = OrderedDict()
+
+    def _get_key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                'Metric {0} requires labels: {1}.'.format(
+                    self.name,
+                    ', '.join(self.labelnames)
+                )
+            )
+
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def get_value(self, **labels):
+        """
+        Return the current value for the labels, 0 if never set.
+        """
+        key = self._get_key(labels)
+
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def set_function(self, function):
+        """
+        Set the function to call for the metric values on collection.
+        """
+        self.function = function
+
+    def get_samples(self):
+        """
+        Return a list of (suffix, label pairs, value) samples.
+        """
+        if self.function:
+            values = self.function()
+
+            if not isinstance(values, dict):
+                values = {(): values}
+        else:
+            with self._lock:
+                values = dict(self._values)
+
+        return [
+            ('', list(zip(self.labelnames, key)), value)
+            for key, value in values.items()
+        ]
+
+    def collect(self):
+        """
+        Return the metric family in the text exposition format.
+        """
+        lines = [
+            '# HELP {0} {1}'.format(self.name, self.documentation),
+            '# TYPE {0} {1}'.format(self.name, self.metric_type)
+        ]
+
+        for suffix, labels, value in self.get_samples():
+            lines.append('{0}{1}{2} {3}'.format(
+                self.name,
+                suffix,
+                format_labels(labels),
+                format_value(value)
+            ))
+
+        return lines
+
+
+class Counter(Metric):
+    """
+    A monotonically increasing value.
+    """
+    metric_type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError('Counters can only be incremented.')
+
+        key = self._get_key(labels)
+
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """
+    A value that can go up and down.
+    """
+    metric_type = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._get_key(labels)
+
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._get_key(labels)
+
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """
+    Counts observations in cumulative buckets.
+
+    Bucket counts are stored per bucket and only accumulated on
+    collection which keeps an observation to a bisect and an add.
+    """
+    metric_type = 'histogram'
+
+    def __init__(
+        self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS
+    ):
+        super(Histogram, self).__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._get_key(labels)
+        index = bisect_left(self.buckets, value)
+
+        with self._lock:
+            if key not in self._values:
+                self._values[key] = [[0] * len(self.buckets), 0, 0]
+
+            counts = self._values[key]
+            counts[0][index] += 1
+            counts[1] += value
+            counts[2] += 1
+
+    def get_value(self, **labels):
+        """
+        Return the number of observations for the labels.
+        """
+        key = self._get_key(labels)
+
+        with self._lock:
+            return self._values[key][2] if key in self._values else 0
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observe the duration in seconds of the with block.
+        """
+        start = time.monotonic()
+
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - start, **labels)
+
+    def get_samples(self):
+        with self._lock:
+            values = [
+                (key, list(counts[0]), counts[1], counts[2])
+                for key, counts in self._values.items()
+            ]
+
+        samples = []
+        for key, bucket_counts, total, count in values:
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0
+
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                samples.append((
+                    '_bucket',
+                    labels + [('le', format_value(bound))],
+                    cumulative
+                ))
+
+            samples.append(('_sum', labels, total))
+            samples.append(('_count', labels, count))
+
+        return samples
+
+
+class MetricsRegistry(object):
+    """
+    A set of metric families exposed together.
+
+    Metrics are created on first use and returned on later calls
+    with the same name so modules can share them without import
+    order dependencies.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = OrderedDict()
+
+    def _get_metric(self, metric_class, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+
+            if metric is None:
+                metric = metric_class(name, *args, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, metric_class):
+                raise ValueError(
+                    'Metric {0} is already registered as a {1}.'.format(
+                        name,
+                        metric.metric_type
+                    )
+                )
+
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._get_metric(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._get_metric(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS
+    ):
+        return self._get_metric(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def expose(self):
+        """
+        Return all metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.collect())
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+cloud_api_duration = registry.histogram(
+    'mash_cloud_api_call_duration_seconds',
+    'Cloud provider API call latency in seconds.',
+    ('cloud', 'operation')
+)
+cloud_api_errors = registry.counter(
+    'mash_cloud_api_errors_total',
+    'Cloud provider API calls that returned an error.',
+    ('cloud', 'operation', 'error')
+)
+
+
+class MetricsServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """
+    Serve the registry on /metrics.
+    """
+    metrics_registry = registry
+
+    def do_GET(self):
+        if self.path.split('?', maxsplit=1)[0] != '/metrics':
+            self.send_error(404)
+            return
+
+        output = self.metrics_registry.expose().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(output)))
+        self.end_headers()
+        self.wfile.write(output)
+
+    def log_message(self, format, *args):
+        """Scrapes are frequent, do not log each request to stderr."""
+        pass
+
+
+def start_metrics_server(port, host='localhost', metrics_registry=registry):
+    """
+    Serve the registry over HTTP in a daemon thread.
+
+    Returns the server, call shutdown on it to stop serving.
+    """
+    handler = type(
+        'RegistryMetricsHandler',
+        (MetricsHandler,),
+        {'metrics_registry': metrics_registry}
+    )
+    server = MetricsServer((host, port), handler)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    return server
+
+
+def register_flask_metrics(app, service, metrics_registry=registry):
+    """
+    Record request counts and latencies and add a /metrics route.
+
+    Requests are labelled with the URL rule instead of the path so
+    ids in the path do not create a new series per request.
+    """
+    requests_total = metrics_registry.counter(
+        'mash_http_requests_total',
+        'HTTP requests handled.',
+        ('service', 'method', 'endpoint', 'status')
+    )
+    request_duration = metrics_registry.histogram(
+        'mash_http_request_duration_seconds',
+        'HTTP request latency in seconds.',
+        ('service', 'method', 'endpoint')
+    )
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_start_time = time.monotonic()
+
+    @app.after_request
+    def record_request_metrics(response):
+        start_time = g.pop('metrics_start_time', None)
+        endpoint = request.url_rule.rule if request.url_rule else 'none'
+
+        requests_total.inc(
+            service=service,
+            method=request.method,
+            endpoint=endpoint,
+            status=response.status_code
+        )
+
+        if start_time is not None:
+            request_duration.observe(
+                time.monotonic() - start_time,
+                service=service,
+                method=request.method,
+                endpoint=endpoint
+            )
+
+        return response
+
+    def metrics():
+        return Response(metrics_registry.expose(), content_type=CONTENT_TYPE)
+
+    app.add_url_rule('/metrics', 'metrics', metrics)
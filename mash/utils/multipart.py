@@ -0,0 +1,300 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import math
+import os
+import time
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from mash.mash_exceptions import MashUploadException
+from mash.utils.bandwidth import open_throttled
+from mash.utils.cloud_api import (
+    get_account,
+    get_profiler,
+    get_user,
+    profile_api_calls
+)
+
+MIB = 1024 ** 2
+MIN_PART_SIZE = 10 * MIB
+MAX_PART_SIZE = 128 * MIB
+MAX_PARTS = 10000
+
+# Key of the upload state in the persisted job config
+MULTIPART_UPLOAD_KEY = 'multipart_upload'
+
+
+def new_upload_state(upload_id, object_name, image_file):
+    """
+    Return the resume state of a new multipart upload of image_file.
+
+    The state is a json serializable dictionary that is persisted
+    with the job. Every part is recorded with its byte range before
+    it is uploaded and with its etag once it is uploaded.
+    """
+    return {
+        'upload_id': upload_id,
+        'object_name': object_name,
+        'image_file': image_file,
+        'image_size': os.path.getsize(image_file),
+        'parts': []
+    }
+
+
+def is_resumable(state, object_name, image_file):
+    """
+    Return True if the state belongs to an upload of the same image.
+    """
+    if not state:
+        return False
+
+    try:
+        image_size = os.path.getsize(image_file)
+    except OSError:
+        return False
+
+    return state.get('object_name') == object_name and \
+        state.get('image_file') == image_file and \
+        state.get('image_size') == image_size
+
+
+def reconcile_parts(state, uploaded_parts):
+    """
+    Update the state with the parts that exist in the object storage.
+
+    uploaded_parts maps part numbers to (etag, size). Parts that were
+    uploaded before the state was persisted are picked up, parts that
+    are missing or incomplete are uploaded again.
+
+    Return the number of bytes already uploaded.
+    """
+    uploaded = 0
+
+    for part in state['parts']:
+        etag, size = uploaded_parts.get(part['part_num'], (None, None))
+
+        if size == part['size']:
+            part['etag'] = etag
+            uploaded += size
+        else:
+            part['etag'] = None
+
+    return uploaded
+
+
+class ThroughputTuner(object):
+    """
+    Adapt the part size and the number of parallel part uploads.
+
+    Parts complete in rounds of one part per worker. After each
+    round the throughput of the round is compared with the previous
+    round: a worker is added while more workers increase the
+    throughput and removed when the throughput drops. The part size
+    is set so that one part takes about target_seconds to upload at
+    the measured throughput of a single worker.
+    """
+    def __init__(
+        self,
+        part_size=32 * MIB,
+        workers=3,
+        max_workers=8,
+        min_part_size=MIN_PART_SIZE,
+        max_part_size=MAX_PART_SIZE,
+        target_seconds=30,
+        tolerance=0.1
+    ):
+        self.min_part_size = min_part_size
+        self.max_part_size = max_part_size
+        self.max_workers = max(1, max_workers)
+        self.part_size = self._limit_part_size(part_size)
+        self.workers = min(max(1, workers), self.max_workers)
+        self.target_seconds = target_seconds
+        self.tolerance = tolerance
+        self.throughput = None
+
+        self._round_start = None
+        self._round_bytes = 0
+        self._round_parts = 0
+        self._part_seconds = 0
+
+    def _limit_part_size(self, part_size):
+        part_size = max(
+            self.min_part_size, min(self.max_part_size, int(part_size))
+        )
+        return max(self.min_part_size, part_size - part_size % MIB)
+
+    def start(self, now=None):
+        """
+        Start a new round of measurements.
+        """
+        self._round_start = time.monotonic() if now is None else now
+        self._round_bytes = 0
+        self._round_parts = 0
+        self._part_seconds = 0
+
+    def record(self, size, seconds, now=None):
+        """
+        Record an uploaded part and adapt at the end of a round.
+        """
+        now = time.monotonic() if now is None else now
+
+        if self._round_start is None:
+            self.start(now - seconds)
+
+        self._round_bytes += size
+        self._round_parts += 1
+        self._part_seconds += seconds
+
+        if self._round_parts < self.workers:
+            return
+
+        elapsed = max(now - self._round_start, 1e-6)
+        throughput = self._round_bytes / elapsed
+        worker_throughput = self._round_bytes / max(self._part_seconds, 1e-6)
+
+        if self.throughput is None or \
+                throughput > self.throughput * (1 + self.tolerance):
+            self.workers = min(self.workers + 1, self.max_workers)
+        elif throughput < self.throughput * (1 - self.tolerance):
+            self.workers = max(self.workers - 1, 1)
+
+        self.throughput = throughput
+        self.part_size = self._limit_part_size(
+            worker_throughput * self.target_seconds
+        )
+        self.start(now)
+
+
+def upload_parts(
+    image_file,
+    state,
+    upload_part,
+    tuner=None,
+    persist_callback=None,
+    progress_callback=None,
+    job_id=None
+):
+    """
+    Upload the parts of image_file that are missing in the state.
+
+    upload_part(part_num, data) uploads one part and returns its
+    etag. Parts are uploaded in parallel, the part size and number
+    of parallel uploads are adapted by the tuner. The state is
+    passed to persist_callback whenever a part is planned or
+    uploaded so an interrupted upload can be resumed. Parts are
+    read through the bandwidth scheduler on behalf of job_id.
+
+    Return the list of (part_num, etag) tuples of all parts ordered
+    by part number.
+    """
+    tuner = tuner or ThroughputTuner()
+    profiler = get_profiler()
+    account = get_account()
+    user = get_user()
+    image_size = state['image_size']
+    parts = state['parts']
+
+    def persist():
+        if persist_callback:
+            persist_callback(state)
+
+    def put_part(part):
+        start = time.monotonic()
+
+        with open_throttled(image_file, job_id) as image:
+            image.seek(part['offset'])
+            data = image.read(part['size'])
+
+        with profile_api_calls(profiler, account, user):
+            etag = upload_part(part['part_num'], data)
+
+        return etag, time.monotonic() - start
+
+    def plan_part():
+        offset = 0
+        part_num = 1
+
+        if parts:
+            offset = parts[-1]['offset'] + parts[-1]['size']
+            part_num = parts[-1]['part_num'] + 1
+
+        remaining = image_size - offset
+
+        if part_num > MAX_PARTS:
+            raise MashUploadException(
+                'Image {0} requires more than {1} parts.'.format(
+                    image_file, MAX_PARTS
+                )
+            )
+
+        # Parts have to grow if the remaining part numbers
+        # do not cover the rest of the image.
+        size = max(
+            tuner.part_size,
+            math.ceil(remaining / (MAX_PARTS - part_num + 1))
+        )
+        part = {
+            'part_num': part_num,
+            'offset': offset,
+            'size': min(size, remaining),
+            'etag': None
+        }
+        parts.append(part)
+        return part
+
+    def next_offset():
+        if not parts:
+            return 0
+
+        return parts[-1]['offset'] + parts[-1]['size']
+
+    retry = [part for part in parts if not part['etag']]
+    pending = {}
+
+    with ThreadPoolExecutor(max_workers=tuner.max_workers) as pool:
+        try:
+            tuner.start()
+
+            while retry or pending or next_offset() < image_size:
+                while len(pending) < tuner.workers and \
+                        (retry or next_offset() < image_size):
+                    if retry:
+                        part = retry.pop(0)
+                    else:
+                        part = plan_part()
+                        persist()
+
+                    pending[pool.submit(put_part, part)] = part
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    part = pending.pop(future)
+                    part['etag'], seconds = future.result()
+                    persist()
+                    tuner.record(part['size'], seconds)
+
+                    if progress_callback:
+                        progress_callback(part['size'])
+        except Exception:
+            for future in pending:
+                future.cancel()
+            raise
+
+    return [(part['part_num'], part['etag']) for part in parts]
@@ -0,0 +1,240 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import threading
+import time
+
+from mash.utils.metrics import registry
+
+READ_OPERATIONS = (
+    'aggregatedlist',
+    'describe',
+    'get',
+    'list',
+    'search'
+)
+
+rate_limit_wait = registry.histogram(
+    'mash_cloud_api_rate_limit_wait_seconds',
+    'Time API calls waited for the shared rate limiter.',
+    ('cloud', 'family'),
+    buckets=(0, 0.1, 0.5, 1, 5, 30, 60)
+)
+rate_limit_decreases = registry.counter(
+    'mash_cloud_api_rate_limit_decreases_total',
+    'Rate limiter slow downs after throttled API calls.',
+    ('cloud', 'family')
+)
+
+
+def get_api_family(cloud, operation):
+    """
+    Return the rate limit family of the cloud API operation.
+
+    Clouds limit read and write calls separately. EC2 operations
+    are named like DescribeImages and GCE methods like
+    compute.images.get. Azure operations are the HTTP method and
+    the ARM resource type, calls to other endpoints such as blob
+    storage are not subject to ARM limits and get their own family.
+    """
+    if cloud == 'azure':
+        method, _, target = operation.partition(' ')
+
+        if not target.startswith('Microsoft.'):
+            return 'other'
+
+        return 'read' if method in ('GET', 'HEAD') else 'write'
+
+    name = operation.rsplit('.', 1)[-1].lower()
+    return 'read' if name.startswith(READ_OPERATIONS) else 'write'
+
+
+class TokenBucket(object):
+    """
+    Token bucket with an adaptive refill rate.
+
+    The bucket holds up to one second of tokens. The rate starts
+    at max_rate, it is reduced by decrease_factor when a call is
+    throttled and grows back by increase_ratio of max_rate with
+    every successful call. Throttled responses of calls already in
+    flight arrive together, only one decrease is applied per
+    cooldown period.
+
+    Tokens are reserved in order, a caller that finds the bucket
+    empty sleeps until its token has been refilled.
+    """
+    def __init__(
+        self, max_rate, min_rate=None, decrease_factor=0.5,
+        increase_ratio=0.05, cooldown=1
+    ):
+        self.max_rate = max_rate
+        self.min_rate = min_rate or max_rate * 0.05
+        self.decrease_factor = decrease_factor
+        self.increase_ratio = increase_ratio
+        self.cooldown = cooldown
+        self.rate = max_rate
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._last_decrease = None
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self):
+        return max(self.rate, 1)
+
+    def _refill(self, now):
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def reserve(self):
+        """
+        Take a token and return the seconds until it can be used.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+
+            if self.tokens >= 0:
+                return 0
+
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """
+        Wait for a token and return the time spent waiting.
+        """
+        wait = self.reserve()
+
+        if wait:
+            time.sleep(wait)
+
+        return wait
+
+    def throttled(self):
+        """
+        Slow down after a throttled call.
+
+        Return True if the rate was reduced.
+        """
+        with self._lock:
+            now = time.monotonic()
+
+            if self._last_decrease is not None and \
+                    now - self._last_decrease < self.cooldown:
+                return False
+
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self.tokens = min(self.tokens, 0)
+            self._last_decrease = now
+            return True
+
+    def succeeded(self):
+        """
+        Speed up after a successful call until max_rate is reached.
+        """
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill(time.monotonic())
+                self.rate = min(
+                    self.max_rate,
+                    self.rate + self.max_rate * self.increase_ratio
+                )
+
+
+class RateLimiter(object):
+    """
+    Rate limiter shared by all jobs of a service.
+
+    Calls are limited per cloud, user, account, region and API
+    family with a separate token bucket, the rate of a bucket adapts
+    to throttled responses. Jobs calling the same account and region
+    share the bucket and slow down together instead of retrying
+    against each other. Account names are only unique per user.
+
+    Rates are configured per cloud and family in calls per second,
+    families without a rate are not limited.
+    """
+    def __init__(self, rates=None):
+        self.rates = rates or {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def configure(self, rates):
+        with self._lock:
+            self.rates = rates or {}
+            self._buckets = {}
+
+    def get_bucket(
+        self, cloud, family, account=None, region=None, user=None
+    ):
+        """
+        Return the bucket for the calls or None if they are not limited.
+        """
+        max_rate = self.rates.get(cloud, {}).get(family)
+
+        if not max_rate:
+            return None
+
+        key = (cloud, user, account, region, family)
+
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(max_rate)
+
+            return self._buckets[key]
+
+    def acquire(
+        self, cloud, operation, account=None, region=None, user=None
+    ):
+        """
+        Wait until the call can be sent and return the time waited.
+        """
+        family = get_api_family(cloud, operation)
+        bucket = self.get_bucket(cloud, family, account, region, user)
+
+        if not bucket:
+            return 0
+
+        wait = bucket.acquire()
+        rate_limit_wait.observe(wait, cloud=cloud, family=family)
+        return wait
+
+    def record(
+        self, cloud, operation, throttled=False, account=None, region=None,
+        user=None
+    ):
+        """
+        Adapt the rate of the bucket to the response of a call.
+        """
+        family = get_api_family(cloud, operation)
+        bucket = self.get_bucket(cloud, family, account, region, user)
+
+        if not bucket:
+            return
+
+        if not throttled:
+            bucket.succeeded()
+        elif bucket.throttled():
+            rate_limit_decreases.inc(cloud=cloud, family=family)
+
+
+rate_limiter = RateLimiter()
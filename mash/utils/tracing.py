@@ -0,0 +1,365 @@
+# Copyright (c) 2026 SUSE LLC.  All rights reserved.
+#
+# This file is part of mash.
+#
+# mash is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# mash is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with mash.  If not, see <http://www.gnu.org/licenses/>
+#
+
+import json
+import os
+import re
+import threading
+import time
+import uuid
+
+from collections import namedtuple
+from contextlib import contextmanager
+
+from mash.utils.metrics import registry
+
+TRACEPARENT = 'traceparent'
+TRACEPARENT_REGEX = re.compile(
+    r'^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$'
+)
+
+# OTLP span kind and status code values
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+spans_dropped = registry.counter(
+    'mash_trace_spans_dropped_total',
+    'Finished spans that could not be exported.'
+)
+
+SpanContext = namedtuple('SpanContext', ['trace_id', 'span_id'])
+
+
+def new_trace_id():
+    return os.urandom(16).hex()
+
+
+def new_span_id():
+    return os.urandom(8).hex()
+
+
+def get_job_trace_id(job_id):
+    """
+    Return the trace id for the job.
+
+    Job ids are UUIDs which are valid trace ids. Deriving the trace
+    id from the job id groups all spans of a job in one trace even
+    if a service receives the job without a trace context.
+    """
+    try:
+        return uuid.UUID(str(job_id)).hex
+    except ValueError:
+        return new_trace_id()
+
+
+def format_traceparent(context):
+    """
+    Return the W3C traceparent header value for the span context.
+    """
+    return '00-{0}-{1}-01'.format(context.trace_id, context.span_id)
+
+
+def parse_traceparent(value):
+    """
+    Return the span context from a W3C traceparent header value.
+
+    Returns None if the value is missing or invalid.
+    """
+    if isinstance(value, bytes):
+        value = value.decode(errors='replace')
+
+    if not isinstance(value, str):
+        return None
+
+    match = TRACEPARENT_REGEX.match(value.strip().lower())
+
+    if not match or not int(match.group(1), 16) or not int(match.group(2), 16):
+        return None
+
+    return SpanContext(*match.groups())
+
+
+def format_attribute(key, value):
+    """
+    Return the attribute as an OTLP/JSON key value pair.
+    """
+    if isinstance(value, bool):
+        value = {'boolValue': value}
+    elif isinstance(value, int):
+        value = {'intValue': str(value)}
+    elif isinstance(value, float):
+        value = {'doubleValue': value}
+    else:
+        value = {'stringValue': str(value)}
+
+    return {'key': key, 'value': value}
+
+
+def get_time_unix_nano():
+    return int(time.time() * 1e9)
+
+
+class Span(object):
+    """
+    A timed operation within a trace.
+    """
+    def __init__(
+        self, tracer, name, context, parent_id=None,
+        kind=SPAN_KIND_INTERNAL, attributes=None
+    ):
+        self.tracer = tracer
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.status_code = STATUS_OK
+        self.status_message = None
+        self.start_time = get_time_unix_nano()
+        self.end_time = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_error(self, error):
+        """
+        Set the span status to error with the exception or message.
+        """
+        self.status_code = STATUS_ERROR
+
+        if isinstance(error, BaseException):
+            self.attributes['exception.type'] = type(error).__name__
+
+        self.status_message = str(error)
+
+    def end(self):
+        """
+        Finish the span and hand it to the exporter.
+
+        Ending a span more than once has no effect.
+        """
+        if self.end_time is not None:
+            return
+
+        self.end_time = get_time_unix_nano()
+        self.tracer.export(self)
+
+    def to_otlp(self):
+        """
+        Return the span in the OTLP/JSON format.
+        """
+        span = {
+            'traceId': self.context.trace_id,
+            'spanId': self.context.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start_time),
+            'endTimeUnixNano': str(self.end_time),
+            'attributes': [
+                format_attribute(key, value)
+                for key, value in self.attributes.items()
+                if value is not None
+            ],
+            'status': {'code': self.status_code}
+        }
+
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+
+        if self.status_message:
+            span['status']['message'] = self.status_message
+
+        return span
+
+
+class FileSpanExporter(object):
+    """
+    Append finished spans to a file in the OTLP/JSON format.
+
+    Each line is a complete export request which is the format read
+    by the OpenTelemetry collector otlpjsonfile receiver. Spans are
+    coarse (job stages, API calls, downloads) so each one is written
+    as it ends which keeps spans of a crashed service on disk.
+    """
+    def __init__(self, directory, service_name):
+        self.service_name = service_name
+        self.file_name = os.path.join(
+            directory, '{0}_spans.json'.format(service_name)
+        )
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+
+    def get_export_request(self, spans):
+        return {
+            'resourceSpans': [{
+                'resource': {
+                    'attributes': [
+                        format_attribute('service.name', self.service_name)
+                    ]
+                },
+                'scopeSpans': [{
+                    'scope': {'name': 'mash'},
+                    'spans': [span.to_otlp() for span in spans]
+                }]
+            }]
+        }
+
+    def export(self, spans):
+        line = json.dumps(self.get_export_request(spans)) + '\n'
+
+        with self._lock:
+            with open(self.file_name, 'a') as span_file:
+                span_file.write(line)
+
+
+class Tracer(object):
+    """
+    Create spans and propagate their context.
+
+    The active span context is kept per thread. Spans started
+    without an explicit parent are children of the active context.
+    Without an exporter spans are still created so the context is
+    propagated to other services but nothing is written.
+    """
+    def __init__(self):
+        self.exporter = None
+        self._local = threading.local()
+
+    def configure(self, exporter):
+        self.exporter = exporter
+
+    def _get_stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+
+        return self._local.stack
+
+    def get_current_context(self):
+        """
+        Return the active span context of the thread or None.
+        """
+        stack = self._get_stack()
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def activate(self, context):
+        """
+        Make the span context active in the with block.
+
+        A context of None leaves the active context unchanged.
+        """
+        if not context:
+            yield
+            return
+
+        stack = self._get_stack()
+        stack.append(context)
+
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    def start_span(
+        self, name, parent=None, trace_id=None, kind=SPAN_KIND_INTERNAL,
+        attributes=None
+    ):
+        """
+        Start and return a span without activating it.
+
+        The trace_id is only used if there is no parent context.
+        """
+        parent = parent or self.get_current_context()
+
+        if parent:
+            trace_id = parent.trace_id
+            parent_id = parent.span_id
+        else:
+            trace_id = trace_id or new_trace_id()
+            parent_id = None
+
+        return Span(
+            self,
+            name,
+            SpanContext(trace_id, new_span_id()),
+            parent_id=parent_id,
+            kind=kind,
+            attributes=attributes
+        )
+
+    @contextmanager
+    def span(self, name, **kwargs):
+        """
+        Start a span that is active and ends with the with block.
+
+        An exception raised in the block sets the span status to
+        error and is re-raised.
+        """
+        span = self.start_span(name, **kwargs)
+
+        try:
+            with self.activate(span.context):
+                yield span
+        except Exception as error:
+            span.set_error(error)
+            raise
+        finally:
+            span.end()
+
+    def inject(self, headers=None):
+        """
+        Return a copy of headers with the active trace context added.
+        """
+        headers = dict(headers or {})
+        context = self.get_current_context()
+
+        if context:
+            headers[TRACEPARENT] = format_traceparent(context)
+
+        return headers
+
+    def extract(self, headers):
+        """
+        Return the span context from message or request headers.
+        """
+        if not isinstance(headers, dict):
+            return None
+
+        value = headers.get(TRACEPARENT) or headers.get(TRACEPARENT.encode())
+        return parse_traceparent(value)
+
+    def export(self, span):
+        """
+        Export the finished span.
+
+        Tracing is informational, a span that cannot be written is
+        counted and dropped instead of failing the operation.
+        """
+        if not self.exporter:
+            return
+
+        try:
+            self.exporter.export([span])
+        except Exception:
+            spans_dropped.inc()
+
+
+tracer = Tracer()
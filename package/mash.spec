@@ -155,6 +155,9 @@ install -D -m 644 config/mash_deprecate.service \
 install -D -m 644 config/mash_cleanup.service \
     %{buildroot}%{_unitdir}/mash_cleanup.service
 
+install -D -m 644 config/mash_outbox.service \
+    %{buildroot}%{_unitdir}/mash_outbox.service
+
 %pre
 %{_bindir}/getent group mash > /dev/null || %{_sbindir}/groupadd mash
 %{_bindir}/getent passwd mash > /dev/null || %{_sbindir}/useradd -r -g mash -s %{_bindir}/false -c "User for MASH" -d %{_localstatedir}/lib/mash mash
@@ -221,4 +224,7 @@ python3 -m pytest
 %{_bindir}/mash-cleanup-service
 %{_unitdir}/mash_cleanup.service
 
+%{_bindir}/mash-outbox-service
+%{_unitdir}/mash_outbox.service
+
 %changelog
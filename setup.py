@@ -35,7 +35,8 @@ config = {
             'mash-publish-service=mash.services.publish_service:main',
             'mash-deprecate-service=mash.services.deprecate_service:main',
             'mash-raw-image-upload-service=mash.services.raw_image_upload_service:main',
-            'mash-cleanup-service=mash.services.cleanup_service:main'
+            'mash-cleanup-service=mash.services.cleanup_service:main',
+            'mash-outbox-service=mash.services.outbox_service:main'
         ]
     },
     'include_package_data': True,
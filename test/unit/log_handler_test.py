@@ -1,50 +1,26 @@
+import json
 import logging
+import os
+import queue
 
-from unittest.mock import Mock, patch
+from pytest import raises
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, call, patch
 
 from mash.log.handler import (
-    RabbitMQHandler,
+    AsyncRabbitMQHandler,
     RabbitMQSocket
 )
 
 
-class TestRabbitMQHandler(object):
-    def setup(self):
+class TestRabbitMQSocket(object):
+    def setup_method(self, method):
         self.connection = Mock()
         self.channel = Mock()
         self.channel.exchange.declare.return_value = None
         self.channel.basic.publish.return_value = None
         self.connection.channel.return_value = self.channel
 
-        self.handler = RabbitMQHandler()
-
-    @patch('mash.log.handler.Connection')
-    def test_rabbit_handler_messages(self, mock_connection):
-        mock_connection.return_value = self.connection
-
-        log = logging.getLogger('log_handler_test')
-        log.addHandler(self.handler)
-        log.setLevel(logging.DEBUG)
-
-        log.info('Job finished!', extra={'job_id': '4711'})
-        self.channel.basic.publish.assert_called_once_with(
-            exchange='logger',
-            routing_key='mash.logger',
-            body='{"job_id": "4711", "msg": "Job finished!"}',
-            properties={
-                'content_type': 'application/json',
-                'delivery_mode': 2
-            }
-        )
-        self.channel.basic.publish.reset_mock()
-
-        try:
-            raise Exception('Broken')
-        except Exception:
-            log.exception('Test exc_info')
-
-        assert self.channel.basic.publish.call_count == 1
-
     @patch('mash.log.handler.Connection')
     def test_rabbit_socket(self, mock_connection):
         mock_connection.return_value = self.connection
@@ -68,25 +44,223 @@ class TestRabbitMQHandler(object):
         )
 
         self.connection.channel.assert_called_once_with()
+        self.channel.tx.select.assert_called_once_with()
         self.channel.exchange.declare.assert_called_once_with(
             exchange='exchange',
             exchange_type='direct',
             durable=True
         )
 
-        msg = '{"levelname": "INFO"}'
-        socket.sendall(msg)
+        self.channel.is_closed = False
+        messages = ['{"levelname": "INFO"}', '{"levelname": "ERROR"}']
+        socket.publish(messages)
 
-        self.channel.basic.publish.assert_called_once_with(
-            exchange='exchange',
-            routing_key='mash.logger',
-            body=msg,
-            properties={
-                'content_type': 'application/json',
-                'delivery_mode': 2
-            }
-        )
+        assert self.channel.basic.publish.call_args_list == [
+            call(
+                exchange='exchange',
+                routing_key='mash.logger',
+                body=msg,
+                properties={
+                    'content_type': 'application/json',
+                    'delivery_mode': 2
+                }
+            ) for msg in messages
+        ]
+        self.channel.tx.commit.assert_called_once_with()
+        self.channel.tx.select.assert_called_once_with()
 
         socket.close()
         self.connection.close.assert_called_once_with()
         self.channel.close.assert_called_once_with()
+
+
+class TestAsyncRabbitMQHandler(object):
+    def setup_method(self, method):
+        self.handler = AsyncRabbitMQHandler(
+            max_queue_size=2,
+            batch_size=2,
+            flush_interval=0.01,
+            retry_interval=0
+        )
+        self.log = logging.getLogger('async_log_handler_test')
+        self.log.propagate = False
+        self.log.setLevel(logging.DEBUG)
+
+    def teardown_method(self, method):
+        self.log.removeHandler(self.handler)
+
+    def test_invalid_overflow_policy(self):
+        with raises(ValueError):
+            AsyncRabbitMQHandler(overflow_policy='block')
+
+        with raises(ValueError):
+            AsyncRabbitMQHandler(overflow_policy='spill')
+
+    @patch('mash.log.handler.RabbitMQSocket')
+    def test_async_handler_publish(self, mock_socket):
+        sock = Mock()
+        mock_socket.return_value = sock
+        self.log.addHandler(self.handler)
+
+        self.log.info('Job finished!', extra={'job_id': '4711'})
+        self.handler.close()
+
+        mock_socket.assert_called_once_with(
+            'localhost',
+            5672,
+            'guest',
+            'guest',
+            'logger',
+            'mash.logger'
+        )
+        record = json.loads(sock.publish.call_args[0][0][0])
+        assert record['job_id'] == '4711'
+        assert record['msg'] == 'Job finished!'
+        assert record['message'] == 'Job finished!'
+        assert record['levelname'] == 'INFO'
+        assert record['name'] == 'async_log_handler_test'
+        assert 'created' in record
+        sock.close.assert_called_once_with()
+
+        stats = self.handler.get_stats()
+        assert stats['queued'] == 1
+        assert stats['published'] == 1
+        assert stats['max_latency'] >= stats['last_latency'] >= 0
+
+    @patch('mash.log.handler.time.monotonic')
+    @patch('mash.log.handler.RabbitMQSocket')
+    def test_async_handler_publish_batch(self, mock_socket, mock_monotonic):
+        sock = Mock()
+        mock_socket.return_value = sock
+        mock_monotonic.return_value = 10
+        batch = [(4, '{"msg": "Message 0"}'), (8, '{"msg": "Message 1"}')]
+
+        self.handler._publish_batch(batch)
+
+        # One transaction for the batch
+        sock.publish.assert_called_once_with(
+            ['{"msg": "Message 0"}', '{"msg": "Message 1"}']
+        )
+        assert batch == []
+
+        stats = self.handler.get_stats()
+        assert stats['published'] == 2
+        assert stats['last_latency'] == 2
+        assert stats['max_latency'] == 6
+
+    @patch('mash.log.handler.sys.stderr')
+    def test_async_handler_drop(self, mock_stderr):
+        self.handler._pid = os.getpid()
+        self.handler.records = queue.Queue(maxsize=2)
+        self.log.addHandler(self.handler)
+
+        for index in range(3):
+            self.log.info('Message {0}'.format(index))
+
+        assert self.handler.get_stats()['dropped'] == 1
+        assert [
+            json.loads(body)['msg'] for _, body in self.handler._get_batch()
+        ] == ['Message 0', 'Message 1']
+
+        self.handler.close()
+        mock_stderr.write.assert_called_once_with(
+            'RabbitMQ log handler dropped 1 records.\n'
+        )
+
+    @patch('mash.log.handler.RabbitMQSocket')
+    def test_async_handler_spill(self, mock_socket):
+        sock = Mock()
+        mock_socket.return_value = sock
+
+        with TemporaryDirectory() as test_dir:
+            spill_file = os.path.join(test_dir, 'spill.log')
+            handler = AsyncRabbitMQHandler(
+                max_queue_size=1,
+                flush_interval=0.01,
+                overflow_policy='spill',
+                spill_file=spill_file
+            )
+            handler._pid = os.getpid()
+            handler.records = queue.Queue(maxsize=1)
+            self.log.addHandler(handler)
+
+            self.log.info('Message 0')
+            self.log.info('Message 1')
+
+            assert handler.get_stats()['spilled'] == 1
+            assert handler._get_spilled_batch() == []
+
+            batch = handler._get_batch()
+            handler._publish_batch(batch)
+
+            batch = handler._get_spilled_batch()
+            assert [json.loads(body)['msg'] for _, body in batch] == [
+                'Message 1'
+            ]
+            assert not os.path.exists(spill_file)
+            assert handler._get_spilled_batch() == []
+
+            # Spill file cannot be written
+            handler.spill_file = os.path.join(test_dir, 'missing', 'spill')
+            self.log.info('Message 2')
+            self.log.info('Message 3')
+            assert handler.get_stats()['dropped'] == 1
+
+            self.log.removeHandler(handler)
+
+    @patch('mash.log.handler.sys.stderr')
+    @patch('mash.log.handler.RabbitMQSocket')
+    def test_async_handler_publish_error(self, mock_socket, mock_stderr):
+        sock = Mock()
+        sock.close.side_effect = Exception('Closed')
+        mock_socket.return_value = sock
+
+        def publish(messages):
+            if sock.publish.call_count == 1:
+                raise Exception('Broken')
+
+            self.handler._stopped.set()
+
+        sock.publish.side_effect = publish
+        self.handler.report_interval = 0
+        self.handler.records = queue.Queue()
+        self.handler.records.put((0, '{"msg": "Message 0"}'))
+        self.handler.stats['dropped'] = 1
+
+        self.handler._publish_records()
+
+        stats = self.handler.get_stats()
+        assert stats['publish_errors'] == 1
+        assert stats['published'] == 1
+        assert mock_socket.call_count == 2
+        assert self.handler.sock is None
+        mock_stderr.write.assert_called_once_with(
+            'RabbitMQ log handler dropped 1 records.\n'
+        )
+
+        # Stopped while the broker is unavailable
+        sock.publish.side_effect = Exception('Broken')
+        self.handler.records.put((0, '{"msg": "Message 1"}'))
+
+        self.handler._publish_records()
+
+        assert self.handler.get_stats()['publish_errors'] == 2
+
+    @patch('mash.log.handler.os.getpid')
+    def test_async_handler_publisher_started(self, mock_getpid):
+        mock_getpid.side_effect = [1, 2]
+        self.handler._pid = 2
+
+        self.handler._ensure_publisher()
+
+        assert self.handler._thread is None
+
+    def test_async_handler_format_error(self):
+        self.handler.format_record = Mock(side_effect=Exception('Broken'))
+        self.handler.handleError = Mock()
+        self.log.addHandler(self.handler)
+
+        self.log.info('Message 0')
+
+        assert self.handler.handleError.call_count == 1
+        self.handler.close()
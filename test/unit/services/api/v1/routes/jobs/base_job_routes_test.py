@@ -1,8 +1,14 @@
+import gzip
 import json
+import queue
 
 from datetime import datetime
 from unittest.mock import patch, Mock
 
+from pytest import raises
+
+from mash.mash_exceptions import MashException, MashJobException
+
 
 @patch('mash.services.api.v1.routes.jobs.delete_job')
 @patch('mash.services.api.v1.routes.jobs.get_jwt_identity')
@@ -137,3 +143,248 @@ def test_api_get_job_list(
     assert result.json[0]['profile'] == 'Server'
     assert result.json[0]['state'] == 'pending'
     assert result.json[0]['start_time'] == '2011-11-11 11:11:11'
+
+
+@patch('mash.services.api.v1.routes.jobs.get_subscriber')
+@patch('mash.services.api.v1.routes.jobs.get_job')
+@patch('mash.services.api.v1.routes.jobs.get_jwt_identity')
+@patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
+def test_api_get_job_events(
+        mock_jwt_required,
+        mock_jwt_identity,
+        mock_get_job,
+        mock_get_subscriber,
+        test_client
+):
+    job = {
+        'job_id': '12345678-1234-1234-1234-123456789012',
+        'state': 'running',
+        'current_service': 'upload',
+        'errors': []
+    }
+    watcher = queue.Queue()
+    watcher.put({
+        'job_id': '12345678-1234-1234-1234-123456789012',
+        'state': 'finished',
+        'current_service': None,
+        'prev_service': 'test',
+        'status': 'success',
+        'errors': []
+    })
+    subscriber = Mock()
+    subscriber.subscribe.return_value = watcher
+    mock_get_subscriber.return_value = subscriber
+    mock_get_job.return_value = job
+    mock_jwt_identity.return_value = 'user1'
+
+    result = test_client.get(
+        '/v1/jobs/12345678-1234-1234-1234-123456789012/events'
+    )
+
+    assert result.status_code == 200
+    assert result.mimetype == 'text/event-stream'
+    events = result.get_data(as_text=True).split('\n\n')
+    assert events[0] == (
+        'event: status\ndata: {"current_service": "upload", "errors": [], '
+        '"job_id": "12345678-1234-1234-1234-123456789012", '
+        '"state": "running"}'
+    )
+    assert '"state": "finished"' in events[1]
+    subscriber.subscribe.assert_called_once_with(
+        '12345678-1234-1234-1234-123456789012'
+    )
+    subscriber.unsubscribe.assert_called_once_with(
+        '12345678-1234-1234-1234-123456789012', watcher
+    )
+
+    # Job not found
+    subscriber.unsubscribe.reset_mock()
+    mock_get_job.return_value = {}
+
+    result = test_client.get(
+        '/v1/jobs/12345678-1234-1234-1234-123456789012/events'
+    )
+
+    assert result.status_code == 404
+    assert result.json['msg'] == 'Job not found'
+    subscriber.unsubscribe.assert_called_once_with(
+        '12345678-1234-1234-1234-123456789012', watcher
+    )
+
+    # Database request failed
+    subscriber.unsubscribe.reset_mock()
+    mock_get_job.side_effect = MashException('Database not available')
+
+    with raises(MashException):
+        test_client.get(
+            '/v1/jobs/12345678-1234-1234-1234-123456789012/events'
+        )
+
+    subscriber.unsubscribe.assert_called_once_with(
+        '12345678-1234-1234-1234-123456789012', watcher
+    )
+
+
+@patch('mash.services.api.v1.routes.jobs.read_job_log')
+@patch('mash.services.api.v1.routes.jobs.get_job')
+@patch('mash.services.api.v1.routes.jobs.get_jwt_identity')
+@patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
+def test_api_get_job_logs(
+        mock_jwt_required,
+        mock_jwt_identity,
+        mock_get_job,
+        mock_read_job_log,
+        test_client
+):
+    mock_get_job.return_value = {
+        'job_id': '12345678-1234-1234-1234-123456789012'
+    }
+    mock_jwt_identity.return_value = 'user1'
+    log = {
+        'job_id': '12345678-1234-1234-1234-123456789012',
+        'lines': ['Job started.\n'] * 200,
+        'line_offset': 0,
+        'next_line_offset': 200,
+        'size': 2600
+    }
+    mock_read_job_log.return_value = log
+
+    result = test_client.get(
+        '/v1/jobs/12345678-1234-1234-1234-123456789012/logs',
+        content_type='application/json',
+        data=json.dumps({'line_offset': 0, 'line_limit': 200}),
+        headers={'Accept-Encoding': 'gzip'}
+    )
+
+    assert result.status_code == 200
+    assert result.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(result.data)) == log
+    mock_read_job_log.assert_called_once_with(
+        '12345678-1234-1234-1234-123456789012',
+        {'line_offset': 0, 'line_limit': 200}
+    )
+
+    # Default range and no compression
+    mock_read_job_log.reset_mock()
+    result = test_client.get(
+        '/v1/jobs/12345678-1234-1234-1234-123456789012/logs',
+        content_type='application/json',
+        data=json.dumps({})
+    )
+
+    assert result.status_code == 200
+    assert 'Content-Encoding' not in result.headers
+    assert result.json == log
+    mock_read_job_log.assert_called_once_with(
+        '12345678-1234-1234-1234-123456789012', {}
+    )
+
+    # No log
+    mock_read_job_log.side_effect = MashJobException('No log found.')
+    result = test_client.get(
+        '/v1/jobs/12345678-1234-1234-1234-123456789012/logs',
+        content_type='application/json',
+        data=json.dumps({})
+    )
+
+    assert result.status_code == 404
+    assert result.json['msg'] == 'No log found.'
+
+    # Job not found
+    mock_get_job.return_value = {}
+    result = test_client.get(
+        '/v1/jobs/12345678-1234-1234-1234-123456789012/logs',
+        content_type='application/json',
+        data=json.dumps({})
+    )
+
+    assert result.status_code == 404
+    assert result.json['msg'] == 'Job not found'
+
+
+@patch('mash.services.api.v1.routes.jobs.get_job_timeline')
+@patch('mash.services.api.v1.routes.jobs.get_jwt_identity')
+@patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
+def test_api_get_job_timeline(
+        mock_jwt_required,
+        mock_jwt_identity,
+        mock_get_timeline,
+        test_client
+):
+    timeline = {
+        'job_id': '12345678-1234-1234-1234-123456789012',
+        'stages': [{'service': 'upload', 'duration': 120.0}]
+    }
+    mock_get_timeline.return_value = timeline
+    mock_jwt_identity.return_value = 'user1'
+
+    result = test_client.get(
+        '/v1/jobs/12345678-1234-1234-1234-123456789012/timeline'
+    )
+
+    assert result.status_code == 200
+    assert result.json == timeline
+    mock_get_timeline.assert_called_once_with(
+        '12345678-1234-1234-1234-123456789012',
+        'user1'
+    )
+
+    # Not found
+    mock_get_timeline.return_value = {}
+
+    result = test_client.get(
+        '/v1/jobs/12345678-1234-1234-1234-123456789012/timeline'
+    )
+
+    assert result.status_code == 404
+    assert result.json['msg'] == 'Job not found'
+
+
+@patch('mash.services.api.v1.routes.jobs.get_stage_statistics')
+@patch('mash.services.api.v1.routes.jobs.get_jwt_identity')
+@patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
+def test_api_get_job_stages(
+        mock_jwt_required,
+        mock_jwt_identity,
+        mock_get_statistics,
+        test_client
+):
+    statistics = [{
+        'cloud': 'ec2',
+        'service': 'upload',
+        'count': 2,
+        'duration': {'p50': 60.0, 'p95': 120.0}
+    }]
+    mock_get_statistics.return_value = statistics
+    mock_jwt_identity.return_value = 'user1'
+
+    result = test_client.get(
+        '/v1/jobs/stages',
+        content_type='application/json',
+        data=json.dumps({'cloud': 'ec2'})
+    )
+
+    assert result.status_code == 200
+    assert result.json == statistics
+    mock_get_statistics.assert_called_once_with('user1', cloud='ec2')
+
+    # Exception
+    mock_get_statistics.side_effect = Exception('Invalid date')
+
+    result = test_client.get(
+        '/v1/jobs/stages',
+        content_type='application/json',
+        data=json.dumps({})
+    )
+
+    assert result.status_code == 400
+    assert result.json['msg'] == 'Invalid date'
+
+    # Validation error
+    result = test_client.get(
+        '/v1/jobs/stages',
+        content_type='application/json',
+        data=json.dumps({'state': 'failed'})
+    )
+
+    assert result.status_code == 400
@@ -0,0 +1,73 @@
+import json
+
+from unittest.mock import patch
+
+
+@patch('mash.services.api.v1.routes.jobs.bulk.submit_bulk_jobs')
+@patch('mash.services.api.v1.routes.jobs.bulk.get_jwt_identity')
+@patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
+def test_api_add_bulk_jobs(
+    mock_jwt_required,
+    mock_jwt_identity,
+    mock_submit_bulk_jobs,
+    test_client
+):
+    mock_jwt_identity.return_value = 'user1'
+    mock_submit_bulk_jobs.return_value = [
+        {
+            'index': 0,
+            'status': 'created',
+            'job': {'job_id': '12345678-1234-1234-1234-123456789012'}
+        },
+        {'index': 1, 'status': 'invalid', 'msg': 'Job failed: Broken'}
+    ]
+
+    data = {
+        'job': {'image': 'test_image_oem'},
+        'matrix': {
+            'cloud': ['ec2'],
+            'cloud_account': ['acnt1', 'acnt2']
+        }
+    }
+
+    response = test_client.post(
+        '/v1/jobs/bulk/',
+        content_type='application/json',
+        data=json.dumps(data, sort_keys=True)
+    )
+
+    assert response.status_code == 201
+    assert response.json['jobs'][0]['job']['job_id'] == \
+        '12345678-1234-1234-1234-123456789012'
+    assert response.json['jobs'][1]['msg'] == 'Job failed: Broken'
+    mock_submit_bulk_jobs.assert_called_once_with(data, 'user1')
+
+    # Dry run
+    mock_submit_bulk_jobs.return_value = [
+        {'index': 0, 'status': 'valid', 'msg': 'Job doc is valid!'}
+    ]
+    response = test_client.post(
+        '/v1/jobs/bulk/',
+        content_type='application/json',
+        data=json.dumps(data, sort_keys=True)
+    )
+    assert response.status_code == 200
+
+    # All invalid
+    mock_submit_bulk_jobs.return_value = [
+        {'index': 0, 'status': 'invalid', 'msg': 'Job failed: Broken'}
+    ]
+    response = test_client.post(
+        '/v1/jobs/bulk/',
+        content_type='application/json',
+        data=json.dumps(data, sort_keys=True)
+    )
+    assert response.status_code == 400
+
+    # Schema validation
+    response = test_client.post(
+        '/v1/jobs/bulk/',
+        content_type='application/json',
+        data=json.dumps({'job': {}}, sort_keys=True)
+    )
+    assert response.status_code == 400
@@ -0,0 +1,158 @@
+import json
+import queue
+
+from unittest.mock import MagicMock, Mock, patch
+
+from werkzeug.local import LocalProxy
+
+from mash.services.api.v1.utils import job_status
+from mash.services.api.v1.utils.job_status import (
+    JobStatusSubscriber,
+    format_event,
+    get_subscriber,
+    stream_job_status
+)
+
+
+class TestJobStatusSubscriber(object):
+
+    def setup_method(self, method):
+        self.subscriber = JobStatusSubscriber(
+            'localhost',
+            'guest',
+            'guest',
+            retry_interval=0,
+            max_queued_events=1
+        )
+        self.subscriber.log = Mock()
+
+    @patch('mash.services.api.v1.utils.job_status.threading.Thread')
+    def test_subscribe(self, mock_thread):
+        thread = Mock()
+        thread.is_alive.return_value = True
+        mock_thread.return_value = thread
+
+        watcher1 = self.subscriber.subscribe('1')
+        watcher2 = self.subscriber.subscribe('1')
+
+        # Consumer thread only started once
+        thread.start.assert_called_once_with()
+        assert self.subscriber.watchers['1'] == [watcher1, watcher2]
+
+        self.subscriber.unsubscribe('1', watcher1)
+        assert self.subscriber.watchers['1'] == [watcher2]
+
+        self.subscriber.unsubscribe('1', watcher2)
+        self.subscriber.unsubscribe('1', watcher2)
+        assert '1' not in self.subscriber.watchers
+
+    def test_dispatch(self):
+        watcher = queue.Queue(maxsize=1)
+        self.subscriber.watchers['1'] = [watcher]
+        message = Mock()
+        message.body = json.dumps({'job_id': '1', 'state': 'running'})
+
+        self.subscriber._dispatch(message)
+        assert watcher.get_nowait() == {'job_id': '1', 'state': 'running'}
+
+        # Full watcher queue drops the event
+        self.subscriber._dispatch(message)
+        self.subscriber._dispatch(message)
+        assert watcher.qsize() == 1
+
+        # Invalid message
+        message.body = 'Not json'
+        self.subscriber._dispatch(message)
+        self.subscriber.log.warning.assert_called_once_with(
+            'Invalid job status event received: '
+            'Expecting value: line 1 column 1 (char 0)'
+        )
+
+    @patch('mash.services.api.v1.utils.job_status.Connection')
+    def test_consume(self, mock_connection):
+        connection = MagicMock()
+        channel = MagicMock()
+        channel.queue.declare.return_value = {'queue': 'amq.gen-1'}
+        connection.channel.return_value = channel
+        connection.is_open = True
+        mock_connection.side_effect = [Exception('Refused'), connection]
+
+        def stop_consuming():
+            self.subscriber.stop()
+
+        channel.start_consuming.side_effect = stop_consuming
+
+        self.subscriber._consume()
+
+        self.subscriber.log.warning.assert_called_once_with(
+            'Job status subscription failed: Refused'
+        )
+        channel.queue.bind.assert_called_once_with(
+            exchange='jobcreator',
+            queue='amq.gen-1',
+            routing_key='job_status'
+        )
+        channel.basic.consume.assert_called_once_with(
+            callback=self.subscriber._dispatch,
+            queue='amq.gen-1',
+            no_ack=True
+        )
+        connection.close.assert_called_once_with()
+
+
+@patch.object(LocalProxy, '_get_current_object')
+def test_get_subscriber(mock_get_current_object):
+    app = Mock()
+    app.config = {
+        'AMQP_HOST': 'localhost',
+        'AMQP_USER': 'guest',
+        'AMQP_PASS': 'guest'
+    }
+    mock_get_current_object.return_value = app
+    job_status.subscriber = None
+
+    subscriber = get_subscriber()
+
+    assert subscriber.host == 'localhost'
+    assert get_subscriber() is subscriber
+    job_status.subscriber = None
+
+
+def test_stream_job_status():
+    job = {
+        'job_id': '1',
+        'state': 'running',
+        'current_service': 'upload',
+        'errors': []
+    }
+    subscriber = Mock()
+    watcher = queue.Queue()
+    watcher.put({'job_id': '1', 'state': 'running'})
+
+    stream = stream_job_status(
+        job,
+        subscriber,
+        watcher,
+        keepalive_interval=0.01,
+        timeout=0.05
+    )
+    events = list(stream)
+
+    assert events[0] == format_event({
+        'job_id': '1',
+        'state': 'running',
+        'current_service': 'upload',
+        'errors': []
+    })
+    assert events[1] == format_event({'job_id': '1', 'state': 'running'})
+    assert ': keepalive\n\n' in events
+    subscriber.unsubscribe.assert_called_once_with('1', watcher)
+
+    # Job already finished
+    subscriber.reset_mock()
+    job['state'] = 'finished'
+
+    events = list(stream_job_status(job, subscriber, watcher))
+
+    assert len(events) == 1
+    subscriber.unsubscribe.assert_called_once_with('1', watcher)
@@ -5,7 +5,10 @@ from unittest.mock import Mock, patch
 
 from mash.services.api.v1.utils.jobs import (
     create_job,
+    create_jobs,
     delete_job,
+    get_job_timeline,
+    get_stage_statistics,
     validate_last_service,
     validate_create_args,
     validate_deprecate_args,
@@ -17,7 +20,6 @@ from werkzeug.local import LocalProxy
 
 
 @patch.object(LocalProxy, '_get_current_object')
-@patch('mash.services.api.v1.utils.jobs.publish')
 @patch('mash.services.api.v1.utils.jobs.handle_request')
 @patch('mash.services.api.v1.utils.jobs.get_user_by_id')
 @patch('mash.services.api.v1.utils.jobs.uuid')
@@ -25,7 +27,6 @@ def test_create_job(
     mock_uuid,
     mock_get_user,
     mock_handle_request,
-    mock_publish,
     mock_get_current_obj
 ):
     app = Mock()
@@ -85,15 +86,14 @@ def test_create_job(
     data['job_id'] = '12345678-1234-1234-1234-123456789012'
 
     assert result == job
-    mock_publish.assert_called_once_with(
-        'jobcreator',
-        'job_document',
-        json.dumps(data, sort_keys=True)
-    )
+    job_data = mock_handle_request.call_args[1]['job_data']
+    assert job_data['job_id'] == '12345678-1234-1234-1234-123456789012'
+    assert job_data['state'] == 'running'
+    assert job_data['current_service'] == 'obs'
+    assert job_data['job_document'] == json.dumps(data, sort_keys=True)
 
     # Exception
-    mock_publish.side_effect = Exception('Cannot publish message!')
-    mock_handle_request.side_effect = [None, Exception('Borked')]
+    mock_handle_request.side_effect = Exception('Borked')
     del data['job_id']
 
     with raises(Exception):
@@ -106,14 +106,57 @@ def test_create_job(
 
 
 @patch.object(LocalProxy, '_get_current_object')
-@patch('mash.services.api.v1.utils.jobs.publish')
 @patch('mash.services.api.v1.utils.jobs.handle_request')
-def test_delete_jobs(mock_handle_request, mock_publish, mock_get_current_obj):
+@patch('mash.services.api.v1.utils.jobs.uuid')
+def test_create_jobs(
+    mock_uuid,
+    mock_handle_request,
+    mock_get_current_obj
+):
+    app = Mock()
+    app.config = {
+        'DATABASE_API_URL': 'http://localhost:5007',
+        'SERVICE_NAMES': ['obs', 'upload', 'create']
+    }
+    mock_get_current_obj.return_value = app
+    mock_uuid.uuid4.side_effect = ['1', '2']
+
+    response = Mock()
+    response.json.return_value = [{'job_id': '1'}, {'job_id': '2'}]
+    mock_handle_request.return_value = response
+
+    data = {
+        'last_service': 'create',
+        'utctime': 'now',
+        'image': 'test_oem_image',
+        'download_url': 'http://download.opensuse.org/repositories/Cloud:Tools/images',
+        'requesting_user': '1',
+        'cloud_image_name': 'Test OEM Image',
+        'image_description': 'Description of an image'
+    }
+    data2 = dict(data)
+    data2['cloud_architecture'] = 'aarch64'
+
+    result = create_jobs([data, data2])
+
+    assert result == [{'job_id': '1'}, {'job_id': '2'}]
+    assert mock_handle_request.call_args[0][1] == 'jobs/bulk'
+    kwargs = mock_handle_request.call_args[1]['job_data']['jobs']
+    assert kwargs[0]['job_id'] == '1'
+    assert kwargs[0]['job_document'] == json.dumps(data, sort_keys=True)
+    assert kwargs[1]['job_id'] == '2'
+    assert kwargs[1]['cloud_architecture'] == 'aarch64'
+    assert kwargs[1]['current_service'] == 'obs'
+    assert kwargs[1]['job_document'] == json.dumps(data2, sort_keys=True)
+
+
+@patch.object(LocalProxy, '_get_current_object')
+@patch('mash.services.api.v1.utils.jobs.handle_request')
+def test_delete_jobs(mock_handle_request, mock_get_current_obj):
     job = {'rows_deleted': 1}
     response = Mock()
     response.json.return_value = job
     mock_handle_request.return_value = response
-    mock_publish.side_effect = Exception('Broken')
 
     app = Mock()
     app.config = {
@@ -130,6 +173,66 @@ def test_delete_jobs(mock_handle_request, mock_publish, mock_get_current_obj):
         delete_job('12345678-1234-1234-1234-123456789012', '1')
 
 
+@patch.object(LocalProxy, '_get_current_object')
+@patch('mash.services.api.v1.utils.jobs.handle_request')
+def test_get_job_timeline(mock_handle_request, mock_get_current_obj):
+    timeline = {
+        'job_id': '12345678-1234-1234-1234-123456789012',
+        'stages': [{'service': 'upload'}]
+    }
+    response = Mock()
+    response.json.return_value = timeline
+    mock_handle_request.return_value = response
+
+    app = Mock()
+    app.config = {
+        'DATABASE_API_URL': 'http://localhost:5007',
+    }
+    mock_get_current_obj.return_value = app
+
+    assert get_job_timeline(
+        '12345678-1234-1234-1234-123456789012', '1'
+    ) == timeline
+    mock_handle_request.assert_called_once_with(
+        'http://localhost:5007',
+        'jobs/timeline',
+        'get',
+        job_data={
+            'job_id': '12345678-1234-1234-1234-123456789012',
+            'user_id': '1'
+        }
+    )
+
+
+@patch.object(LocalProxy, '_get_current_object')
+@patch('mash.services.api.v1.utils.jobs.handle_request')
+def test_get_stage_statistics(mock_handle_request, mock_get_current_obj):
+    statistics = [{'cloud': 'ec2', 'service': 'upload'}]
+    response = Mock()
+    response.json.return_value = statistics
+    mock_handle_request.return_value = response
+
+    app = Mock()
+    app.config = {
+        'DATABASE_API_URL': 'http://localhost:5007',
+    }
+    mock_get_current_obj.return_value = app
+
+    assert get_stage_statistics(
+        '1', cloud='ec2', start='2026-10-01T00:00:00Z'
+    ) == statistics
+    mock_handle_request.assert_called_once_with(
+        'http://localhost:5007',
+        'jobs/stages',
+        'get',
+        job_data={
+            'user_id': '1',
+            'cloud': 'ec2',
+            'start': '2026-10-01T00:00:00Z'
+        }
+    )
+
+
 @patch.object(LocalProxy, '_get_current_object')
 def test_validate_last_service(mock_get_current_obj):
     app = Mock()
@@ -0,0 +1,127 @@
+from unittest.mock import Mock, patch
+
+from mash.mash_exceptions import MashException
+from mash.services.api.v1.utils.jobs.bulk import (
+    expand_job_matrix,
+    submit_bulk_jobs,
+    validate_bulk_job
+)
+
+from pytest import raises
+from werkzeug.local import LocalProxy
+
+
+def test_expand_job_matrix():
+    data = {
+        'jobs': [{'cloud': 'gce', 'cloud_account': 'acnt1'}],
+        'job': {'image': 'test_image'},
+        'matrix': {
+            'cloud': ['ec2'],
+            'cloud_account': ['acnt1', 'acnt2'],
+            'cloud_architecture': ['x86_64', 'aarch64']
+        }
+    }
+
+    jobs = expand_job_matrix(data)
+
+    assert len(jobs) == 5
+    assert jobs[0] == {'cloud': 'gce', 'cloud_account': 'acnt1'}
+    assert jobs[1] == {
+        'cloud': 'ec2',
+        'cloud_account': 'acnt1',
+        'cloud_architecture': 'x86_64',
+        'image': 'test_image'
+    }
+    assert jobs[4]['cloud_account'] == 'acnt2'
+    assert jobs[4]['cloud_architecture'] == 'aarch64'
+
+    # Base job is not modified
+    assert data['job'] == {'image': 'test_image'}
+
+
+@patch.dict(
+    'mash.services.api.v1.utils.jobs.bulk.job_types',
+    {'gce': (Mock(), Mock())}
+)
+def test_validate_bulk_job():
+    from mash.services.api.v1.utils.jobs.bulk import job_types
+    schema, validate = job_types['gce']
+    validate.side_effect = lambda doc: doc
+    schema_docs = []
+    schema.validate.side_effect = lambda doc: schema_docs.append(dict(doc))
+
+    job = validate_bulk_job({'cloud': 'gce', 'image': 'test'}, 'user1')
+
+    assert schema_docs == [{'image': 'test'}]
+    assert job == {
+        'cloud': 'gce',
+        'image': 'test',
+        'requesting_user': 'user1'
+    }
+
+    # Missing cloud
+    with raises(MashException):
+        validate_bulk_job({'image': 'test'}, 'user1')
+
+
+def test_validate_bulk_job_schema_error():
+    with raises(MashException) as error:
+        validate_bulk_job({'cloud': 'gce', 'image': 'test'}, 'user1')
+
+    assert 'Invalid gce job doc' in str(error.value)
+    assert "'last_service' is a required property" in str(error.value)
+
+
+@patch.object(LocalProxy, '_get_current_object')
+@patch('mash.services.api.v1.utils.jobs.bulk.create_jobs')
+@patch('mash.services.api.v1.utils.jobs.bulk.validate_bulk_job')
+def test_submit_bulk_jobs(
+    mock_validate_job,
+    mock_create_jobs,
+    mock_get_current_obj
+):
+    mock_get_current_obj.return_value = Mock()
+    mock_validate_job.side_effect = [
+        {'cloud': 'ec2', 'image': 'test1'},
+        MashException('Account not found'),
+        Exception('Broken'),
+        {'cloud': 'ec2', 'image': 'test4', 'dry_run': True},
+        {'cloud': 'ec2', 'image': 'test5'}
+    ]
+    mock_create_jobs.return_value = [{'job_id': '1'}, {'job_id': '5'}]
+
+    data = {'jobs': [{}, {}, {}, {}, {}]}
+    results = submit_bulk_jobs(data, 'user1')
+
+    mock_create_jobs.assert_called_once_with([
+        {'cloud': 'ec2', 'image': 'test1'},
+        {'cloud': 'ec2', 'image': 'test5'}
+    ])
+    assert results == [
+        {'index': 0, 'status': 'created', 'job': {'job_id': '1'}},
+        {
+            'index': 1,
+            'status': 'invalid',
+            'msg': 'Job failed: Account not found'
+        },
+        {'index': 2, 'status': 'invalid', 'msg': 'Failed to validate job'},
+        {'index': 3, 'status': 'valid', 'msg': 'Job doc is valid!'},
+        {'index': 4, 'status': 'created', 'job': {'job_id': '5'}}
+    ]
+
+    # Create failed
+    mock_validate_job.side_effect = None
+    mock_validate_job.return_value = {'cloud': 'ec2', 'image': 'test1'}
+    mock_create_jobs.side_effect = Exception('Cannot publish')
+
+    results = submit_bulk_jobs({'jobs': [{}]}, 'user1')
+    assert results == [
+        {'index': 0, 'status': 'failed', 'msg': 'Failed to start job'}
+    ]
+
+    # Dry run
+    mock_create_jobs.reset_mock()
+    results = submit_bulk_jobs({'jobs': [{}], 'dry_run': True}, 'user1')
+
+    assert results[0]['status'] == 'valid'
+    assert not mock_create_jobs.called
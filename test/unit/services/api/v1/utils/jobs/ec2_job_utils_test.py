@@ -83,7 +83,9 @@ def test_add_target_ec2_account(mock_get_regions):
 
     mock_get_regions.return_value = ['us-east-99']
 
-    cloud_accounts = {'acnt1': {'root_swap_ami': 'ami-456'}}
+    cloud_accounts = {
+        'acnt1': {'root_swap_ami': 'ami-456', 'create_method': 'ebs_direct'}
+    }
     accounts = {}
     helper_images = {'us-east-99': 'ami-789'}
 
@@ -98,6 +100,7 @@ def test_add_target_ec2_account(mock_get_regions):
     assert 'us-east-100' in accounts
     assert accounts['us-east-100']['account'] == 'acnt1'
     assert accounts['us-east-100']['helper_image'] == 'ami-456'
+    assert accounts['us-east-100']['create_method'] == 'ebs_direct'
     assert 'us-east-99' in accounts['us-east-100']['target_regions']
     assert 'us-east-100' in accounts['us-east-100']['target_regions']
 
@@ -120,6 +123,7 @@ def test_add_target_ec2_account(mock_get_regions):
     )
 
     assert accounts['us-east-100']['helper_image'] == 'ami-987'
+    assert accounts['us-east-100']['create_method'] is None
 
     add_target_ec2_account(
         account,
@@ -242,6 +246,25 @@ def test_validate_ec2_job(
     with raises(MashJobException):
         validate_ec2_job(job_doc)
 
+    # Test doc with create_once and billing codes
+    job_doc = {
+        'last_service': 'testing',
+        'requesting_user': '1',
+        'cloud_groups': ['group1'],
+        'cloud_image_name': 'Test OEM Image',
+        'image_description': 'Description of an image',
+        'billing_codes': 'bp-1234567890',
+        'create_once': True
+    }
+    with raises(MashJobException) as error:
+        validate_ec2_job(job_doc)
+
+    assert 'billing codes cannot be copied' in str(error.value)
+
+    # Billing codes without create_once are created in every account
+    del job_doc['create_once']
+    validate_ec2_job(job_doc)
+
 
 @patch.object(LocalProxy, '_get_current_object')
 def test_validate_mp_fields(mock_get_current_obj):
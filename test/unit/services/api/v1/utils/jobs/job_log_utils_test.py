@@ -0,0 +1,133 @@
+import gzip
+import os
+
+from pytest import raises
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
+
+from flask import Flask
+from werkzeug.local import LocalProxy
+
+from mash.mash_exceptions import MashJobException
+from mash.services.api.v1.utils.jobs.logs import (
+    get_job_log_file,
+    gzip_response,
+    read_job_log
+)
+from mash.utils.job_log_archive import JobLogArchive
+
+
+@patch.object(LocalProxy, '_get_current_object')
+@patch('mash.services.api.v1.utils.jobs.logs.wait_for_log_growth')
+def test_read_job_log(mock_wait, mock_get_current_object):
+    with TemporaryDirectory() as test_dir:
+        app = Mock()
+        app.config = {
+            'JOB_LOG_DIRECTORY': test_dir,
+            'JOB_LOG_ARCHIVE_DIRECTORY': os.path.join(test_dir, 'archive')
+        }
+        mock_get_current_object.return_value = app
+        log_file = os.path.join(test_dir, '1.log')
+
+        with open(log_file, 'w') as log:
+            log.write('line 0\nline 1\nline 2\n')
+
+        # Default tail
+        result = read_job_log('1', {})
+        assert result == {
+            'job_id': '1',
+            'lines': ['line 0\n', 'line 1\n', 'line 2\n'],
+            'line_offset': 0,
+            'next_line_offset': 3,
+            'size': 21
+        }
+
+        # Byte range
+        result = read_job_log('1', {'byte_offset': 7, 'byte_limit': 7})
+        assert result['data'] == 'line 1\n'
+        assert result['next_byte_offset'] == 14
+
+        # Follow at the end of the log
+        def append(log_file, size, timeout):
+            with open(log_file, 'a') as log:
+                log.write('line 3\n')
+            return True
+
+        mock_wait.side_effect = append
+        result = read_job_log(
+            '1', {'line_offset': 3, 'follow': True, 'wait': 5}
+        )
+        assert result['lines'] == ['line 3\n']
+        mock_wait.assert_called_once_with(log_file, 21, 5)
+
+        # Follow timed out
+        mock_wait.side_effect = None
+        mock_wait.return_value = False
+        result = read_job_log('1', {'byte_offset': 28, 'follow': True})
+        assert result['data'] == ''
+        assert result['next_byte_offset'] == 28
+
+        # No log
+        with raises(MashJobException):
+            read_job_log('2', {})
+
+        # Archived log with records written after it was archived
+        archive = JobLogArchive(os.path.join(test_dir, 'archive'))
+        archive.archive('1', log_file)
+
+        with open(log_file, 'w') as log:
+            log.write('line 4\n')
+
+        mock_wait.reset_mock()
+        result = read_job_log('1', {'line_offset': -2, 'follow': True})
+        assert result['lines'] == ['line 3\n', 'line 4\n']
+        assert result['size'] == 35
+        assert mock_wait.call_count == 0
+
+        os.remove(log_file)
+        result = read_job_log('1', {'byte_offset': 0})
+        assert result['data'] == 'line 0\nline 1\nline 2\nline 3\n'
+
+
+@patch.object(LocalProxy, '_get_current_object')
+def test_get_job_log_file(mock_get_current_object):
+    with TemporaryDirectory() as test_dir:
+        app = Mock()
+        app.config = {'JOB_LOG_DIRECTORY': test_dir}
+        mock_get_current_object.return_value = app
+        log_file = os.path.join(test_dir, '12', '1234.log')
+        legacy_file = os.path.join(test_dir, '1234.log')
+
+        assert get_job_log_file('1234') == log_file
+
+        # Log written before the job log directory was sharded
+        with open(legacy_file, 'w') as log:
+            log.write('line 0\n')
+
+        assert get_job_log_file('1234') == legacy_file
+
+        os.mkdir(os.path.join(test_dir, '12'))
+
+        with open(log_file, 'w') as log:
+            log.write('line 0\n')
+
+        assert get_job_log_file('1234') == log_file
+
+
+def test_gzip_response():
+    app = Flask('test')
+
+    with app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+        response = app.response_class('a' * 2048)
+        response = gzip_response(response)
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.get_data()) == b'a' * 2048
+
+        # Small responses are not compressed
+        response = gzip_response(app.response_class('a'))
+        assert 'Content-Encoding' not in response.headers
+
+    with app.test_request_context():
+        response = gzip_response(app.response_class('a' * 2048))
+        assert 'Content-Encoding' not in response.headers
@@ -0,0 +1,39 @@
+from unittest.mock import Mock
+
+from flask import Flask
+
+from mash.services.api.v1.utils.lookups import cached_lookup, shared_lookups
+
+
+def test_cached_lookup():
+    lookup = Mock(__name__='lookup')
+    lookup.side_effect = lambda name, user: {'name': name, 'user': user}
+    cached = cached_lookup(lookup)
+
+    app = Flask('test')
+    with app.app_context():
+        # Not in a shared lookup context
+        cached('acnt1', 'user1')
+        cached('acnt1', 'user1')
+        assert lookup.call_count == 2
+
+        lookup.reset_mock()
+        with shared_lookups():
+            account = cached('acnt1', 'user1')
+            account['name'] = 'changed'
+
+            assert cached('acnt1', 'user1') == {
+                'name': 'acnt1',
+                'user': 'user1'
+            }
+            cached('acnt2', 'user1')
+
+        assert lookup.call_count == 2
+
+        # Cache is cleared when the context exits
+        cached('acnt1', 'user1')
+        assert lookup.call_count == 3
+
+    # No app context
+    cached('acnt1', 'user1')
+    assert lookup.call_count == 4
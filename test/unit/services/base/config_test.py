@@ -121,11 +121,21 @@ class TestBaseConfig(object):
         assert self.config.get_log_directory() == '/tmp/log/'
         assert self.empty_config.get_log_directory() == '/var/log/mash/'
 
+    def test_get_job_log_directory(self):
+        assert self.config.get_job_log_directory() == '/tmp/log/jobs'
+
+    def test_get_job_log_archive_directory(self):
+        assert self.config.get_job_log_archive_directory() == \
+            '/tmp/log/archive'
+
+    def test_get_log_store_directory(self):
+        assert self.config.get_log_store_directory() == '/tmp/log/store'
+
     @patch.object(BaseConfig, 'get_log_directory')
     def test_get_job_log_file(self, mock_get_log_dir):
         mock_get_log_dir.return_value = '/var/log/mash/'
         assert self.empty_config.get_job_log_file('1234') == \
-            '/var/log/mash/jobs/1234.log'
+            '/var/log/mash/jobs/12/1234.log'
 
     def test_get_credentials_url(self):
         assert self.config.get_credentials_url() == 'http://localhost:5006/'
@@ -155,6 +165,10 @@ class TestBaseConfig(object):
         assert self.config.get_oci_upload_process_count() == 2
         assert self.empty_config.get_oci_upload_process_count() == 3
 
+    def test_get_aliyun_upload_process_count(self):
+        assert self.config.get_aliyun_upload_process_count() == 4
+        assert self.empty_config.get_aliyun_upload_process_count() == 3
+
     def test_get_base_thread_pool_count(self):
         assert self.config.get_base_thread_pool_count() == 20
         assert self.empty_config.get_base_thread_pool_count() == 10
@@ -163,6 +177,14 @@ class TestBaseConfig(object):
         assert self.config.get_publish_thread_pool_count() == 60
         assert self.empty_config.get_publish_thread_pool_count() == 50
 
+    def test_get_job_thread_pool_count(self):
+        assert self.config.get_job_thread_pool_count() == 20
+        assert self.empty_config.get_job_thread_pool_count() == 10
+
+    def test_get_account_thread_pool_count(self):
+        assert self.config.get_account_thread_pool_count() == 4
+        assert self.empty_config.get_account_thread_pool_count() == 5
+
     @patch.object(BaseConfig, 'get_auth_methods', lambda x: ['oauth2'])
     def test_get_oauth2_client_id(self):
         with raises(MashConfigException):
@@ -187,3 +209,57 @@ class TestBaseConfig(object):
         assert self.config.get_database_api_url() == 'http://localhost:5057/'
         assert self.empty_config.get_database_api_url() == \
             'http://localhost:5007/'
+
+    def test_get_metrics_host(self):
+        assert self.config.get_metrics_host() == '0.0.0.0'
+        assert self.empty_config.get_metrics_host() == 'localhost'
+
+    def test_get_metrics_port(self):
+        assert self.config.get_metrics_port('obs') == 9710
+        assert self.config.get_metrics_port('upload') is None
+        assert self.config.get_metrics_port('jobcreator') == 9620
+        assert self.config.get_metrics_port('unknown') is None
+        assert self.empty_config.get_metrics_port('obs') == 9610
+
+    def test_get_tracing_enabled(self):
+        assert self.config.get_tracing_enabled()
+        assert not self.empty_config.get_tracing_enabled()
+
+    def test_get_trace_directory(self):
+        assert self.config.get_trace_directory() == '/tmp/traces'
+        assert self.empty_config.get_trace_directory() == \
+            '/var/log/mash/traces'
+
+    def test_get_cloud_api_rate_limits(self):
+        assert self.config.get_cloud_api_rate_limits() == {
+            'azure': 3,
+            'ec2': 10,
+            'gce': 20
+        }
+        assert self.empty_config.get_cloud_api_rate_limits()['ec2'] == 20
+
+    def test_get_ec2_helper_pool(self):
+        assert self.config.get_ec2_helper_pool() == {
+            'size': 2,
+            'max_instances': 10,
+            'idle_timeout': 600
+        }
+        assert self.empty_config.get_ec2_helper_pool()['size'] == 0
+
+    def test_get_bandwidth_scheduler(self):
+        assert self.config.get_bandwidth_scheduler() == {
+            'state_dir': '/var/lib/mash/bandwidth/',
+            'limits': {'upload': 100000000},
+            'weights': {'upload': 1, 'download': 2}
+        }
+        assert self.empty_config.get_bandwidth_scheduler()['limits'] == {}
+
+    def test_get_cloud_api_rate_limiter_rates(self):
+        assert self.config.get_cloud_api_rate_limiter_rates() == {
+            'azure': {'read': 5},
+            'ec2': {'read': 20, 'write': 2},
+            'gce': {'read': 20, 'write': 10}
+        }
+        assert self.empty_config.get_cloud_api_rate_limiter_rates()[
+            'ec2'
+        ] == {'read': 20, 'write': 5}
@@ -1,8 +1,11 @@
+from datetime import datetime
 from pytest import raises
 from unittest.mock import Mock, patch
 
-from mash.services.mash_job import MashJob
+from mash.services.mash_job import MashJob, transfer_bytes
 from mash.mash_exceptions import MashJobException
+from mash.utils.cloud_api import CloudApiProfiler, get_account, get_profiler
+from mash.utils.tracing import SpanContext
 
 
 class TestMashJob(object):
@@ -99,8 +102,81 @@ class TestMashJob(object):
     def test_process_job(self, mock_run_job):
         job = MashJob(self.job_config, self.config)
         job._log_callback = Mock()
+        job.trace_context = SpanContext(
+            '0af7651916cd43dd8448eb211c80319c', 'b7ad6b7169203331'
+        )
+        job.account = 'acnt1'
+
+        active = []
+        mock_run_job.side_effect = lambda: active.append(
+            (get_profiler(), get_account())
+        )
+
         job.process_job()
         mock_run_job.assert_called_once_with()
+        assert job.start_time
+        assert active == [(job.api_profiler, 'acnt1')]
+
+        # The job continues the trace of the previous stage
+        assert job.trace_context.trace_id == '0af7651916cd43dd8448eb211c80319c'
+        assert job.trace_context.span_id != 'b7ad6b7169203331'
+
+    def test_add_bytes_transferred(self, tmpdir):
+        image_file = tmpdir.join('image.raw')
+        image_file.write('a' * 100)
+
+        uploaded = transfer_bytes.get_value(direction='upload', cloud='ec2')
+
+        job = MashJob(self.job_config, self.config)
+        job.add_bytes_transferred(str(image_file))
+        job.add_bytes_transferred(str(image_file))
+
+        # Missing files are not counted
+        job.add_bytes_transferred(str(tmpdir.join('missing.raw')))
+
+        assert job.bytes_transferred == 200
+        assert transfer_bytes.get_value(
+            direction='upload', cloud='ec2'
+        ) == uploaded + 200
+
+    def test_get_stage_metrics(self):
+        job = MashJob(self.job_config, self.config)
+        metrics = job.get_stage_metrics('test')
+
+        assert metrics['service'] == 'test'
+        assert metrics['cloud'] == 'ec2'
+        assert metrics['queued_time'] is None
+        assert metrics['start_time'] is None
+        assert metrics['finish_time']
+        assert metrics['bytes_transferred'] == 0
+        assert metrics['api_calls'] is None
+        assert metrics['tasks'] == []
+
+        job.queued_time = datetime(2026, 10, 19, 10, 0, 0)
+        job.start_time = datetime(2026, 10, 19, 10, 0, 1)
+        job.api_profiler = CloudApiProfiler()
+        job.api_profiler.record_call('ec2', 'DescribeImages', 0.5)
+        metrics = job.get_stage_metrics('test')
+
+        assert metrics['queued_time'] == '2026-10-19T10:00:00'
+        assert metrics['start_time'] == '2026-10-19T10:00:01'
+        assert metrics['api_calls']['calls'] == 1
+
+    def test_run_tasks(self):
+        self.config.get_job_thread_pool_count.return_value = 4
+        self.config.get_account_thread_pool_count.return_value = 2
+        job = MashJob(self.job_config, self.config)
+        executor = job.get_task_executor()
+
+        assert executor.max_workers == 4
+        assert executor.max_account_workers == 2
+
+        executor.submit('us-east-1', lambda: 'ami-123', account='acnt1')
+        results = job.run_tasks(executor)
+
+        assert results[0].result == 'ami-123'
+        assert job.task_metrics[0]['name'] == 'us-east-1'
+        assert job.get_stage_metrics('test')['tasks'] == job.task_metrics
 
     def test_get_set_status(self):
         job = MashJob(self.job_config, self.config)
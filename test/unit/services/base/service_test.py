@@ -2,7 +2,12 @@ from unittest.mock import patch
 from unittest.mock import Mock
 from pytest import raises
 
-from mash.services.mash_service import MashService
+from mash.services.mash_service import (
+    MashService,
+    log_handler_latency,
+    log_handler_records,
+    messages_consumed
+)
 
 from mash.mash_exceptions import MashRabbitConnectionException
 
@@ -31,6 +36,10 @@ class TestBaseService(object):
             'obs', 'upload', 'create', 'raw_image_upload', 'test',
             'replicate', 'publish', 'deprecate'
         ]
+        config.get_metrics_port.return_value = None
+        config.get_tracing_enabled.return_value = False
+        config.get_bandwidth_scheduler.return_value = {'limits': {}}
+        self.config = config
 
         self.service = MashService('obs', config=config)
 
@@ -46,9 +55,75 @@ class TestBaseService(object):
     def test_consume_queue(self):
         callback = Mock()
         self.service.consume_queue(callback, 'service', 'obs')
-        self.channel.basic.consume.assert_called_once_with(
-            callback=callback, queue='obs.service'
+
+        kwargs = self.channel.basic.consume.call_args[1]
+        assert kwargs['queue'] == 'obs.service'
+
+        labels = {'service': 'obs', 'queue': 'obs.service'}
+        count = messages_consumed.get_value(**labels)
+
+        message = Mock()
+        kwargs['callback'](message)
+
+        callback.assert_called_once_with(message)
+        assert messages_consumed.get_value(**labels) == count + 1
+
+    @patch('mash.services.mash_service.start_metrics_server')
+    def test_start_metrics_server(self, mock_start_metrics_server):
+        rabbit_handler = Mock()
+        rabbit_handler.get_stats.return_value = {
+            'published': 10,
+            'dropped': 1,
+            'last_latency': 0.5,
+            'max_latency': 2.0
+        }
+        server = Mock()
+        mock_start_metrics_server.return_value = server
+        self.config.get_metrics_port.return_value = 9610
+        self.config.get_metrics_host.return_value = 'localhost'
+
+        self.service._start_metrics_server(rabbit_handler)
+
+        assert self.service.metrics_server == server
+        mock_start_metrics_server.assert_called_once_with(
+            9610, host='localhost'
         )
+        assert log_handler_records.function() == {
+            ('published',): 10,
+            ('dropped',): 1
+        }
+        assert log_handler_latency.function() == {
+            ('last',): 0.5,
+            ('max',): 2.0
+        }
+
+        # Port in use
+        mock_start_metrics_server.side_effect = OSError('Address in use')
+        self.service._start_metrics_server(rabbit_handler)
+        self.service.log.warning.assert_called_once_with(
+            'Metrics server failed to start: Address in use'
+        )
+
+    @patch('mash.services.mash_service.FileSpanExporter')
+    @patch('mash.services.mash_service.tracer')
+    def test_configure_tracing(self, mock_tracer, mock_exporter):
+        exporter = Mock()
+        mock_exporter.return_value = exporter
+        self.config.get_tracing_enabled.return_value = True
+        self.config.get_trace_directory.return_value = '/tmp/traces'
+
+        self.service._configure_tracing()
+
+        mock_exporter.assert_called_once_with('/tmp/traces', 'obs')
+        mock_tracer.configure.assert_called_once_with(exporter)
+
+    @patch('mash.services.mash_service.tracer')
+    def test_publish_trace_context(self, mock_tracer):
+        mock_tracer.inject.return_value = {'traceparent': 'context'}
+        self.service._publish('obs', 'listener_msg', 'message')
+
+        properties = self.channel.basic.publish.call_args[1]['properties']
+        assert properties['headers'] == {'traceparent': 'context'}
 
     def test_close_connection(self):
         self.connection.close.return_value = None
@@ -64,3 +139,23 @@ class TestBaseService(object):
         self.service.channel.queue.unbind.assert_called_once_with(
             queue='test.service', exchange='test', routing_key='1'
         )
+
+    @patch.object(MashService, '_open_connection')
+    def test_publish_batch(self, mock_open_connection):
+        batch_channel = Mock()
+        self.connection.channel.return_value = batch_channel
+
+        self.service._publish_batch('jobcreator', 'job_document', ['1', '2'])
+
+        mock_open_connection.assert_called_once_with()
+        batch_channel.tx.select.assert_called_once_with()
+        assert batch_channel.basic.publish.call_count == 2
+        batch_channel.basic.publish.assert_called_with(
+            body='2',
+            routing_key='job_document',
+            exchange='jobcreator',
+            properties=self.msg_properties,
+            mandatory=True
+        )
+        batch_channel.tx.commit.assert_called_once_with()
+        batch_channel.close.assert_called_once_with()
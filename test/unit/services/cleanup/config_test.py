@@ -8,3 +8,6 @@ class TestTestConfig(object):
 
     def test_get_max_image_age(self):
         assert self.empty_config.get_max_image_age() == 90
+
+    def test_get_log_archive_age(self):
+        assert self.empty_config.get_log_archive_age() == 7
@@ -1,3 +1,7 @@
+import os
+import time
+
+from tempfile import TemporaryDirectory
 from unittest.mock import MagicMock, Mock, patch
 
 from mash.services.cleanup_service import CleanupService
@@ -51,12 +55,18 @@ class TestCleanupService(object):
         mock_setup_logfile.assert_called_once_with(
             '/var/log/mash/cleanup_service.log'
         )
-        scheduler.add_job.assert_called_once_with(
+        scheduler.add_job.assert_any_call(
             self.cleanup._purge_images,
             'cron',
             hour='5',
             minute='0'
         )
+        scheduler.add_job.assert_any_call(
+            self.cleanup._archive_job_logs,
+            'cron',
+            hour='5',
+            minute='30'
+        )
         scheduler.start.assert_called_once()
 
     @patch('shutil.rmtree')
@@ -85,3 +95,62 @@ class TestCleanupService(object):
 
         mock_isdir.return_value = False
         self.cleanup._purge_images()
+
+    @patch('mash.services.cleanup.service.JobLogArchive')
+    def test_cleanup_archive_job_logs(self, mock_archive):
+        def archive_log(job_id, log_file):
+            if job_id == 'ab2':
+                raise Exception('Disk full')
+            return True
+
+        archive = Mock()
+        archive.archive.side_effect = archive_log
+        mock_archive.return_value = archive
+
+        with TemporaryDirectory() as log_dir:
+            old_time = time.time() - 8 * 86400
+
+            for name in ('ab', 'cd', 'ef'):
+                os.mkdir(os.path.join(log_dir, name))
+
+            for name in (
+                '1.log', 'ab/ab2.log', 'ef/ef3.log', 'other.txt',
+                'cd/cd4.log.archiving'
+            ):
+                path = os.path.join(log_dir, name)
+                with open(path, 'w') as log_file:
+                    log_file.write('Job started.\n')
+
+                if name in ('1.log', 'ab/ab2.log', 'other.txt'):
+                    os.utime(path, (old_time, old_time))
+
+            os.mkdir(os.path.join(log_dir, 'ef', 'dir.log'))
+
+            self.cleanup.config = self.config
+            self.config.get_job_log_directory.return_value = log_dir
+            self.config.get_job_log_archive_directory.return_value = \
+                '/var/log/mash/archive'
+            self.config.get_log_archive_age.return_value = 7
+
+            self.cleanup._archive_job_logs()
+
+            assert sorted(
+                call[0] for call in archive.archive.call_args_list
+            ) == [
+                ('1', os.path.join(log_dir, '1.log')),
+                ('ab2', os.path.join(log_dir, 'ab', 'ab2.log')),
+                ('cd4', os.path.join(log_dir, 'cd', 'cd4.log'))
+            ]
+
+        mock_archive.assert_called_once_with('/var/log/mash/archive')
+        self.cleanup.log.error.assert_called_once()
+        self.cleanup.log.info.assert_called_once_with(
+            'Archived 2 job logs.'
+        )
+
+        # No job log directory
+        self.config.get_job_log_directory.return_value = '/not/a/dir'
+        self.cleanup._archive_job_logs()
+        self.cleanup.log.error.assert_called_with(
+            'Error: no such directory /not/a/dir'
+        )
@@ -71,34 +71,64 @@ class TestAzureSIGCreateJob(object):
             AzureSIGCreateJob(job_doc, self.config)
 
     @patch('mash.services.create.azure_sig_job.AzureImage')
-    @patch('builtins.open')
-    def test_create(
-        self,
-        mock_open,
-        mock_azure_image,
-    ):
+    def test_create(self, mock_azure_image):
         azure_image = MagicMock()
+        pollers = {}
+
+        def begin_create(**kwargs):
+            pollers[kwargs['gallery_image_name']] = Mock()
+            return pollers[kwargs['gallery_image_name']]
+
+        azure_image.begin_create_gallery_image_version.side_effect = \
+            begin_create
         mock_azure_image.return_value = azure_image
+        self.job.target_regions = [{'name': 'eastus', 'replica_count': 2}]
 
         self.job.status_msg['cloud_image_name'] = 'image-123-v20220202'
         self.job.status_msg['blob_name'] = 'name.vhd'
         self.job.run_job()
 
-        azure_image.create_gallery_image_version.has_calls(
+        azure_image.begin_create_gallery_image_version.assert_has_calls([
             call(
                 blob_name='name.vhd',
                 gallery_name='gallery1',
-                gallery_image_name='sles_15_sp3_gen1',
+                gallery_image_name=image_name,
                 image_version='2022.02.02',
                 region='region',
-                force_replace_image=True
-            ),
-            call(
-                blob_name='name.vhd',
-                gallery_name='gallery1',
-                gallery_image_name='sles_15_sp3_gen2',
-                image_version='2022.02.02',
-                region='region',
-                force_replace_image=True
-            )
-        )
+                force_replace_image=True,
+                gallery_resource_group='group_name',
+                target_regions=[{'name': 'eastus', 'replica_count': 2}]
+            ) for image_name in ('sles_15_sp3_gen1', 'sles_15_sp3_gen2')
+        ], any_order=True)
+
+        # Both operations were started before waiting for them
+        assert pollers['sles_15_sp3_gen1'].result.call_count == 1
+        assert pollers['sles_15_sp3_gen2'].result.call_count == 1
+        assert self.job.status_msg['images'] == [
+            'sles_15_sp3_gen1', 'sles_15_sp3_gen2'
+        ]
+        assert self.job.status_msg['image_version'] == '2022.02.02'
+
+    @patch('mash.services.create.azure_sig_job.AzureImage')
+    def test_create_failed(self, mock_azure_image):
+        azure_image = MagicMock()
+        poller = Mock()
+        poller.result.side_effect = Exception('Replication failed!')
+        azure_image.begin_create_gallery_image_version.side_effect = [
+            poller,
+            Exception('Version exists!')
+        ]
+        mock_azure_image.return_value = azure_image
+        self.job.config = Mock()
+        self.job.config.get_job_thread_pool_count.return_value = 1
+        self.job.config.get_account_thread_pool_count.return_value = 1
+
+        self.job.status_msg['cloud_image_name'] = 'image-123-v20220202'
+        self.job.status_msg['blob_name'] = 'name.vhd'
+
+        with raises(MashCreateException) as error:
+            self.job.run_job()
+
+        assert str(error.value) == \
+            'Failed to create gallery image versions: ' \
+            'Replication failed!; Version exists!'
@@ -8,6 +8,7 @@ from test.unit.test_helper import (
 from mash.services.create.ec2_job import EC2CreateJob
 from mash.mash_exceptions import MashUploadException
 from mash.services.base_config import BaseConfig
+from mash.utils.cloud_api import get_account
 
 
 class TestAmazonCreateJob(object):
@@ -202,6 +203,277 @@ class TestAmazonCreateJob(object):
         self.job.run_job()
         assert mock_cleanup_all_images.call_count == 1
 
+    @patch('mash.services.create.ec2_job.helper_pool')
+    @patch('mash.services.create.ec2_job.image_exists')
+    @patch('mash.services.create.ec2_job.EC2Setup')
+    @patch('mash.services.create.ec2_job.get_client')
+    @patch('mash.services.create.ec2_job.EC2ImageUploader')
+    def test_create_pooled_helper(
+        self, mock_EC2ImageUploader, mock_get_client, mock_ec2_setup,
+        mock_image_exists, mock_helper_pool
+    ):
+        mock_image_exists.return_value = False
+        helper = Mock(
+            instance_id='i-123',
+            key_pair_name='mash-pool-xxxx',
+            private_key_file='/tmp/key',
+            subnet_id='subnet-123',
+            security_group_id='sg-123',
+            lease_wait=0.5
+        )
+        mock_helper_pool.lease.return_value = helper
+
+        ec2_upload = Mock()
+        ec2_upload.create_image.return_value = 'ami-123'
+        mock_EC2ImageUploader.return_value = ec2_upload
+
+        self.job.run_job()
+
+        assert self.job.status_msg['source_regions'] == {
+            'us-east-1': 'ami-123'
+        }
+        mock_helper_pool.lease.assert_called_once_with(
+            'user1',
+            'test',
+            'us-east-1',
+            'arm64',
+            'ami-bc5b48d0',
+            self.credentials['test'],
+            subnet='subnet-123456789',
+            instance_type='t2.micro'
+        )
+        kwargs = mock_EC2ImageUploader.call_args[1]
+        assert kwargs['running_id'] == 'i-123'
+        assert kwargs['ssh_key_pair_name'] == 'mash-pool-xxxx'
+        assert kwargs['ssh_key_private_key_file'] == '/tmp/key'
+        assert kwargs['vpc_subnet_id'] == 'subnet-123'
+        assert kwargs['security_group_ids'] == 'sg-123'
+        assert ec2_upload.instance_ids == []
+        mock_helper_pool.release.assert_called_once_with(
+            helper, reusable=True
+        )
+        assert self.job.ec2_upload_parameters['running_id'] is None
+        assert not mock_ec2_setup.called
+        self.job._log_callback.info.assert_any_call(
+            'Leased helper instance i-123 in us-east-1 after 0.5 seconds.'
+        )
+
+        # Root swap consumes the instance
+        mock_helper_pool.release.reset_mock()
+        ec2_upload.create_image_use_root_swap.return_value = 'ami-456'
+        self.job.target_regions['us-east-1']['use_root_swap'] = True
+        self.job.run_job()
+
+        assert self.job.status_msg['source_regions'] == {
+            'us-east-1': 'ami-456'
+        }
+        mock_helper_pool.release.assert_called_once_with(
+            helper, reusable=False
+        )
+
+        # Failed image creation does not return the instance
+        mock_helper_pool.release.reset_mock()
+        self.job.target_regions['us-east-1']['use_root_swap'] = False
+        ec2_upload.create_image.side_effect = Exception('Failed!')
+        self.job.run_job()
+
+        assert self.job.status == 'failed'
+        mock_helper_pool.release.assert_called_once_with(
+            helper, reusable=False
+        )
+
+    @patch('mash.services.create.ec2_job.delete_snapshot')
+    @patch('mash.services.create.ec2_job.register_image_from_snapshot')
+    @patch('mash.services.create.ec2_job.create_snapshot_from_image')
+    @patch('mash.services.create.ec2_job.get_volume_size')
+    @patch('mash.services.create.ec2_job.image_exists')
+    @patch('mash.services.create.ec2_job.EC2Setup')
+    @patch('mash.services.create.ec2_job.get_client')
+    @patch('mash.services.create.ec2_job.EC2ImageUploader')
+    def test_create_ebs_direct(
+        self, mock_EC2ImageUploader, mock_get_client, mock_ec2_setup,
+        mock_image_exists, mock_get_volume_size, mock_create_snapshot,
+        mock_register_image, mock_delete_snapshot
+    ):
+        mock_image_exists.return_value = False
+        ec2_client = Mock()
+        ebs_client = Mock()
+        mock_get_client.side_effect = [ec2_client, ebs_client]
+        mock_get_volume_size.return_value = 10
+        mock_create_snapshot.return_value = 'snap-123'
+        mock_register_image.return_value = 'ami-123'
+
+        self.job.target_regions['us-east-1']['create_method'] = 'ebs_direct'
+        self.job.target_regions['us-east-1']['billing_codes'] = 'bp-1'
+        self.job.run_job()
+
+        assert self.job.status_msg['source_regions'] == {
+            'us-east-1': 'ami-123'
+        }
+        mock_get_client.assert_called_with(
+            'ebs', 'access-key', 'secret-access-key', 'us-east-1'
+        )
+        mock_get_volume_size.assert_called_once_with('file', 10)
+        mock_create_snapshot.assert_called_once_with(
+            ebs_client,
+            'file',
+            'description',
+            volume_size=10,
+            log_callback=self.job._log_callback,
+            job_id='1',
+            ec2_client=ec2_client
+        )
+        mock_register_image.assert_called_once_with(
+            ec2_client,
+            'snap-123',
+            'name v20200925',
+            'description',
+            arch='arm64',
+            boot_mode='legacy-bios',
+            tpm_support='v2.0',
+            billing_codes='bp-1',
+            volume_type='gp3'
+        )
+
+        # No helper instance is used
+        assert not mock_EC2ImageUploader.called
+        assert not mock_ec2_setup.called
+        assert not ec2_client.create_key_pair.called
+        assert not mock_delete_snapshot.called
+
+        # Snapshot of an image that was not registered is deleted
+        mock_get_client.side_effect = [ec2_client, ebs_client]
+        mock_register_image.side_effect = Exception('Snapshot failed')
+        self.job.run_job()
+
+        assert self.job.status == 'failed'
+        mock_delete_snapshot.assert_called_once_with(
+            ec2_client, 'snap-123', self.job._log_callback
+        )
+
+    @patch('mash.services.create.ec2_job.cleanup_ec2_image')
+    @patch('mash.services.create.ec2_job.modify_image_sharing')
+    @patch('mash.services.create.ec2_job.get_account_id')
+    @patch('mash.services.create.ec2_job.image_exists')
+    @patch('mash.services.create.ec2_job.get_client')
+    @patch.object(EC2CreateJob, '_create_image_helper_instance')
+    def test_create_once(
+        self, mock_create_image, mock_get_client, mock_image_exists,
+        mock_get_account_id, mock_modify_image_sharing, mock_cleanup_image
+    ):
+        accounts = []
+
+        def create_image(ec2_client, region, info, credentials):
+            accounts.append(('create', region, get_account()))
+            return {'us-east-1': 'ami-east', 'us-gov-west-1': 'ami-gov'}[region]
+
+        def modify_image_sharing(*args, **kwargs):
+            accounts.append(('share', args[1], get_account()))
+
+        def copy_image(**kwargs):
+            accounts.append(('copy', kwargs['SourceImageId'], get_account()))
+            return {'ImageId': 'ami-west'}
+
+        mock_image_exists.return_value = False
+        mock_create_image.side_effect = create_image
+        mock_modify_image_sharing.side_effect = modify_image_sharing
+        mock_get_account_id.side_effect = lambda key, secret, region: \
+            '1111' if key == 'access-key' else '2222'
+
+        clients = {}
+
+        def get_client(service, key, secret, region):
+            return clients.setdefault((key, region), Mock())
+
+        mock_get_client.side_effect = get_client
+
+        self.credentials['test2'] = {
+            'access_key_id': 'access-key2',
+            'secret_access_key': 'secret-access-key2'
+        }
+        self.job.create_once = True
+        self.job.target_regions = {
+            'us-east-1': {
+                'account': 'test',
+                'partition': 'aws',
+                'regions': ['us-east-1']
+            },
+            'us-gov-west-1': {
+                'account': 'test',
+                'partition': 'aws-us-gov',
+                'regions': ['us-gov-west-1']
+            },
+            'us-west-2': {
+                'account': 'test2',
+                'partition': 'aws',
+                'regions': ['us-west-2']
+            }
+        }
+        copy_client = get_client('ec2', 'access-key2', None, 'us-west-2')
+        copy_client.copy_image.side_effect = copy_image
+
+        self.job.run_job()
+
+        # The image is created once per partition
+        assert mock_create_image.call_count == 2
+        assert self.job.status_msg['source_regions'] == {
+            'us-east-1': 'ami-east',
+            'us-gov-west-1': 'ami-gov',
+            'us-west-2': 'ami-west'
+        }
+        assert self.job.status_msg['image_provenance'] == {
+            'us-east-1': {'account': 'test', 'method': 'helper_instance'},
+            'us-gov-west-1': {'account': 'test', 'method': 'helper_instance'},
+            'us-west-2': {
+                'account': 'test2',
+                'method': 'copy',
+                'source_account': 'test',
+                'source_region': 'us-east-1',
+                'source_image': 'ami-east'
+            }
+        }
+
+        source_client = clients[('access-key', 'us-east-1')]
+        assert mock_modify_image_sharing.call_args_list[0][0] == \
+            (source_client, 'ami-east', ['2222'])
+        assert mock_modify_image_sharing.call_args_list[1][1] == \
+            {'operation': 'remove'}
+        copy_client.copy_image.assert_called_once_with(
+            Name='name v20200925',
+            Description='description',
+            SourceImageId='ami-east',
+            SourceRegion='us-east-1'
+        )
+        copy_client.get_waiter.assert_called_once_with('image_available')
+        assert self.job.task_metrics[0]['name'] == 'us-west-2'
+
+        # Calls are rate limited for the account they are sent from
+        assert accounts == [
+            ('create', 'us-east-1', 'test'),
+            ('create', 'us-gov-west-1', 'test'),
+            ('share', 'ami-east', 'test'),
+            ('copy', 'ami-east', 'test2'),
+            ('share', 'ami-east', 'test')
+        ]
+
+        # Copy failed, the images are cleaned up
+        mock_modify_image_sharing.reset_mock()
+        mock_get_account_id.side_effect = None
+        mock_get_account_id.return_value = '1111'
+        copy_client.copy_image.side_effect = Exception('Not shared!')
+
+        self.job.run_job()
+
+        assert self.job.status == 'failed'
+        self.job._log_callback.error.assert_called_once_with(
+            'Image copy in account test2 failed with: Not shared!'
+        )
+        assert self.job.status_msg['source_regions']['us-west-2'] is None
+        assert mock_cleanup_image.call_count == 2
+
+        # Accounts with the same account number do not share
+        assert not mock_modify_image_sharing.called
+
     @patch('mash.services.create.ec2_job.image_exists')
     @patch('mash.services.create.ec2_job.EC2Setup')
     @patch('mash.services.create.ec2_job.get_client')
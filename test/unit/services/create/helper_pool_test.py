@@ -0,0 +1,294 @@
+from pytest import raises
+from unittest.mock import Mock, patch
+
+from mash.services.create.helper_pool import EC2HelperPool
+
+CREDENTIALS = {
+    'access_key_id': 'access-key',
+    'secret_access_key': 'secret-access-key'
+}
+
+
+def get_instance(instance_id, state='running', devices=('/dev/sda1',)):
+    return {
+        'Reservations': [{
+            'Instances': [{
+                'InstanceId': instance_id,
+                'State': {'Name': state},
+                'RootDeviceName': '/dev/sda1',
+                'BlockDeviceMappings': [
+                    {'DeviceName': device} for device in devices
+                ]
+            }]
+        }]
+    }
+
+
+class TestEC2HelperPool(object):
+
+    def setup_method(self):
+        self.client = Mock()
+        self.client.create_key_pair.return_value = {'KeyMaterial': 'pkey'}
+        self.client.run_instances.side_effect = [
+            {'Instances': [{'InstanceId': 'i-{0}'.format(index)}]}
+            for index in range(1, 5)
+        ]
+        self.client.describe_instances.return_value = get_instance('i-1')
+
+        self.ec2_setup = Mock()
+        self.ec2_setup.create_vpc_subnet.return_value = 'subnet-123'
+        self.ec2_setup.create_security_group.return_value = 'sg-123'
+
+        patches = [
+            patch(
+                'mash.services.create.helper_pool.get_client',
+                return_value=self.client
+            ),
+            patch(
+                'mash.services.create.helper_pool.EC2Setup',
+                return_value=self.ec2_setup
+            ),
+            patch(
+                'mash.services.create.helper_pool.generate_name',
+                return_value='xxxx'
+            ),
+            patch.object(EC2HelperPool, '_start_refill')
+        ]
+        self.mock_get_client = patches[0].start()
+        self.mock_start_refill = patches[3].start()
+        for item in patches[1:3]:
+            item.start()
+        self.patches = patches
+
+        self.log = Mock()
+        self.pool = EC2HelperPool()
+        self.pool.configure(
+            size=1, max_instances=2, reap_interval=3600, log=self.log
+        )
+
+    def teardown_method(self):
+        self.pool.close()
+
+        for item in self.patches:
+            item.stop()
+
+    def lease(self, account='acnt1', subnet=None, user='user1'):
+        return self.pool.lease(
+            user, account, 'us-east-1', 'x86_64', 'ami-123', CREDENTIALS,
+            subnet=subnet
+        )
+
+    def test_lease_and_release(self):
+        helper = self.lease()
+
+        assert helper.instance_id == 'i-1'
+        assert helper.key_pair_name == 'mash-pool-xxxx'
+        assert helper.subnet_id == 'subnet-123'
+        assert helper.security_group_id == 'sg-123'
+        with open(helper.private_key_file) as private_key:
+            assert private_key.read() == 'pkey'
+
+        self.mock_get_client.assert_called_with(
+            'ec2', 'access-key', 'secret-access-key', 'us-east-1'
+        )
+        self.client.run_instances.assert_called_once_with(
+            ImageId='ami-123',
+            MinCount=1,
+            MaxCount=1,
+            KeyName='mash-pool-xxxx',
+            InstanceType='t2.micro',
+            NetworkInterfaces=[{
+                'DeviceIndex': 0,
+                'AssociatePublicIpAddress': True,
+                'SubnetId': 'subnet-123',
+                'Groups': ['sg-123']
+            }],
+            TagSpecifications=[{
+                'ResourceType': 'instance',
+                'Tags': [{'Key': 'Name', 'Value': 'mash-helper-pool'}]
+            }]
+        )
+        self.client.get_waiter.assert_called_with('instance_status_ok')
+        self.mock_start_refill.assert_called_once_with(
+            self.pool._slots[helper.key]
+        )
+        assert self.pool._get_instance_counts() == {
+            ('idle',): 0, ('leased',): 1, ('launching',): 0
+        }
+
+        # The instance returns to the pool and is leased again
+        self.pool.release(helper)
+        assert self.pool._get_instance_counts()[('idle',)] == 1
+
+        helper = self.lease()
+        assert helper.instance_id == 'i-1'
+        assert helper.lease_wait < 1
+        assert self.client.run_instances.call_count == 1
+
+        # An instance with an attached volume is terminated
+        self.client.describe_instances.return_value = get_instance(
+            'i-1', devices=('/dev/sda1', '/dev/sdf')
+        )
+        self.pool.release(helper)
+
+        self.client.terminate_instances.assert_called_once_with(
+            InstanceIds=['i-1']
+        )
+        assert not self.pool._slots
+        self.client.delete_key_pair.assert_called_once_with(
+            KeyName='mash-pool-xxxx'
+        )
+        self.ec2_setup.clean_up.assert_called_once_with()
+
+    def test_lease_with_subnet(self):
+        with patch(
+            'mash.services.create.helper_pool.get_vpc_id_from_subnet',
+            return_value='vpc-123'
+        ):
+            helper = self.lease(subnet='subnet-456')
+
+        assert helper.subnet_id == 'subnet-456'
+        self.ec2_setup.create_security_group.assert_called_once_with(
+            vpc_id='vpc-123'
+        )
+        assert not self.ec2_setup.create_vpc_subnet.called
+
+    def test_lease_capacity(self):
+        self.lease('acnt1')
+        self.lease('acnt2')
+
+        assert self.lease('acnt3') is None
+        assert len(self.pool._slots) == 2
+
+    def test_lease_other_user(self):
+        helper = self.lease()
+        self.pool.release(helper)
+
+        # Accounts of other users with the same name get their own slot
+        other = self.lease(user='user2')
+
+        assert other.instance_id == 'i-2'
+        assert other.key != helper.key
+        assert self.pool._slots[other.key].user == 'user2'
+        assert self.pool._slots[helper.key].idle[0][0] == 'i-1'
+
+    def test_lease_idle_gone(self):
+        helper = self.lease()
+        self.pool.release(helper)
+
+        # The idle instance was terminated outside the pool
+        self.client.describe_instances.return_value = get_instance(
+            'i-1', state='terminated'
+        )
+        helper = self.lease()
+
+        assert helper.instance_id == 'i-2'
+        self.client.terminate_instances.assert_called_once_with(
+            InstanceIds=['i-1']
+        )
+        assert self.pool._get_instance_counts() == {
+            ('idle',): 0, ('leased',): 1, ('launching',): 0
+        }
+
+        # The idle instance cannot be inspected
+        self.client.describe_instances.return_value = get_instance('i-2')
+        self.pool.release(helper)
+        self.client.describe_instances.side_effect = Exception('Not found')
+        helper = self.lease()
+
+        assert helper.instance_id == 'i-3'
+        self.log.warning.assert_called_once_with(
+            'Idle helper instance i-2 is not available: Not found'
+        )
+
+    def test_lease_launch_failed(self):
+        self.client.get_waiter.return_value.wait.side_effect = \
+            Exception('Impaired!')
+
+        with raises(Exception):
+            self.lease()
+
+        self.client.terminate_instances.assert_called_once_with(
+            InstanceIds=['i-1']
+        )
+        assert not self.pool._slots
+
+    def test_release_not_reusable(self):
+        helper = self.lease()
+        self.client.describe_instances.side_effect = Exception('Gone')
+        self.client.terminate_instances.side_effect = Exception('Gone')
+        self.client.delete_key_pair.side_effect = Exception('Denied')
+
+        self.pool.release(helper)
+
+        assert self.log.warning.call_count == 3
+        assert not self.pool._slots
+
+        helper = self.lease()
+        self.client.describe_instances.side_effect = None
+        self.client.describe_instances.return_value = get_instance(
+            'i-2', state='stopped'
+        )
+        self.pool.release(helper)
+        assert not self.pool._slots
+
+    def test_refill(self):
+        helper = self.lease()
+        slot = self.pool._slots[helper.key]
+
+        self.pool._refill(slot)
+        assert [item[0] for item in slot.idle] == ['i-2']
+
+        # Full slot
+        self.pool._refill(slot)
+        assert self.client.run_instances.call_count == 2
+
+        # Failed launch
+        slot.idle = []
+        self.client.run_instances.side_effect = Exception('Limit')
+        self.pool._refill(slot)
+        self.log.warning.assert_called_once_with(
+            'Unable to launch helper instance in us-east-1: Limit'
+        )
+        assert slot.launching == 0
+
+    def test_reap(self):
+        helper = self.lease()
+        self.pool.release(helper)
+
+        self.pool.reap()
+        assert self.pool._get_instance_counts()[('idle',)] == 1
+
+        self.pool.reap(now=10 ** 9)
+        self.client.terminate_instances.assert_called_once_with(
+            InstanceIds=['i-1']
+        )
+        assert not self.pool._slots
+
+    def test_reap_loop(self):
+        self.pool._stopped.set()
+        self.pool._reap_loop(0)
+
+        with patch.object(self.pool, 'reap') as mock_reap:
+            self.pool._stopped.wait = Mock(side_effect=[False, True])
+            self.pool._reap_loop(0)
+
+        mock_reap.assert_called_once_with()
+
+
+def test_lease_disabled():
+    pool = EC2HelperPool()
+
+    assert not pool.enabled
+    assert pool.lease(
+        'user1', 'acnt1', 'us-east-1', 'x86_64', 'ami-123', CREDENTIALS
+    ) is None
+
+
+def test_start_refill():
+    pool = EC2HelperPool()
+
+    with patch.object(EC2HelperPool, '_refill') as mock_refill:
+        pool._start_refill('slot').join()
+
+    mock_refill.assert_called_once_with('slot')
@@ -6,10 +6,15 @@ from mash.services.create_service import main
 
 class TestCreate(object):
     @patch('mash.services.create_service.BaseJobFactory')
+    @patch('mash.services.create_service.helper_pool')
     @patch('mash.services.create_service.BaseConfig')
     @patch('mash.services.create_service.ListenerService')
-    def test_main(self, mock_create_service, mock_config, mock_factory):
+    def test_main(
+        self, mock_create_service, mock_config, mock_helper_pool,
+        mock_factory
+    ):
         config = Mock()
+        config.get_ec2_helper_pool.return_value = {'size': 1}
         mock_config.return_value = config
 
         factory = Mock()
@@ -23,42 +28,48 @@ class TestCreate(object):
                 'job_factory': factory
             }
         )
+        assert mock_helper_pool.configure.call_args[1]['size'] == 1
+        mock_helper_pool.close.assert_called_once_with()
 
+    @patch('mash.services.create_service.helper_pool')
     @patch('mash.services.create_service.BaseConfig')
     @patch('mash.services.create_service.ListenerService')
     @patch('sys.exit')
     def test_main_mash_error(
-        self, mock_exit, mock_create_service, mock_config
+        self, mock_exit, mock_create_service, mock_config, mock_helper_pool
     ):
         mock_create_service.side_effect = MashException('error')
         main()
         mock_exit.assert_called_once_with(1)
 
+    @patch('mash.services.create_service.helper_pool')
     @patch('mash.services.create_service.BaseConfig')
     @patch('mash.services.create_service.ListenerService')
     @patch('sys.exit')
     def test_main_keyboard_interrupt(
-        self, mock_exit, mock_create_service, mock_config
+        self, mock_exit, mock_create_service, mock_config, mock_helper_pool
     ):
         mock_create_service.side_effect = KeyboardInterrupt
         main()
         mock_exit.assert_called_once_with(0)
 
+    @patch('mash.services.create_service.helper_pool')
     @patch('mash.services.create_service.BaseConfig')
     @patch('mash.services.create_service.ListenerService')
     @patch('sys.exit')
     def test_main_system_exit(
-        self, mock_exit, mock_create_service, mock_config
+        self, mock_exit, mock_create_service, mock_config, mock_helper_pool
     ):
         mock_create_service.side_effect = SystemExit
         main()
         mock_exit.assert_called_once_with(0)
 
+    @patch('mash.services.create_service.helper_pool')
     @patch('mash.services.create_service.BaseConfig')
     @patch('mash.services.create_service.ListenerService')
     @patch('sys.exit')
     def test_main_unexpected_error(
-        self, mock_exit, mock_create_service, mock_config
+        self, mock_exit, mock_create_service, mock_config, mock_helper_pool
     ):
         mock_create_service.side_effect = Exception
         main()
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from mash.services.database.models import (
     User,
     Token,
@@ -8,6 +10,8 @@ from mash.services.database.models import (
     AzureAccount,
     AliyunAccount,
     Job,
+    JobOutbox,
+    JobStage,
     OCIAccount
 )
 
@@ -122,3 +126,34 @@ def test_oci_account_model():
         tenancy='ocid1.tenancy.oc1..'
     )
     assert account.__repr__() == '<OCI Account acnt1>'
+
+
+def test_job_outbox_model():
+    message = JobOutbox(
+        job_id='12345678-1234-1234-1234-123456789012',
+        message='{"job_id": "12345678-1234-1234-1234-123456789012"}'
+    )
+    assert message.__repr__() == \
+        '<Job Outbox 12345678-1234-1234-1234-123456789012>'
+
+
+def test_job_stage_model():
+    stage = JobStage(
+        service='upload',
+        cloud='ec2',
+        queued_time=datetime(2026, 10, 19, 10, 0, 0),
+        start_time=datetime(2026, 10, 19, 10, 0, 30),
+        finish_time=datetime(2026, 10, 19, 10, 2, 30)
+    )
+    assert stage.queue_wait == 30
+    assert stage.duration == 120
+    assert stage.__repr__() == '<Job Stage upload>'
+
+    # Skipped stage
+    stage.start_time = None
+    assert stage.queue_wait is None
+    assert stage.duration is None
+    assert stage.api_calls is None
+
+    stage.api_calls = {'calls': 10}
+    assert stage.api_calls == {'calls': 10}
@@ -57,6 +57,99 @@ def test_create_job(mock_db, test_client):
     assert response.data == b'{"msg":"Unable to create job: Broken"}\n'
 
 
+@patch('mash.services.database.utils.jobs.db')
+def test_create_jobs(mock_db, test_client):
+    data = {
+        'job_id': '12345678-1234-1234-1234-123456789012',
+        'last_service': 'deprecate',
+        'utctime': 'now',
+        'image': 'test_oem_image',
+        'download_url': 'http://download.opensuse.org/repositories/Cloud:Tools/images',
+        'cloud_architecture': 'x86_64',
+        'profile': 'Server'
+    }
+    data2 = dict(data)
+    data2['job_id'] = '12345678-1234-1234-1234-123456789013'
+    data2['cloud_architecture'] = 'aarch64'
+
+    response = test_client.post(
+        '/jobs/bulk',
+        content_type='application/json',
+        data=json.dumps({'jobs': [data, data2]}, sort_keys=True)
+    )
+
+    assert response.status_code == 200
+    assert len(response.json) == 2
+    assert response.json[1]['job_id'] == '12345678-1234-1234-1234-123456789013'
+    assert response.json[1]['cloud_architecture'] == 'aarch64'
+    mock_db.session.commit.assert_called_once_with()
+
+    # Mash Exception
+    mock_db.session.commit.side_effect = Exception('Broken')
+
+    response = test_client.post(
+        '/jobs/bulk',
+        content_type='application/json',
+        data=json.dumps({'jobs': [data, data2]}, sort_keys=True)
+    )
+    mock_db.session.rollback.assert_called_once_with()
+    assert response.status_code == 400
+    assert response.data == b'{"msg":"Unable to create jobs: Broken"}\n'
+
+
+@patch('mash.services.database.utils.jobs.JobOutbox')
+def test_get_outbox(mock_outbox, test_client):
+    message = Mock()
+    message.id = 1
+    message.job_id = '12345678-1234-1234-1234-123456789012'
+    message.message = '{"job_id": "12345678-1234-1234-1234-123456789012"}'
+    mock_outbox.query.order_by.return_value.limit.return_value.all.\
+        return_value = [message]
+
+    response = test_client.get(
+        '/jobs/outbox',
+        content_type='application/json',
+        data=json.dumps({'limit': 10})
+    )
+
+    assert response.status_code == 200
+    assert response.json == [{
+        'id': 1,
+        'job_id': '12345678-1234-1234-1234-123456789012',
+        'message': '{"job_id": "12345678-1234-1234-1234-123456789012"}'
+    }]
+    mock_outbox.query.order_by.return_value.limit.assert_called_once_with(10)
+
+
+@patch('mash.services.database.utils.jobs.JobOutbox')
+@patch('mash.services.database.utils.jobs.db')
+def test_delete_outbox(mock_db, mock_outbox, test_client):
+    mock_outbox.query.filter.return_value.delete.return_value = 2
+
+    response = test_client.delete(
+        '/jobs/outbox',
+        content_type='application/json',
+        data=json.dumps({'ids': [1, 2]})
+    )
+
+    assert response.status_code == 200
+    assert response.json['rows_deleted'] == 2
+    mock_db.session.commit.assert_called_once_with()
+
+    # Exception
+    mock_db.session.commit.side_effect = Exception('Broken')
+
+    response = test_client.delete(
+        '/jobs/outbox',
+        content_type='application/json',
+        data=json.dumps({'ids': [1, 2]})
+    )
+
+    mock_db.session.rollback.assert_called_once_with()
+    assert response.status_code == 400
+    assert response.json['msg'] == 'Delete outbox messages failed'
+
+
 @patch('mash.services.database.utils.jobs.get_job')
 @patch('mash.services.database.utils.jobs.db')
 def test_update_job_status(mock_db, mock_get_job, test_client):
@@ -87,6 +180,8 @@ def test_update_job_status(mock_db, mock_get_job, test_client):
 
     assert response.status_code == 200
     assert response.json['msg'] == 'Job status updated'
+    assert response.json['state'] == 'finished'
+    assert response.json['current_service'] is None
 
     # Job failed
     data['status'] = 'failed'
@@ -100,6 +195,8 @@ def test_update_job_status(mock_db, mock_get_job, test_client):
 
     assert response.status_code == 200
     assert response.json['msg'] == 'Job status updated'
+    assert response.json['state'] == 'failed'
+    assert response.json['current_service'] == 'raw_image_upload'
 
     # Mash Exception
     mock_db.session.commit.side_effect = Exception('Broken')
@@ -249,3 +346,95 @@ def test_delete_job(mock_get_job, mock_db, test_client):
 
     assert response.status_code == 200
     assert response.json['rows_deleted'] == 0
+
+
+@patch('mash.services.database.routes.jobs.get_job_timeline')
+def test_get_job_timeline(mock_get_timeline, test_client):
+    stage = Mock()
+    stage.service = 'upload'
+    stage.cloud = 'ec2'
+    stage.status = 'success'
+    stage.queued_time = datetime(2026, 10, 19, 10, 0, 0)
+    stage.start_time = datetime(2026, 10, 19, 10, 0, 30)
+    stage.finish_time = datetime(2026, 10, 19, 10, 2, 30)
+    stage.queue_wait = 30.0
+    stage.duration = 120.0
+    stage.bytes_transferred = 1024
+    stage.api_calls = {'calls': 10, 'throttled': 1}
+    mock_get_timeline.return_value = [stage]
+
+    data = {
+        'job_id': '12345678-1234-1234-1234-123456789012',
+        'user_id': 'user1'
+    }
+
+    response = test_client.get(
+        '/jobs/timeline',
+        content_type='application/json',
+        data=json.dumps(data, sort_keys=True)
+    )
+
+    assert response.status_code == 200
+    assert response.json['job_id'] == '12345678-1234-1234-1234-123456789012'
+    assert response.json['stages'][0]['service'] == 'upload'
+    assert response.json['stages'][0]['duration'] == 120.0
+    assert response.json['stages'][0]['bytes_transferred'] == 1024
+    assert response.json['stages'][0]['api_calls']['throttled'] == 1
+
+    # Job not found
+    mock_get_timeline.return_value = None
+
+    response = test_client.get(
+        '/jobs/timeline',
+        content_type='application/json',
+        data=json.dumps(data, sort_keys=True)
+    )
+
+    assert response.status_code == 200
+    assert response.json == {}
+
+    # Exception
+    mock_get_timeline.side_effect = Exception('Broken')
+
+    response = test_client.get(
+        '/jobs/timeline',
+        content_type='application/json',
+        data=json.dumps(data, sort_keys=True)
+    )
+
+    assert response.status_code == 400
+    assert response.json['msg'] == (
+        'Unable to get timeline for job '
+        '12345678-1234-1234-1234-123456789012: Broken'
+    )
+
+
+@patch('mash.services.database.routes.jobs.get_stage_statistics')
+def test_get_job_stages(mock_get_statistics, test_client):
+    mock_get_statistics.return_value = [{
+        'cloud': 'ec2',
+        'service': 'upload',
+        'count': 2,
+        'duration': {'p50': 60.0, 'p95': 120.0},
+        'queue_wait': {'p50': 1.0, 'p95': 2.0},
+        'bytes_per_second': {'p50': None, 'p95': None}
+    }]
+
+    response = test_client.get(
+        '/jobs/stages',
+        content_type='application/json',
+        data=json.dumps({'user_id': 'user1', 'cloud': 'ec2'})
+    )
+
+    assert response.status_code == 200
+    assert response.json[0]['duration'] == {'p50': 60.0, 'p95': 120.0}
+    assert response.json[0]['bytes_per_second'] == {'p50': None, 'p95': None}
+    mock_get_statistics.assert_called_once_with(user_id='user1', cloud='ec2')
+
+    # Exception
+    mock_get_statistics.side_effect = Exception('Broken')
+
+    response = test_client.get('/jobs/stages')
+
+    assert response.status_code == 400
+    assert response.json['msg'] == 'Unable to get stage statistics: Broken'
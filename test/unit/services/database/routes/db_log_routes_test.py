@@ -0,0 +1,42 @@
+import json
+
+from unittest.mock import patch
+
+
+@patch('mash.services.database.routes.logs.query_job_logs')
+def test_get_logs(mock_query_job_logs, test_client):
+    record = {
+        'job_id': '12345678-1234-1234-1234-123456789012',
+        'service': 'upload',
+        'level': 'ERROR',
+        'timestamp': 1760832000.0,
+        'message': 'Upload failed'
+    }
+    mock_query_job_logs.return_value = [record]
+
+    response = test_client.get(
+        '/logs/',
+        content_type='application/json',
+        data=json.dumps({'level': 'ERROR', 'text': 'failed', 'limit': 10})
+    )
+
+    assert response.status_code == 200
+    assert response.json == [record]
+    mock_query_job_logs.assert_called_once_with(
+        level='ERROR', text='failed', limit=10
+    )
+
+    # No filters
+    mock_query_job_logs.reset_mock()
+    response = test_client.get('/logs/')
+
+    assert response.status_code == 200
+    mock_query_job_logs.assert_called_once_with()
+
+    # Invalid query
+    mock_query_job_logs.side_effect = Exception('fts5: syntax error')
+    response = test_client.get('/logs/')
+
+    assert response.status_code == 400
+    assert response.json['msg'] == \
+        'Unable to query job logs: fts5: syntax error'
@@ -16,10 +16,18 @@
 # along with mash.  If not, see <http://www.gnu.org/licenses/>
 #
 
+from datetime import datetime
 from unittest.mock import patch, Mock
 
+from mash.services.database.models import JobStage
 from mash.services.database.utils.jobs import (
-    get_job
+    create_new_job,
+    get_job,
+    get_job_timeline,
+    get_percentiles,
+    get_stage_statistics,
+    parse_time,
+    save_job_status
 )
 
 
@@ -33,3 +41,158 @@ def test_get_job(mock_job):
     result = get_job('12345678-1234-1234-1234-123456789012')
 
     assert result == job
+
+
+@patch('mash.services.database.utils.jobs.JobOutbox')
+@patch('mash.services.database.utils.jobs.Job')
+@patch('mash.services.database.utils.jobs.db')
+def test_create_new_job_with_document(mock_db, mock_job, mock_outbox):
+    job = Mock()
+    job.job_id = '12345678-1234-1234-1234-123456789012'
+    mock_job.return_value = job
+    outbox_message = Mock()
+    mock_outbox.return_value = outbox_message
+
+    data = {
+        'job_id': '12345678-1234-1234-1234-123456789012',
+        'job_document': '{"job_id": "12345678-1234-1234-1234-123456789012"}'
+    }
+
+    assert create_new_job(data) == job
+
+    mock_job.assert_called_once_with(
+        job_id='12345678-1234-1234-1234-123456789012'
+    )
+    mock_outbox.assert_called_once_with(
+        job_id='12345678-1234-1234-1234-123456789012',
+        message='{"job_id": "12345678-1234-1234-1234-123456789012"}'
+    )
+    mock_db.session.add.assert_any_call(job)
+    mock_db.session.add.assert_any_call(outbox_message)
+    mock_db.session.commit.assert_called_once_with()
+
+
+@patch('mash.services.database.utils.jobs.get_job')
+@patch('mash.services.database.utils.jobs.db')
+def test_save_job_status_stage_metrics(mock_db, mock_get_job):
+    job = Mock()
+    job.state = 'running'
+    job.last_service = 'test'
+    job.stages = []
+    mock_get_job.return_value = job
+
+    save_job_status({
+        'id': '12345678-1234-1234-1234-123456789012',
+        'prev_service': 'upload',
+        'current_service': 'create',
+        'status': 'success',
+        'stage_metrics': {
+            'service': 'upload',
+            'cloud': 'ec2',
+            'queued_time': '2026-10-19T10:00:00',
+            'start_time': '2026-10-19T10:00:30',
+            'finish_time': '2026-10-19T10:02:30',
+            'bytes_transferred': 1024,
+            'api_calls': {'calls': 10, 'throttled': 1}
+        }
+    })
+
+    stage = job.stages[0]
+    assert stage.service == 'upload'
+    assert stage.cloud == 'ec2'
+    assert stage.status == 'success'
+    assert stage.duration == 120
+    assert stage.queue_wait == 30
+    assert stage.bytes_transferred == 1024
+    assert stage.api_calls == {'calls': 10, 'throttled': 1}
+    assert job.data == {}
+    mock_db.session.commit.assert_called_once_with()
+
+
+@patch('mash.services.database.utils.jobs.get_job_by_user')
+def test_get_job_timeline(mock_get_job):
+    upload = JobStage(
+        service='upload',
+        finish_time=datetime(2026, 10, 19, 10, 2, 30)
+    )
+    obs = JobStage(
+        service='obs',
+        finish_time=datetime(2026, 10, 19, 10, 0, 0)
+    )
+    job = Mock()
+    job.stages = [upload, obs]
+    mock_get_job.return_value = job
+
+    assert get_job_timeline('1', 'user1') == [obs, upload]
+
+    # Job not found
+    mock_get_job.return_value = None
+    assert get_job_timeline('1', 'user1') is None
+
+
+def get_stage(job_id, service, cloud, start, size=0):
+    return JobStage(
+        job_id=job_id,
+        service=service,
+        cloud=cloud,
+        queued_time=datetime(2026, 10, 19, 10, 0, 0),
+        start_time=datetime(2026, 10, 19, 10, 0, start),
+        finish_time=datetime(2026, 10, 19, 10, 10, 0),
+        bytes_transferred=size
+    )
+
+
+@patch.object(JobStage, 'query')
+def test_get_stage_statistics(mock_query, test_client):
+    query = mock_query.join.return_value.filter.return_value
+    query.all.return_value = [
+        get_stage(1, 'obs', None, 0, 6000),
+        get_stage(1, 'upload', 'ec2', 10, 5900),
+        get_stage(2, 'upload', 'ec2', 20, 5800),
+        get_stage(3, 'upload', 'gce', 0, 6000),
+        get_stage(4, 'obs', None, 0)
+    ]
+
+    statistics = get_stage_statistics(
+        user_id='user1',
+        start='2026-10-19T00:00:00Z',
+        end='2026-10-20T00:00:00Z'
+    )
+
+    # The OBS stage of job 1 is counted for the cloud of the job
+    assert [(item['cloud'], item['service']) for item in statistics] == [
+        (None, 'obs'), ('ec2', 'obs'), ('ec2', 'upload'), ('gce', 'upload')
+    ]
+    assert statistics[0] == {
+        'cloud': None,
+        'service': 'obs',
+        'count': 1,
+        'duration': {'p50': 600, 'p95': 600},
+        'queue_wait': {'p50': 0, 'p95': 0},
+        'bytes_per_second': {'p50': None, 'p95': None}
+    }
+    assert statistics[1]['cloud'] == 'ec2'
+    assert statistics[1]['service'] == 'obs'
+    assert statistics[1]['bytes_per_second'] == {'p50': 10, 'p95': 10}
+    assert statistics[2]['count'] == 2
+    assert statistics[2]['queue_wait'] == {'p50': 10, 'p95': 20}
+    assert statistics[2]['bytes_per_second'] == {'p50': 10, 'p95': 10}
+
+    # Cloud filter
+    statistics = get_stage_statistics(cloud='gce')
+    assert len(statistics) == 1
+    assert statistics[0]['service'] == 'upload'
+
+
+def test_get_percentiles():
+    assert get_percentiles([], (50, 95)) == {'p50': None, 'p95': None}
+    assert get_percentiles(list(range(1, 21)), (0, 50, 95, 100)) == {
+        'p0': 1, 'p50': 10, 'p95': 19, 'p100': 20
+    }
+
+
+def test_parse_time():
+    assert parse_time(None) is None
+    assert parse_time('2026-10-19T10:00:00') == datetime(2026, 10, 19, 10)
+    assert parse_time('2026-10-19T12:00:00+02:00') == \
+        datetime(2026, 10, 19, 10)
@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+
+from werkzeug.local import LocalProxy
+
+from mash.services.database.utils.logs import parse_date, query_job_logs
+
+
+@patch('mash.services.database.utils.logs.JobLogStore')
+@patch.object(LocalProxy, '_get_current_object')
+def test_query_job_logs(mock_get_current_object, mock_store):
+    app = Mock()
+    app.config = {'LOG_STORE_DIRECTORY': '/var/log/mash/store'}
+    mock_get_current_object.return_value = app
+    store = Mock()
+    store.query.return_value = []
+    mock_store.return_value = store
+
+    assert query_job_logs(
+        level='ERROR',
+        text='us-east-1',
+        start='2026-10-18T00:00:00',
+        limit=5000
+    ) == []
+
+    mock_store.assert_called_once_with('/var/log/mash/store')
+    store.query.assert_called_once_with(
+        job_id=None,
+        service=None,
+        level='ERROR',
+        text='us-east-1',
+        start=datetime(2026, 10, 18, tzinfo=timezone.utc),
+        end=None,
+        limit=1000
+    )
+
+
+def test_parse_date():
+    assert parse_date(None) is None
+    assert parse_date('2026-10-18T12:00:00+02:00') == datetime(
+        2026, 10, 18, 10, tzinfo=timezone.utc
+    )
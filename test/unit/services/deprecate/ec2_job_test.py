@@ -23,6 +23,8 @@ class TestEC2DeprecateJob(object):
         }
 
         self.config = Mock()
+        self.config.get_job_thread_pool_count.return_value = 10
+        self.config.get_account_thread_pool_count.return_value = 5
         self.job = EC2DeprecateJob(self.job_config, self.config)
         self.job._log_callback = Mock()
         self.job.credentials = {
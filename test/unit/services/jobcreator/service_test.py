@@ -83,7 +83,8 @@ class TestJobCreatorService(object):
                 'target_regions': ['us-gov-west-1'],
                 'helper_image': 'ami-c2b5d7e1',
                 'subnet': 'subnet-12345',
-                'partition': 'aws-us-gov'
+                'partition': 'aws-us-gov',
+                'create_method': 'ebs_direct'
             },
             'ap-northeast-1': {
                 'account': 'test-aws',
@@ -98,6 +99,7 @@ class TestJobCreatorService(object):
         del job['cloud_accounts']
         del job['cloud_groups']
         job['notification_email'] = 'test@fake.com'
+        job['create_once'] = True
 
         message = MagicMock()
         message.body = JsonFormat.json_message(job)
@@ -135,17 +137,21 @@ class TestJobCreatorService(object):
         assert data['cloud_architecture'] == 'aarch64'
         assert data['cloud_image_name'] == 'new_image_123'
         assert data['image_description'] == 'New Image #123'
+        assert data['create_once']
 
         for region, info in data['target_regions'].items():
             if region == 'ap-northeast-1':
                 assert info['account'] == 'test-aws'
                 assert info['helper_image'] == 'ami-383c1956'
                 assert info['billing_codes'] is None
+                assert info['create_method'] == 'helper_instance'
+                assert info['partition'] == 'aws'
             else:
                 assert region == 'us-gov-west-1'
                 assert info['account'] == 'test-aws-gov'
                 assert info['helper_image'] == 'ami-c2b5d7e1'
                 assert info['billing_codes'] is None
+                assert info['create_method'] == 'ebs_direct'
 
         # Test Job Doc
 
@@ -280,6 +286,9 @@ class TestJobCreatorService(object):
         assert data['container'] == 'container1'
         assert data['resource_group'] == 'rg-1'
         assert data['storage_account'] == 'sa1'
+        assert data['target_regions'] == [
+            {'name': 'eastus', 'replica_count': 2}
+        ]
 
         # Test Job Doc
 
@@ -532,10 +541,37 @@ class TestJobCreatorService(object):
         message = MagicMock()
         message.body = json.dumps(data)
         self.jobcreator.database_api_url = 'http://localhost:5007/'
+        self.jobcreator.job_status_key = 'job_status'
+        self.jobcreator.channel = self.channel
+        mock_handle_request.return_value.json.return_value = {
+            'msg': 'Job status updated',
+            'state': 'finished',
+            'current_service': None
+        }
 
         self.jobcreator._handle_status_message(message)
         assert mock_send_notif.call_count == 1
 
+        call_kwargs = self.channel.basic.publish.call_args[1]
+        assert call_kwargs['exchange'] == 'jobcreator'
+        assert call_kwargs['routing_key'] == 'job_status'
+        assert json.loads(call_kwargs['body']) == {
+            'job_id': '12345678-1234-1234-1234-123456789012',
+            'state': 'finished',
+            'current_service': None,
+            'prev_service': 'publish',
+            'status': 'success',
+            'errors': []
+        }
+
+        # Status event publish failed
+        self.channel.basic.publish.side_effect = Exception('Closed')
+        self.jobcreator._handle_status_message(message)
+        self.jobcreator.log.warning.assert_called_once_with(
+            'Job status event publish failed: Closed'
+        )
+        self.jobcreator.log.warning.reset_mock()
+
         # Request failed
         mock_handle_request.side_effect = Exception('Not found')
         self.jobcreator._handle_status_message(message)
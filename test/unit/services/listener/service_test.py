@@ -1,5 +1,6 @@
 import pytest
 
+from datetime import datetime
 from unittest.mock import call, MagicMock, Mock, patch
 
 from amqpstorm import AMQPError
@@ -7,8 +8,14 @@ from amqpstorm import AMQPError
 from apscheduler.jobstores.base import ConflictingIdError
 
 from mash.services.base_defaults import Defaults
-from mash.services.mash_service import MashService
-from mash.services.listener_service import ListenerService
+from mash.services.mash_service import MashService, service_jobs
+from mash.services.listener_service import (
+    ListenerService,
+    job_queue_wait,
+    job_stage_duration,
+    thread_pool_busy,
+    thread_pool_workers
+)
 from mash.mash_exceptions import MashListenerServiceException
 from mash.utils.json_format import JsonFormat
 
@@ -27,6 +34,7 @@ class TestListenerService(object):
         ]
         self.config.get_job_directory.return_value = '/var/lib/mash/replicate_jobs/'
         self.config.get_base_thread_pool_count.return_value = 10
+        self.config.get_cloud_api_rate_limiter_rates.return_value = {}
 
         self.channel = Mock()
         self.channel.basic_ack.return_value = None
@@ -46,6 +54,14 @@ class TestListenerService(object):
             'delivery_mode': 2
         }
 
+        self.stage_metrics = {
+            'service': 'replicate',
+            'cloud': 'ec2',
+            'queued_time': '2026-10-19T10:00:00',
+            'start_time': '2026-10-19T10:00:01',
+            'finish_time': '2026-10-19T10:05:00',
+            'bytes_transferred': 0
+        }
         self.error_message = JsonFormat.json_message({
             "replicate_result": {
                 "id": "1",
@@ -65,6 +81,8 @@ class TestListenerService(object):
         self.service.jwt_secret = 'a-secret'
         self.service.jwt_algorithm = 'HS256'
         self.service.jobs = {}
+        self.service.scheduled_jobs = set()
+        self.service.running_jobs = set()
         self.service.log = Mock()
 
         self.service.channel = self.channel
@@ -83,6 +101,8 @@ class TestListenerService(object):
         self.service.listener_msg_args = ['cloud_image_name']
         self.service.status_msg_args = ['cloud_image_name']
 
+    @patch('mash.services.listener_service.rate_limiter')
+    @patch('mash.services.listener_service.register_boto_handlers')
     @patch('mash.services.listener_service.os.makedirs')
     @patch.object(ListenerService, 'bind_queue')
     @patch('mash.services.listener_service.restart_jobs')
@@ -91,7 +111,8 @@ class TestListenerService(object):
     def test_service_post_init(
         self, mock_start,
         mock_setup_logfile, mock_restart_jobs,
-        mock_bind_queue, mock_makedirs
+        mock_bind_queue, mock_makedirs, mock_register_boto_handlers,
+        mock_rate_limiter
     ):
         self.service.config = self.config
         self.config.get_log_file.return_value = \
@@ -128,6 +149,10 @@ class TestListenerService(object):
             '/var/lib/mash/replicate_jobs/',
             self.service._add_job
         )
+        mock_register_boto_handlers.assert_called_once_with()
+        mock_rate_limiter.configure.assert_called_once_with(
+            self.config.get_cloud_api_rate_limiter_rates.return_value
+        )
         mock_start.assert_called_once_with()
 
     @patch('mash.services.listener_service.os.makedirs')
@@ -164,6 +189,7 @@ class TestListenerService(object):
         job.utctime = 'now'
         job.get_job_id.return_value = {'job_id': '1'}
         job.get_status_message.return_value = {'id': '1', 'status': 'failed'}
+        job.get_stage_metrics.return_value = self.stage_metrics
 
         self.service.jobs['1'] = job
         self.service._cleanup_job('1')
@@ -173,7 +199,13 @@ class TestListenerService(object):
             extra={'job_id': '1'}
         )
         mock_delete_job.assert_called_once_with('1')
-        msg = {"replicate_result": {"id": "1", "status": "failed"}}
+        msg = {
+            "replicate_result": {
+                "id": "1",
+                "status": "failed",
+                "stage_metrics": self.stage_metrics
+            }
+        }
         mock_publish_message.assert_called_once_with(
             JsonFormat.json_message(msg),
             '1'
@@ -271,9 +303,17 @@ class TestListenerService(object):
                 "errors": []
             }
         })
+        self.message.properties = {
+            'headers': {
+                'traceparent': '00-0af7651916cd43dd8448eb211c80319c-'
+                               'b7ad6b7169203331-01'
+            }
+        }
         self.service._handle_listener_message(self.message)
 
         assert self.service.jobs['1'].listener_msg == self.message
+        assert isinstance(self.service.jobs['1'].queued_time, datetime)
+        assert job.trace_context.span_id == 'b7ad6b7169203331'
         mock_schedule_job.assert_called_once_with('1')
 
     def test_service_handle_listener_message_no_job(self):
@@ -350,15 +390,35 @@ class TestListenerService(object):
         job = Mock()
         job.id = '1'
         job.utctime = 'now'
+        job.cloud = 'ec2'
         job.status = 'success'
         job.listener_msg = msg
+        job.queued_time = datetime(2026, 10, 19, 10, 0, 0)
+        job.start_time = datetime(2026, 10, 19, 10, 0, 5)
         job.get_job_id.return_value = {'job_id': '1'}
 
         mock_get_status_msg.return_value = '{"status": "message"}'
 
+        durations = job_stage_duration.get_value(
+            service='replicate', cloud='ec2', status='success'
+        )
+        queue_waits = job_queue_wait.get_value(
+            service='replicate', cloud='ec2'
+        )
+
         self.service.jobs['1'] = job
+        self.service.scheduled_jobs.add('1')
+        self.service.running_jobs.add('1')
         self.service._process_job_result(event)
 
+        assert not self.service.scheduled_jobs
+        assert not self.service.running_jobs
+        assert job_stage_duration.get_value(
+            service='replicate', cloud='ec2', status='success'
+        ) == durations + 1
+        assert job_queue_wait.get_value(
+            service='replicate', cloud='ec2'
+        ) == queue_waits + 1
         mock_delete_job.assert_called_once_with('1')
         self.service.log.info.assert_called_once_with(
             'replicate successful.',
@@ -385,6 +445,7 @@ class TestListenerService(object):
         job.id = '1'
         job.utctime = 'now'
         job.status = 2
+        job.start_time = None
         job.status_msg = {'errors': []}
         job.get_job_id.return_value = {'job_id': '1'}
 
@@ -416,8 +477,10 @@ class TestListenerService(object):
         job.id = '1'
         job.status = 'error'
         job.utctime = 'now'
+        job.start_time = None
         job.get_job_id.return_value = {'job_id': '1'}
         job.get_status_message.return_value = {"id": "1", "status": "error"}
+        job.get_stage_metrics.return_value = self.stage_metrics
 
         self.service.jobs['1'] = job
         self.service._process_job_result(event)
@@ -427,7 +490,13 @@ class TestListenerService(object):
             extra={'job_id': '1'}
         )
         mock_delete_job('1')
-        msg = {"replicate_result": {"id": "1", "status": "error"}}
+        msg = {
+            "replicate_result": {
+                "id": "1",
+                "status": "error",
+                "stage_metrics": self.stage_metrics
+            }
+        }
         mock_publish_message.assert_called_once_with(
             JsonFormat.json_message(msg),
             '1'
@@ -503,6 +572,16 @@ class TestListenerService(object):
         scheduler.add_job.side_effect = ConflictingIdError('Conflicting jobs.')
         self.service.scheduler = scheduler
 
+        self.service._schedule_job('1')
+        assert '1' not in self.service.scheduled_jobs
+
+        scheduler.add_job.side_effect = None
+        self.service._schedule_job('1')
+        assert '1' in self.service.scheduled_jobs
+        scheduler.add_job.reset_mock()
+        scheduler.add_job.side_effect = ConflictingIdError('Conflicting jobs.')
+        self.service.log.warning.reset_mock()
+
         self.service._schedule_job('1')
         self.service.log.warning.assert_called_once_with(
             'Job already running. Received multiple '
@@ -584,6 +663,22 @@ class TestListenerService(object):
 
         self.service._start_job('1')
         job.process_job.assert_called_once_with()
+        assert '1' in self.service.running_jobs
+
+    def test_register_metrics(self):
+        self.service._register_metrics(20)
+
+        self.service.jobs = {'1': Mock(), '2': Mock(), '3': Mock()}
+        self.service.scheduled_jobs = {'2', '3'}
+        self.service.running_jobs = {'3'}
+
+        assert service_jobs.function() == {
+            ('replicate', 'waiting'): 1,
+            ('replicate', 'pending'): 1,
+            ('replicate', 'running'): 1
+        }
+        assert thread_pool_workers.get_value(service='replicate') == 20
+        assert thread_pool_busy.function() == {('replicate',): 1}
 
     def test_get_status_message(self):
         job = Mock()
@@ -593,9 +688,18 @@ class TestListenerService(object):
             'status': 'success',
             'cloud_image_name': 'image123'
         }
+        job.get_stage_metrics.return_value = self.stage_metrics
 
         data = self.service._get_status_message(job)
-        assert data == self.status_message
+        assert data == JsonFormat.json_message({
+            'replicate_result': {
+                'cloud_image_name': 'image123',
+                'id': '1',
+                'status': 'success',
+                'stage_metrics': self.stage_metrics
+            }
+        })
+        job.get_stage_metrics.assert_called_once_with('replicate')
 
     @patch.object(ListenerService, 'close_connection')
     def test_service_stop(self, mock_close_connection):
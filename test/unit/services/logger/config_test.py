@@ -0,0 +1,15 @@
+from mash.services.logger.config import LoggerConfig
+
+
+class TestLoggerConfig(object):
+    def setup_method(self):
+        self.empty_config = LoggerConfig('test/data/empty_mash_config.yaml')
+
+    def test_get_flush_interval(self):
+        assert self.empty_config.get_flush_interval() == 1
+
+    def test_get_batch_size(self):
+        assert self.empty_config.get_batch_size() == 500
+
+    def test_get_max_open_files(self):
+        assert self.empty_config.get_max_open_files() == 64
@@ -1,13 +1,21 @@
 import io
 import json
+import os
 import sys
 
-from unittest.mock import MagicMock, Mock, patch
+from collections import OrderedDict
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, Mock, call, patch
 from pytest import raises
 
 from mash.mash_exceptions import MashLoggerException
 from mash.services.mash_service import MashService
-from mash.services.logger.service import LoggerService
+from mash.services.logger.service import (
+    LoggerService,
+    flush_duration,
+    records_written
+)
+from mash.utils.job_log_archive import JobLogArchive
 
 open_name = "__builtin__.open" if sys.version_info.major < 3 \
     else "builtins.open"
@@ -23,6 +31,7 @@ class TestLoggerService(object):
 
         self.config = Mock()
         self.config.get_log_file.return_value = '/tmp/file.log'
+        self.config.get_job_log_file.return_value = '/var/log/mash/4711.log'
 
         self.channel = Mock()
         self.tag = Mock()
@@ -32,7 +41,10 @@ class TestLoggerService(object):
             "levelname": "INFO",
             "msg": u"INFO 2017-11-01 11:36:36.782072 "
                    "LoggerService \n Job[4711]: Test log message! \n",
-            "job_id": "4711"
+            "job_id": "4711",
+            "name": "UploadService",
+            "created": 1760832000.0,
+            "message": "Test log message! "
         }
         self.message = MagicMock(
             body=json.dumps(body),
@@ -44,16 +56,30 @@ class TestLoggerService(object):
         self.logger.log = MagicMock()
         self.logger.service_exchange = 'logger'
         self.logger.channel = self.channel
+        self.logger.batch_size = 2
+        self.logger.max_open_files = 64
+        self.logger.log_files = OrderedDict()
+        self.logger.pending_records = {}
+        self.logger.pending_store_records = []
+        self.logger.log_store = Mock()
+        self.logger.unacked_count = 0
+        self.logger.last_delivery_tag = None
 
+    @patch('mash.services.logger.service.JobLogStore')
     @patch('mash.services.logger.service.setup_logfile')
     @patch.object(LoggerService, 'start')
     @patch.object(LoggerService, 'bind_queue')
     @patch.object(LoggerService, '_process_log')
     def test_logger_post_init(
-        self, mock_process_log, mock_bind_queue, mock_start, mock_setup_logfile
+        self, mock_process_log, mock_bind_queue, mock_start,
+        mock_setup_logfile, mock_log_store
     ):
         config = Mock()
+        config.get_log_store_directory.return_value = '/var/log/mash/store'
         config.get_log_file.return_value = '/var/log/mash/logger_service.log'
+        config.get_flush_interval.return_value = 1
+        config.get_batch_size.return_value = 500
+        config.get_max_open_files.return_value = 64
         self.logger.config = config
 
         # Test normal run
@@ -67,69 +93,277 @@ class TestLoggerService(object):
             'logger', 'mash.logger', 'logging'
         )
         mock_start.assert_called_once_with()
+        assert self.logger.batch_size == 500
+        assert self.logger.max_open_files == 64
+        mock_log_store.assert_called_once_with('/var/log/mash/store')
 
     def test_logger_process_invalid_log(self):
         self.message.body = ''
         with raises(MashLoggerException):
             self.logger._process_log(self.message)
 
-    @patch('os.path.exists')
-    def test_logger_process_append(
-        self, mock_path_exists
+        # Invalid message is acked with the batch
+        self.channel.basic.ack.assert_called_once_with(
+            delivery_tag=self.message.delivery_tag,
+            multiple=True
+        )
+
+    @patch.object(LoggerService, '_is_log_file')
+    @patch('mash.services.logger.service.os.makedirs')
+    @patch('mash.services.logger.service.fcntl')
+    @patch('mash.services.logger.service.os.fsync')
+    def test_logger_process_batch(
+        self, mock_fsync, mock_fcntl, mock_makedirs, mock_is_log_file
     ):
-        mock_path_exists.return_value = True
+        mock_is_log_file.return_value = True
         self.logger.config = self.config
+        self.config.get_job_log_file.return_value = '/var/log/mash/4711.log'
+
+        written = records_written.get_value()
+        flushes = flush_duration.get_value()
 
         with patch(open_name, create=True) as mock_open:
-            mock_open.return_value = MagicMock(spec=io.IOBase)
+            file_handle = MagicMock(spec=io.TextIOBase)
+            mock_open.return_value = file_handle
+
             self.logger._process_log(self.message)
-            file_handle = mock_open.return_value.__enter__.return_value
-            file_handle.write.assert_called_with(
+
+            # Buffered until the batch is full
+            assert file_handle.write.call_count == 0
+            assert self.channel.basic.ack.call_count == 0
+
+            self.logger._process_log(self.message)
+
+            mock_open.assert_called_once_with('/var/log/mash/4711.log', 'a')
+            mock_makedirs.assert_called_once_with(
+                '/var/log/mash', exist_ok=True
+            )
+            mock_fcntl.flock.assert_has_calls([
+                call(file_handle, mock_fcntl.LOCK_SH),
+                call(file_handle, mock_fcntl.LOCK_UN)
+            ])
+            file_handle.write.assert_called_once_with(
                 u'INFO 2017-11-01 11:36:36.782072 '
-                'LoggerService \n Test log message! \n'
+                'LoggerService \n Test log message! \n' * 2
+            )
+            file_handle.flush.assert_called_once_with()
+            mock_fsync.assert_called_once_with(file_handle.fileno.return_value)
+            self.channel.basic.ack.assert_called_once_with(
+                delivery_tag=self.message.delivery_tag,
+                multiple=True
             )
+            assert self.logger.unacked_count == 0
+            assert self.logger.pending_records == {}
+            self.logger.log_store.add_records.assert_called_once_with([{
+                'job_id': '4711',
+                'service': 'upload',
+                'level': 'INFO',
+                'timestamp': 1760832000.0,
+                'message': 'Test log message! '
+            }] * 2)
+            assert self.logger.pending_store_records == []
+            assert records_written.get_value() == written + 2
+            assert flush_duration.get_value() == flushes + 1
+
+            # Cached handle is reused
+            self.logger._process_log(self.message)
+            self.logger._process_log(self.message)
+            assert mock_open.call_count == 1
+
+            # Log file was archived
+            mock_is_log_file.side_effect = [False, True]
+            self.logger._process_log(self.message)
+            self.logger._process_log(self.message)
+            assert mock_open.call_count == 2
+            file_handle.close.assert_called_once_with()
+
+    def test_logger_reopen_archived_log(self):
+        self.logger.config = self.config
+        self.logger.batch_size = 1
+
+        with TemporaryDirectory() as log_dir:
+            log_file = os.path.join(log_dir, '47', '4711.log')
+            self.config.get_job_log_file.return_value = log_file
+            archive = JobLogArchive(os.path.join(log_dir, 'archive'))
+
+            self.logger._process_log(self.message)
+            assert archive.archive('4711', log_file)
+
+            # Late record starts a new log file
+            self.logger._process_log(self.message)
+            assert archive.archive('4711', log_file)
+
+            self.logger._close_log_files()
+
+            assert archive.read('4711') == (
+                b'INFO 2017-11-01 11:36:36.782072 '
+                b'LoggerService \n Test log message! \n' * 2
+            )
+
+            with open(os.path.join(log_dir, 'other.log'), 'w') as other:
+                assert not LoggerService._is_log_file(other, log_file)
+
+    @patch.object(LoggerService, '_is_log_file')
+    @patch('mash.services.logger.service.os.makedirs')
+    @patch('mash.services.logger.service.fcntl')
+    @patch('mash.services.logger.service.os.fsync')
+    def test_logger_process_store_exception(
+        self, mock_fsync, mock_fcntl, mock_makedirs, mock_is_log_file
+    ):
+        self.logger.config = self.config
+        self.logger.log_store.add_records.side_effect = Exception('Locked')
+        self.logger._process_log(self.message)
+
+        with patch(open_name, create=True) as mock_open:
+            mock_open.return_value = MagicMock(spec=io.TextIOBase)
+
+            with raises(MashLoggerException) as error:
+                self.logger._process_log(self.message)
+
+        assert 'Could not write to log store: Locked' == str(error.value)
+        assert self.channel.basic.ack.call_count == 0
+
+    def test_logger_seal_log_store(self):
+        self.logger.log_store.seal_partitions.side_effect = Exception('Full')
+
+        self.logger._seal_log_store()
+
+        self.logger.log.warning.assert_called_once_with(
+            'Could not compress log store partitions: Full'
+        )
+
+        self.logger.log_store.seal_partitions.side_effect = None
+        self.logger._seal_log_store()
+
+        assert self.logger.log_store.seal_partitions.call_count == 2
+        assert self.logger.log.warning.call_count == 1
+
+    def test_logger_get_service_name(self):
+        assert LoggerService._get_service_name(
+            'Raw_Image_UploadService'
+        ) == 'raw_image_upload'
+        assert LoggerService._get_service_name('APIService') == 'api'
+        assert LoggerService._get_service_name('mash') == 'mash'
+        assert LoggerService._get_service_name(None) is None
+
+    @patch.object(LoggerService, '_is_log_file')
+    @patch('mash.services.logger.service.os.makedirs')
+    @patch('mash.services.logger.service.fcntl')
+    def test_logger_get_log_file_lru(
+        self, mock_fcntl, mock_makedirs, mock_is_log_file
+    ):
+        self.logger.config = self.config
+        self.logger.max_open_files = 2
+        self.config.get_job_log_file.side_effect = \
+            lambda job_id: os.path.join('/var/log/mash', job_id + '.log')
+
+        with patch(open_name, create=True) as mock_open:
+            handles = {}
 
-    @patch('os.path.exists')
+            def open_file(name, mode):
+                job_id = os.path.basename(name)[:-len('.log')]
+                handles[job_id] = MagicMock(spec=io.TextIOBase)
+                return handles[job_id]
+
+            mock_open.side_effect = open_file
+
+            self.logger._get_log_file('1')
+            self.logger._get_log_file('2')
+            self.logger._get_log_file('1')
+            self.logger._get_log_file('3')
+
+            # 2 was the least recently used
+            handles['2'].close.assert_called_once_with()
+            assert list(self.logger.log_files) == ['1', '3']
+
+            self.logger._close_log_files()
+            handles['1'].close.assert_called_once_with()
+            handles['3'].close.assert_called_once_with()
+            assert self.logger.log_files == {}
+
+    @patch.object(LoggerService, '_is_log_file')
+    @patch('mash.services.logger.service.os.makedirs')
+    @patch('mash.services.logger.service.fcntl')
     def test_logger_process_write_exception(
-        self, mock_path_exists
+        self, mock_fcntl, mock_makedirs, mock_is_log_file
     ):
-        mock_path_exists.return_value = True
         self.logger.config = self.config
 
         with patch(open_name, create=True) as mock_open:
-            mock_open.return_value = MagicMock(spec=io.IOBase)
-            file_handle = mock_open.return_value.__enter__.return_value
+            file_handle = MagicMock(spec=io.TextIOBase)
             file_handle.write.side_effect = Exception('Error writing file!')
+            mock_open.return_value = file_handle
+
+            self.logger._process_log(self.message)
 
             with raises(MashLoggerException):
                 self.logger._process_log(self.message)
 
+            file_handle.close.assert_called_once_with()
+            assert self.channel.basic.ack.call_count == 0
+
+    @patch('mash.services.logger.service.time.monotonic')
+    @patch.object(LoggerService, '_flush')
+    def test_logger_consume(self, mock_flush, mock_monotonic):
+        self.channel.is_closed = False
+        self.channel.consumer_tags = ['tag']
+        self.logger.flush_interval = 1
+        self.logger.last_flush = 0
+        self.logger.unacked_count = 1
+        mock_monotonic.side_effect = [0.5, 1.5]
+
+        def stop_consuming():
+            if mock_monotonic.call_count == 1:
+                self.channel.consumer_tags = []
+
+        self.channel.process_data_events.side_effect = stop_consuming
+
+        self.logger._consume()
+
+        assert self.channel.process_data_events.call_count == 2
+        mock_flush.assert_called_once_with()
+
+    @patch('mash.services.logger.service.BackgroundScheduler')
+    @patch.object(LoggerService, '_consume')
     @patch.object(LoggerService, 'consume_queue')
     @patch.object(LoggerService, 'close_connection')
-    def test_logger_start(self, mock_close_connection, mock_consume_queue):
+    def test_logger_start(
+        self, mock_close_connection, mock_consume_queue, mock_consume,
+        mock_scheduler
+    ):
+        scheduler = mock_scheduler.return_value
         self.logger.channel = self.channel
+        self.logger.batch_size = 500
         self.logger.start()
-        self.channel.start_consuming.assert_called_once_with()
+        self.channel.basic.qos.assert_called_once_with(prefetch_count=500)
+        scheduler.add_job.assert_called_once_with(
+            self.logger._seal_log_store, 'cron', minute='5'
+        )
+        scheduler.start.assert_called_once_with()
+        scheduler.shutdown.assert_called_once_with()
+        mock_consume.assert_called_once_with()
         mock_consume_queue.assert_called_once_with(
             self.logger._process_log, 'logging', 'logger'
         )
         mock_close_connection.assert_called_once_with()
 
+    @patch('mash.services.logger.service.BackgroundScheduler')
+    @patch.object(LoggerService, '_consume')
     @patch.object(LoggerService, 'consume_queue')
     @patch.object(LoggerService, 'close_connection')
     def test_logger_start_exception(
-        self, mock_close_connection, mock_consume_queue
+        self, mock_close_connection, mock_consume_queue, mock_consume,
+        mock_scheduler
     ):
-        scheduler = Mock()
-        self.logger.scheduler = scheduler
         self.logger.channel = self.channel
+        self.logger.batch_size = 500
 
-        self.channel.start_consuming.side_effect = KeyboardInterrupt()
+        mock_consume.side_effect = KeyboardInterrupt()
         self.logger.start()
 
         mock_close_connection.assert_called_once_with()
         mock_close_connection.reset_mock()
-        self.channel.start_consuming.side_effect = Exception(
+        mock_consume.side_effect = Exception(
             'Cannot start scheduler.'
         )
 
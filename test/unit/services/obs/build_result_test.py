@@ -39,7 +39,9 @@ class TestOBSImageBuildResult(object):
         self.obs_result.call_result_handler()
         mock_result_callback.assert_called_once_with()
 
-    def test_result_callback(self):
+    @patch.object(OBSImageBuildResult, '_get_stage_metrics')
+    def test_result_callback(self, mock_get_stage_metrics):
+        mock_get_stage_metrics.return_value = {'service': 'obs'}
         self.obs_result.result_callback = Mock()
         self.obs_result.job_status = 'success'
         self.downloader.image_source = 'image'
@@ -54,11 +56,28 @@ class TestOBSImageBuildResult(object):
                     'errors': [],
                     'notification_email': 'test@fake.com',
                     'last_service': 'publish',
-                    'build_time': '1601061355'
+                    'build_time': '1601061355',
+                    'image_digest': None,
+                    'download_url': 'obs_project',
+                    'stage_metrics': {'service': 'obs'}
                 }
             }
         )
 
+    def test_get_stage_metrics(self):
+        self.obs_result.queued_time = datetime(2026, 10, 19, 10, 0, 0)
+        self.obs_result.start_time = datetime(2026, 10, 19, 10, 0, 5)
+        self.obs_result.bytes_transferred = 1024
+
+        metrics = self.obs_result._get_stage_metrics()
+
+        assert metrics['service'] == 'obs'
+        assert metrics['cloud'] is None
+        assert metrics['queued_time'] == '2026-10-19T10:00:00'
+        assert metrics['start_time'] == '2026-10-19T10:00:05'
+        assert metrics['bytes_transferred'] == 1024
+        assert metrics['finish_time']
+
     @patch('mash.services.obs.build_result.BackgroundScheduler')
     @patch.object(OBSImageBuildResult, '_update_image_status')
     @patch.object(OBSImageBuildResult, '_job_submit_event')
@@ -110,6 +129,37 @@ class TestOBSImageBuildResult(object):
         self.downloader.get_image.return_value = 'new-image.xz'
         self.obs_result._update_image_status()
         mock_result_callback.assert_called_once_with()
+        assert self.obs_result.start_time
+        assert self.obs_result.bytes_transferred == 0
+
+    @patch('mash.services.obs.build_result.os.path.getsize')
+    @patch.object(OBSImageBuildResult, '_result_callback')
+    def test_update_image_status_bytes_transferred(
+        self, mock_result_callback, mock_getsize
+    ):
+        mock_getsize.return_value = 2048
+        self.downloader.get_image.return_value = 'new-image.xz'
+        self.obs_result._update_image_status()
+        mock_getsize.assert_called_once_with('new-image.xz')
+        assert self.obs_result.bytes_transferred == 2048
+
+    @patch('mash.services.obs.build_result.get_image_digest')
+    @patch.object(OBSImageBuildResult, '_result_callback')
+    def test_update_image_status_image_digest(
+        self, mock_result_callback, mock_get_image_digest
+    ):
+        mock_get_image_digest.return_value = 'abc'
+        self.downloader.get_image.return_value = 'new-image.xz'
+        self.downloader.image_checksum = '123'
+        self.obs_result._update_image_status()
+        assert self.obs_result.image_digest == '123'
+        assert not mock_get_image_digest.called
+
+        # Checksum validation skipped
+        self.downloader.image_checksum = None
+        self.obs_result._update_image_status()
+        mock_get_image_digest.assert_called_once_with('new-image.xz')
+        assert self.obs_result.image_digest == 'abc'
 
     @patch.object(OBSImageBuildResult, '_result_callback')
     def test_update_image_status_raises(
@@ -129,7 +179,12 @@ class TestOBSImageBuildResult(object):
         ]
         assert len(self.obs_result.errors) == 2
 
-    def test_progress_callback(self):
+    @patch('mash.services.obs.build_result.bandwidth_scheduler')
+    def test_progress_callback(self, mock_scheduler):
+        self.obs_result.progress_callback(0, 25, 400)
+        assert not mock_scheduler.request.called
+        self.log_callback.info.reset_mock()
+
         self.obs_result.progress_callback(0, 0, 0, done=True)
         self.log_callback.info.assert_called_once_with(
             'Image download finished.'
@@ -140,3 +195,6 @@ class TestOBSImageBuildResult(object):
         self.log_callback.info.assert_called_once_with(
             'Image 25% downloaded.'
         )
+        mock_scheduler.request.assert_called_once_with(
+            25, self.obs_result.job_id, 'download'
+        )
@@ -8,7 +8,7 @@ from test.unit.test_helper import (
 )
 
 from mash.services.obs.service import OBSImageBuildResultService
-from mash.services.mash_service import MashService
+from mash.services.mash_service import MashService, service_jobs
 
 
 class TestOBSImageBuildResultService(object):
@@ -58,6 +58,7 @@ class TestOBSImageBuildResultService(object):
         )
 
         mock_setup_logfile.assert_called_once_with('logfile')
+        assert service_jobs.function() == {('obs', 'running'): 0}
         mock_restart_jobs.assert_called_once_with(
             '/var/lib/mash/obs_jobs/',
             self.obs_result._start_job
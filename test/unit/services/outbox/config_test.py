@@ -0,0 +1,12 @@
+from mash.services.outbox.config import OutboxConfig
+
+
+class TestOutboxConfig(object):
+    def setup_method(self):
+        self.empty_config = OutboxConfig('test/data/empty_mash_config.yaml')
+
+    def test_get_relay_interval(self):
+        assert self.empty_config.get_relay_interval() == 2
+
+    def test_get_relay_batch_size(self):
+        assert self.empty_config.get_relay_batch_size() == 100
@@ -0,0 +1,70 @@
+from unittest.mock import patch, Mock
+
+from mash.mash_exceptions import MashException
+from mash.services.outbox_service import main
+
+
+class TestOutbox(object):
+    @patch('mash.services.outbox_service.OutboxConfig')
+    @patch('mash.services.outbox_service.OutboxService')
+    def test_main(self, mock_outbox_service, mock_config):
+        config = Mock()
+        mock_config.return_value = config
+
+        main()
+        mock_outbox_service.assert_called_once_with(
+            service_exchange='outbox',
+            config=config
+        )
+
+    @patch('mash.services.outbox_service.OutboxConfig')
+    @patch('mash.services.outbox_service.OutboxService')
+    @patch('sys.exit')
+    def test_outbox_main_mash_error(
+        self, mock_exit, mock_outbox_service, mock_config
+    ):
+        config = Mock()
+        mock_config.return_value = config
+
+        mock_outbox_service.side_effect = MashException('error')
+
+        main()
+
+        mock_outbox_service.assert_called_once_with(
+            service_exchange='outbox',
+            config=config
+        )
+        mock_exit.assert_called_once_with(1)
+
+    @patch('mash.services.outbox_service.OutboxConfig')
+    @patch('mash.services.outbox_service.OutboxService')
+    @patch('sys.exit')
+    def test_outbox_main_keyboard_interrupt(
+        self, mock_exit, mock_outbox_service, mock_config
+    ):
+        mock_outbox_service.side_effect = KeyboardInterrupt()
+
+        main()
+        mock_exit.assert_called_once_with(0)
+
+    @patch('mash.services.outbox_service.OutboxConfig')
+    @patch('mash.services.outbox_service.OutboxService')
+    @patch('sys.exit')
+    def test_outbox_main_system_exit(
+        self, mock_exit, mock_outbox_service, mock_config
+    ):
+        mock_outbox_service.side_effect = SystemExit()
+
+        main()
+        mock_exit.assert_called_once_with(0)
+
+    @patch('mash.services.outbox_service.OutboxConfig')
+    @patch('mash.services.outbox_service.OutboxService')
+    @patch('sys.exit')
+    def test_outbox_main_unexpected_error(
+        self, mock_exit, mock_outbox_service, mock_config
+    ):
+        mock_outbox_service.side_effect = Exception('Error!')
+
+        main()
+        mock_exit.assert_called_once_with(1)
@@ -0,0 +1,128 @@
+from unittest.mock import MagicMock, Mock, patch
+
+from mash.services.outbox_service import OutboxService
+from mash.services.mash_service import MashService
+
+
+class TestOutboxService(object):
+
+    @patch.object(MashService, '__init__')
+    def setup_method(self, method, mock_base_init):
+        mock_base_init.return_value = None
+
+        self.outbox = OutboxService()
+        self.outbox.log = MagicMock()
+        self.outbox.service_exchange = 'outbox'
+        self.outbox.channel = Mock()
+        self.outbox.job_creator_exchange = 'jobcreator'
+        self.outbox.job_document_key = 'job_document'
+        self.outbox.database_api_url = 'http://localhost:5007/'
+        self.outbox.relay_batch_size = 2
+
+    @patch.object(OutboxService, '_declare_direct_exchange')
+    @patch('mash.services.outbox.service.BlockingScheduler')
+    @patch('mash.services.outbox.service.setup_logfile')
+    def test_outbox_post_init(
+        self, mock_setup_logfile, mock_scheduler, mock_declare_exchange
+    ):
+        config = Mock()
+        config.get_log_file.return_value = '/var/log/mash/outbox_service.log'
+        config.get_relay_interval.return_value = 2
+        config.get_relay_batch_size.return_value = 100
+        self.outbox.config = config
+
+        scheduler = Mock()
+        mock_scheduler.return_value = scheduler
+
+        self.outbox.post_init()
+
+        config.get_log_file.assert_called_once_with('outbox')
+        mock_setup_logfile.assert_called_once_with(
+            '/var/log/mash/outbox_service.log'
+        )
+        mock_declare_exchange.assert_called_once_with('jobcreator')
+        scheduler.add_job.assert_called_once_with(
+            self.outbox._relay_messages,
+            'interval',
+            seconds=2,
+            max_instances=1,
+            coalesce=True
+        )
+        scheduler.start.assert_called_once()
+
+    @patch.object(OutboxService, '_publish_batch')
+    @patch('mash.services.outbox.service.handle_request')
+    def test_outbox_relay_messages(self, mock_handle_request, mock_publish):
+        response1 = Mock()
+        response1.json.return_value = [
+            {'id': 1, 'job_id': '1', 'message': '{"job_id": "1"}'},
+            {'id': 2, 'job_id': '2', 'message': '{"job_id": "2"}'}
+        ]
+        response2 = Mock()
+        response2.json.return_value = [
+            {'id': 3, 'job_id': '3', 'message': '{"job_id": "3"}'}
+        ]
+        mock_handle_request.side_effect = [
+            response1, Mock(), response2, Mock()
+        ]
+
+        self.outbox._relay_messages()
+
+        assert mock_publish.call_count == 2
+        mock_publish.assert_any_call(
+            'jobcreator',
+            'job_document',
+            ['{"job_id": "1"}', '{"job_id": "2"}']
+        )
+        mock_handle_request.assert_any_call(
+            'http://localhost:5007/',
+            'jobs/outbox',
+            'delete',
+            job_data={'ids': [3]}
+        )
+        self.outbox.log.info.assert_called_with(
+            'Job document sent to job creator.',
+            extra={'job_id': '3'}
+        )
+
+        # Empty outbox
+        mock_publish.reset_mock()
+        response1.json.return_value = []
+        mock_handle_request.side_effect = [response1]
+        self.outbox._relay_messages()
+        assert not mock_publish.called
+
+    @patch.object(OutboxService, '_publish_batch')
+    @patch('mash.services.outbox.service.handle_request')
+    def test_outbox_relay_messages_errors(
+        self, mock_handle_request, mock_publish
+    ):
+        # Outbox request fails
+        mock_handle_request.side_effect = Exception('DB down')
+        self.outbox._relay_messages()
+        self.outbox.log.error.assert_called_once_with(
+            'Unable to retrieve outbox messages: DB down'
+        )
+        assert not mock_publish.called
+
+        # Publish fails, messages stay in outbox
+        response = Mock()
+        response.json.return_value = [
+            {'id': 1, 'job_id': '1', 'message': '{"job_id": "1"}'}
+        ]
+        mock_handle_request.side_effect = [response]
+        mock_publish.side_effect = Exception('Broker down')
+        self.outbox._relay_messages()
+        self.outbox.log.error.assert_called_with(
+            'Unable to publish outbox messages: Broker down'
+        )
+        assert mock_handle_request.call_count == 2
+
+        # Delete fails
+        mock_publish.side_effect = None
+        mock_handle_request.side_effect = [response, Exception('DB down')]
+        self.outbox._relay_messages()
+        self.outbox.log.error.assert_called_with(
+            'Unable to delete outbox messages: DB down'
+        )
+        assert not self.outbox.log.info.called
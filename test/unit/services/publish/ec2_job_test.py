@@ -24,6 +24,8 @@ class TestEC2PublishJob(object):
         }
 
         self.config = Mock()
+        self.config.get_job_thread_pool_count.return_value = 10
+        self.config.get_account_thread_pool_count.return_value = 5
         self.job = EC2PublishJob(self.job_config, self.config)
         self.job._log_callback = Mock()
         self.job.credentials = {
@@ -73,3 +75,42 @@ class TestEC2PublishJob(object):
         with raises(MashPublishException) as e:
             self.job.run_job()
         assert msg == str(e.value)
+
+    @patch('mash.services.publish.ec2_job.EC2PublishImage')
+    def test_publish_regions_exception(self, mock_ec2_publish_image):
+        self.job.publish_regions[0]['target_regions'] = [
+            'us-east-1', 'us-east-2', 'us-west-1'
+        ]
+        publishers = {}
+
+        def get_publish(**kwargs):
+            publish = Mock()
+
+            def set_region(region):
+                publishers[region] = publish
+                if region != 'us-east-2':
+                    publish.publish_images.side_effect = Exception('Denied.')
+
+            publish.set_region.side_effect = set_region
+            return publish
+
+        mock_ec2_publish_image.side_effect = get_publish
+
+        with raises(MashPublishException) as e:
+            self.job.run_job()
+
+        # All regions are published and the errors are collected
+        assert str(e.value) == \
+            'An error publishing image image_name_123 in us-east-1. ' \
+            'Denied. An error publishing image image_name_123 in ' \
+            'us-west-1. Denied.'
+        assert sorted(publishers) == ['us-east-1', 'us-east-2', 'us-west-1']
+        assert publishers['us-east-2'].publish_images.call_count == 1
+        assert [
+            (task['name'], task['account'], task['status'])
+            for task in self.job.task_metrics
+        ] == [
+            ('us-east-1', 'test-aws', 'failed'),
+            ('us-east-2', 'test-aws', 'success'),
+            ('us-west-1', 'test-aws', 'failed')
+        ]
@@ -2,7 +2,7 @@ from pytest import raises
 from unittest.mock import Mock, patch
 
 from mash.mash_exceptions import MashReplicateException
-from mash.services.status_levels import FAILED
+from mash.services.status_levels import FAILED, SUCCESS
 from mash.services.replicate.aliyun_job import AliyunReplicateJob
 
 
@@ -39,15 +39,24 @@ class TestAliyunReplicateJob(object):
         with raises(MashReplicateException):
             AliyunReplicateJob(self.job_config, self.config)
 
-    @patch('mash.services.replicate.aliyun_job.time')
+    @patch('mash.services.replicate.aliyun_job.ImageReplicationTracker')
     @patch('mash.services.replicate.aliyun_job.AliyunImage')
-    def test_replicate(self, mock_aliyun_image, mock_time):
+    def test_replicate(self, mock_aliyun_image, mock_tracker):
         aliyun_image = Mock()
         mock_aliyun_image.return_value = aliyun_image
-        aliyun_image.replicate_image.return_value = {'cn-shanghai': None}
+        aliyun_image.replicate_image.return_value = {
+            'cn-shanghai': None,
+            'cn-hangzhou': 'm-1'
+        }
+        tracker = Mock()
+        mock_tracker.return_value = tracker
 
         self.job.run_job()
 
+        mock_tracker.assert_called_once_with(
+            '123456', '654321', {'cn-hangzhou': 'm-1'}
+        )
+        tracker.track.assert_called_once_with(self.job._replication_finished)
         self.job._log_callback.info.assert_called_once_with(
             'Replicating My image'
         )
@@ -55,20 +64,23 @@ class TestAliyunReplicateJob(object):
             'Replicate to cn-shanghai failed: Image ID is None'
         )
         assert self.job.status == FAILED
+        assert self.job.status_msg['source_regions'] == {
+            'cn-beijing': 'ami-12345',
+            'cn-shanghai': None,
+            'cn-hangzhou': 'm-1'
+        }
 
-    @patch('mash.services.replicate.aliyun_job.time')
-    @patch('mash.services.replicate.aliyun_job.AliyunImage')
-    def test_replicate_fail(self, mock_aliyun_image, mock_time):
-        aliyun_image = Mock()
-        mock_aliyun_image.return_value = aliyun_image
-        aliyun_image.replicate_image.return_value = {'cn-shanghai': 'i-8765'}
-        aliyun_image.wait_on_compute_image.side_effect = Exception('Broken!')
-
-        self.job.run_job()
+    def test_replication_finished(self):
+        self.job.status = SUCCESS
+        self.job._replication_finished('cn-hangzhou', 'm-1', None)
 
         self.job._log_callback.info.assert_called_once_with(
-            'Replicating My image'
+            'Image m-1 available in cn-hangzhou.'
         )
+        assert self.job.status == SUCCESS
+
+        self.job._replication_finished('cn-shanghai', 'm-2', 'Broken!')
+
         self.job._log_callback.warning.assert_called_once_with(
             'Replicate to cn-shanghai failed: Broken!'
         )
@@ -4,6 +4,7 @@ from unittest.mock import Mock, patch
 from mash.mash_exceptions import MashReplicateException
 from mash.services.status_levels import FAILED
 from mash.services.replicate.ec2_job import EC2ReplicateJob
+from mash.utils.cloud_api import get_account
 
 
 class TestEC2ReplicateJob(object):
@@ -50,8 +51,18 @@ class TestEC2ReplicateJob(object):
         self, mock_replicate_to_region,
         mock_wait_on_image, mock_time
     ):
-        mock_replicate_to_region.return_value = 'ami-54321'
-        mock_wait_on_image.side_effect = Exception('Broken!')
+        accounts = []
+
+        def replicate_to_region(*args):
+            accounts.append(get_account())
+            return 'ami-54321'
+
+        def wait_on_image(*args):
+            accounts.append(get_account())
+            raise Exception('Broken!')
+
+        mock_replicate_to_region.side_effect = replicate_to_region
+        mock_wait_on_image.side_effect = wait_on_image
 
         self.job.run_job()
 
@@ -75,6 +86,9 @@ class TestEC2ReplicateJob(object):
         )
         assert self.job.status == FAILED
 
+        # Calls are rate limited for the account of the source region
+        assert accounts == ['test-aws', 'test-aws']
+
     @patch.object(EC2ReplicateJob, 'image_exists')
     @patch('mash.services.replicate.ec2_job.get_client')
     def test_replicate_to_region(
@@ -1,3 +1,4 @@
+import json
 import pytest
 
 from unittest.mock import call, Mock, patch
@@ -23,6 +24,8 @@ class TestAzureTestJob(object):
             'utctime': 'now',
         }
         self.config = Mock()
+        self.config.get_job_thread_pool_count.return_value = 10
+        self.config.get_account_thread_pool_count.return_value = 1
         self.config.get_ssh_private_key_file.return_value = \
             'private_ssh_key.file'
         self.config.get_img_proof_timeout.return_value = 600
@@ -134,3 +137,62 @@ class TestAzureTestJob(object):
             call('Image tests failed in region: East US.'),
             call('Failed to cleanup image: Cleanup image failed!')
         ])
+
+    @patch('mash.services.test.azure_job.AzureImage')
+    @patch('mash.services.test.azure_job.os')
+    @patch('mash.utils.mash_utils.NamedTemporaryFile')
+    @patch('mash.services.test.azure_job.test_image')
+    def test_run_azure_test_images(
+        self, mock_test_image, mock_temp_file, mock_os, mock_azure_image
+    ):
+        tmp_file = Mock()
+        tmp_file.name = '/tmp/acnt.file'
+        mock_temp_file.return_value = tmp_file
+        mock_os.path.exists.return_value = True
+        self.job_config['cleanup_images'] = False
+
+        def test_image(cloud, image_id, **kwargs):
+            return (
+                0 if image_id != 'name-fail' else 1,
+                {
+                    'tests': [{'outcome': 'passed', 'name': image_id}],
+                    'summary': {'duration': 1, 'passed': 1, 'num_tests': 1}
+                }
+            )
+
+        mock_test_image.side_effect = test_image
+
+        job = AzureTestJob(self.job_config, self.config)
+        job.credentials = {'test-azure': {'subscriptionId': 'sub1'}}
+        job.status_msg['cloud_image_name'] = 'name'
+        job._log_callback = Mock()
+        job.status_msg['images'] = {'bios': 'name', 'uefi': 'name-gen2'}
+        job.run_job()
+
+        test_results = json.loads(job.status_msg['test_results'])
+        assert sorted(test_results['variants']) == ['name', 'name-gen2']
+        assert test_results['summary']['passed'] == 2
+        assert job.status == 'success'
+        assert [task['account'] for task in job.task_metrics] == [
+            'sub1', 'sub1'
+        ]
+
+        # One test instance per subscription, the failed image
+        # cancels the images that have not started.
+        job.status_msg['images'] = {
+            'bios': 'name-fail', 'uefi': 'name-gen2'
+        }
+        job.task_metrics = []
+        job.run_job()
+
+        assert mock_test_image.call_count == 3
+        assert job.status == 'failed'
+        assert [task['status'] for task in job.task_metrics] == [
+            'success', 'cancelled'
+        ]
+        job._log_callback.info.assert_called_with(
+            'Skipped testing image name-gen2, another image failed.'
+        )
+        assert list(
+            json.loads(job.status_msg['test_results'])['variants']
+        ) == ['name-fail']
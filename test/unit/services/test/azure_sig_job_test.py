@@ -24,6 +24,8 @@ class TestAzureSIGTestJob(object):
             'gallery_name': 'gallery1'
         }
         self.config = Mock()
+        self.config.get_job_thread_pool_count.return_value = 10
+        self.config.get_account_thread_pool_count.return_value = 1
         self.config.get_ssh_private_key_file.return_value = \
             'private_ssh_key.file'
         self.config.get_img_proof_timeout.return_value = 600
@@ -141,3 +143,31 @@ class TestAzureSIGTestJob(object):
                 'Cleanup image failed!.'
             )
         ])
+
+    @patch('mash.services.test.azure_sig_job.AzureImage')
+    @patch('mash.services.test.azure_sig_job.os')
+    @patch('mash.utils.mash_utils.NamedTemporaryFile')
+    @patch('mash.services.test.azure_sig_job.test_image')
+    def test_run_azure_sig_test_cancelled(
+        self, mock_test_image, mock_temp_file, mock_os, mock_azure_image
+    ):
+        tmp_file = Mock()
+        tmp_file.name = '/tmp/acnt.file'
+        mock_temp_file.return_value = tmp_file
+        mock_os.path.exists.return_value = True
+        mock_test_image.side_effect = Exception('Tests broken!')
+        self.job_config['cleanup_images'] = False
+
+        job = AzureSIGTestJob(self.job_config, self.config)
+        job.credentials = {'test-azure': {'subscriptionId': 'sub1'}}
+        job.status_msg['image_version'] = '2022.02.02'
+        job._log_callback = Mock()
+        job.status_msg['images'] = ['image_123', 'image_123_gen2']
+        job.run_job()
+
+        mock_test_image.assert_called_once()
+        assert job.status == 'failed'
+        assert 'Tests broken!' in job.status_msg['errors']
+        job._log_callback.info.assert_called_with(
+            'Skipped testing image image_123_gen2, another image failed.'
+        )
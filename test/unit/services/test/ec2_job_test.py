@@ -4,6 +4,7 @@ from unittest.mock import call, Mock, patch
 
 from mash.services.test.ec2_job import EC2TestJob
 from mash.mash_exceptions import MashTestException
+from mash.utils.cloud_api import get_account
 
 
 class TestEC2TestJob(object):
@@ -49,7 +50,15 @@ class TestEC2TestJob(object):
         mock_cleanup_image
     ):
         client = Mock()
-        mock_get_client.return_value = client
+        accounts = []
+
+        def get_client(*args, **kwargs):
+            accounts.append(get_account())
+            return client
+
+        mock_get_client.side_effect = get_client
+        mock_cleanup_image.side_effect = lambda *args, **kwargs: \
+            accounts.append(get_account())
         mock_generate_name.return_value = 'random_name'
         mock_get_key_from_file.return_value = 'fakekey'
         mock_random.choice.return_value = 't2.micro'
@@ -128,6 +137,9 @@ class TestEC2TestJob(object):
             'us-east-1',
             image_id='ami-123'
         )
+
+        # Calls are rate limited for the testing account
+        assert accounts and set(accounts) == {'test-aws'}
         job._log_callback.warning.reset_mock()
 
         # Failed job test
@@ -1,3 +1,4 @@
+import json
 import pytest
 
 from unittest.mock import call, Mock, patch
@@ -28,6 +29,8 @@ class TestGCETestJob(object):
         self.config.get_ssh_private_key_file.return_value = \
             'private_ssh_key.file'
         self.config.get_img_proof_timeout.return_value = 600
+        self.config.get_job_thread_pool_count.return_value = 10
+        self.config.get_account_thread_pool_count.return_value = 5
 
     def test_test_gce_missing_key(self):
         del self.job_config['account']
@@ -334,3 +337,123 @@ class TestGCETestJob(object):
                 use_gvnic=True
             )
         ])
+
+    @patch('mash.services.test.gce_job.get_gce_compute_driver')
+    @patch('mash.services.test.gce_job.get_region_list')
+    @patch('mash.services.test.gce_job.os')
+    @patch('mash.services.test.gce_job.create_ssh_key_pair')
+    @patch('mash.services.test.gce_job.random')
+    @patch('mash.utils.mash_utils.NamedTemporaryFile')
+    @patch('mash.services.test.gce_job.test_image')
+    def test_run_gce_firmware_variants(
+        self, mock_test_image, mock_temp_file, mock_random,
+        mock_create_ssh_key_pair, mock_os, mock_get_region_list,
+        mock_get_compute_driver
+    ):
+        tmp_file = Mock()
+        tmp_file.name = '/tmp/acnt.file'
+        mock_temp_file.return_value = tmp_file
+
+        def test_image(cloud, **kwargs):
+            firmware = 'uefi' if kwargs['enable_secure_boot'] else 'bios'
+            return (
+                0 if firmware == 'bios' else 1,
+                {
+                    'tests': [{'outcome': 'passed', 'name': firmware}],
+                    'summary': {
+                        'duration': 10 if firmware == 'bios' else 20,
+                        'passed': 1,
+                        'num_tests': 1
+                    }
+                }
+            )
+
+        mock_test_image.side_effect = test_image
+        mock_random.choice.side_effect = ['n1-standard-1', 'us-east1-c']
+        mock_os.path.exists.return_value = True
+        mock_get_region_list.return_value = set(['us-west1-c', 'us-east1-c'])
+        self.job_config['boot_firmware'] = ['bios', 'uefi']
+        self.job_config['cleanup_images'] = False
+
+        job = GCETestJob(self.job_config, self.config)
+        job._log_callback = Mock()
+        job.credentials = {
+            'test-gce': {'fake': '123'},
+            'testacnt': {'fake': '123'}
+        }
+        job.status_msg['cloud_image_name'] = 'ami-123'
+        job.run_job()
+
+        # Variants are tested in different zones
+        zones = {
+            kwargs['enable_secure_boot']: kwargs['region']
+            for _, kwargs in mock_test_image.call_args_list
+        }
+        assert zones == {False: 'us-west1-c', True: 'us-east1-c'}
+        assert mock_random.choice.call_args_list[1] == call(
+            ['us-east1-c']
+        )
+
+        test_results = json.loads(job.status_msg['test_results'])
+        assert [test['name'] for test in test_results['tests']] == [
+            'bios', 'uefi'
+        ]
+        assert test_results['summary'] == {
+            'duration': 20,
+            'passed': 2,
+            'num_tests': 2
+        }
+        assert test_results['variants']['uefi']['duration'] == 20
+        assert job.status == 'failed'
+        job._log_callback.warning.assert_called_once_with(
+            'Image tests failed in region: us-east1-c.'
+        )
+        assert [task['name'] for task in job.task_metrics] == ['bios', 'uefi']
+
+    @patch('mash.services.test.gce_job.get_gce_compute_driver')
+    @patch('mash.services.test.gce_job.get_region_list')
+    @patch('mash.services.test.gce_job.os')
+    @patch('mash.utils.mash_utils.NamedTemporaryFile')
+    @patch.object(GCETestJob, '_test_variant')
+    def test_run_gce_firmware_variant_error(
+        self, mock_test_variant, mock_temp_file, mock_os,
+        mock_get_region_list, mock_get_compute_driver
+    ):
+        def test_variant(firmware, zone, fallback_regions, auth_file):
+            if firmware == 'uefi':
+                raise Exception('Cannot create SSH key')
+
+            return 0, {}, zone, None
+
+        mock_test_variant.side_effect = test_variant
+        mock_os.path.exists.return_value = True
+        mock_get_region_list.return_value = set(['us-west1-c'])
+        self.job_config['boot_firmware'] = ['bios', 'uefi']
+        self.job_config['cleanup_images'] = False
+
+        job = GCETestJob(self.job_config, self.config)
+        job._log_callback = Mock()
+        job.credentials = {
+            'test-gce': {'fake': '123'},
+            'testacnt': {'fake': '123'}
+        }
+        job.status_msg['cloud_image_name'] = 'ami-123'
+        job.run_job()
+
+        assert job.status == 'failed'
+        job._log_callback.error.assert_called_once_with(
+            'Testing uefi boot firmware variant failed: Cannot create SSH key'
+        )
+        assert 'Testing uefi boot firmware variant failed: ' \
+            'Cannot create SSH key' in job.status_msg['errors']
+
+    @patch('mash.services.test.gce_job.os')
+    def test_get_variant_zones_no_fallback(self, mock_os):
+        mock_os.path.exists.return_value = True
+        self.job_config['boot_firmware'] = ['bios', 'uefi']
+
+        job = GCETestJob(self.job_config, self.config)
+
+        assert job._get_variant_zones({'us-west1-c'}) == [
+            'us-west1-c', 'us-west1-c'
+        ]
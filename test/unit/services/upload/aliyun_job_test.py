@@ -3,6 +3,8 @@ from unittest.mock import (
     MagicMock, Mock, patch
 )
 
+from oss2.exceptions import NoSuchUpload
+
 from mash.services.upload.aliyun_job import AliyunUploadJob
 from mash.mash_exceptions import MashUploadException
 from mash.services.upload.config import UploadConfig
@@ -59,17 +61,55 @@ class TestAliyunUploadJob(object):
         with raises(MashUploadException):
             self.job.run_job()
 
+    @patch('mash.services.upload.aliyun_job.persist_json')
+    @patch('mash.services.upload.aliyun_job.upload_parts')
+    @patch('mash.services.upload.aliyun_job.new_upload_state')
+    @patch('mash.services.upload.aliyun_job.os')
     @patch('mash.services.upload.aliyun_job.AliyunImage')
     def test_upload(
         self,
-        mock_aliyun_image
+        mock_aliyun_image,
+        mock_os,
+        mock_new_upload_state,
+        mock_upload_parts,
+        mock_persist_json
     ):
         aliyun_image = MagicMock()
         mock_aliyun_image.return_value = aliyun_image
         aliyun_image.image_tarball_exists.return_value = False
+        bucket_client = aliyun_image.bucket_client
+        bucket_client.init_multipart_upload.return_value.upload_id = 'upload1'
+        bucket_client.upload_part.return_value.etag = 'etag1'
+        mock_os.path.getsize.return_value = 400
+        mock_new_upload_state.return_value = {'upload_id': 'upload1'}
+
+        def upload_parts(image_file, state, upload_part, **kwargs):
+            assert kwargs['tuner'].workers == 4
+            assert kwargs['tuner'].max_workers == 8
+            kwargs['progress_callback'](100)
+            return [(1, upload_part(1, b'data'))]
+
+        mock_upload_parts.side_effect = upload_parts
+        self.job.job_file = 'job-1.json'
 
         self.job.run_job()
-        assert aliyun_image.upload_image_tarball.call_count == 1
+
+        bucket_client.init_multipart_upload.assert_called_once_with(
+            'sles-15-sp2-v20200925.qcow2'
+        )
+        bucket_client.upload_part.assert_called_once_with(
+            'sles-15-sp2-v20200925.qcow2', 'upload1', 1, b'data'
+        )
+        args = bucket_client.complete_multipart_upload.call_args[0]
+        assert args[:2] == ('sles-15-sp2-v20200925.qcow2', 'upload1')
+        assert (args[2][0].part_number, args[2][0].etag) == (1, 'etag1')
+        aliyun_image.wait_on_blob.assert_called_once_with(
+            'sles-15-sp2-v20200925.qcow2'
+        )
+        assert 'multipart_upload' not in self.job.job_config
+        assert mock_persist_json.call_count == 2
+        self.log_callback.info.assert_any_call('Image 25% uploaded.')
+        self.log_callback.info.assert_any_call('Image upload finished.')
 
         # Tarball exists and no force replace
         aliyun_image.image_tarball_exists.return_value = True
@@ -82,6 +122,96 @@ class TestAliyunUploadJob(object):
 
         assert aliyun_image.delete_storage_blob.call_count == 1
 
+    @patch('mash.services.upload.aliyun_job.PartIterator')
+    @patch('mash.services.upload.aliyun_job.is_resumable')
+    def test_get_upload_state_resume(
+        self, mock_is_resumable, mock_part_iterator
+    ):
+        state = {
+            'upload_id': 'upload1',
+            'parts': [
+                {'part_num': 1, 'offset': 0, 'size': 100, 'etag': None},
+                {'part_num': 2, 'offset': 100, 'size': 100, 'etag': None}
+            ]
+        }
+        self.job.job_config['multipart_upload'] = state
+        self.job._image_size = 400
+        mock_is_resumable.return_value = True
+        part = Mock(part_number=1, etag='etag1', size=100)
+        mock_part_iterator.return_value = [part]
+        bucket_client = Mock()
+
+        result = self.job._get_upload_state(
+            bucket_client, 'image.qcow2', 'image.qcow2'
+        )
+
+        assert result is state
+        assert state['parts'][0]['etag'] == 'etag1'
+        mock_part_iterator.assert_called_once_with(
+            bucket_client, 'image.qcow2', 'upload1'
+        )
+        self.log_callback.info.assert_any_call('Image 25% uploaded.')
+        bucket_client.init_multipart_upload.assert_not_called()
+
+        # Nothing uploaded yet
+        mock_part_iterator.return_value = []
+        self.job._get_upload_state(bucket_client, 'image.qcow2', 'image.qcow2')
+        assert self.job.percent_uploaded == 25
+
+    @patch('mash.services.upload.aliyun_job.new_upload_state')
+    @patch('mash.services.upload.aliyun_job.PartIterator')
+    @patch('mash.services.upload.aliyun_job.is_resumable')
+    def test_get_upload_state_expired(
+        self, mock_is_resumable, mock_part_iterator, mock_new_upload_state
+    ):
+        self.job.job_config['multipart_upload'] = {'upload_id': 'upload1'}
+        mock_is_resumable.return_value = True
+        mock_part_iterator.side_effect = NoSuchUpload(
+            404, {}, '', {'Message': 'Upload not found'}
+        )
+        bucket_client = Mock()
+        bucket_client.init_multipart_upload.return_value.upload_id = 'upload2'
+        state = {'upload_id': 'upload2'}
+        mock_new_upload_state.return_value = state
+
+        result = self.job._get_upload_state(
+            bucket_client, 'image.qcow2', 'image.qcow2'
+        )
+
+        assert result == state
+        assert self.job.job_config['multipart_upload'] == state
+        self.log_callback.warning.assert_called_once_with(
+            'Multipart upload upload1 no longer exists, starting a new upload.'
+        )
+
+    @patch('mash.services.upload.aliyun_job.new_upload_state')
+    @patch('mash.services.upload.aliyun_job.is_resumable')
+    def test_get_upload_state_other_image(
+        self, mock_is_resumable, mock_new_upload_state
+    ):
+        old_state = {'upload_id': 'upload1', 'object_name': 'old.qcow2'}
+        self.job.job_config['multipart_upload'] = old_state
+        mock_is_resumable.return_value = False
+        mock_new_upload_state.return_value = {'upload_id': 'upload2'}
+        bucket_client = Mock()
+
+        self.job._get_upload_state(bucket_client, 'image.qcow2', 'image.qcow2')
+
+        bucket_client.abort_multipart_upload.assert_called_once_with(
+            'old.qcow2', 'upload1'
+        )
+
+        # Abort failures are logged
+        bucket_client.abort_multipart_upload.side_effect = NoSuchUpload(
+            404, {}, '', {'Message': 'Upload not found'}
+        )
+        self.job.job_config['multipart_upload'] = old_state
+        self.job._get_upload_state(bucket_client, 'image.qcow2', 'image.qcow2')
+
+        self.log_callback.warning.assert_called_once_with(
+            'Unable to abort multipart upload upload1: Upload not found'
+        )
+
     def test_progress_callback(self):
         self.job.progress_callback(0, 0, done=True)
         self.log_callback.info.assert_called_once_with(
@@ -5,6 +5,7 @@ from unittest.mock import (
 )
 
 from mash.services.upload.azure_job import AzureUploadJob
+from mash.services.upload.blob_sources import BlobSource, blob_sources
 from mash.mash_exceptions import MashUploadException
 from mash.services.upload.config import UploadConfig
 
@@ -53,8 +54,16 @@ class TestAzureUploadJob(object):
         self.job = AzureUploadJob(job_doc, self.config)
         self.job.status_msg['image_file'] = 'file.vhdfixed.xz'
         self.job.status_msg['build_time'] = '1601061355'
+        self.job.status_msg['image_digest'] = 'abc'
+        self.job.status_msg['download_url'] = 'https://download/'
         self.job.credentials = self.credentials
         self.job._log_callback = MagicMock()
+        self.key = ('user1', 'https://download/', 'abc')
+
+        blob_sources.clear()
+
+    def teardown(self):
+        blob_sources.clear()
 
     def test_post_init_incomplete_arguments(self):
         job_doc = {
@@ -86,6 +95,7 @@ class TestAzureUploadJob(object):
         client = MagicMock()
         mock_azure_image.return_value = client
         client.blob_service_client = bsc
+        client.find_blob_by_digest.return_value = None
 
         self.job.force_replace_image = True
         self.job.run_job()
@@ -95,5 +105,186 @@ class TestAzureUploadJob(object):
             max_workers=8,
             max_retry_attempts=5,
             blob_name='name v20200925.vhd',
-            force_replace_image=True
+            force_replace_image=True,
+            job_id='1',
+            metadata={'mash_image_sha256': 'abc'}
+        )
+        assert blob_sources.get_source(self.key) == (
+            BlobSource(
+                'storage',
+                'container',
+                'name v20200925.vhd',
+                client.get_blob_sas_url.return_value
+            ),
+            False
+        )
+        client.get_blob_sas_url.assert_called_once_with(
+            'name v20200925.vhd',
+            expire_hours=6
+        )
+
+        # Images of other users are not copied
+        blob_sources.publish(
+            self.key,
+            BlobSource('source', 'images', 'name.vhd', 'https://url?sas'),
+            60
+        )
+        self.job.requesting_user = 'user2'
+        self.job.run_job()
+
+        assert client.upload_image_blob.call_count == 2
+        assert not client.copy_image_blob.called
+
+    @patch('mash.services.upload.azure_job.AzureImage')
+    def test_upload_without_digest(self, mock_azure_image):
+        client = MagicMock()
+        mock_azure_image.return_value = client
+        del self.job.status_msg['image_digest']
+
+        self.job.run_job()
+
+        # Images without a digest are not shared
+        assert client.upload_image_blob.call_args[1]['metadata'] is None
+        assert not client.find_blob_by_digest.called
+        assert not client.get_blob_sas_url.called
+        assert blob_sources.get_source(self.key) == (None, True)
+
+    @patch('mash.services.upload.azure_job.AzureImage')
+    def test_upload_without_blob_copy(self, mock_azure_image):
+        client = MagicMock()
+        mock_azure_image.return_value = client
+        client.find_blob_by_digest.return_value = None
+
+        with patch.object(
+            self.config, 'get_azure_blob_copy', return_value=False
+        ):
+            self.job.run_job()
+
+        assert client.upload_image_blob.call_count == 1
+        assert not client.get_blob_sas_url.called
+
+    @patch('mash.services.upload.azure_job.AzureImage')
+    def test_upload_copy(self, mock_azure_image):
+        client = MagicMock()
+        mock_azure_image.return_value = client
+        client.find_blob_by_digest.return_value = None
+        key = self.key
+        blob_sources.get_source(key)
+        blob_sources.publish(
+            key,
+            BlobSource('source', 'images', 'name.vhd', 'https://url?sas'),
+            60
+        )
+
+        self.job.run_job()
+
+        client.copy_image_blob.assert_called_once_with(
+            'https://url?sas',
+            'name v20200925.vhd',
+            force_replace_image=None
+        )
+        assert not client.upload_image_blob.called
+        assert self.job.status_msg['blob_source'] == \
+            'source/images/name.vhd'
+        assert self.job.status_msg['blob_name'] == 'name v20200925.vhd'
+
+        # Copy failed
+        client.copy_image_blob.side_effect = Exception('Copy failed')
+        self.job.run_job()
+
+        assert client.upload_image_blob.call_count == 1
+        self.job._log_callback.warning.assert_called_once_with(
+            'Server side copy of the image blob failed, uploading '
+            'the image instead: Copy failed'
+        )
+
+        # The source is in the same container
+        client.copy_image_blob.reset_mock()
+        blob_sources.publish(
+            key,
+            BlobSource('storage', 'container', 'name.vhd', 'https://url'),
+            60
+        )
+        self.job.run_job()
+
+        assert not client.copy_image_blob.called
+        assert client.upload_image_blob.call_count == 2
+
+    @patch('mash.services.upload.azure_job.AzureImage')
+    def test_upload_source_failed(self, mock_azure_image):
+        client = MagicMock()
+        mock_azure_image.return_value = client
+        client.find_blob_by_digest.return_value = None
+        key = self.key
+
+        # Sharing the uploaded blob failed
+        client.get_blob_sas_url.side_effect = Exception('No key')
+        self.job.run_job()
+
+        self.job._log_callback.warning.assert_called_once_with(
+            'Unable to share the image blob for copies: No key'
+        )
+        assert blob_sources.get_source(key) == (None, True)
+        blob_sources.discard(key)
+
+        # Upload failed
+        client.upload_image_blob.side_effect = Exception('Upload failed')
+
+        with raises(Exception):
+            self.job.run_job()
+
+        assert blob_sources.get_source(key) == (None, True)
+
+    @patch('mash.services.upload.azure_job.AzureImage')
+    def test_upload_image_digest(self, mock_azure_image):
+        client = MagicMock()
+        mock_azure_image.return_value = client
+
+        # Blob with the digest exists
+        client.find_blob_by_digest.return_value = 'name v20200925.vhd'
+        self.job.run_job()
+
+        client.find_blob_by_digest.assert_called_once_with(
+            'abc',
+            blob_name='name v20200925.vhd'
+        )
+        assert not client.upload_image_blob.called
+        assert not client.copy_image_blob.called
+        assert self.job.status_msg['blob_name'] == 'name v20200925.vhd'
+
+        # Blob with the digest exists under a different name
+        client.find_blob_by_digest.return_value = 'name v20200924.vhd'
+        self.job.run_job()
+
+        client.get_blob_sas_url.assert_called_once_with(
+            'name v20200924.vhd'
+        )
+        client.copy_image_blob.assert_called_once_with(
+            client.get_blob_sas_url.return_value,
+            'name v20200925.vhd',
+            force_replace_image=None
+        )
+        assert not client.upload_image_blob.called
+
+        # Copy failed
+        client.copy_image_blob.side_effect = Exception('Copy failed')
+        self.job.run_job()
+
+        client.upload_image_blob.assert_called_once_with(
+            'file.vhdfixed.xz',
+            max_workers=8,
+            max_retry_attempts=5,
+            blob_name='name v20200925.vhd',
+            force_replace_image=None,
+            job_id='1',
+            metadata={'mash_image_sha256': 'abc'}
         )
+        assert blob_sources.get_source(self.key)[0].blob_name == \
+            'name v20200925.vhd'
+
+        # No blob with the digest
+        client.upload_image_blob.reset_mock()
+        client.find_blob_by_digest.return_value = None
+        self.job.run_job()
+
+        assert client.upload_image_blob.call_count == 1
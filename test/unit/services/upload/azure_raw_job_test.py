@@ -94,7 +94,8 @@ class TestAzureRawUploadJob(object):
                 bsc,
                 max_retry_attempts=5,
                 max_workers=8,
-                expand_image=False
+                expand_image=False,
+                job_id='1'
             ),
             call(
                 'file.vhdfixed.xz',
@@ -103,6 +104,7 @@ class TestAzureRawUploadJob(object):
                 bsc,
                 max_retry_attempts=5,
                 max_workers=8,
-                expand_image=False
+                expand_image=False,
+                job_id='1'
             )
         ])
@@ -64,7 +64,8 @@ class TestAzureSASUploadJob(object):
             blob_service_client=bsc,
             max_retry_attempts=5,
             max_workers=8,
-            is_page_blob=True
+            is_page_blob=True,
+            job_id='1'
         )
 
     @patch('mash.services.upload.azure_sas_job.AzureImage')
@@ -94,5 +95,6 @@ class TestAzureSASUploadJob(object):
             blob_service_client=bsc,
             max_retry_attempts=5,
             max_workers=8,
-            is_page_blob=True
+            is_page_blob=True,
+            job_id='1'
         )
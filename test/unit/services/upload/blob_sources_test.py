@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+from mash.services.upload.blob_sources import (
+    BlobSource,
+    BlobSourceRegistry,
+    get_image_key
+)
+
+
+def test_get_image_key():
+    assert get_image_key('user1', 'abc', 'https://download/') == \
+        ('user1', 'https://download/', 'abc')
+    assert get_image_key('user1', 'abc') != get_image_key('user2', 'abc')
+
+
+class TestBlobSourceRegistry(object):
+
+    def setup_method(self):
+        self.registry = BlobSourceRegistry()
+        self.source = BlobSource('sa1', 'images', 'image.vhd', 'https://url')
+
+    def test_get_source(self):
+        assert self.registry.get_source('image') == (None, True)
+
+        # The upload of the owner is not finished
+        assert self.registry.get_source('image', timeout=0) == (None, False)
+
+        self.registry.publish('image', self.source, 60)
+        assert self.registry.get_source('image') == (self.source, False)
+
+    @patch('mash.services.upload.blob_sources.time')
+    def test_get_source_expired(self, mock_time):
+        mock_time.monotonic.return_value = 100
+        self.registry.publish('image', self.source, 60)
+        self.registry.publish('other', self.source, 10)
+
+        mock_time.monotonic.return_value = 160
+        assert self.registry.get_source('image') == (None, True)
+        assert 'other' not in self.registry._entries
+
+    def test_discard_and_clear(self):
+        self.registry.get_source('image')
+        self.registry.discard('image')
+        self.registry.discard('image')
+
+        assert self.registry.get_source('image') == (None, True)
+
+        self.registry.clear()
+        assert self.registry.get_source('image') == (None, True)
@@ -23,3 +23,7 @@ class TestUploadConfig(object):
     def test_get_azure_max_workers(self):
         max_workers = self.config.get_azure_max_workers()
         assert 8 == max_workers
+
+    def test_get_azure_blob_copy(self):
+        assert self.config.get_azure_blob_copy()
+        assert not self.config_defaults.get_azure_blob_copy()
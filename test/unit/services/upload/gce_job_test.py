@@ -125,3 +125,61 @@ class TestGCEUploadJob(object):
         self.job.run_job()
 
         assert mock_delete_tarball.call_count == 1
+
+    @patch('mash.services.upload.gce_job.copy_blob')
+    @patch('mash.services.upload.gce_job.find_blob_by_digest')
+    @patch('mash.services.upload.gce_job.blob_exists')
+    @patch('mash.services.upload.gce_job.get_gce_storage_driver')
+    @patch('mash.services.upload.gce_job.upload_image_tarball')
+    def test_upload_image_digest(
+        self,
+        mock_upload_image,
+        mock_get_driver,
+        mock_blob_exists,
+        mock_find_blob,
+        mock_copy_blob
+    ):
+        storage_driver = Mock()
+        mock_get_driver.return_value = storage_driver
+        mock_blob_exists.return_value = False
+        self.job.status_msg['image_digest'] = 'abc'
+
+        # Tarball with the digest exists
+        mock_find_blob.return_value = 'sles-12-sp4-v20200925.tar.gz'
+        self.job.run_job()
+
+        mock_find_blob.assert_called_once_with(
+            storage_driver,
+            'abc',
+            'images',
+            object_name='sles-12-sp4-v20200925.tar.gz'
+        )
+        assert not mock_upload_image.called
+        assert not mock_copy_blob.called
+        assert self.job.status_msg['object_name'] == \
+            'sles-12-sp4-v20200925.tar.gz'
+
+        # Tarball with the digest exists under a different name
+        mock_find_blob.return_value = 'sles-12-sp4-v20200924.tar.gz'
+        self.job.run_job()
+
+        mock_copy_blob.assert_called_once_with(
+            storage_driver,
+            'sles-12-sp4-v20200924.tar.gz',
+            'sles-12-sp4-v20200925.tar.gz',
+            'images'
+        )
+        assert not mock_upload_image.called
+
+        # No tarball with the digest
+        mock_find_blob.return_value = None
+        self.job.run_job()
+
+        mock_upload_image.assert_called_once_with(
+            storage_driver,
+            'sles-12-sp4-v20200925.tar.gz',
+            'sles-12-sp4-v20180909.tar.gz',
+            'images',
+            job_id='1',
+            digest='abc'
+        )
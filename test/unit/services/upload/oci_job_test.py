@@ -1,7 +1,7 @@
 from pytest import raises
-from unittest.mock import (
-    MagicMock, Mock, patch
-)
+from unittest.mock import Mock, patch
+
+from oci.exceptions import ServiceError
 
 from mash.services.upload.oci_job import OCIUploadJob
 from mash.mash_exceptions import MashUploadException
@@ -63,17 +63,15 @@ class TestOCIUploadJob(object):
         with raises(MashUploadException):
             self.job.run_job()
 
+    @patch('mash.services.upload.oci_job.persist_json')
+    @patch('mash.services.upload.oci_job.upload_parts')
+    @patch('mash.services.upload.oci_job.new_upload_state')
     @patch('mash.services.upload.oci_job.stat')
-    @patch('mash.services.upload.oci_job.UploadManager')
     @patch('mash.services.upload.oci_job.ObjectStorageClient')
-    @patch('builtins.open')
     def test_upload(
-        self, mock_open, mock_storage_client, mock_upload_manager, mock_stat
+        self, mock_storage_client, mock_stat, mock_new_upload_state,
+        mock_upload_parts, mock_persist_json
     ):
-        open_handle = MagicMock()
-        open_handle.__enter__.return_value = open_handle
-        mock_open.return_value = open_handle
-
         image_info = Mock()
         image_info.st_size = 112358
         mock_stat.return_value = image_info
@@ -83,21 +81,304 @@ class TestOCIUploadJob(object):
 
         storage_driver = Mock()
         storage_driver.get_namespace.return_value = namespace
-
+        storage_driver.create_multipart_upload.return_value.data.upload_id = \
+            'upload1'
+        storage_driver.upload_part.return_value.headers = {'etag': 'etag1'}
         mock_storage_client.return_value = storage_driver
 
-        upload_manager = Mock()
-        mock_upload_manager.return_value = upload_manager
+        state = {'upload_id': 'upload1', 'parts': []}
+        mock_new_upload_state.return_value = state
+
+        def upload_parts(image_file, state, upload_part, **kwargs):
+            assert kwargs['tuner'].workers == 2
+            assert kwargs['tuner'].max_workers == 4
+            kwargs['persist_callback'](state)
+            return [(1, upload_part(1, b'data'))]
+
+        mock_upload_parts.side_effect = upload_parts
+        self.job.job_file = 'job-1.json'
 
         self.job.run_job()
 
-        upload_manager.upload_stream.assert_called_once_with(
+        mock_new_upload_state.assert_called_once_with(
+            'upload1',
+            'sles-12-sp4-v20200925.qcow2',
+            'sles-12-sp4-v20200925.qcow2'
+        )
+        storage_driver.upload_part.assert_called_once_with(
+            'namespace name',
+            'images',
+            'sles-12-sp4-v20200925.qcow2',
+            'upload1',
+            1,
+            b'data',
+            content_md5='jXd/OF09/siBXSD3SWAm3A=='
+        )
+        call = storage_driver.commit_multipart_upload.call_args[0]
+        assert call[:4] == (
+            'namespace name',
+            'images',
+            'sles-12-sp4-v20200925.qcow2',
+            'upload1'
+        )
+        part = call[4].parts_to_commit[0]
+        assert (part.part_num, part.etag) == (1, 'etag1')
+
+        # State is removed from the job file once the upload is committed
+        assert 'multipart_upload' not in self.job.job_config
+        assert mock_persist_json.call_count == 3
+        assert self.job.status_msg['object_name'] == \
+            'sles-12-sp4-v20200925.qcow2'
+        assert self.job.status_msg['namespace'] == 'namespace name'
+
+    @patch('mash.services.upload.oci_job.list_call_get_all_results')
+    @patch('mash.services.upload.oci_job.is_resumable')
+    def test_get_upload_state_resume(
+        self, mock_is_resumable, mock_list_parts
+    ):
+        state = {
+            'upload_id': 'upload1',
+            'parts': [
+                {'part_num': 1, 'offset': 0, 'size': 400, 'etag': None},
+                {'part_num': 2, 'offset': 400, 'size': 400, 'etag': None}
+            ]
+        }
+        self.job.job_config['multipart_upload'] = state
+        self.job._image_size = 800
+        mock_is_resumable.return_value = True
+
+        part = Mock(part_number=1, etag='etag1', size=400)
+        mock_list_parts.return_value.data = [part]
+        storage_driver = Mock()
+
+        result = self.job._get_upload_state(
+            storage_driver, 'namespace name', 'image.qcow2', 'image.qcow2'
+        )
+
+        assert result is state
+        assert state['parts'][0]['etag'] == 'etag1'
+        assert self.job._total_bytes_transferred == 400
+        mock_list_parts.assert_called_once_with(
+            storage_driver.list_multipart_upload_parts,
             'namespace name',
             'images',
+            'image.qcow2',
+            'upload1'
+        )
+        storage_driver.create_multipart_upload.assert_not_called()
+
+        # Nothing uploaded yet
+        mock_list_parts.return_value.data = []
+        self.job._get_upload_state(
+            storage_driver, 'namespace name', 'image.qcow2', 'image.qcow2'
+        )
+        assert self.job._total_bytes_transferred == 400
+
+    @patch('mash.services.upload.oci_job.new_upload_state')
+    @patch('mash.services.upload.oci_job.list_call_get_all_results')
+    @patch('mash.services.upload.oci_job.is_resumable')
+    def test_get_upload_state_expired(
+        self, mock_is_resumable, mock_list_parts, mock_new_upload_state
+    ):
+        self.job.job_config['multipart_upload'] = {'upload_id': 'upload1'}
+        mock_is_resumable.return_value = True
+        mock_list_parts.side_effect = ServiceError(
+            404, 'NoSuchUpload', {}, 'Upload not found'
+        )
+        storage_driver = Mock()
+        storage_driver.create_multipart_upload.return_value.data.upload_id = \
+            'upload2'
+        state = {'upload_id': 'upload2'}
+        mock_new_upload_state.return_value = state
+
+        result = self.job._get_upload_state(
+            storage_driver, 'namespace name', 'image.qcow2', 'image.qcow2'
+        )
+
+        assert result == state
+        assert self.job.job_config['multipart_upload'] == state
+
+        # Other errors fail the job
+        mock_list_parts.side_effect = ServiceError(
+            500, 'InternalServerError', {}, 'Internal error'
+        )
+
+        with raises(ServiceError):
+            self.job._get_upload_state(
+                storage_driver, 'namespace name', 'image.qcow2', 'image.qcow2'
+            )
+
+    @patch('mash.services.upload.oci_job.new_upload_state')
+    @patch('mash.services.upload.oci_job.is_resumable')
+    def test_get_upload_state_other_image(
+        self, mock_is_resumable, mock_new_upload_state
+    ):
+        old_state = {'upload_id': 'upload1', 'object_name': 'old.qcow2'}
+        self.job.job_config['multipart_upload'] = old_state
+        mock_is_resumable.return_value = False
+        mock_new_upload_state.return_value = {'upload_id': 'upload2'}
+        storage_driver = Mock()
+
+        self.job._get_upload_state(
+            storage_driver, 'namespace name', 'image.qcow2', 'image.qcow2'
+        )
+
+        storage_driver.abort_multipart_upload.assert_called_once_with(
+            'namespace name', 'images', 'old.qcow2', 'upload1'
+        )
+
+        # Abort failures are logged
+        storage_driver.abort_multipart_upload.side_effect = ServiceError(
+            404, 'NoSuchUpload', {}, 'Upload not found'
+        )
+        self.job.job_config['multipart_upload'] = old_state
+        self.job._get_upload_state(
+            storage_driver, 'namespace name', 'image.qcow2', 'image.qcow2'
+        )
+
+        self.job._log_callback.warning.assert_called_once_with(
+            'Unable to abort multipart upload upload1: Upload not found'
+        )
+
+    @patch.object(OCIUploadJob, '_upload_object')
+    @patch.object(OCIUploadJob, '_copy_object')
+    @patch.object(OCIUploadJob, '_find_object_by_digest')
+    @patch('mash.services.upload.oci_job.stat')
+    @patch('mash.services.upload.oci_job.ObjectStorageClient')
+    def test_upload_image_digest(
+        self, mock_storage_client, mock_stat, mock_find_object,
+        mock_copy_object, mock_upload_object
+    ):
+        mock_stat.return_value.st_size = 112358
+        storage_driver = Mock()
+        storage_driver.get_namespace.return_value.data = 'namespace name'
+        mock_storage_client.return_value = storage_driver
+        self.job.status_msg['image_digest'] = 'abc'
+
+        # Object with the digest exists
+        mock_find_object.return_value = 'sles-12-sp4-v20200925.qcow2'
+        self.job.run_job()
+
+        mock_find_object.assert_called_once_with(
+            storage_driver,
+            'namespace name',
             'sles-12-sp4-v20200925.qcow2',
-            open_handle,
-            progress_callback=self.job._progress_callback
+            'abc'
         )
+        assert not mock_copy_object.called
+        assert not mock_upload_object.called
+        assert self.job.status_msg['object_name'] == \
+            'sles-12-sp4-v20200925.qcow2'
+
+        # Object with the digest exists under a different name
+        mock_find_object.return_value = 'sles-12-sp4-v20200924.qcow2'
+        self.job.run_job()
+
+        mock_copy_object.assert_called_once_with(
+            storage_driver,
+            'namespace name',
+            'sles-12-sp4-v20200924.qcow2',
+            'sles-12-sp4-v20200925.qcow2'
+        )
+        assert not mock_upload_object.called
+
+        # No object with the digest
+        mock_find_object.return_value = None
+        self.job.run_job()
+
+        mock_upload_object.assert_called_once_with(
+            storage_driver,
+            'namespace name',
+            'sles-12-sp4-v20200925.qcow2',
+            'sles-12-sp4-v20200925.qcow2',
+            'abc'
+        )
+
+    @patch('mash.services.upload.oci_job.list_call_get_all_results')
+    def test_find_object_by_digest(self, mock_list_objects):
+        objects = []
+
+        for name, size in (
+            ('small.qcow2', 10), ('old.qcow2', 100), ('new.qcow2', 100)
+        ):
+            item = Mock(size=size)
+            item.name = name
+            objects.append(item)
+
+        mock_list_objects.return_value.data.objects = objects
+        storage_driver = Mock()
+        storage_driver.head_object.return_value.headers = {
+            'opc-meta-mash_image_sha256': 'abc'
+        }
+        self.job._image_size = 100
+
+        assert self.job._find_object_by_digest(
+            storage_driver, 'namespace name', 'new.qcow2', 'abc'
+        ) == 'new.qcow2'
+        mock_list_objects.assert_called_once_with(
+            storage_driver.list_objects,
+            'namespace name',
+            'images',
+            fields='name,size'
+        )
+        storage_driver.head_object.assert_called_once_with(
+            'namespace name', 'images', 'new.qcow2'
+        )
+
+        assert self.job._find_object_by_digest(
+            storage_driver, 'namespace name', 'image.qcow2', 'abc'
+        ) == 'old.qcow2'
+        assert self.job._find_object_by_digest(
+            storage_driver, 'namespace name', 'image.qcow2', 'def'
+        ) is None
+
+    @patch('mash.services.upload.oci_job.ObjectStorageClientCompositeOperations')
+    def test_copy_object(self, mock_composite):
+        composite = mock_composite.return_value
+        composite.copy_object_and_wait_for_state.return_value.data.status = \
+            'COMPLETED'
+        storage_driver = Mock()
+
+        self.job._copy_object(
+            storage_driver, 'namespace name', 'old.qcow2', 'new.qcow2'
+        )
+
+        mock_composite.assert_called_once_with(storage_driver)
+        args, kwargs = composite.copy_object_and_wait_for_state.call_args
+        assert args[:2] == ('namespace name', 'images')
+        assert args[2].source_object_name == 'old.qcow2'
+        assert args[2].destination_object_name == 'new.qcow2'
+        assert args[2].destination_region == 'us-phoenix-1'
+        assert kwargs['wait_for_states'] == [
+            'COMPLETED', 'FAILED', 'CANCELED'
+        ]
+        assert kwargs['waiter_kwargs'] == {'max_wait_seconds': 1000}
+
+        # Copy failed
+        composite.copy_object_and_wait_for_state.return_value.data.status = \
+            'FAILED'
+
+        with raises(MashUploadException):
+            self.job._copy_object(
+                storage_driver, 'namespace name', 'old.qcow2', 'new.qcow2'
+            )
+
+    @patch('mash.services.upload.oci_job.new_upload_state')
+    @patch('mash.services.upload.oci_job.is_resumable')
+    def test_get_upload_state_image_digest(
+        self, mock_is_resumable, mock_new_upload_state
+    ):
+        mock_is_resumable.return_value = False
+        storage_driver = Mock()
+
+        self.job._get_upload_state(
+            storage_driver, 'namespace name', 'image.qcow2', 'image.qcow2',
+            digest='abc'
+        )
+
+        details = storage_driver.create_multipart_upload.call_args[0][2]
+        assert details.object == 'image.qcow2'
+        assert details.metadata == {'opc-meta-mash_image_sha256': 'abc'}
 
     def test_progress_callback(self):
         self.job._image_size = 112358
@@ -1,9 +1,5 @@
 from pytest import raises
-from unittest.mock import Mock, patch
-
-from test.unit.test_helper import (
-    patch_open
-)
+from unittest.mock import MagicMock, Mock, patch
 
 from mash.services.upload.s3bucket_job import S3BucketUploadJob
 from mash.mash_exceptions import MashUploadException
@@ -70,10 +66,13 @@ class TestS3BucketUploadJob(object):
 
     @patch('mash.services.upload.s3bucket_job.stat')
     @patch('mash.services.upload.s3bucket_job.get_client')
-    @patch_open
+    @patch('mash.services.upload.s3bucket_job.open_throttled')
     def test_upload(
-        self, mock_request_credentials, mock_get_client, mock_stat
+        self, mock_open_throttled, mock_get_client, mock_stat
     ):
+        image = MagicMock()
+        image.__enter__.return_value = image
+        mock_open_throttled.return_value = image
         mock_client = Mock()
         mock_get_client.return_value = mock_client
 
@@ -85,39 +84,43 @@ class TestS3BucketUploadJob(object):
         mock_get_client.assert_called_once_with(
             's3', 'access-key', 'secret-access-key', None,
         )
-        mock_client.upload_file.assert_called_once_with(
-            'file.raw.gz',
+        mock_open_throttled.assert_called_once_with('file.raw.gz', '1')
+        mock_client.upload_fileobj.assert_called_once_with(
+            image,
             'my-bucket',
             'some-prefix/name.raw.gz',
+            ExtraArgs=None,
             Callback=self.job._log_progress
         )
 
         # Test bucket only location
-        mock_client.upload_file.reset_mock()
+        mock_client.upload_fileobj.reset_mock()
         self.job.location = 'my-bucket'
         self.job.run_job()
 
-        mock_client.upload_file.assert_called_once_with(
-            'file.raw.gz',
+        mock_client.upload_fileobj.assert_called_once_with(
+            image,
             'my-bucket',
             'name.raw.gz',
+            ExtraArgs=None,
             Callback=self.job._log_progress
         )
 
         # Test bucket and full name
-        mock_client.upload_file.reset_mock()
+        mock_client.upload_fileobj.reset_mock()
         self.job.location = 'my-bucket/some-prefix/image.raw.gz'
         self.job.status_msg['cloud_image_name'] = None
         self.job.run_job()
 
-        mock_client.upload_file.assert_called_once_with(
-            'file.raw.gz',
+        mock_client.upload_fileobj.assert_called_once_with(
+            image,
             'my-bucket',
             'some-prefix/image.raw.gz',
+            ExtraArgs=None,
             Callback=self.job._log_progress
         )
 
-        mock_client.upload_file.side_effect = Exception
+        mock_client.upload_fileobj.side_effect = Exception
 
         with raises(MashUploadException):
             self.job.run_job()
@@ -128,3 +131,59 @@ class TestS3BucketUploadJob(object):
         self.job._log_callback.info.assert_called_once_with(
             'Raw image 100% uploaded.'
         )
+
+    @patch('mash.services.upload.s3bucket_job.find_object_by_digest')
+    @patch('mash.services.upload.s3bucket_job.stat')
+    @patch('mash.services.upload.s3bucket_job.get_client')
+    @patch('mash.services.upload.s3bucket_job.open_throttled')
+    def test_upload_image_digest(
+        self, mock_open_throttled, mock_get_client, mock_stat, mock_find
+    ):
+        image = MagicMock()
+        image.__enter__.return_value = image
+        mock_open_throttled.return_value = image
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+        mock_stat.return_value.st_size = 100
+        self.job.status_msg['image_digest'] = 'abc'
+
+        # Raw image with the digest exists
+        mock_find.return_value = 'some-prefix/name.raw.gz'
+        self.job.run_job()
+
+        mock_find.assert_called_once_with(
+            mock_client,
+            'my-bucket',
+            'abc',
+            100,
+            key_name='some-prefix/name.raw.gz'
+        )
+        assert not mock_client.upload_fileobj.called
+        assert not mock_client.copy.called
+
+        # Raw image with the digest exists under a different name
+        mock_find.return_value = 'some-prefix/old.raw.gz'
+        self.job.run_job()
+
+        mock_client.copy.assert_called_once_with(
+            {'Bucket': 'my-bucket', 'Key': 'some-prefix/old.raw.gz'},
+            'my-bucket',
+            'some-prefix/name.raw.gz',
+            ExtraArgs={
+                'Metadata': {'mash_image_sha256': 'abc'},
+                'MetadataDirective': 'REPLACE'
+            }
+        )
+        assert not mock_client.upload_fileobj.called
+
+        # No raw image with the digest
+        mock_find.return_value = None
+        self.job.run_job()
+
+        mock_client.upload_fileobj.assert_called_once_with(
+            image,
+            'my-bucket',
+            'some-prefix/name.raw.gz',
+            ExtraArgs={'Metadata': {'mash_image_sha256': 'abc'}},
+            Callback=self.job._log_progress
+        )
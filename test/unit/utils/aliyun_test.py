@@ -0,0 +1,126 @@
+from unittest.mock import Mock, call, patch
+
+from aliyun_img_utils.aliyun_exceptions import AliyunImageException
+
+from mash.utils.aliyun import ImageReplicationTracker
+
+
+class TestImageReplicationTracker(object):
+
+    def setup_method(self):
+        self.tracker = ImageReplicationTracker(
+            '123456',
+            '654321',
+            {'cn-shanghai': 'm-1', 'cn-hangzhou': 'm-2', 'cn-qingdao': 'm-3'},
+            min_interval=10,
+            max_interval=30,
+            timeout=100
+        )
+        self.clients = {}
+
+        def get_client(access_key, access_secret, region):
+            return self.clients.setdefault(region, Mock())
+
+        self.patcher = patch('mash.utils.aliyun.AliyunImage')
+        self.mock_aliyun_image = self.patcher.start()
+        self.mock_aliyun_image.side_effect = get_client
+        self.mock_aliyun_image.IMAGE_BROKEN_STATES = ['CreateFailed']
+        self.mock_aliyun_image.IMAGE_PROCESSING_STATES = ['Creating']
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def set_images(self, **images):
+        for region, image in images.items():
+            client = self.clients.setdefault(region.replace('_', '-'), Mock())
+
+            if isinstance(image, Exception):
+                client.get_compute_image.side_effect = image
+            else:
+                client.get_compute_image.side_effect = None
+                client.get_compute_image.return_value = image
+
+    def test_poll(self):
+        self.set_images(
+            cn_shanghai={'Status': 'Creating', 'Progress': '10%'},
+            cn_hangzhou=AliyunImageException('Unable to find image.'),
+            cn_qingdao={'Status': 'Available'}
+        )
+
+        assert self.tracker.poll() == [('cn-qingdao', 'm-3', None)]
+        assert self.tracker.interval == 10
+        self.clients['cn-shanghai'].get_compute_image.assert_called_once_with(
+            image_id='m-1'
+        )
+        self.mock_aliyun_image.assert_any_call(
+            '123456', '654321', 'cn-shanghai'
+        )
+
+        # No changes, the interval backs off
+        assert self.tracker.poll() == []
+        assert self.tracker.interval == 20
+        assert self.tracker.poll() == []
+        assert self.tracker.interval == 30
+
+        # Progress resets the interval
+        self.set_images(
+            cn_shanghai={'Status': 'CreateFailed'},
+            cn_hangzhou={'Status': 'Deprecated'}
+        )
+
+        assert sorted(self.tracker.poll()) == [
+            ('cn-hangzhou', 'm-2', 'Image in an unexpected state: Deprecated'),
+            ('cn-shanghai', 'm-1', 'Image in a broken state: CreateFailed')
+        ]
+        assert self.tracker.interval == 10
+        assert self.tracker.pending == {}
+        assert len(self.clients) == 3
+
+    @patch('mash.utils.aliyun.time')
+    def test_track(self, mock_time):
+        mock_time.monotonic.side_effect = [0, 5, 50, 120]
+        callback = Mock()
+        self.set_images(
+            cn_shanghai={'Status': 'Available'},
+            cn_hangzhou={'Status': 'Creating'},
+            cn_qingdao={'Status': 'Creating'}
+        )
+
+        def get_compute_image(image_id):
+            self.set_images(cn_hangzhou={'Status': 'Available'})
+            return {'Status': 'Creating'}
+
+        self.clients['cn-hangzhou'].get_compute_image.side_effect = \
+            get_compute_image
+
+        self.tracker.track(callback)
+
+        assert callback.mock_calls == [
+            call('cn-shanghai', 'm-1', None),
+            call('cn-hangzhou', 'm-2', None),
+            call(
+                'cn-qingdao', 'm-3', 'Image not available within 100 seconds.'
+            )
+        ]
+        assert mock_time.sleep.mock_calls == [call(10), call(10)]
+
+    @patch('mash.utils.aliyun.time')
+    def test_track_finished(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        callback = Mock()
+        self.set_images(
+            cn_shanghai={'Status': 'Available'},
+            cn_hangzhou={'Status': 'Available'},
+            cn_qingdao={'Status': 'Available'}
+        )
+
+        # Failed polls are retried
+        self.tracker._get_state = Mock(side_effect=[
+            Exception('Connection reset'), ('Available', None),
+            ('Available', None), ('Available', None)
+        ])
+
+        self.tracker.track(callback)
+
+        assert callback.call_count == 3
+        assert mock_time.sleep.call_count == 1
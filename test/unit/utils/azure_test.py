@@ -0,0 +1,352 @@
+import lzma
+
+from pytest import raises
+from unittest.mock import MagicMock, Mock, patch
+
+from azure_img_utils.exceptions import (
+    AzureImgUtilsException,
+    AzureImgUtilsStorageException
+)
+
+from mash.utils.azure import (
+    AzureImage,
+    get_gallery_target_regions,
+    upload_azure_file
+)
+
+
+@patch('mash.utils.azure.add_azure_profiler_policy')
+def test_azure_image_clients(mock_add_policy):
+    compute_client = Mock()
+    blob_service_client = Mock()
+    mock_add_policy.side_effect = lambda client: client
+
+    azure_image = AzureImage(storage_account='sa1', sas_token='token')
+    azure_image._compute_client = compute_client
+    azure_image._blob_service_client = blob_service_client
+
+    assert azure_image.compute_client == compute_client
+    assert azure_image.blob_service_client == blob_service_client
+    mock_add_policy.assert_any_call(compute_client)
+    mock_add_policy.assert_any_call(blob_service_client)
+
+
+def test_get_gallery_target_regions():
+    assert get_gallery_target_regions('westus') == [
+        {'name': 'westus', 'regional_replica_count': 1}
+    ]
+    assert get_gallery_target_regions(
+        'westus',
+        [
+            {'name': 'eastus', 'replica_count': 3},
+            {'name': 'westus', 'replica_count': 2}
+        ]
+    ) == [
+        {'name': 'westus', 'regional_replica_count': 2},
+        {'name': 'eastus', 'regional_replica_count': 3}
+    ]
+
+
+@patch('mash.utils.azure.add_azure_profiler_policy')
+@patch.object(AzureImage, 'delete_gallery_image_version')
+@patch.object(AzureImage, 'gallery_image_version_exists')
+def test_begin_create_gallery_image_version(
+    mock_exists, mock_delete, mock_add_policy
+):
+    mock_add_policy.side_effect = lambda client: client
+    compute_client = Mock()
+    compute_client._config.subscription_id = 'sub1'
+    mock_exists.return_value = True
+
+    azure_image = AzureImage(
+        container='container1',
+        storage_account='sa1',
+        resource_group='rg1'
+    )
+    azure_image._compute_client = compute_client
+
+    poller = azure_image.begin_create_gallery_image_version(
+        'image.vhd',
+        'gallery1',
+        'image1',
+        '2026.10.19',
+        'westus',
+        force_replace_image=True,
+        target_regions=[{'name': 'eastus', 'replica_count': 2}]
+    )
+
+    versions = compute_client.gallery_image_versions
+    assert poller == versions.begin_create_or_update.return_value
+    mock_delete.assert_called_once_with(
+        'gallery1', 'image1', '2026.10.19', 'rg1'
+    )
+    args = versions.begin_create_or_update.call_args[0]
+    assert args[:4] == ('rg1', 'gallery1', 'image1', '2026.10.19')
+    assert args[4]['publishing_profile']['target_regions'] == [
+        {'name': 'westus', 'regional_replica_count': 1},
+        {'name': 'eastus', 'regional_replica_count': 2}
+    ]
+    assert args[4]['storage_profile']['os_disk_image']['source'] == {
+        'id': '/subscriptions/sub1/resourceGroups/rg1/providers/'
+              'Microsoft.Storage/storageAccounts/sa1',
+        'uri': 'https://sa1.blob.core.windows.net/container1/image.vhd'
+    }
+
+    # Existing version without force replace
+    with raises(AzureImgUtilsException):
+        azure_image.begin_create_gallery_image_version(
+            'image.vhd', 'gallery1', 'image1', '2026.10.19', 'westus'
+        )
+
+    # Missing storage details
+    azure_image.container = None
+    with raises(AzureImgUtilsException):
+        azure_image.begin_create_gallery_image_version(
+            'image.vhd', 'gallery1', 'image1', '2026.10.19', 'westus'
+        )
+
+
+@patch('mash.utils.azure.get_blob_client')
+@patch('mash.utils.azure.open_throttled')
+@patch('mash.utils.azure.FileType')
+def test_upload_azure_file(
+    mock_file_type, mock_open_throttled, mock_get_blob_client
+):
+    image_stream = MagicMock()
+    image_stream.__enter__.return_value = image_stream
+    mock_open_throttled.return_value = image_stream
+    mock_file_type.return_value.is_xz.return_value = True
+    mock_file_type.return_value.get_size.return_value = 1024
+    blob_service_client = Mock()
+    blob_client = mock_get_blob_client.return_value
+    blob_client.upload_blob.side_effect = [Exception('Timeout'), None]
+
+    upload_azure_file(
+        'image.vhd',
+        'container1',
+        'image.vhdfixed.xz',
+        blob_service_client,
+        max_workers=2,
+        is_page_blob=True,
+        job_id='1'
+    )
+
+    mock_get_blob_client.assert_called_with(
+        blob_service_client, 'image.vhd', 'container1'
+    )
+    mock_open_throttled.assert_called_with(
+        'image.vhdfixed.xz', '1', opener=lzma.LZMAFile
+    )
+    blob_client.upload_blob.assert_called_with(
+        image_stream,
+        blob_type='PageBlob',
+        length=1024,
+        max_concurrency=2,
+        metadata=None
+    )
+
+    # Uncompressed block blob, all attempts fail
+    blob_client.upload_blob.side_effect = Exception('Timeout')
+
+    with raises(AzureImgUtilsStorageException):
+        upload_azure_file(
+            'image.vhd',
+            'container1',
+            'image.vhdfixed.xz',
+            blob_service_client,
+            max_retry_attempts=2,
+            expand_image=False
+        )
+
+    mock_open_throttled.assert_called_with(
+        'image.vhdfixed.xz', None, opener=open
+    )
+    assert blob_client.upload_blob.call_args[1]['blob_type'] == 'BlockBlob'
+
+
+class TestAzureImageUpload(object):
+
+    def setup_method(self):
+        self.azure_image = AzureImage(
+            container='container1',
+            storage_account='sa1',
+            resource_group='rg1'
+        )
+        self.azure_image._blob_service_client = Mock()
+        self.azure_image.image_blob_exists = Mock(return_value=False)
+        self.azure_image.delete_storage_blob = Mock()
+
+    @patch('mash.utils.azure.add_azure_profiler_policy')
+    @patch('mash.utils.azure.upload_azure_file')
+    def test_upload_image_blob(self, mock_upload_azure_file, mock_policy):
+        blob_name = self.azure_image.upload_image_blob(
+            '/images/image.vhdfixed.xz',
+            max_workers=4,
+            max_retry_attempts=3,
+            job_id='1'
+        )
+
+        assert blob_name == 'image.vhdfixed.xz'
+        mock_upload_azure_file.assert_called_once_with(
+            'image.vhdfixed.xz',
+            'container1',
+            '/images/image.vhdfixed.xz',
+            mock_policy.return_value,
+            is_page_blob=True,
+            expand_image=True,
+            job_id='1',
+            metadata=None,
+            max_workers=4,
+            max_retry_attempts=3
+        )
+
+        # Existing blob is replaced
+        self.azure_image.image_blob_exists.return_value = True
+        self.azure_image.upload_image_blob(
+            'image.vhdfixed.xz',
+            blob_name='image.vhd',
+            force_replace_image=True
+        )
+
+        self.azure_image.delete_storage_blob.assert_called_once_with(
+            'image.vhd'
+        )
+
+        with raises(AzureImgUtilsException):
+            self.azure_image.upload_image_blob(
+                'image.vhdfixed.xz', blob_name='image.vhd'
+            )
+
+        # Image file not found
+        self.azure_image.image_blob_exists.return_value = False
+        mock_upload_azure_file.side_effect = FileNotFoundError
+
+        with raises(AzureImgUtilsException):
+            self.azure_image.upload_image_blob('image.vhdfixed.xz')
+
+
+class TestAzureImageBlobCopy(object):
+
+    def setup_method(self):
+        policy_patch = patch(
+            'mash.utils.azure.add_azure_profiler_policy',
+            side_effect=lambda client: client
+        )
+        policy_patch.start()
+        self.policy_patch = policy_patch
+
+        self.blob_client = Mock()
+        self.blob_client.start_copy_from_url.return_value = {
+            'copy_id': 'copy1'
+        }
+        self.blob_service_client = Mock()
+        self.blob_service_client.get_blob_client.return_value = \
+            self.blob_client
+        self.blob_service_client.credential.account_key = 'a2V5'
+
+        self.azure_image = AzureImage(
+            container='container1',
+            storage_account='sa1',
+            resource_group='rg1'
+        )
+        self.azure_image._blob_service_client = self.blob_service_client
+
+    def teardown_method(self):
+        self.policy_patch.stop()
+
+    def get_copy(self, status, description=None):
+        return Mock(
+            copy=Mock(status=status, status_description=description)
+        )
+
+    def test_find_blob_by_digest(self):
+        blobs = []
+
+        for name, metadata in (
+            ('other.vhd', None),
+            ('old.vhd', {'mash_image_sha256': 'abc'}),
+            ('new.vhd', {'mash_image_sha256': 'abc'})
+        ):
+            blob = Mock(metadata=metadata)
+            blob.name = name
+            blobs.append(blob)
+
+        container_client = \
+            self.blob_service_client.get_container_client.return_value
+        container_client.list_blobs.return_value = blobs
+
+        assert self.azure_image.find_blob_by_digest('abc') == 'old.vhd'
+        assert self.azure_image.find_blob_by_digest(
+            'abc', blob_name='new.vhd'
+        ) == 'new.vhd'
+        assert self.azure_image.find_blob_by_digest('def') is None
+        self.blob_service_client.get_container_client.assert_called_with(
+            'container1'
+        )
+        container_client.list_blobs.assert_called_with(include=['metadata'])
+
+    def test_get_blob_sas_url(self):
+        url = self.azure_image.get_blob_sas_url('image.vhd')
+
+        assert url.startswith(
+            'https://sa1.blob.core.windows.net/container1/image.vhd?'
+        )
+        assert 'sp=r' in url
+        assert 'sr=b' in url
+
+    @patch('mash.utils.azure.time')
+    @patch.object(AzureImage, 'delete_storage_blob')
+    @patch.object(AzureImage, 'image_blob_exists')
+    def test_copy_image_blob(self, mock_exists, mock_delete, mock_time):
+        mock_exists.return_value = True
+        mock_time.monotonic.return_value = 0
+        self.blob_client.get_blob_properties.side_effect = [
+            self.get_copy('pending'),
+            self.get_copy('success')
+        ]
+
+        assert self.azure_image.copy_image_blob(
+            'https://source', 'image.vhd', force_replace_image=True
+        ) == 'image.vhd'
+
+        mock_delete.assert_called_once_with('image.vhd')
+        self.blob_service_client.get_blob_client.assert_called_once_with(
+            'container1', 'image.vhd'
+        )
+        self.blob_client.start_copy_from_url.assert_called_once_with(
+            'https://source'
+        )
+        mock_time.sleep.assert_called_once_with(10)
+
+        # Blob exists
+        with raises(AzureImgUtilsException):
+            self.azure_image.copy_image_blob('https://source', 'image.vhd')
+
+    @patch('mash.utils.azure.time')
+    @patch.object(AzureImage, 'delete_storage_blob')
+    @patch.object(AzureImage, 'image_blob_exists')
+    def test_copy_image_blob_failed(
+        self, mock_exists, mock_delete, mock_time
+    ):
+        mock_exists.return_value = False
+        mock_time.monotonic.side_effect = [0, 0, 3601]
+        self.blob_client.get_blob_properties.side_effect = [
+            self.get_copy('failed', '403 AuthorizationFailure'),
+            self.get_copy('pending'),
+            self.get_copy('pending')
+        ]
+
+        with raises(AzureImgUtilsException) as error:
+            self.azure_image.copy_image_blob('https://source', 'image.vhd')
+
+        assert str(error.value) == \
+            'Copy of blob image.vhd failed: 403 AuthorizationFailure'
+        mock_delete.assert_called_once_with('image.vhd')
+
+        # Timeout
+        with raises(AzureImgUtilsException) as error:
+            self.azure_image.copy_image_blob('https://source', 'image.vhd')
+
+        assert 'did not finish within 3600 seconds' in str(error.value)
+        self.blob_client.abort_copy.assert_called_once_with('copy1')
+        assert mock_delete.call_count == 2
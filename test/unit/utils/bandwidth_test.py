@@ -0,0 +1,279 @@
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, Mock
+
+from mash.utils.bandwidth import (
+    DOWNLOAD,
+    UPLOAD,
+    BandwidthBucket,
+    BandwidthScheduler,
+    ThrottledReader,
+    WeightedBandwidthBucket,
+    bandwidth_bytes,
+    open_throttled
+)
+
+
+class FakeBucket(object):
+    def __init__(self):
+        self.blocked = True
+        self.consumed = []
+
+    def get_wait(self, now, direction):
+        return 0.01 if self.blocked else 0
+
+    def consume(self, size, now, direction):
+        self.consumed.append(size)
+
+
+class TestBandwidthBucket(object):
+
+    def test_bucket(self):
+        bucket = BandwidthBucket(100)
+        now = time.monotonic()
+
+        assert bucket.get_wait(now=now) == 0
+        bucket.consume(150, now=now)
+        assert bucket.get_wait(now=now) == 0.5
+        assert bucket.get_wait(now=now + 0.5) == 0
+
+        # The bucket holds at most burst seconds of tokens
+        assert bucket.get_wait(now=now + 100) == 0
+        bucket.consume(200, now=now + 100)
+        assert bucket.get_wait(now=now + 100) == 1
+
+    def test_shared_bucket(self):
+        with TemporaryDirectory() as test_dir:
+            state_file = os.path.join(test_dir, 'upload.bucket')
+            bucket = BandwidthBucket(100, state_file=state_file)
+            other = BandwidthBucket(100, state_file=state_file)
+
+            bucket.consume(150, now=0)
+            assert other.get_wait(now=0) == 0.5
+
+            with open(state_file) as state:
+                assert json.load(state) == {'tokens': -50, 'updated': 0}
+
+            with open(state_file, 'w') as state:
+                state.write('invalid')
+
+            assert other.get_wait(now=1) == 0
+
+
+class TestWeightedBandwidthBucket(object):
+
+    def test_bucket(self):
+        bucket = WeightedBandwidthBucket(300, weights={'download': 2})
+
+        # A single direction gets the whole rate
+        bucket.consume(300, now=0, direction=UPLOAD)
+        assert bucket.get_wait(now=0, direction=UPLOAD) == 1
+
+        # Active directions share the rate by weight
+        bucket.consume(300, now=0, direction=DOWNLOAD)
+        assert bucket.get_wait(now=0, direction=UPLOAD) == 3
+        assert bucket.get_wait(now=0, direction=DOWNLOAD) == 1.5
+        assert bucket.get_wait(now=1.5, direction=DOWNLOAD) == 0
+        assert bucket.get_wait(now=2, direction=UPLOAD) == 1
+
+        # The share of an idle direction goes to the others
+        assert bucket.get_wait(now=2.6, direction=UPLOAD) == 0
+        assert list(bucket._state['tokens']) == [UPLOAD]
+
+    def test_shared_bucket(self):
+        with TemporaryDirectory() as test_dir:
+            state_file = os.path.join(test_dir, 'total.bucket')
+            weights = {'download': 2}
+            upload = WeightedBandwidthBucket(
+                300, weights=weights, state_file=state_file
+            )
+            download = WeightedBandwidthBucket(
+                300, weights=weights, state_file=state_file
+            )
+
+            upload.consume(300, now=0, direction=UPLOAD)
+            download.consume(300, now=0, direction=DOWNLOAD)
+            assert upload.get_wait(now=0, direction=UPLOAD) == 3
+
+            with open(state_file) as state:
+                assert json.load(state)['tokens'] == {
+                    UPLOAD: -300, DOWNLOAD: -300
+                }
+
+
+def transfer(state_dir, direction, duration, results):
+    scheduler = BandwidthScheduler()
+    scheduler.configure(
+        limits={'total': 200000},
+        weights={'upload': 1, 'download': 2},
+        state_dir=state_dir
+    )
+    transferred = 0
+    end = time.monotonic() + duration
+
+    while time.monotonic() < end:
+        scheduler.request(2000, direction, direction)
+        transferred += 2000
+
+    results.put((direction, transferred))
+
+
+def test_weights_between_processes():
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+
+    with TemporaryDirectory() as test_dir:
+        processes = [
+            context.Process(
+                target=transfer,
+                args=(test_dir, direction, 1.5, results)
+            )
+            for direction in (UPLOAD, DOWNLOAD)
+        ]
+
+        for process in processes:
+            process.start()
+
+        transferred = dict(results.get(timeout=30) for _ in processes)
+
+        for process in processes:
+            process.join()
+
+    # Downloads get twice the share of uploads of the other service
+    ratio = transferred[DOWNLOAD] / transferred[UPLOAD]
+    assert 1.5 < ratio < 2.5
+
+
+class TestBandwidthScheduler(object):
+
+    def setup_method(self):
+        self.scheduler = BandwidthScheduler()
+
+    def test_unlimited(self):
+        count = bandwidth_bytes.get_value(direction=UPLOAD)
+
+        assert self.scheduler.request(0) == 0
+        assert self.scheduler.request(100, '1') == 0
+        assert bandwidth_bytes.get_value(direction=UPLOAD) == count + 100
+
+    def test_request(self):
+        self.scheduler.configure(limits={'upload': 1000, 'total': 0})
+
+        assert self.scheduler.limits == {'upload': 1000}
+        assert self.scheduler.request(1100, '1') < 0.1
+        assert self.scheduler.request(10, '1', DOWNLOAD) == 0
+        assert self.scheduler.request(10, '2') >= 0.1
+
+    def test_weighted_fair_queuing(self):
+        self.scheduler.configure(
+            limits={'upload': 1000, 'download': 1000},
+            weights={'download': 2}
+        )
+        bucket = FakeBucket()
+        self.scheduler._buckets = {'upload': bucket, 'download': bucket}
+
+        def request(size, job_id, direction=UPLOAD):
+            thread = threading.Thread(
+                target=self.scheduler.request,
+                args=(size, job_id, direction)
+            )
+            thread.start()
+
+            while len(self.scheduler._queue) < len(threads) + 1:
+                time.sleep(0.001)
+
+            threads.append(thread)
+
+        threads = []
+        request(1000, 'a')
+        request(999, 'a')
+        request(500, 'b')
+        request(1200, 'c', DOWNLOAD)
+        bucket.blocked = False
+
+        for thread in threads:
+            thread.join()
+
+        # Finish tags 1000, 1999, 500 and 600
+        assert bucket.consumed == [500, 1200, 1000, 999]
+        assert self.scheduler._queue == []
+        assert self.scheduler._flows == {('a', UPLOAD): 1999}
+
+    def test_live_limits(self):
+        with TemporaryDirectory() as test_dir:
+            state_dir = os.path.join(test_dir, 'bandwidth')
+            self.scheduler.configure(
+                limits={'upload': 1000},
+                state_dir=state_dir,
+                check_interval=0
+            )
+            limits_file = os.path.join(state_dir, 'limits.json')
+            assert self.scheduler.limits_file == limits_file
+
+            # No limits file, the configured limits apply
+            self.scheduler.request(10, '1')
+            assert self.scheduler.limits == {'upload': 1000}
+
+            self.scheduler.set_limits({'download': 500}, {'download': 3})
+            os.utime(limits_file, (1, 1))
+            self.scheduler.request(10, '1')
+
+            assert self.scheduler.limits == {'download': 500}
+            assert self.scheduler.weights == {'download': 3}
+            assert self.scheduler._buckets['download'].state_file == \
+                os.path.join(state_dir, 'download.bucket')
+
+            # Invalid files are ignored
+            with open(limits_file, 'w') as limits:
+                limits.write('invalid')
+            os.utime(limits_file, (2, 2))
+            self.scheduler.request(10, '1')
+            assert self.scheduler.limits == {'download': 500}
+
+            # Without the file the configured limits apply again
+            os.remove(limits_file)
+            self.scheduler.request(10, '1')
+            assert self.scheduler.limits == {'upload': 1000}
+
+            # Checks are limited to the interval
+            self.scheduler.check_interval = 60
+            self.scheduler.set_limits({'upload': 2000})
+            self.scheduler.request(10, '1')
+            assert self.scheduler.limits == {'upload': 1000}
+
+    def test_set_limits_local(self):
+        self.scheduler.configure(limits={'upload': 1000})
+        self.scheduler.set_limits({'total': 2000})
+
+        assert self.scheduler.limits == {'total': 2000}
+        assert self.scheduler.limits_file is None
+
+
+def test_throttled_reader():
+    scheduler = Mock()
+    image = MagicMock()
+    image.read.return_value = b'data'
+
+    with ThrottledReader(image, '1', scheduler=scheduler) as reader:
+        assert reader.read(4) == b'data'
+        assert reader.tell() == image.tell.return_value
+
+    scheduler.request.assert_called_once_with(4, '1', UPLOAD)
+    image.close.assert_called_once_with()
+
+
+def test_open_throttled():
+    with TemporaryDirectory() as test_dir:
+        image_file = os.path.join(test_dir, 'image.raw')
+
+        with open(image_file, 'wb') as image:
+            image.write(b'0123456789')
+
+        with open_throttled(image_file, '1') as image:
+            assert image.read(4) == b'0123'
+            assert image.read() == b'456789'
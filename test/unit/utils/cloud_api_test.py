@@ -0,0 +1,550 @@
+import json
+
+from pytest import raises
+from unittest.mock import Mock, patch
+
+from botocore import handlers
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpMockSequence
+
+from mash.utils.cloud_api import (
+    AzureApiProfilerPolicy,
+    CloudApiProfiler,
+    CountingHttp,
+    ProfiledHttpRequest,
+    add_azure_profiler_policy,
+    api_account,
+    boto_after_call,
+    boto_after_call_error,
+    boto_before_call,
+    boto_request_created,
+    boto_response_received,
+    cloud_api_retries,
+    cloud_api_throttled,
+    finish_api_call,
+    get_account,
+    get_azure_operation,
+    get_gce_reason,
+    get_profiler,
+    get_user,
+    is_throttling_error,
+    profile_api_calls,
+    register_boto_handlers,
+    start_api_call
+)
+from mash.utils.metrics import cloud_api_duration, cloud_api_errors
+from mash.utils.rate_limiter import RateLimiter
+
+
+def test_is_throttling_error():
+    assert is_throttling_error('RequestLimitExceeded')
+    assert is_throttling_error('rateLimitExceeded')
+    assert is_throttling_error('429')
+    assert not is_throttling_error('InvalidAMIID.NotFound')
+    assert not is_throttling_error(None)
+
+
+def test_profile_api_calls():
+    profiler = CloudApiProfiler()
+
+    with profile_api_calls(profiler, 'acnt1', 'user1'):
+        assert get_profiler() == profiler
+        assert get_account() == 'acnt1'
+        assert get_user() == 'user1'
+
+        with api_account('acnt2'):
+            assert get_account() == 'acnt2'
+            assert get_user() == 'user1'
+
+        with api_account('acnt3', user='user2'):
+            assert get_account() == 'acnt3'
+            assert get_user() == 'user2'
+
+        assert get_account() == 'acnt1'
+        assert get_user() == 'user1'
+
+    assert get_profiler() is None
+    assert get_account() is None
+    assert get_user() is None
+
+
+class TestCloudApiProfiler(object):
+
+    def setup_method(self):
+        self.log = Mock()
+        self.profiler = CloudApiProfiler(
+            log_callback=self.log,
+            rate_limits={'ec2': 2},
+            window=1
+        )
+
+    def test_record_call(self):
+        self.profiler.record_call(
+            'ec2', 'DescribeImages', 0.25, region='us-east-1'
+        )
+        self.profiler.record_call(
+            'ec2', 'CopyImage', 1.5, retries=2, region='us-east-1'
+        )
+
+        with api_account('acnt1'):
+            self.profiler.record_call(
+                'gce', 'compute.images.get', 0.5, error='notFound'
+            )
+
+        summary = self.profiler.get_summary(max_operations=2)
+
+        assert summary['calls'] == 3
+        assert summary['errors'] == 1
+        assert summary['retries'] == 2
+        assert summary['throttled'] == 0
+        assert summary['duration'] == 2.25
+        assert summary['accounts'][0] == {
+            'cloud': 'ec2',
+            'account': None,
+            'region': 'us-east-1',
+            'calls': 2,
+            'errors': 0,
+            'retries': 2,
+            'throttled': 0,
+            'duration': 1.75,
+            'max_duration': 1.5,
+            'max_rate': 2
+        }
+        assert summary['accounts'][1]['account'] == 'acnt1'
+        assert [item['operation'] for item in summary['operations']] == [
+            'CopyImage', 'compute.images.get'
+        ]
+
+    def test_warnings(self):
+        # The second call reaches 80% of the rate limit
+        self.profiler.record_call('ec2', 'DescribeImages', 0.1)
+        assert not self.log.warning.called
+
+        self.profiler.record_call(
+            'ec2', 'DescribeImages', 0.1, error='RequestLimitExceeded'
+        )
+        self.profiler.record_call(
+            'ec2', 'DescribeImages', 0.1, error='RequestLimitExceeded'
+        )
+
+        # Each warning is logged once per window
+        assert self.log.warning.call_count == 2
+        assert self.log.warning.call_args_list[0][0][0] == \
+            'API rate limit warning for ec2 account unknown: ' \
+            'DescribeImages was throttled: RequestLimitExceeded.'
+        assert 'call rate is 2.0/s of a 2/s limit' in \
+            self.log.warning.call_args_list[1][0][0]
+        assert self.profiler.get_summary()['throttled'] == 2
+
+    @patch('mash.utils.cloud_api.time')
+    def test_rate_window(self, mock_time):
+        mock_time.monotonic.side_effect = [0, 0.5, 2]
+
+        self.profiler.record_call('ec2', 'DescribeImages', 0.1)
+        self.profiler.record_call('ec2', 'DescribeImages', 0.1)
+        self.profiler.record_call('ec2', 'DescribeImages', 0.1)
+
+        # Calls older than the window are dropped from the rate
+        assert list(self.profiler._calls[('ec2', None, None)]) == [2]
+        assert self.log.warning.call_count == 1
+
+    def test_no_log_callback(self):
+        profiler = CloudApiProfiler()
+        profiler.record_call('gce', 'compute.images.get', 0.1, error='429')
+
+        assert profiler.get_summary()['throttled'] == 1
+
+
+@patch('mash.utils.cloud_api.tracer')
+def test_api_call(mock_tracer):
+    span = Mock()
+    mock_tracer.start_span.return_value = span
+    profiler = CloudApiProfiler()
+
+    call = start_api_call('ec2', 'ApiCallTest', region='eu-west-1')
+
+    with profile_api_calls(profiler):
+        finish_api_call(
+            call, error='RequestLimitExceeded', retries=3, status_code=503
+        )
+
+    assert mock_tracer.start_span.call_args[0][0] == 'ec2 ApiCallTest'
+    span.set_error.assert_called_once_with('RequestLimitExceeded')
+    span.end.assert_called_once_with()
+    assert cloud_api_duration.get_value(
+        cloud='ec2', operation='ApiCallTest'
+    ) == 1
+    assert cloud_api_errors.get_value(
+        cloud='ec2', operation='ApiCallTest', error='RequestLimitExceeded'
+    ) == 1
+    assert cloud_api_retries.get_value(
+        cloud='ec2', operation='ApiCallTest'
+    ) == 3
+    assert cloud_api_throttled.get_value(
+        cloud='ec2', operation='ApiCallTest'
+    ) == 1
+    assert profiler.get_summary()['accounts'][0]['region'] == 'eu-west-1'
+
+    # Without an active profiler only metrics are recorded
+    finish_api_call(start_api_call('ec2', 'ApiCallTest'))
+    assert cloud_api_duration.get_value(
+        cloud='ec2', operation='ApiCallTest'
+    ) == 2
+
+
+class TestBotoHandlers(object):
+
+    def setup_method(self):
+        self.model = Mock()
+        self.model.name = 'BotoCallTest'
+        self.model.service_model.service_name = 'ec2'
+        self.signer = Mock(region_name='us-east-1')
+
+    @patch('mash.utils.cloud_api.finish_api_call')
+    def test_after_call(self, mock_finish_api_call):
+        context = {}
+        boto_before_call(self.model, context, request_signer=self.signer)
+        call = context['mash_api_call']
+
+        assert call['cloud'] == 'ec2'
+        assert call['operation'] == 'BotoCallTest'
+        assert call['region'] == 'us-east-1'
+
+        # Calls are labelled with the service of the client
+        ebs_model = Mock()
+        ebs_model.service_model.service_name = 'ebs'
+        ebs_context = {}
+        boto_before_call(ebs_model, ebs_context, request_signer=self.signer)
+        assert ebs_context['mash_api_call']['cloud'] == 'ebs'
+
+        boto_after_call(
+            Mock(status_code=400),
+            {
+                'Error': {'Code': 'RequestLimitExceeded'},
+                'ResponseMetadata': {'RetryAttempts': 4}
+            },
+            context
+        )
+        mock_finish_api_call.assert_called_once_with(
+            call,
+            error='RequestLimitExceeded',
+            retries=4,
+            status_code=400
+        )
+
+        # No call was started
+        boto_after_call(Mock(status_code=200), {}, context)
+        assert mock_finish_api_call.call_count == 1
+
+    @patch('mash.utils.cloud_api.finish_api_call')
+    def test_after_call_success(self, mock_finish_api_call):
+        context = {}
+        boto_before_call(self.model, context)
+        call = context['mash_api_call']
+
+        boto_after_call(Mock(status_code=200), {}, context)
+
+        assert call['region'] is None
+        mock_finish_api_call.assert_called_once_with(
+            call, error=None, retries=0, status_code=200
+        )
+
+    @patch('mash.utils.cloud_api.finish_api_call')
+    def test_after_call_error(self, mock_finish_api_call):
+        context = {}
+        boto_before_call(self.model, context, request_signer=self.signer)
+        call = context['mash_api_call']
+
+        boto_after_call_error(ConnectionError('reset'), context)
+        boto_after_call_error(ConnectionError('reset'), context)
+
+        mock_finish_api_call.assert_called_once_with(
+            call, error='ConnectionError'
+        )
+
+    @patch('mash.utils.cloud_api.rate_limiter')
+    def test_rate_limiter(self, mock_rate_limiter):
+        context = {}
+        boto_before_call(self.model, context, request_signer=self.signer)
+
+        with api_account('acnt1', user='user1'):
+            boto_request_created(
+                Mock(context=context), 'BotoCallTest'
+            )
+            boto_response_received(
+                {'Error': {'Code': 'RequestLimitExceeded'}}, context
+            )
+
+        mock_rate_limiter.acquire.assert_called_once_with(
+            'ec2',
+            'BotoCallTest',
+            account='acnt1',
+            region='us-east-1',
+            user='user1'
+        )
+        mock_rate_limiter.record.assert_called_once_with(
+            'ec2',
+            'BotoCallTest',
+            throttled=True,
+            account='acnt1',
+            region='us-east-1',
+            user='user1'
+        )
+
+        # Failed requests and calls not started are not recorded
+        boto_response_received(None, context, exception=ConnectionError())
+        boto_request_created(Mock(context={}), 'BotoCallTest')
+        boto_response_received({}, {})
+        assert mock_rate_limiter.acquire.call_count == 1
+        assert mock_rate_limiter.record.call_count == 1
+
+        boto_response_received({}, context)
+        assert mock_rate_limiter.record.call_args[1]['throttled'] is False
+
+    def test_rate_limiter_per_account(self):
+        limiter = RateLimiter({'ec2': {'write': 10}})
+
+        with patch('mash.utils.cloud_api.rate_limiter', limiter):
+            for user, account, response in (
+                ('user1', 'acnt1', {'Error': {'Code': 'RequestLimitExceeded'}}),
+                ('user1', 'acnt2', {}),
+                ('user2', 'acnt1', {})
+            ):
+                context = {}
+                boto_before_call(
+                    self.model, context, request_signer=self.signer
+                )
+
+                with api_account(account, user=user):
+                    boto_request_created(
+                        Mock(context=context), 'BotoCallTest'
+                    )
+                    boto_response_received(response, context)
+
+        acnt1 = limiter.get_bucket(
+            'ec2', 'write', 'acnt1', 'us-east-1', 'user1'
+        )
+        acnt2 = limiter.get_bucket(
+            'ec2', 'write', 'acnt2', 'us-east-1', 'user1'
+        )
+        other_acnt1 = limiter.get_bucket(
+            'ec2', 'write', 'acnt1', 'us-east-1', 'user2'
+        )
+
+        # Throttling one account does not slow down the others, account
+        # names of different users are different accounts
+        assert len({id(acnt1), id(acnt2), id(other_acnt1)}) == 3
+        assert acnt1.rate == 5
+        assert acnt2.rate == 10
+        assert other_acnt1.rate == 10
+
+    def test_register_boto_handlers(self):
+        builtin_handlers = list(handlers.BUILTIN_HANDLERS)
+        specs = [
+            ('before-call', boto_before_call),
+            ('after-call', boto_after_call),
+            ('after-call-error', boto_after_call_error),
+            ('request-created.ec2', boto_request_created),
+            ('response-received.ec2', boto_response_received)
+        ]
+        handlers.BUILTIN_HANDLERS[:] = [
+            spec for spec in builtin_handlers if spec not in specs
+        ]
+        start = len(handlers.BUILTIN_HANDLERS)
+
+        try:
+            register_boto_handlers()
+            register_boto_handlers()
+
+            assert handlers.BUILTIN_HANDLERS[start:] == specs
+        finally:
+            handlers.BUILTIN_HANDLERS[:] = builtin_handlers
+
+
+@patch('mash.utils.cloud_api.rate_limiter')
+def test_counting_http(mock_rate_limiter):
+    http = Mock()
+    http.request.side_effect = [
+        (Mock(status=429), b''),
+        (Mock(status=200), b'{}')
+    ]
+    counting_http = CountingHttp(http, {'operation': 'compute.images.get'})
+
+    with api_account('acnt1', user='user1'):
+        counting_http.request('uri')
+        assert counting_http.request('uri')[1] == b'{}'
+
+    assert counting_http.requests == 2
+    assert counting_http.timeout == http.timeout
+    mock_rate_limiter.acquire.assert_called_with(
+        'gce', 'compute.images.get', account='acnt1', user='user1'
+    )
+    assert [
+        item[1]['throttled'] for item in mock_rate_limiter.record.call_args_list
+    ] == [True, False]
+
+
+def test_get_gce_reason():
+    content = {'error': {'errors': [{'reason': 'rateLimitExceeded'}]}}
+
+    assert get_gce_reason(200, b'{}') is None
+    assert get_gce_reason(403, json.dumps(content)) == 'rateLimitExceeded'
+    assert get_gce_reason(404, b'Not Found') == '404'
+
+
+class TestProfiledHttpRequest(object):
+
+    def get_request(self, responses):
+        request = ProfiledHttpRequest(
+            HttpMockSequence(responses),
+            lambda response, content: json.loads(content),
+            'https://compute.googleapis.com/images/image1',
+            methodId='compute.images.get'
+        )
+        request._sleep = Mock()
+        return request
+
+    @patch('mash.utils.cloud_api.finish_api_call')
+    def test_execute(self, mock_finish_api_call):
+        request = self.get_request([
+            ({'status': '429'}, '{}'),
+            ({'status': '200'}, '{"name": "image1"}')
+        ])
+
+        assert request.execute(num_retries=1) == {'name': 'image1'}
+
+        call, kwargs = mock_finish_api_call.call_args
+        assert call[0]['operation'] == 'compute.images.get'
+        assert kwargs == {'error': None, 'retries': 1}
+
+    @patch('mash.utils.cloud_api.finish_api_call')
+    def test_execute_http_error(self, mock_finish_api_call):
+        content = {'error': {'errors': [{'reason': 'rateLimitExceeded'}]}}
+        request = self.get_request([
+            ({'status': '403'}, json.dumps(content))
+        ])
+
+        with raises(HttpError):
+            request.execute()
+
+        assert mock_finish_api_call.call_args[1] == {
+            'error': 'rateLimitExceeded', 'retries': 0
+        }
+
+        request = self.get_request([({'status': '404'}, 'Not Found')])
+
+        with raises(HttpError):
+            request.execute()
+
+        assert mock_finish_api_call.call_args[1]['error'] == '404'
+
+    @patch('mash.utils.cloud_api.finish_api_call')
+    def test_execute_exception(self, mock_finish_api_call):
+        http = Mock()
+        http.request.side_effect = ValueError('Broken')
+        request = self.get_request([])
+
+        with raises(ValueError):
+            request.execute(http=http)
+
+        assert mock_finish_api_call.call_args[1] == {
+            'error': 'ValueError', 'retries': 0
+        }
+
+
+def test_get_azure_operation():
+    def get_request(url, method='GET'):
+        return Mock(url=url, method=method)
+
+    assert get_azure_operation(get_request(
+        'https://management.azure.com/subscriptions/123/resourceGroups/'
+        'rg1/providers/Microsoft.Compute/galleries/gallery1/images/image1/'
+        'versions/1.0.0?api-version=2022-03-03',
+        'PUT'
+    )) == 'PUT Microsoft.Compute/galleries/images/versions'
+    assert get_azure_operation(get_request(
+        'https://sa1.blob.core.windows.net/images/image1.vhd?comp=block'
+    )) == 'GET blob'
+    assert get_azure_operation(get_request(
+        'https://login.microsoftonline.com/tenant/oauth2/token', 'POST'
+    )) == 'POST token'
+    assert get_azure_operation(get_request('https://example.com')) == \
+        'GET example.com'
+
+
+class TestAzureApiProfilerPolicy(object):
+
+    def setup_method(self):
+        self.policy = AzureApiProfilerPolicy()
+        self.policy.next = Mock()
+        self.request = Mock()
+        self.request.http_request.url = 'https://sa1.blob.core.windows.net/c'
+        self.request.http_request.method = 'PUT'
+        self.request.context = {'retry_count': 2}
+
+    @patch('mash.utils.cloud_api.rate_limiter')
+    @patch('mash.utils.cloud_api.finish_api_call')
+    def test_send(self, mock_finish_api_call, mock_rate_limiter):
+        response = Mock()
+        response.http_response.status_code = 503
+        response.http_response.headers = {'x-ms-error-code': 'ServerBusy'}
+        self.policy.next.send.return_value = response
+
+        assert self.policy.send(self.request) == response
+
+        call, kwargs = mock_finish_api_call.call_args
+        assert call[0]['operation'] == 'PUT blob'
+        assert kwargs == {
+            'error': 'ServerBusy', 'retries': 2, 'status_code': 503
+        }
+
+        response.http_response.status_code = 429
+        response.http_response.headers = {}
+
+        with api_account('acnt1'):
+            self.policy.send(self.request)
+
+        assert mock_finish_api_call.call_args[1]['error'] == '429'
+        mock_rate_limiter.acquire.assert_called_with(
+            'azure', 'PUT blob', account='acnt1', user=None
+        )
+        mock_rate_limiter.record.assert_called_with(
+            'azure', 'PUT blob', throttled=True, account='acnt1', user=None
+        )
+
+        response.http_response.status_code = 200
+        self.policy.send(self.request)
+        assert mock_finish_api_call.call_args[1]['error'] is None
+
+    @patch('mash.utils.cloud_api.finish_api_call')
+    def test_send_exception(self, mock_finish_api_call):
+        self.policy.next.send.side_effect = ConnectionError('reset')
+
+        with raises(ConnectionError):
+            self.policy.send(self.request)
+
+        assert mock_finish_api_call.call_args[1] == {
+            'error': 'ConnectionError', 'retries': 2
+        }
+
+
+def test_add_azure_profiler_policy():
+    first = Mock()
+    client = Mock(spec=['_client'])
+    client._client._pipeline._impl_policies = [first]
+
+    assert add_azure_profiler_policy(client) == client
+    add_azure_profiler_policy(client)
+
+    policies = client._client._pipeline._impl_policies
+    assert len(policies) == 2
+    assert isinstance(policies[0], AzureApiProfilerPolicy)
+    assert policies[0].next == first
+
+    # Storage clients have the pipeline on the client
+    client = Mock(spec=['_pipeline'])
+    client._pipeline._impl_policies = [first]
+    add_azure_profiler_policy(client)
+    assert isinstance(
+        client._pipeline._impl_policies[0], AzureApiProfilerPolicy
+    )
@@ -0,0 +1,128 @@
+import threading
+
+from unittest.mock import Mock
+
+from mash.utils.cloud_api import (
+    CloudApiProfiler,
+    get_account,
+    get_profiler,
+    get_user,
+    profile_api_calls
+)
+from mash.utils.concurrency import TaskExecutor, TaskResult
+from mash.utils.tracing import SpanContext, tracer
+
+TRACE_ID = '0af7651916cd43dd8448eb211c80319c'
+
+
+def test_task_result():
+    result = TaskResult('us-east-1', 'acnt1', None, ValueError(), 1.23456)
+
+    assert result.to_dict() == {
+        'name': 'us-east-1',
+        'account': 'acnt1',
+        'status': 'failed',
+        'duration': 1.235
+    }
+    assert TaskResult('us-east-1', None, 1, None, 0).to_dict()['status'] == \
+        'success'
+
+
+class TestTaskExecutor(object):
+
+    def test_run(self):
+        profiler = CloudApiProfiler()
+        context = SpanContext(TRACE_ID, 'b7ad6b7169203331')
+
+        def task(value):
+            if value == 'fail':
+                raise ValueError('Broken region')
+
+            return (
+                value,
+                get_profiler(),
+                get_account(),
+                get_user(),
+                tracer.get_current_context().trace_id
+            )
+
+        with profile_api_calls(profiler, 'acnt0', 'user1'), \
+                tracer.activate(context):
+            executor = TaskExecutor(max_workers=2)
+
+        executor.submit('us-east-1', task, 'a', account='acnt1')
+        executor.submit('us-east-2', task, value='b')
+        executor.submit('us-west-1', task, 'fail', account='acnt1')
+        results = executor.run()
+
+        assert [result.name for result in results] == [
+            'us-east-1', 'us-east-2', 'us-west-1'
+        ]
+        assert results[0].result == ('a', profiler, 'acnt1', 'user1', TRACE_ID)
+        assert results[1].result == ('b', profiler, 'acnt0', 'user1', TRACE_ID)
+        assert str(results[2].error) == 'Broken region'
+        assert results[2].result is None
+        assert executor.tasks == []
+        assert executor.run() == []
+
+    def test_max_account_workers(self):
+        lock = threading.Lock()
+        running = {'acnt1': 0, 'acnt2': 0}
+        max_running = dict(running)
+        barrier = threading.Barrier(2, timeout=5)
+
+        def task(account):
+            with lock:
+                running[account] += 1
+                max_running[account] = max(
+                    max_running[account], running[account]
+                )
+
+            if account == 'acnt2':
+                # Tasks of other accounts are not blocked
+                barrier.wait()
+
+            with lock:
+                running[account] -= 1
+
+        executor = TaskExecutor(max_workers=4, max_account_workers=1)
+        executor.submit('us-east-1', task, 'acnt1', account='acnt1')
+        executor.submit('us-east-2', task, 'acnt1', account='acnt1')
+        executor.submit('us-east-1', task, 'acnt2', account='acnt2')
+        executor.submit('us-east-2', task, 'acnt2', account='acnt2')
+
+        executor.max_account_workers = 2
+        executor._account_semaphores['acnt1'] = threading.BoundedSemaphore(1)
+        results = executor.run()
+
+        assert not any(result.error for result in results)
+        assert max_running == {'acnt1': 1, 'acnt2': 2}
+
+    def test_account_semaphore_released(self):
+        executor = TaskExecutor(max_account_workers=1)
+        executor.submit('us-east-1', Mock(side_effect=ValueError()), account='a')
+        executor.submit('us-east-2', Mock(return_value=1), account='a')
+
+        results = executor.run()
+
+        assert isinstance(results[0].error, ValueError)
+        assert results[1].result == 1
+
+    def test_cancel(self):
+        executor = TaskExecutor(max_workers=1)
+
+        def task():
+            executor.cancel()
+            return 'done'
+
+        executor.submit('image1', task)
+        executor.submit('image2', Mock())
+        results = executor.run()
+
+        assert results[0].result == 'done'
+        assert results[1].cancelled
+        assert results[1].to_dict()['status'] == 'cancelled'
+
+        # Cancellation is reset for the next run
+        executor.submit('image3', Mock(return_value=1))
+        assert executor.run()[0].result == 1
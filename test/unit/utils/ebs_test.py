@@ -0,0 +1,280 @@
+import base64
+import hashlib
+import lzma
+import os
+
+from pytest import raises
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
+
+from mash.mash_exceptions import MashUploadException
+from mash.utils.ebs import (
+    create_snapshot_from_image,
+    delete_snapshot,
+    get_volume_size,
+    get_xz_uncompressed_size,
+    is_zero_block,
+    open_image,
+    read_block,
+    register_image_from_snapshot
+)
+
+
+def get_checksum(data):
+    return base64.b64encode(hashlib.sha256(data).digest()).decode()
+
+
+def write_image(test_dir, name, data):
+    image_file = os.path.join(test_dir, name)
+
+    if name.endswith('.xz'):
+        with lzma.open(image_file, 'wb') as image:
+            image.write(data)
+    else:
+        with open(image_file, 'wb') as image:
+            image.write(data)
+
+    return image_file
+
+
+def test_open_image_and_get_volume_size():
+    with TemporaryDirectory() as test_dir:
+        raw_file = write_image(test_dir, 'image.raw', b'raw')
+        xz_file = write_image(test_dir, 'image.raw.xz', b'compressed')
+
+        with open_image(raw_file) as image:
+            assert image.read() == b'raw'
+
+        with open_image(xz_file) as image:
+            assert image.read() == b'compressed'
+
+        assert get_volume_size(raw_file) == 10
+        assert get_volume_size(xz_file, min_size=20) == 20
+
+        with patch('mash.utils.ebs.GIB', 2):
+            assert get_volume_size(raw_file, min_size=1) == 2
+            assert get_volume_size(xz_file, min_size=1) == 5
+
+
+def test_get_xz_uncompressed_size():
+    with TemporaryDirectory() as test_dir:
+        xz_file = os.path.join(test_dir, 'image.raw.xz')
+
+        # Concatenated streams with stream padding
+        with open(xz_file, 'wb') as image:
+            image.write(lzma.compress(b'a' * 1000))
+            image.write(b'\0' * 8)
+            image.write(lzma.compress(b'b' * 300))
+            image.write(b'\0' * 4)
+
+        assert get_xz_uncompressed_size(xz_file) == 1300
+
+        invalid_file = os.path.join(test_dir, 'invalid.raw.xz')
+
+        with open(invalid_file, 'wb') as image:
+            image.write(b'not an xz image')
+
+        with raises(MashUploadException) as error:
+            get_xz_uncompressed_size(invalid_file)
+
+        assert 'Unable to read the size of image' in str(error.value)
+
+        # Footer without index
+        with open(invalid_file, 'wb') as image:
+            image.write(b'\1' * 12 + lzma.compress(b'a')[-12:])
+
+        with raises(MashUploadException):
+            get_xz_uncompressed_size(invalid_file)
+
+
+def test_delete_snapshot():
+    ec2_client = Mock()
+    log_callback = Mock()
+
+    delete_snapshot(ec2_client, 'snap-123', log_callback)
+    ec2_client.delete_snapshot.assert_called_once_with(SnapshotId='snap-123')
+
+    ec2_client.delete_snapshot.side_effect = Exception('Not found')
+    delete_snapshot(ec2_client, 'snap-123')
+    delete_snapshot(ec2_client, 'snap-123', log_callback)
+    log_callback.warning.assert_called_once_with(
+        'Unable to delete snapshot snap-123: Not found'
+    )
+
+
+def test_read_block():
+    image = Mock()
+    image.read.side_effect = [b'ab', b'c', b'', b'']
+
+    assert read_block(image, 4) == b'abc\0'
+    assert read_block(image, 4) is None
+    assert is_zero_block(b'\0\0')
+    assert not is_zero_block(b'\0a')
+
+
+class TestCreateSnapshotFromImage(object):
+
+    def setup_method(self):
+        self.ebs_client = Mock()
+        self.ebs_client.start_snapshot.return_value = {
+            'SnapshotId': 'snap-123',
+            'BlockSize': 4
+        }
+        self.log_callback = Mock()
+
+    def test_create_snapshot(self):
+        with TemporaryDirectory() as test_dir:
+            image_file = write_image(
+                test_dir, 'image.raw.xz', b'abcd\0\0\0\0ef'
+            )
+
+            snapshot_id = create_snapshot_from_image(
+                self.ebs_client,
+                image_file,
+                'description',
+                max_workers=2,
+                log_callback=self.log_callback
+            )
+
+        assert snapshot_id == 'snap-123'
+        self.ebs_client.start_snapshot.assert_called_once_with(
+            VolumeSize=10,
+            Description='description'
+        )
+
+        # The zero block is skipped and the last block is padded
+        calls = sorted(
+            self.ebs_client.put_snapshot_block.call_args_list,
+            key=lambda call: call[1]['BlockIndex']
+        )
+        assert [call[1]['BlockIndex'] for call in calls] == [0, 2]
+        assert calls[1][1]['BlockData'] == b'ef\0\0'
+        assert calls[1][1]['Checksum'] == get_checksum(b'ef\0\0')
+        assert calls[1][1]['DataLength'] == 4
+
+        digests = [hashlib.sha256(b'abcd'), hashlib.sha256(b'ef\0\0')]
+        checksum = hashlib.sha256(
+            b''.join(digest.digest() for digest in digests)
+        ).digest()
+        self.ebs_client.complete_snapshot.assert_called_once_with(
+            SnapshotId='snap-123',
+            ChangedBlocksCount=2,
+            Checksum=base64.b64encode(checksum).decode(),
+            ChecksumAlgorithm='SHA256',
+            ChecksumAggregationMethod='LINEAR'
+        )
+        self.log_callback.info.assert_called_once_with(
+            'Wrote 2 of 3 blocks of image to snapshot snap-123.'
+        )
+
+    @patch('mash.utils.ebs.GIB', 8)
+    def test_create_snapshot_image_too_large(self):
+        ec2_client = Mock()
+
+        with TemporaryDirectory() as test_dir:
+            image_file = write_image(test_dir, 'image.raw.xz', b'a' * 12)
+
+            with raises(MashUploadException) as error:
+                create_snapshot_from_image(
+                    self.ebs_client, image_file, 'description',
+                    volume_size=1, ec2_client=ec2_client
+                )
+
+            assert 'does not fit in a volume of 1 GiB' in str(error.value)
+            assert not self.ebs_client.start_snapshot.called
+
+            # Image larger than the size in the xz index
+            with patch('mash.utils.ebs.get_image_size') as mock_size:
+                mock_size.return_value = 8
+
+                with raises(MashUploadException) as error:
+                    create_snapshot_from_image(
+                        self.ebs_client, image_file, 'description',
+                        volume_size=1, ec2_client=ec2_client
+                    )
+
+        assert 'does not fit in a volume of 1 GiB' in str(error.value)
+        assert not self.ebs_client.complete_snapshot.called
+        ec2_client.delete_snapshot.assert_called_once_with(
+            SnapshotId='snap-123'
+        )
+
+    def test_create_snapshot_put_block_failed(self):
+        self.ebs_client.put_snapshot_block.side_effect = Exception('Broken')
+
+        with TemporaryDirectory() as test_dir:
+            image_file = write_image(test_dir, 'image.raw', b'a' * 40)
+
+            with raises(Exception) as error:
+                create_snapshot_from_image(
+                    self.ebs_client, image_file, 'description', max_workers=1
+                )
+
+        assert str(error.value) == 'Broken'
+        assert not self.ebs_client.complete_snapshot.called
+
+    def test_create_snapshot_complete_failed(self):
+        self.ebs_client.complete_snapshot.side_effect = Exception('Broken')
+        ec2_client = Mock()
+
+        with TemporaryDirectory() as test_dir:
+            image_file = write_image(test_dir, 'image.raw', b'a' * 8)
+
+            with raises(Exception) as error:
+                create_snapshot_from_image(
+                    self.ebs_client, image_file, 'description',
+                    log_callback=self.log_callback, ec2_client=ec2_client
+                )
+
+        assert str(error.value) == 'Broken'
+        ec2_client.delete_snapshot.assert_called_once_with(
+            SnapshotId='snap-123'
+        )
+        assert not self.log_callback.info.called
+
+
+def test_register_image_from_snapshot():
+    ec2_client = Mock()
+    ec2_client.register_image.return_value = {'ImageId': 'ami-123'}
+
+    assert register_image_from_snapshot(
+        ec2_client,
+        'snap-123',
+        'image',
+        'description',
+        arch='arm64',
+        boot_mode='uefi',
+        tpm_support='v2.0',
+        billing_codes='bp-1,bp-2'
+    ) == 'ami-123'
+
+    ec2_client.get_waiter.assert_called_once_with('snapshot_completed')
+    ec2_client.get_waiter.return_value.wait.assert_called_once_with(
+        SnapshotIds=['snap-123']
+    )
+    ec2_client.register_image.assert_called_once_with(
+        Name='image',
+        Description='description',
+        Architecture='arm64',
+        RootDeviceName='/dev/sda1',
+        BlockDeviceMappings=[{
+            'DeviceName': '/dev/sda1',
+            'Ebs': {
+                'SnapshotId': 'snap-123',
+                'VolumeType': 'gp3',
+                'DeleteOnTermination': True
+            }
+        }],
+        VirtualizationType='hvm',
+        EnaSupport=True,
+        SriovNetSupport='simple',
+        BootMode='uefi',
+        TpmSupport='v2.0',
+        BillingProducts=['bp-1', 'bp-2']
+    )
+
+    register_image_from_snapshot(ec2_client, 'snap-123', 'image', 'desc')
+    kwargs = ec2_client.register_image.call_args[1]
+    assert 'TpmSupport' not in kwargs
+    assert 'BillingProducts' not in kwargs
+    assert kwargs['BootMode'] == 'legacy-bios'
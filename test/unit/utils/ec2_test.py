@@ -23,8 +23,11 @@ from mash.utils.ec2 import (
     get_vpc_id_from_subnet,
     cleanup_ec2_image,
     cleanup_all_ec2_images,
+    find_object_by_digest,
+    get_account_id,
     get_image,
     image_exists,
+    modify_image_sharing,
     start_mp_change_set
 )
 from mash.mash_exceptions import MashGCEUtilsException
@@ -117,6 +120,85 @@ def test_image_exists(mock_get_image):
     assert not image_exists(client, 'image name 321')
 
 
+def test_find_object_by_digest():
+    client = Mock()
+    client.get_paginator.return_value.paginate.return_value = [
+        {'Contents': [
+            {'Key': 'small.raw.gz', 'Size': 10},
+            {'Key': 'old.raw.gz', 'Size': 100},
+            {'Key': 'new.raw.gz', 'Size': 100}
+        ]},
+        {}
+    ]
+    metadata = {
+        'old.raw.gz': {'mash_image_sha256': 'abc'},
+        'new.raw.gz': {'mash_image_sha256': 'abc'}
+    }
+    client.head_object.side_effect = lambda Bucket, Key: {
+        'Metadata': metadata[Key]
+    }
+
+    assert find_object_by_digest(
+        client, 'bucket', 'abc', 100, key_name='new.raw.gz'
+    ) == 'new.raw.gz'
+    client.head_object.assert_called_once_with(
+        Bucket='bucket', Key='new.raw.gz'
+    )
+    client.get_paginator.return_value.paginate.assert_called_once_with(
+        Bucket='bucket'
+    )
+
+    assert find_object_by_digest(client, 'bucket', 'abc', 100) == \
+        'old.raw.gz'
+    assert find_object_by_digest(client, 'bucket', 'def', 100) is None
+    assert find_object_by_digest(client, 'bucket', 'abc', 50) is None
+
+
+@patch('mash.utils.ec2.get_client')
+def test_get_account_id(mock_get_client):
+    client = Mock()
+    client.get_caller_identity.return_value = {'Account': '123456789012'}
+    mock_get_client.return_value = client
+
+    assert get_account_id('123456', 'abc123', 'us-east-1') == '123456789012'
+    mock_get_client.assert_called_once_with(
+        'sts', '123456', 'abc123', 'us-east-1'
+    )
+
+
+def test_modify_image_sharing():
+    client = Mock()
+    client.describe_images.return_value = {
+        'Images': [{
+            'BlockDeviceMappings': [
+                {'DeviceName': '/dev/sda1', 'Ebs': {'SnapshotId': 'snap-1'}},
+                {'DeviceName': '/dev/sdb', 'VirtualName': 'ephemeral0'}
+            ]
+        }]
+    }
+
+    modify_image_sharing(client, 'ami-123', ['123456789012'])
+
+    client.modify_image_attribute.assert_called_once_with(
+        ImageId='ami-123',
+        LaunchPermission={'Add': [{'UserId': '123456789012'}]}
+    )
+    client.modify_snapshot_attribute.assert_called_once_with(
+        SnapshotId='snap-1',
+        Attribute='createVolumePermission',
+        OperationType='add',
+        UserIds=['123456789012']
+    )
+
+    modify_image_sharing(
+        client, 'ami-123', ['123456789012'], operation='remove'
+    )
+    assert client.modify_image_attribute.call_args[1]['LaunchPermission'] \
+        == {'Remove': [{'UserId': '123456789012'}]}
+    assert client.modify_snapshot_attribute.call_args[1]['OperationType'] \
+        == 'remove'
+
+
 def test_start_mp_change_set():
     client = Mock()
     client.start_change_set.return_value = {
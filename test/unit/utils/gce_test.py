@@ -22,7 +22,7 @@ from pytest import raises
 
 from googleapiclient.errors import HttpError
 
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 from mash.utils.gce import (
     get_region_list,
     get_zones,
@@ -37,9 +37,12 @@ from mash.utils.gce import (
     get_gce_compute_driver,
     get_gce_storage_driver,
     wait_on_operation,
-    blob_exists
+    blob_exists,
+    copy_blob,
+    find_blob_by_digest
 )
 from mash.mash_exceptions import MashException
+from mash.utils.cloud_api import ProfiledHttpRequest
 
 
 @patch('mash.utils.gce.wait_on_operation')
@@ -91,10 +94,16 @@ def test_delete_image_tarball():
     blob.delete.assert_called_once_with()
 
 
-def test_upload_image_tarball():
+@patch('mash.utils.gce.os')
+@patch('mash.utils.gce.open_throttled')
+def test_upload_image_tarball(mock_open_throttled, mock_os):
     driver = Mock()
     bucket = Mock()
     blob = Mock()
+    image = MagicMock()
+    image.__enter__.return_value = image
+    mock_open_throttled.return_value = image
+    mock_os.path.getsize.return_value = 1024
 
     bucket.blob.return_value = blob
     driver.get_bucket.return_value = bucket
@@ -103,11 +112,61 @@ def test_upload_image_tarball():
         driver,
         'image_123.tar.gz',
         '/path/to/file.tar.gz',
-        'bucket'
+        'bucket',
+        job_id='1'
     )
 
     driver.get_bucket.assert_called_once_with('bucket')
-    blob.upload_from_filename.assert_called_once_with('/path/to/file.tar.gz')
+    mock_open_throttled.assert_called_once_with('/path/to/file.tar.gz', '1')
+    blob.upload_from_file.assert_called_once_with(image, size=1024)
+
+    # Image digest
+    upload_image_tarball(
+        driver,
+        'image_123.tar.gz',
+        '/path/to/file.tar.gz',
+        'bucket',
+        digest='abc'
+    )
+    assert blob.metadata == {'mash_image_sha256': 'abc'}
+
+
+def get_blob(name, metadata=None):
+    blob = Mock(metadata=metadata)
+    blob.name = name
+    return blob
+
+
+def test_find_blob_by_digest():
+    driver = Mock()
+    bucket = Mock()
+    bucket.list_blobs.return_value = [
+        get_blob('other.tar.gz'),
+        get_blob('old.tar.gz', {'mash_image_sha256': 'abc'}),
+        get_blob('new.tar.gz', {'mash_image_sha256': 'abc'}),
+        get_blob('image.tar.gz', {'mash_image_sha256': '123'})
+    ]
+    driver.get_bucket.return_value = bucket
+
+    assert find_blob_by_digest(driver, 'abc', 'bucket') == 'old.tar.gz'
+    assert find_blob_by_digest(
+        driver, 'abc', 'bucket', object_name='new.tar.gz'
+    ) == 'new.tar.gz'
+    assert find_blob_by_digest(driver, 'def', 'bucket') is None
+    driver.get_bucket.assert_called_with('bucket')
+
+
+def test_copy_blob():
+    driver = Mock()
+    bucket = Mock()
+    source = Mock()
+    bucket.blob.return_value = source
+    driver.get_bucket.return_value = bucket
+
+    copy_blob(driver, 'old.tar.gz', 'new.tar.gz', 'bucket')
+
+    bucket.blob.assert_called_once_with('old.tar.gz')
+    bucket.copy_blob.assert_called_once_with(source, bucket, 'new.tar.gz')
 
 
 def test_get_region_list():
@@ -271,7 +330,8 @@ def test_get_gce_compute_driver(mock_service_account, mock_discovery):
         'compute',
         'v1',
         credentials=creds,
-        cache_discovery=False
+        cache_discovery=False,
+        requestBuilder=ProfiledHttpRequest
     )
 
 
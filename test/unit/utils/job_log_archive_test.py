@@ -0,0 +1,94 @@
+import fcntl
+import os
+import threading
+
+from tempfile import TemporaryDirectory
+
+from mash.utils.job_log_archive import JobLogArchive
+
+job_id = '12345678-1234-1234-1234-123456789012'
+
+
+def write_log(log_file, data):
+    with open(log_file, 'w') as log:
+        log.write(data)
+
+
+def test_job_log_archive():
+    with TemporaryDirectory() as log_dir:
+        archive_dir = os.path.join(log_dir, 'archive')
+        log_file = os.path.join(log_dir, job_id + '.log')
+        archive = JobLogArchive(archive_dir, max_segment_size=1)
+
+        assert archive.read(job_id) is None
+        assert archive.get_shard_directory(job_id) == \
+            os.path.join(archive_dir, '12')
+
+        write_log(log_file, 'Job started.\n')
+        assert archive.archive(job_id, log_file)
+        assert not os.path.exists(log_file)
+        assert archive.read(job_id) == b'Job started.\n'
+
+        # Late records are appended to the archived log
+        write_log(log_file, 'Job finished.\n')
+        assert archive.archive(job_id, log_file)
+        assert archive.read(job_id) == b'Job started.\nJob finished.\n'
+
+        # Full segments are not appended to
+        assert sorted(os.listdir(os.path.join(archive_dir, '12'))) == [
+            'index.db', 'segment-000001.gz', 'segment-000002.gz'
+        ]
+
+        # Other job in the same shard
+        other_job = '12000000-1234-1234-1234-123456789012'
+        assert archive.read(other_job) is None
+
+
+def test_job_log_archive_detached_log():
+    with TemporaryDirectory() as log_dir:
+        log_file = os.path.join(log_dir, job_id + '.log')
+        archive = JobLogArchive(os.path.join(log_dir, 'archive'))
+
+        assert not archive.archive(job_id, log_file)
+
+        # Detached log of an interrupted run and a reopened log
+        write_log(log_file + '.archiving', 'Job started.\n')
+        write_log(log_file, 'Job finished.\n')
+
+        assert archive.archive(job_id, log_file)
+        assert not os.path.exists(log_file + '.archiving')
+        assert os.path.exists(log_file)
+        assert archive.read(job_id) == b'Job started.\n'
+
+        assert archive.archive(job_id, log_file)
+        assert not os.path.exists(log_file)
+        assert archive.read(job_id) == b'Job started.\nJob finished.\n'
+
+
+def test_job_log_archive_locked_log():
+    with TemporaryDirectory() as log_dir:
+        log_file = os.path.join(log_dir, job_id + '.log')
+        archive = JobLogArchive(os.path.join(log_dir, 'archive'))
+        write_log(log_file, 'Job started.\n')
+        result = []
+
+        with open(log_file, 'a') as log:
+            # The logger holds a shared lock until records are flushed
+            fcntl.flock(log, fcntl.LOCK_SH)
+            thread = threading.Thread(
+                target=lambda: result.append(archive.archive(job_id, log_file))
+            )
+            thread.start()
+            thread.join(0.2)
+
+            assert thread.is_alive()
+            assert os.path.exists(log_file)
+
+            log.write('Job finished.\n')
+            log.flush()
+            fcntl.flock(log, fcntl.LOCK_UN)
+            thread.join()
+
+        assert result == [True]
+        assert not os.path.exists(log_file)
+        assert archive.read(job_id) == b'Job started.\nJob finished.\n'
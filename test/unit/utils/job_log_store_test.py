@@ -0,0 +1,185 @@
+import gzip
+import os
+import shutil
+import threading
+
+from datetime import datetime, timezone
+from pytest import raises
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from mash.utils.job_log_store import JobLogStore
+
+day1 = datetime(2026, 10, 18, 12, tzinfo=timezone.utc).timestamp()
+day2 = datetime(2026, 10, 19, 12, tzinfo=timezone.utc).timestamp()
+
+
+def get_record(job_id, timestamp, message, level='INFO'):
+    return {
+        'job_id': job_id,
+        'service': 'upload',
+        'level': level,
+        'timestamp': timestamp,
+        'message': message
+    }
+
+
+def test_job_log_store():
+    with TemporaryDirectory() as store_dir:
+        store = JobLogStore(store_dir)
+        store.add_records([
+            get_record('1', day1, 'Uploading to us-east-1'),
+            get_record('1', day1 + 1, 'Upload failed', level='ERROR'),
+            get_record('2', day2, 'Uploading to eu-west-1')
+        ])
+
+        assert store.get_day(day1) == '2026-10-18'
+        assert sorted(os.listdir(store_dir))[0] == '2026-10-18.db'
+
+        start = datetime(2026, 10, 18, tzinfo=timezone.utc)
+        end = datetime(2026, 10, 20, tzinfo=timezone.utc)
+
+        records = store.query(start=start, end=end)
+        assert [record['job_id'] for record in records] == ['1', '1', '2']
+
+        records = store.query(level='ERROR', start=start, end=end)
+        assert records == [get_record('1', day1 + 1, 'Upload failed', 'ERROR')]
+
+        records = store.query(text='"eu-west-1"', start=start, end=end)
+        assert [record['job_id'] for record in records] == ['2']
+
+        records = store.query(
+            job_id='1', service='upload', start=start, end=end, limit=1
+        )
+        assert records == [get_record('1', day1, 'Uploading to us-east-1')]
+
+        # Seal the first day and add a late record for it
+        store.seal_partitions('2026-10-19')
+        assert not os.path.exists(os.path.join(store_dir, '2026-10-18.db'))
+
+        store.add_records([get_record('3', day1 + 0.5, 'Late record')])
+        store.seal_partitions('2026-10-19')
+
+        sealed = [
+            name for name in os.listdir(store_dir)
+            if name.startswith('2026-10-18')
+        ]
+        assert len(sealed) == 2
+        assert all(name.endswith('.db.gz') for name in sealed)
+
+        records = store.query(job_id='1', start=start, end=end)
+        assert len(records) == 2
+
+        records = store.query(start=start, end=end, limit=2)
+        assert [record['job_id'] for record in records] == ['1', '3']
+
+        # Default range is the 7 days before the end
+        assert store.query(end=datetime(2026, 10, 11, tzinfo=timezone.utc)) \
+            == []
+        assert len(store.query(end=end)) == 4
+        store.close()
+        assert store.connections == {}
+
+
+def test_job_log_store_cache():
+    with TemporaryDirectory() as store_dir:
+        store = JobLogStore(store_dir, max_cached_partitions=1)
+        store.add_records([
+            get_record('1', day1, 'Uploading to us-east-1'),
+            get_record('2', day2, 'Uploading to eu-west-1')
+        ])
+        store.seal_partitions('2026-10-20')
+        cache_dir = os.path.join(store_dir, 'cache')
+
+        start = datetime(2026, 10, 18, tzinfo=timezone.utc)
+        end = datetime(2026, 10, 19, 23, tzinfo=timezone.utc)
+
+        # Only the most recently queried partition is cached
+        assert len(store.query(start=start, end=end)) == 2
+        cached = os.listdir(cache_dir)
+        assert len(cached) == 1 and cached[0].startswith('2026-10-19')
+
+        # Cached partitions are reused
+        with patch('mash.utils.job_log_store.gzip.open') as mock_gzip_open:
+            assert len(store.query(
+                start=datetime(2026, 10, 19, tzinfo=timezone.utc), end=end
+            )) == 1
+            assert not mock_gzip_open.called
+
+        # Cached partitions of removed sealed partitions are pruned
+        for name in os.listdir(store_dir):
+            if name.startswith('2026-10-19'):
+                os.remove(os.path.join(store_dir, name))
+
+        assert len(store.query(start=start, end=end)) == 1
+        assert os.listdir(cache_dir)[0].startswith('2026-10-18')
+
+        # A failed extraction leaves no temporary file
+        with patch('mash.utils.job_log_store.shutil.copyfileobj') as mock_copy:
+            mock_copy.side_effect = OSError('No space left on device')
+            shutil.rmtree(cache_dir)
+
+            with raises(OSError):
+                store.query(start=start, end=end)
+
+        assert os.listdir(cache_dir) == []
+
+
+def test_job_log_store_interrupted_seal():
+    with TemporaryDirectory() as store_dir:
+        store = JobLogStore(store_dir)
+        store.add_records([get_record('1', day1, 'Uploading to us-east-1')])
+
+        # Sealing stopped after the partition was renamed
+        store._retire_partition('2026-10-18', store._get_partition_file(
+            '2026-10-18'
+        ))
+        assert store.connections == {}
+
+        start = datetime(2026, 10, 18, tzinfo=timezone.utc)
+        end = datetime(2026, 10, 19, tzinfo=timezone.utc)
+        assert len(store.query(start=start, end=end)) == 1
+
+        # Sealing stopped after the partition was compressed
+        sealed_file = os.path.join(store_dir, os.listdir(store_dir)[0])
+        with open(sealed_file, 'rb') as source:
+            with gzip.open(sealed_file + '.gz', 'wb') as target:
+                shutil.copyfileobj(source, target)
+
+        assert len(store.query(start=start, end=end)) == 1
+        assert not os.path.exists(os.path.join(store_dir, 'cache'))
+
+        store.seal_partitions('2026-10-19')
+        assert os.listdir(store_dir) == [
+            os.path.basename(sealed_file) + '.gz'
+        ]
+        assert len(store.query(start=start, end=end)) == 1
+
+
+def test_job_log_store_seal_thread():
+    with TemporaryDirectory() as store_dir:
+        store = JobLogStore(store_dir)
+        store.add_records([get_record('1', day1, 'Uploading to us-east-1')])
+
+        # The logger seals partitions on the scheduler thread
+        for _ in range(2):
+            thread = threading.Thread(
+                target=store.seal_partitions, args=('2026-10-19',)
+            )
+            thread.start()
+            thread.join()
+
+            store.add_records([get_record('2', day1, 'Late record')])
+
+        sealed = sorted(
+            name for name in os.listdir(store_dir)
+            if name.endswith(('.db', '.gz'))
+        )
+        assert len(sealed) == 3
+        assert all(name.endswith('.db.gz') for name in sealed[:2])
+        assert sealed[2] == '2026-10-18.db'
+
+        start = datetime(2026, 10, 18, tzinfo=timezone.utc)
+        end = datetime(2026, 10, 19, tzinfo=timezone.utc)
+        assert len(store.query(start=start, end=end)) == 3
+        store.close()
@@ -0,0 +1,113 @@
+import os
+
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from mash.utils import job_log
+from mash.utils.job_log import (
+    JobLogReader,
+    get_job_log_reader,
+    wait_for_log_growth
+)
+
+
+def write_lines(log_file, start, stop, mode='a'):
+    with open(log_file, mode) as log:
+        for index in range(start, stop):
+            log.write('line {0}\n'.format(index))
+
+
+class TestJobLogReader(object):
+
+    def test_read_lines(self):
+        with TemporaryDirectory() as test_dir:
+            log_file = os.path.join(test_dir, '1.log')
+            write_lines(log_file, 0, 25)
+
+            reader = JobLogReader(log_file, index_interval=10)
+            lines, offset, next_offset = reader.read_lines(12, 3)
+
+            assert lines == ['line 12\n', 'line 13\n', 'line 14\n']
+            assert (offset, next_offset) == (12, 15)
+            assert len(reader.offsets) == 3
+            assert reader.line_count == 25
+
+            # Tail
+            lines, offset, next_offset = reader.read_lines(-2, 10)
+            assert lines == ['line 23\n', 'line 24\n']
+            assert (offset, next_offset) == (23, 25)
+
+            # Partial last line is not returned or indexed
+            write_lines(log_file, 25, 30)
+            with open(log_file, 'a') as log:
+                log.write('partial')
+
+            lines, offset, next_offset = reader.read_lines(25, 10)
+            assert lines[-1] == 'line 29\n'
+            assert next_offset == 30
+            assert reader.line_count == 30
+            assert len(reader.offsets) == 4
+
+            # Offset past the end
+            lines, offset, next_offset = reader.read_lines(100, 10)
+            assert lines == []
+            assert offset == 30
+
+            # File replaced with a shorter one
+            write_lines(log_file, 0, 5, mode='w')
+            lines, offset, next_offset = reader.read_lines(-10, 10)
+            assert len(lines) == 5
+            assert reader.line_count == 5
+
+            # No change since last update
+            reader.update_index()
+            assert reader.line_count == 5
+
+    def test_read_bytes(self):
+        with TemporaryDirectory() as test_dir:
+            log_file = os.path.join(test_dir, '1.log')
+            write_lines(log_file, 0, 3)
+
+            reader = JobLogReader(log_file)
+            data, next_offset = reader.read_bytes(7, 6)
+
+            assert data == b'line 1'
+            assert next_offset == 13
+            assert reader.get_size() == 21
+
+
+def test_read_archived_lines():
+    reader = JobLogReader('/tmp/1.log', index_interval=2, data=b'a\nb\nc\n')
+
+    assert reader.get_size() == 6
+    assert reader.read_lines(1, 5) == (['b\n', 'c\n'], 1, 3)
+    assert reader.read_bytes(2, 2) == (b'b\n', 4)
+
+
+def test_get_job_log_reader():
+    job_log.readers.clear()
+    reader = get_job_log_reader('/tmp/1.log', max_readers=2)
+
+    assert get_job_log_reader('/tmp/1.log', max_readers=2) is reader
+
+    get_job_log_reader('/tmp/2.log', max_readers=2)
+    get_job_log_reader('/tmp/3.log', max_readers=2)
+
+    assert list(job_log.readers) == ['/tmp/2.log', '/tmp/3.log']
+    job_log.readers.clear()
+
+
+@patch('mash.utils.job_log.time.sleep')
+def test_wait_for_log_growth(mock_sleep):
+    with TemporaryDirectory() as test_dir:
+        log_file = os.path.join(test_dir, '1.log')
+
+        def append(seconds):
+            write_lines(log_file, 0, 1)
+
+        mock_sleep.side_effect = append
+        assert wait_for_log_growth(log_file, 0, 10)
+        assert mock_sleep.call_count == 1
+
+        mock_sleep.side_effect = None
+        assert not wait_for_log_growth(log_file, 100, 0)
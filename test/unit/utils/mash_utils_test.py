@@ -39,6 +39,7 @@ from mash.utils.mash_utils import (
     setup_logfile,
     setup_rabbitmq_log_handler,
     get_fingerprint_from_private_key,
+    get_image_digest,
     normalize_dictionary
 )
 
@@ -137,6 +138,14 @@ def test_persist_json():
         file_handle.write.assert_called_with('{\n    "id": "1"\n}')
 
 
+def test_get_image_digest(tmpdir):
+    image_file = tmpdir.join('image.raw')
+    image_file.write('image')
+
+    assert get_image_digest(str(image_file), block_size=2) == \
+        '6105d6cc76af400325e94d588ce511be5bfdbb73b437dc51eca43917d7a43e3d'
+
+
 @patch('mash.utils.mash_utils.json.load')
 def test_load_json(mock_load_json):
     mock_load_json.return_value = {'id': '123'}
@@ -186,6 +195,11 @@ def test_handle_request(mock_requests):
     result = handle_request('localhost', '/jobs', 'get')
     assert result == response
 
+    # The request is a span and propagates the trace context
+    kwargs = mock_requests.get.call_args[1]
+    assert kwargs['data'] is None
+    assert 'traceparent' in kwargs['headers']
+
 
 @patch('mash.utils.mash_utils.requests')
 def test_handle_request_failed(mock_requests):
@@ -217,7 +231,7 @@ def test_setup_logfile(mock_os, mock_logging):
 
 
 @patch('mash.utils.mash_utils.logging')
-@patch('mash.utils.mash_utils.RabbitMQHandler')
+@patch('mash.utils.mash_utils.AsyncRabbitMQHandler')
 def test_setup_rabbitmq_log_handler(mock_rabbit, mock_logging):
     handler = MagicMock()
     formatter = MagicMock()
@@ -0,0 +1,183 @@
+import math
+
+from pytest import raises
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from flask import Flask
+
+from mash.utils.metrics import (
+    CONTENT_TYPE,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    format_labels,
+    format_value,
+    register_flask_metrics,
+    start_metrics_server
+)
+
+
+def test_format_value():
+    assert format_value(3) == '3'
+    assert format_value(2.0) == '2'
+    assert format_value(0.25) == '0.25'
+    assert format_value(math.inf) == '+Inf'
+    assert format_value(-math.inf) == '-Inf'
+    assert format_value(math.nan) == 'NaN'
+
+
+def test_format_labels():
+    assert format_labels([]) == ''
+    assert format_labels([('a', 'x'), ('b', 'say "hi"\\\n')]) == \
+        '{a="x",b="say \\"hi\\"\\\\\\n"}'
+
+
+class TestCounter(object):
+
+    def test_inc(self):
+        counter = Counter('jobs_total', 'Jobs.', ('cloud',))
+        counter.inc(cloud='ec2')
+        counter.inc(2, cloud='ec2')
+
+        assert counter.get_value(cloud='ec2') == 3
+        assert counter.get_value(cloud='gce') == 0
+        assert counter.collect() == [
+            '# HELP jobs_total Jobs.',
+            '# TYPE jobs_total counter',
+            'jobs_total{cloud="ec2"} 3'
+        ]
+
+    def test_inc_invalid(self):
+        counter = Counter('jobs_total', 'Jobs.', ('cloud',))
+
+        with raises(ValueError):
+            counter.inc(-1, cloud='ec2')
+
+        with raises(ValueError):
+            counter.inc(service='upload')
+
+
+class TestGauge(object):
+
+    def test_set_inc_dec(self):
+        gauge = Gauge('jobs', 'Jobs.')
+        gauge.set(5)
+        gauge.inc()
+        gauge.dec(2)
+
+        assert gauge.get_value() == 4
+        assert gauge.collect()[-1] == 'jobs 4'
+
+    def test_set_function(self):
+        gauge = Gauge('jobs', 'Jobs.', ('state',))
+        gauge.set_function(lambda: {('running',): 2, ('queued',): 1})
+
+        assert gauge.collect()[2:] == [
+            'jobs{state="running"} 2',
+            'jobs{state="queued"} 1'
+        ]
+
+        gauge = Gauge('workers', 'Workers.')
+        gauge.set_function(lambda: 10)
+        assert gauge.collect()[2:] == ['workers 10']
+
+
+class TestHistogram(object):
+
+    def test_observe(self):
+        histogram = Histogram(
+            'duration_seconds', 'Duration.', ('service',), buckets=(1, 5)
+        )
+        histogram.observe(0.5, service='upload')
+        histogram.observe(1, service='upload')
+        histogram.observe(7, service='upload')
+
+        assert histogram.get_value(service='upload') == 3
+        assert histogram.get_value(service='create') == 0
+        assert histogram.collect()[2:] == [
+            'duration_seconds_bucket{service="upload",le="1"} 2',
+            'duration_seconds_bucket{service="upload",le="5"} 2',
+            'duration_seconds_bucket{service="upload",le="+Inf"} 3',
+            'duration_seconds_sum{service="upload"} 8.5',
+            'duration_seconds_count{service="upload"} 3'
+        ]
+
+    def test_time(self):
+        histogram = Histogram('duration_seconds', 'Duration.')
+
+        with histogram.time():
+            pass
+
+        assert histogram.get_value() == 1
+
+
+class TestMetricsRegistry(object):
+
+    def setup_method(self):
+        self.registry = MetricsRegistry()
+
+    def test_get_or_create(self):
+        counter = self.registry.counter('jobs_total', 'Jobs.')
+        assert self.registry.counter('jobs_total', 'Jobs.') is counter
+        assert isinstance(self.registry.gauge('jobs', 'Jobs.'), Gauge)
+        assert isinstance(
+            self.registry.histogram('duration_seconds', 'Duration.'),
+            Histogram
+        )
+
+        with raises(ValueError):
+            self.registry.gauge('jobs_total', 'Jobs.')
+
+    def test_expose(self):
+        self.registry.counter('jobs_total', 'Jobs.').inc()
+        self.registry.gauge('jobs', 'Jobs.').set(2)
+
+        assert self.registry.expose() == (
+            '# HELP jobs_total Jobs.\n'
+            '# TYPE jobs_total counter\n'
+            'jobs_total 1\n'
+            '# HELP jobs Jobs.\n'
+            '# TYPE jobs gauge\n'
+            'jobs 2\n'
+        )
+
+    def test_start_metrics_server(self):
+        self.registry.counter('jobs_total', 'Jobs.').inc()
+        server = start_metrics_server(0, metrics_registry=self.registry)
+        url = 'http://localhost:{0}'.format(server.server_address[1])
+
+        try:
+            response = urlopen(url + '/metrics?x=1')
+            assert response.headers['Content-Type'] == CONTENT_TYPE
+            assert b'jobs_total 1\n' in response.read()
+
+            with raises(HTTPError):
+                urlopen(url + '/')
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_register_flask_metrics(self):
+        app = Flask('test')
+        app.add_url_rule('/jobs/<job_id>', 'job', lambda job_id: job_id)
+        register_flask_metrics(app, 'api', self.registry)
+        client = app.test_client()
+
+        assert client.get('/jobs/1').status_code == 200
+        assert client.get('/missing').status_code == 404
+
+        response = client.get('/metrics')
+        assert response.content_type == CONTENT_TYPE
+
+        requests_total = self.registry.counter(
+            'mash_http_requests_total', 'HTTP requests handled.'
+        )
+        assert requests_total.get_value(
+            service='api', method='GET', endpoint='/jobs/<job_id>', status=200
+        ) == 1
+        assert requests_total.get_value(
+            service='api', method='GET', endpoint='none', status=404
+        ) == 1
+        assert b'mash_http_request_duration_seconds_count' in response.data
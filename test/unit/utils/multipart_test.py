@@ -0,0 +1,199 @@
+import os
+
+from pytest import raises
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
+
+from mash.mash_exceptions import MashUploadException
+from mash.utils.multipart import (
+    MIB,
+    ThroughputTuner,
+    is_resumable,
+    new_upload_state,
+    reconcile_parts,
+    upload_parts
+)
+
+
+def write_image(test_dir, data):
+    image_file = os.path.join(test_dir, 'image.qcow2')
+
+    with open(image_file, 'wb') as image:
+        image.write(data)
+
+    return image_file
+
+
+def test_upload_state():
+    with TemporaryDirectory() as test_dir:
+        image_file = write_image(test_dir, b'0123456789')
+        state = new_upload_state('upload1', 'image.qcow2', image_file)
+
+        assert state == {
+            'upload_id': 'upload1',
+            'object_name': 'image.qcow2',
+            'image_file': image_file,
+            'image_size': 10,
+            'parts': []
+        }
+        assert is_resumable(state, 'image.qcow2', image_file)
+        assert not is_resumable(state, 'other.qcow2', image_file)
+        assert not is_resumable(None, 'image.qcow2', image_file)
+
+        write_image(test_dir, b'01234')
+        assert not is_resumable(state, 'image.qcow2', image_file)
+
+    assert not is_resumable(state, 'image.qcow2', image_file)
+
+
+def test_reconcile_parts():
+    state = {'parts': [
+        {'part_num': 1, 'offset': 0, 'size': 4, 'etag': 'etag1'},
+        {'part_num': 2, 'offset': 4, 'size': 4, 'etag': None},
+        {'part_num': 3, 'offset': 8, 'size': 2, 'etag': 'etag3'}
+    ]}
+
+    uploaded = reconcile_parts(state, {
+        1: ('etag1', 4),
+        2: ('etag2', 4),
+        3: ('partial', 1)
+    })
+
+    assert uploaded == 8
+    assert [part['etag'] for part in state['parts']] == \
+        ['etag1', 'etag2', None]
+
+
+class TestThroughputTuner(object):
+
+    def test_adapt(self):
+        tuner = ThroughputTuner(
+            part_size=16 * MIB + 1, workers=2, max_workers=3
+        )
+        assert tuner.part_size == 16 * MIB
+
+        # First round, two parts of 10 MiB in 2 seconds
+        tuner.record(10 * MIB, 2, now=2)
+        assert tuner.workers == 2
+        tuner.record(10 * MIB, 2, now=2)
+
+        assert tuner.workers == 3
+        assert tuner.throughput == 10 * MIB
+        assert tuner.part_size == 128 * MIB
+
+        # More workers doubled the throughput, limited by max_workers
+        for _ in range(3):
+            tuner.record(20 * MIB, 2, now=4)
+
+        assert tuner.workers == 3
+
+        # Throughput dropped
+        for _ in range(3):
+            tuner.record(MIB, 2, now=6)
+
+        assert tuner.workers == 2
+        assert tuner.part_size == 15 * MIB
+
+        # Throughput unchanged
+        for _ in range(2):
+            tuner.record(3 * MIB // 2, 1, now=8)
+
+        assert tuner.workers == 2
+        assert tuner.part_size == 45 * MIB
+
+    def test_limits(self):
+        tuner = ThroughputTuner(part_size=MIB, workers=0, max_workers=0)
+
+        assert tuner.part_size == 10 * MIB
+        assert tuner.workers == 1
+
+        tuner.start()
+        tuner.record(MIB, 10)
+        assert tuner.part_size == 10 * MIB
+
+
+class TestUploadParts(object):
+
+    def setup_method(self):
+        self.tuner = ThroughputTuner(
+            workers=2, min_part_size=4, max_part_size=4
+        )
+        self.upload_part = Mock(
+            side_effect=lambda part_num, data: 'etag{0}'.format(part_num)
+        )
+        self.persist = Mock()
+        self.progress = Mock()
+
+    def test_upload_parts(self):
+        with TemporaryDirectory() as test_dir:
+            image_file = write_image(test_dir, b'0123456789')
+            state = new_upload_state('upload1', 'image.qcow2', image_file)
+
+            parts = upload_parts(
+                image_file,
+                state,
+                self.upload_part,
+                tuner=self.tuner,
+                persist_callback=self.persist,
+                progress_callback=self.progress
+            )
+
+        assert parts == [(1, 'etag1'), (2, 'etag2'), (3, 'etag3')]
+        self.upload_part.assert_any_call(1, b'0123')
+        self.upload_part.assert_any_call(2, b'4567')
+        self.upload_part.assert_any_call(3, b'89')
+        assert state['parts'][2] == {
+            'part_num': 3, 'offset': 8, 'size': 2, 'etag': 'etag3'
+        }
+        assert self.persist.call_count == 6
+        assert sum(call[0][0] for call in self.progress.call_args_list) == 10
+
+    def test_upload_parts_resume(self):
+        with TemporaryDirectory() as test_dir:
+            image_file = write_image(test_dir, b'0123456789')
+            state = new_upload_state('upload1', 'image.qcow2', image_file)
+            state['parts'] = [
+                {'part_num': 1, 'offset': 0, 'size': 4, 'etag': None},
+                {'part_num': 2, 'offset': 4, 'size': 4, 'etag': 'etag2'}
+            ]
+
+            parts = upload_parts(image_file, state, self.upload_part)
+
+        assert parts == [(1, 'etag1'), (2, 'etag2'), (3, 'etag3')]
+        assert self.upload_part.call_count == 2
+        self.upload_part.assert_any_call(1, b'0123')
+        self.upload_part.assert_any_call(3, b'89')
+
+    @patch('mash.utils.multipart.MAX_PARTS', 2)
+    def test_upload_parts_max_parts(self):
+        with TemporaryDirectory() as test_dir:
+            image_file = write_image(test_dir, b'0123456789')
+            state = new_upload_state('upload1', 'image.qcow2', image_file)
+
+            # Parts grow to fit the image in the remaining part numbers
+            parts = upload_parts(
+                image_file, state, self.upload_part, tuner=self.tuner
+            )
+            assert parts == [(1, 'etag1'), (2, 'etag2')]
+            assert state['parts'][1]['size'] == 5
+
+            state['image_size'] = 12
+
+            with raises(MashUploadException):
+                upload_parts(
+                    image_file, state, self.upload_part, tuner=self.tuner
+                )
+
+    def test_upload_parts_failed(self):
+        self.upload_part.side_effect = Exception('Connection reset')
+
+        with TemporaryDirectory() as test_dir:
+            image_file = write_image(test_dir, b'0123456789')
+            state = new_upload_state('upload1', 'image.qcow2', image_file)
+
+            with raises(Exception):
+                upload_parts(
+                    image_file, state, self.upload_part, tuner=self.tuner
+                )
+
+        assert state['parts'][0]['etag'] is None
@@ -0,0 +1,127 @@
+from unittest.mock import patch
+
+from mash.utils.rate_limiter import (
+    RateLimiter,
+    TokenBucket,
+    get_api_family,
+    rate_limit_decreases,
+    rate_limit_wait
+)
+
+
+def test_get_api_family():
+    assert get_api_family('ec2', 'DescribeImages') == 'read'
+    assert get_api_family('ec2', 'CopyImage') == 'write'
+    assert get_api_family('ec2', 'ModifyImageAttribute') == 'write'
+    assert get_api_family('gce', 'compute.images.get') == 'read'
+    assert get_api_family('gce', 'compute.images.aggregatedList') == 'read'
+    assert get_api_family('gce', 'compute.images.insert') == 'write'
+    assert get_api_family(
+        'azure', 'GET Microsoft.Compute/galleries/images'
+    ) == 'read'
+    assert get_api_family(
+        'azure', 'PUT Microsoft.Compute/galleries/images/versions'
+    ) == 'write'
+    assert get_api_family('azure', 'PUT blob') == 'other'
+
+
+@patch('mash.utils.rate_limiter.time')
+class TestTokenBucket(object):
+
+    def test_acquire(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        bucket = TokenBucket(2)
+
+        # The bucket starts full with one second of tokens
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == 0.5
+        assert bucket.acquire() == 1
+        mock_time.sleep.assert_called_with(1)
+
+        mock_time.monotonic.return_value = 10
+        assert bucket.acquire() == 0
+        assert bucket.tokens == 1
+
+    def test_adapt_rate(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        bucket = TokenBucket(10, increase_ratio=0.1)
+
+        assert bucket.throttled()
+        assert bucket.rate == 5
+        assert bucket.tokens == 0
+
+        # Throttled calls in flight only slow down once
+        mock_time.monotonic.return_value = 0.5
+        assert not bucket.throttled()
+        assert bucket.rate == 5
+
+        bucket.succeeded()
+        assert bucket.rate == 6
+
+        for _ in range(10):
+            bucket.succeeded()
+
+        assert bucket.rate == 10
+
+    def test_min_rate(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        bucket = TokenBucket(1, min_rate=0.4, cooldown=0)
+
+        bucket.throttled()
+        bucket.throttled()
+
+        assert bucket.rate == 0.4
+        assert bucket.capacity == 1
+
+
+class TestRateLimiter(object):
+
+    def setup_method(self):
+        self.limiter = RateLimiter({'ec2': {'read': 20, 'write': 0}})
+
+    def test_get_bucket(self):
+        bucket = self.limiter.get_bucket('ec2', 'read', 'acnt1', 'us-east-1')
+
+        assert bucket.max_rate == 20
+        assert self.limiter.get_bucket(
+            'ec2', 'read', 'acnt1', 'us-east-1'
+        ) is bucket
+        assert self.limiter.get_bucket(
+            'ec2', 'read', 'acnt1', 'us-east-2'
+        ) is not bucket
+        assert self.limiter.get_bucket('ec2', 'write') is None
+        assert self.limiter.get_bucket('gce', 'read') is None
+
+        self.limiter.configure(None)
+        assert self.limiter.get_bucket('ec2', 'read') is None
+
+    def test_acquire(self):
+        waits = rate_limit_wait.get_value(cloud='ec2', family='read')
+
+        assert self.limiter.acquire('ec2', 'DescribeImages') == 0
+        assert self.limiter.acquire('ec2', 'CopyImage') == 0
+        assert rate_limit_wait.get_value(
+            cloud='ec2', family='read'
+        ) == waits + 1
+
+    def test_record(self):
+        decreases = rate_limit_decreases.get_value(cloud='ec2', family='read')
+
+        self.limiter.record(
+            'ec2', 'DescribeImages', throttled=True, region='us-east-1'
+        )
+        self.limiter.record(
+            'ec2', 'DescribeImages', throttled=True, region='us-east-1'
+        )
+        bucket = self.limiter.get_bucket('ec2', 'read', region='us-east-1')
+        assert bucket.rate == 10
+        assert rate_limit_decreases.get_value(
+            cloud='ec2', family='read'
+        ) == decreases + 1
+
+        self.limiter.record('ec2', 'DescribeImages', region='us-east-1')
+        assert bucket.rate == 11
+
+        # Families without a rate are ignored
+        self.limiter.record('ec2', 'CopyImage', throttled=True)
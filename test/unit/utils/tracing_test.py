@@ -0,0 +1,151 @@
+import json
+import os
+
+from pytest import raises
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock
+
+from mash.utils.tracing import (
+    STATUS_ERROR,
+    FileSpanExporter,
+    SpanContext,
+    Tracer,
+    format_attribute,
+    format_traceparent,
+    get_job_trace_id,
+    parse_traceparent,
+    spans_dropped
+)
+
+TRACE_ID = '0af7651916cd43dd8448eb211c80319c'
+SPAN_ID = 'b7ad6b7169203331'
+
+
+def test_get_job_trace_id():
+    assert get_job_trace_id('12345678-1234-1234-1234-123456789012') == \
+        '12345678123412341234123456789012'
+    assert len(get_job_trace_id('123')) == 32
+
+
+def test_traceparent():
+    context = SpanContext(TRACE_ID, SPAN_ID)
+    value = format_traceparent(context)
+
+    assert value == '00-{0}-{1}-01'.format(TRACE_ID, SPAN_ID)
+    assert parse_traceparent(value) == context
+    assert parse_traceparent(value.encode()) == context
+    assert parse_traceparent(None) is None
+    assert parse_traceparent('invalid') is None
+    assert parse_traceparent('00-{0}-{1}-01'.format('0' * 32, SPAN_ID)) \
+        is None
+
+
+def test_format_attribute():
+    assert format_attribute('a', True) == {
+        'key': 'a', 'value': {'boolValue': True}
+    }
+    assert format_attribute('a', 10)['value'] == {'intValue': '10'}
+    assert format_attribute('a', 0.5)['value'] == {'doubleValue': 0.5}
+    assert format_attribute('a', 'ec2')['value'] == {'stringValue': 'ec2'}
+
+
+class TestTracer(object):
+
+    def setup_method(self):
+        self.exporter = Mock()
+        self.tracer = Tracer()
+        self.tracer.configure(self.exporter)
+
+    def test_span(self):
+        with self.tracer.span('process_job', trace_id=TRACE_ID) as parent:
+            with self.tracer.span('download', attributes={'size': 1}):
+                headers = self.tracer.inject({'other': 'value'})
+
+        child = self.exporter.export.call_args_list[0][0][0][0]
+        assert child.name == 'download'
+        assert child.context.trace_id == TRACE_ID
+        assert child.to_otlp()['parentSpanId'] == parent.context.span_id
+        assert headers == {
+            'other': 'value',
+            'traceparent': format_traceparent(child.context)
+        }
+
+        span = parent.to_otlp()
+        assert span['traceId'] == TRACE_ID
+        assert 'parentSpanId' not in span
+        assert int(span['endTimeUnixNano']) >= int(span['startTimeUnixNano'])
+        assert self.tracer.get_current_context() is None
+        assert self.tracer.inject() == {}
+
+    def test_span_error(self):
+        with raises(ValueError):
+            with self.tracer.span('process_job'):
+                raise ValueError('Broken image')
+
+        span = self.exporter.export.call_args[0][0][0].to_otlp()
+        assert span['status'] == {
+            'code': STATUS_ERROR,
+            'message': 'Broken image'
+        }
+        assert span['attributes'] == [
+            {'key': 'exception.type', 'value': {'stringValue': 'ValueError'}}
+        ]
+
+    def test_activate_and_extract(self):
+        context = self.tracer.extract(
+            {'traceparent': '00-{0}-{1}-01'.format(TRACE_ID, SPAN_ID)}
+        )
+        assert self.tracer.extract(None) is None
+
+        with self.tracer.activate(None):
+            assert self.tracer.get_current_context() is None
+
+        with self.tracer.activate(context):
+            span = self.tracer.start_span('publish')
+
+        assert span.parent_id == SPAN_ID
+        assert span.context.trace_id == TRACE_ID
+
+    def test_end_once(self):
+        span = self.tracer.start_span('download')
+        span.end()
+        span.end()
+
+        assert self.exporter.export.call_count == 1
+
+    def test_export_failed(self):
+        self.exporter.export.side_effect = OSError('No space left on device')
+        dropped = spans_dropped.get_value()
+
+        self.tracer.start_span('download').end()
+
+        assert spans_dropped.get_value() == dropped + 1
+
+        # Without an exporter spans are not exported
+        self.tracer.configure(None)
+        self.tracer.start_span('download').end()
+
+
+def test_file_span_exporter():
+    tracer = Tracer()
+
+    with TemporaryDirectory() as test_dir:
+        trace_dir = os.path.join(test_dir, 'traces')
+        tracer.configure(FileSpanExporter(trace_dir, 'upload'))
+
+        with tracer.span('process_job', trace_id=TRACE_ID):
+            pass
+
+        tracer.start_span('download').end()
+
+        with open(os.path.join(trace_dir, 'upload_spans.json')) as span_file:
+            requests = [json.loads(line) for line in span_file]
+
+    assert len(requests) == 2
+    resource_spans = requests[0]['resourceSpans'][0]
+    assert resource_spans['resource']['attributes'] == [
+        {'key': 'service.name', 'value': {'stringValue': 'upload'}}
+    ]
+    span = resource_spans['scopeSpans'][0]['spans'][0]
+    assert span['name'] == 'process_job'
+    assert span['traceId'] == TRACE_ID